@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Locator cost and selectivity audit for all page objects
+
+Evaluates every locator on the BasePage subclasses against stored snapshots,
+flags full-document scans and broad matches, proposes CSS equivalents with
+their measured speedup and fails when a page object exceeds its
+LOCATOR_BUDGET_MS.
+"""
+
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.locator_engine import load_snapshots
+from utils.locator_audit import LocatorAudit
+
+
+def print_report(report, show_all=False):
+    """Print per-page cost, flags and proposals"""
+    for page in report:
+        status = "OK" if page["within_budget"] else "OVER BUDGET"
+        print("=" * 78)
+        print(f"{page['page']}: {page['total_cost_ms']:.2f} ms / budget {page['budget_ms']} ms  [{status}]"
+              f"  ({page['relative_cost']}x a full document scan, static cost {page['static_cost']} scans)")
+        print("=" * 78)
+        for entry in page["locators"]:
+            interesting = show_all or "broad" in entry["flags"] or entry["proposals"]
+            if not interesting:
+                continue
+            print(f"  {entry['name']:<36}{entry['cost_ms']:>8.3f} ms{entry['max_matches']:>6} match(es)")
+            print(f"      {entry['value']}")
+            print(f"      flags: {', '.join(entry['flags']) or '-'}, static cost {entry['static_cost']}")
+            for proposal in entry["proposals"]:
+                note = "same count" if proposal["same_count"] else f"{proposal['max_matches']} match(es)"
+                print(f"      -> {proposal['kind']:<10} {proposal['selector']}")
+                print(f"         {proposal['cost_ms']:.3f} ms, speedup {proposal['speedup']}x, {note}")
+        print()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Audit page-object locator cost and selectivity')
+    parser.add_argument('snapshots', nargs='*',
+                        help='Snapshot files (default: cartlow_page_source.html and snapshots/*.html)')
+    parser.add_argument('--no-stand-in', action='store_true',
+                        help='Do not include pages rendered by the stand-in site')
+    parser.add_argument('--repeat', type=int, default=15, help='Evaluations per measurement')
+    parser.add_argument('--browser', action='store_true',
+                        help='Measure inside a real browser instead of lxml')
+    parser.add_argument('--all', action='store_true', help='Show every locator, not only flagged ones')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    documents = load_snapshots(args.snapshots, include_stand_in=not args.no_stand_in)
+    if not documents:
+        print("[ERROR] No snapshots found")
+        return False
+
+    driver = None
+    if args.browser:
+        from utils.driver_factory import DriverFactory
+        driver = DriverFactory.create_driver()
+    try:
+        report = LocatorAudit(documents, repeat=args.repeat, driver=driver).run()
+    finally:
+        if driver:
+            driver.quit()
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.all)
+
+    over = [page["page"] for page in report if not page["within_budget"]]
+    if over:
+        print(f"[FAILED] Over locator budget: {', '.join(over)}")
+        return False
+    print("[SUCCESS] All page objects within their locator budget")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
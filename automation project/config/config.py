@@ -1,22 +1,162 @@
 import os
+import json
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Written by plan_capacity.py from measurements on this host
+CAPACITY_FILE = Path(__file__).parent / "capacity.json"
+# Named performance profiles (fast-local, ci-parallel, debug-slow, ...)
+PROFILES_FILE = Path(__file__).parent / "profiles.json"
+
+# Network and CPU emulation profiles for EMULATION, applied through CDP on Chromium.
+# Network values follow Chrome DevTools' throttling presets: latency in ms, throughput in bytes/s
+EMULATION_PROFILES = {
+    "3g": {"network": {"latency": 2000, "download": 50000, "upload": 50000}},
+    "slow-4g": {"network": {"latency": 562.5, "download": 180000, "upload": 84375}},
+    "4g": {"network": {"latency": 165, "download": 1012500, "upload": 168750}},
+    "cpu-2x": {"cpu": 2},
+    "cpu-4x": {"cpu": 4},
+    "cpu-6x": {"cpu": 6},
+}
+
+# Typed settings and their defaults; every layer is validated against these
+SETTINGS = {
+    "BASE_URL": (str, "https://cartlow.com/uae/en"),
+    "BROWSER": (str, "edge"),
+    "HEADLESS": (bool, False),
+    "EXPLICIT_WAIT": (int, 20),
+    "POLL_INTERVAL": (float, 0.5),
+    "ABSENCE_TIMEOUT": (float, 3.0),
+    "QUIESCENCE_WINDOW": (float, 0.5),
+    "PAGE_LOAD_STRATEGY": (str, "normal"),
+    "PAGE_LOAD_TIMEOUT": (int, 300),
+    "BLOCK_RESOURCES": (list, []),
+    "EMULATION": (list, []),
+    "OVERLAY_GUARD": (bool, True),
+    "OVERLAY_GUARD_GENERIC": (bool, False),
+    "SLEEP_SCALE": (float, 1.0),
+    "BUDGET_SCALE": (float, 1.0),
+    "PARALLEL_WORKERS": (int, 1),
+    "DRIVER_POOL_SIZE": (int, 2),
+    "STEP_RETRIES": (int, 1),
+    "RETRY_BACKOFF": (float, 0.5),
+    "EMAIL": (str, "test@example.com"),
+    "PASSWORD": (str, "testpassword"),
+    "ACCOUNTS": (list, []),
+    "ACCOUNT_LEASE_SECONDS": (int, 1800),
+    "ACCOUNT_WAIT": (float, 120.0),
+    "SCAN_MAX_RESULTS": (int, 2000),
+    "SCAN_MAX_PAGES": (int, 20),
+    "COLLECT_PAGE_METRICS": (bool, True),
+    "SCREENCAST": (bool, False),
+    "SCREENCAST_SECONDS": (float, 30.0),
+    "SCREENCAST_MAX_WIDTH": (int, 800),
+    "SCREENCAST_MAX_HEIGHT": (int, 600),
+    "SCREENCAST_EVERY_NTH_FRAME": (int, 2),
+    "SCREENCAST_QUALITY": (int, 40),
+}
+CHOICES = {"PAGE_LOAD_STRATEGY": ("normal", "eager", "none"), "EMULATION": tuple(EMULATION_PROFILES)}
+MINIMUMS = {
+    "ACCOUNT_LEASE_SECONDS": 1,
+    "SCAN_MAX_RESULTS": 1,
+    "SCAN_MAX_PAGES": 1,
+    "SCREENCAST_SECONDS": 1,
+    "SCREENCAST_MAX_WIDTH": 16,
+    "SCREENCAST_MAX_HEIGHT": 16,
+    "SCREENCAST_EVERY_NTH_FRAME": 1,
+    "SCREENCAST_QUALITY": 1,
+    "PARALLEL_WORKERS": 1,
+    "DRIVER_POOL_SIZE": 1,
+    "POLL_INTERVAL": 0.01,
+    "BUDGET_SCALE": 0.01,
+}
+
+def load_capacity(path=CAPACITY_FILE):
+    """Recommended parallelism from the capacity plan, or {} when not calibrated"""
+    try:
+        plan = json.loads(Path(path).read_text())
+        return {key: int(plan[key]) for key in ("parallel_workers", "driver_pool_size") if key in plan}
+    except (OSError, ValueError, TypeError):
+        return {}
+
+def load_profile(name, path=PROFILES_FILE):
+    """Settings of a named profile; ValueError when it does not exist"""
+    profiles = json.loads(Path(path).read_text())
+    if name not in profiles:
+        raise ValueError(f"Unknown profile '{name}' (available: {', '.join(sorted(profiles))})")
+    return profiles[name]
+
+def coerce(name, value):
+    """Convert a raw setting (e.g. an env string) to its declared type, or raise ValueError"""
+    if name not in SETTINGS:
+        raise ValueError(f"Unknown setting '{name}'")
+    kind = SETTINGS[name][0]
+    try:
+        if kind is bool:
+            if isinstance(value, str):
+                if value.strip().lower() not in ("true", "false", "1", "0", "yes", "no"):
+                    raise ValueError(value)
+                value = value.strip().lower() in ("true", "1", "yes")
+            elif not isinstance(value, bool):
+                raise ValueError(value)
+        elif kind is list:
+            if isinstance(value, str):
+                value = [item.strip() for item in value.split(",") if item.strip()]
+            elif not isinstance(value, list):
+                raise ValueError(value)
+        elif kind is int and isinstance(value, float) and not value.is_integer():
+            raise ValueError(value)
+        else:
+            value = kind(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name}: expected {kind.__name__}, got {value!r}")
+    if name in CHOICES:
+        for item in value if kind is list else [value]:
+            if item not in CHOICES[name]:
+                raise ValueError(f"{name}: expected one of {', '.join(CHOICES[name])}, got {item!r}")
+    if kind in (int, float) and value < MINIMUMS.get(name, 0):
+        raise ValueError(f"{name}: must be at least {MINIMUMS.get(name, 0)}, got {value!r}")
+    return int(value) if kind is int else value
+
+def resolve_settings(profile=None, overrides=None, environ=None,
+                     profiles_file=PROFILES_FILE, capacity_file=CAPACITY_FILE):
+    """Layer defaults < capacity plan < profile < environment < CLI overrides"""
+    environ = os.environ if environ is None else environ
+    profile = profile or environ.get("PROFILE") or None
+    layers = [
+        {name: default for name, (_, default) in SETTINGS.items()},
+        {key.upper(): value for key, value in load_capacity(capacity_file).items()},
+        load_profile(profile, profiles_file) if profile else {},
+        {name: environ[name] for name in SETTINGS if name in environ},
+        overrides or {},
+    ]
+    settings = {}
+    for layer in layers:
+        for name, value in layer.items():
+            key = name.upper().replace("-", "_")
+            settings[key] = coerce(key, value)
+    settings["PROFILE"] = profile or "default"
+    return settings
+
 class Config:
-    BASE_URL = "https://cartlow.com/uae/en"
-    BROWSER = os.getenv("BROWSER", "edge")
-    HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
-    IMPLICIT_WAIT = int(os.getenv("IMPLICIT_WAIT", "10"))
-    EXPLICIT_WAIT = int(os.getenv("EXPLICIT_WAIT", "20"))
-    
-    # Test data
-    EMAIL = os.getenv("EMAIL", "test@example.com")
-    PASSWORD = os.getenv("PASSWORD", "testpassword")
-    
     # Product details
+    LAPTOP_SEARCH_TERM = "Dell Latitude"
+    WATCH_SEARCH_TERM = "Apple Smartwatch Series 6"
     LAPTOP_NAME = "Dell Latitude 7490 Intel Core i7-8650U 14\" FHD Display, 16GB RAM, 512GB SSD, Windows 10 Pro"
     WATCH_NAME = "Apple Watch Series 6 (40mm, GPS + Cellular) Gold Aluminum Case with Pink Sand Sport Band"
     WATCH_CONNECTIVITY = "GPS and Cellular"
     WATCH_COLOR = "Silver"
     WATCH_SIZE = "44mm"
+
+    @classmethod
+    def apply(cls, profile=None, overrides=None):
+        """Resolve the settings layers and expose them as class attributes (BASE_URL, EXPLICIT_WAIT, ...)"""
+        for name, value in resolve_settings(profile, overrides).items():
+            setattr(cls, name, value)
+        return cls
+
+# Import-time settings come from defaults, the capacity plan, $PROFILE and the environment;
+# entry points call Config.apply() again with their --profile/--set options
+Config.apply()
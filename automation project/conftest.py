@@ -1,21 +1,104 @@
 import pytest
 import logging
 from utils.driver_factory import DriverFactory
+from utils.driver_pool import DriverPool
+from utils.account_pool import AccountPool, reset_cart
+from utils.log_pipeline import LogPipeline, LogContext
+from utils.fake_webdriver import FakeWebDriver, VirtualClock
+from utils.stand_in_site import StandInSite
+from utils.wait_budget import WaitBudget, log_budget
+from utils.step_retry import FlakinessStats, StepQuarantined, StepRetry
+from utils.overlay_guard import OverlayGuard
+from utils.screencast import ScreencastRecorder
+from utils.test_impact import ImpactRecorder, ImpactSelector
+from pages.cart_page import CartPage
 from config.config import Config
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('test_execution.log'),
-        logging.StreamHandler()
-    ]
-)
+def pytest_addoption(parser):
+    """Settings layers that come from the command line"""
+    parser.addoption("--profile", default=None, help="Named settings profile from config/profiles.json")
+    parser.addoption("--set", action="append", default=[], metavar="NAME=VALUE",
+                     help="Override one setting, e.g. --set EXPLICIT_WAIT=5 (repeatable)")
+    parser.addoption("--record-impact", action="store_true", default=False,
+                     help="Record which page-object and helper code each test executes (reports/impact_map.json)")
+    parser.addoption("--impacted-since", default=None, metavar="REF",
+                     help="Run only tests that execute code changed since a git ref, plus the safety set")
+
+def pytest_configure(config):
+    """Start the log pipeline, then apply --profile and --set on top of the defaults, capacity plan and environment"""
+    # Records are queued and written as JSONL by a listener thread into
+    # logs/<run>/test_execution.<worker>.jsonl, merged after the run. pytest
+    # shows them itself (per failed test, or live with --log-cli-level)
+    LogPipeline.start()
+    config.addinivalue_line("markers", "budget(seconds): total wait budget for the test's lookups and pauses")
+    config.addinivalue_line("markers", "cart_seed(items): cart contents the seeded_cart fixture starts the test with")
+    try:
+        overrides = dict(item.split("=", 1) for item in config.getoption("--set"))
+        Config.apply(config.getoption("--profile"), overrides)
+    except ValueError as e:
+        raise pytest.UsageError(f"Invalid settings: {e}")
+    if config.getoption("--record-impact"):
+        if config.getoption("numprocesses", None):
+            raise pytest.UsageError("--record-impact needs a single process; drop -n/--workers")
+        config.pluginmanager.register(ImpactRecorder(), "impact_recorder")
+    if config.getoption("--impacted-since"):
+        config.pluginmanager.register(ImpactSelector(config.getoption("--impacted-since")), "impact_selector")
+
+def pytest_sessionfinish(session, exitstatus):
+    """Flush this process's log stream and merge worker streams on the controller"""
+    LogPipeline.stop()
+    if not hasattr(session.config, "workerinput"):
+        LogPipeline.merge_worker_logs()
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Report a failing quarantined step as xfail instead of a failure; keep each phase's report on the item"""
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+    if call.excinfo is not None and call.excinfo.errisinstance(StepQuarantined):
+        report.outcome = "skipped"
+        report.wasxfail = str(call.excinfo.value)
+
+@pytest.fixture(scope="session")
+def flakiness_stats():
+    """Step and locator flakiness for this session, added to reports/flakiness.json at the end"""
+    stats = FlakinessStats()
+    yield stats
+    stats.save()
+
+@pytest.fixture(scope="function")
+def step_retry(driver, flakiness_stats):
+    """Run a test's steps with in-place retry: step_retry.run("sign_in", lambda: ...)"""
+    return StepRetry(driver, stats=flakiness_stats)
+
+@pytest.fixture(scope="session")
+def account_pool():
+    """Test accounts shared with the other workers and processes on this host"""
+    return AccountPool()
+
+@pytest.fixture(scope="session")
+def account_lease(account_pool):
+    """This worker's own test account for tests that sign in; Config.EMAIL/PASSWORD point at it for the session.
+    The warm runner holds a lease for its lifetime, so its pooled drivers need none."""
+    if DriverPool.active:
+        yield None
+        return
+    saved = (Config.EMAIL, Config.PASSWORD)
+    with account_pool.lease() as lease:
+        Config.EMAIL, Config.PASSWORD = lease.email, lease.password
+        try:
+            yield lease
+        finally:
+            Config.EMAIL, Config.PASSWORD = saved
 
 @pytest.fixture(scope="session")
 def driver_session():
-    """Session-scoped driver fixture"""
+    """Session-scoped driver fixture; leased warm from the runner daemon's pool when one is active"""
+    if DriverPool.active:
+        with DriverPool.active.lease() as driver:
+            yield driver
+        return
     driver = None
     try:
         driver = DriverFactory.create_driver()
@@ -24,21 +107,101 @@ def driver_session():
         if driver:
             driver.quit()
 
+def start_screencast(driver):
+    """Record the test's last seconds when the driver supports it"""
+    recorder = ScreencastRecorder.install(driver)
+    if recorder:
+        recorder.mark()
+    return recorder
+
+def finish_screencast(request, recorder):
+    """Report the test's capture overhead and keep its clip when the test failed"""
+    if recorder:
+        report = getattr(request.node, "rep_call", None)
+        overhead = recorder.finish_test(request.node.name, report is not None and report.failed)
+        request.node.user_properties.append(("screencast", overhead))
+
 @pytest.fixture(scope="function")
-def driver():
-    """Function-scoped driver fixture"""
+def driver(request):
+    """Function-scoped driver fixture; leased warm from the runner daemon's pool when one is active"""
+    if DriverPool.active:
+        with DriverPool.active.lease() as driver:
+            driver.get(Config.BASE_URL)
+            OverlayGuard.ensure(driver)
+            recorder = start_screencast(driver)
+            try:
+                yield driver
+            finally:
+                try:
+                    finish_screencast(request, recorder)
+                finally:
+                    OverlayGuard.log_dismissals(driver)
+        return
     driver = None
+    recorder = None
     try:
         driver = DriverFactory.create_driver()
         driver.get(Config.BASE_URL)
+        OverlayGuard.ensure(driver)
+        recorder = start_screencast(driver)
         yield driver
     finally:
-        if driver:
-            driver.quit()
+        # Each step runs even when an earlier one raised, so the browser is always quit
+        try:
+            if recorder:
+                try:
+                    finish_screencast(request, recorder)
+                finally:
+                    recorder.stop()
+        finally:
+            if driver:
+                try:
+                    OverlayGuard.log_dismissals(driver)
+                finally:
+                    driver.quit()
+
+@pytest.fixture(scope="function")
+def clean_cart(driver, account_lease):
+    """Driver signed in as this worker's leased account with its cart emptied; yields the CartPage"""
+    if not reset_cart(driver):
+        pytest.fail(f"Could not empty the cart of {Config.EMAIL}")
+    driver.get(Config.BASE_URL)
+    yield CartPage(driver)
+
+@pytest.fixture(scope="function")
+def seeded_cart(request, clean_cart):
+    """Cart filled with the test's @pytest.mark.cart_seed([...]) items; the test starts on the cart page"""
+    marker = request.node.get_closest_marker("cart_seed")
+    items = marker.args[0] if marker else []
+    if not clean_cart.seed_cart(items):
+        pytest.fail(f"Could not seed the cart with {items}")
+    clean_cart.open_cart()
+    yield clean_cart
+
+@pytest.fixture(scope="function")
+def fake_driver():
+    """In-process fake driver on a fresh stand-in site; sleeps and waits use a virtual clock"""
+    driver = FakeWebDriver(StandInSite())
+    with VirtualClock():
+        yield driver
+    driver.quit()
 
 @pytest.fixture(autouse=True)
-def setup_test_environment():
+def setup_test_environment(request):
     """Setup test environment before each test"""
+    LogContext.begin_test(request.node.nodeid)
     logging.info("Setting up test environment")
-    yield
+    marker = request.node.get_closest_marker("budget")
+    budget = WaitBudget(request.node.name, marker.args[0] * Config.BUDGET_SCALE) if marker else None
+    if budget:
+        with budget:
+            yield
+    else:
+        yield
     logging.info("Cleaning up test environment")
+    overrun = budget is not None and budget.overrun()
+    if overrun:
+        log_budget(budget)
+    LogContext.end_test()
+    if overrun:
+        pytest.fail(f"Test exceeded its wait budget\n{budget.report()}")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Offline counterpart of inspect_cartlow.py: evaluate every page-object locator
+and fallback list against saved DOM snapshots, without a browser or network
+"""
+
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from utils.locator_engine import LocatorEngine, load_snapshots
+
+
+def print_report(report, verbose=False):
+    """Print match counts, first match and ambiguity per snapshot"""
+    for snapshot in report:
+        print("=" * 78)
+        print(f"SNAPSHOT {snapshot['snapshot']}  (parse {snapshot['parse_ms']:.1f} ms, "
+              f"evaluate {snapshot['evaluate_ms']:.1f} ms)")
+        print("=" * 78)
+        for result in snapshot["locators"]:
+            if result["error"]:
+                status = "ERROR"
+            elif result["count"] == 0:
+                status = "MISSING"
+            elif result["ambiguous"]:
+                status = "AMBIGUOUS"
+            else:
+                status = "OK"
+            print(f"  [{status:<9}] {result['name']:<36} {result['count']:>4} match(es) "
+                  f"{result['elapsed_ms']:>7.2f} ms")
+            if result["first"] and (verbose or result["ambiguous"]):
+                first = result["first"]
+                print(f"              first: <{first['tag']} class='{first.get('class') or ''}'> "
+                      f"'{first['text'][:50]}'")
+            if result["error"]:
+                print(f"              {result['error']}")
+        print("\n  Fallback lists:")
+        for fallback in snapshot["fallbacks"]:
+            if fallback["resolved"] is None:
+                print(f"  [UNRESOLVED] {fallback['name']}")
+            else:
+                resolved = fallback["resolved"]
+                print(f"  [OK        ] {fallback['name']} -> entry {fallback['resolved_index']} "
+                      f"({resolved['count']} match(es))")
+            if verbose:
+                for entry in fallback["entries"]:
+                    print(f"                {entry['count']:>4}  {entry['value']}")
+        print()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Evaluate page-object locators against saved DOM snapshots')
+    parser.add_argument('snapshots', nargs='*',
+                        help='Snapshot files (default: cartlow_page_source.html and snapshots/*.html)')
+    parser.add_argument('--stand-in', action='store_true',
+                        help='Also evaluate against pages rendered by the local stand-in site')
+    parser.add_argument('--xpath', action='append', default=[],
+                        help='Additional ad-hoc XPath to evaluate (repeatable)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--verbose', action='store_true', help='Show first matches and fallback entries')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    documents = load_snapshots(args.snapshots, include_stand_in=args.stand_in)
+    if not documents:
+        print("[ERROR] No snapshots found")
+        return False
+
+    report = LocatorEngine(documents).evaluate_all(args.xpath)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.verbose)
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,21 +1,21 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time
 import logging
+from utils.overlay_guard import OverlayGuard
+from utils.page_metrics import PageMetricsCollector
+from utils.wait_budget import wait_until, probe, pause
 
 class BasePage:
     def __init__(self, driver):
         self.driver = driver
-        self.wait = WebDriverWait(driver, 20)
         self.actions = ActionChains(driver)
         
     def find_element(self, locator):
         """Find element with explicit wait"""
         try:
-            return self.wait.until(EC.presence_of_element_located(locator))
+            return wait_until(self.driver, EC.presence_of_element_located(locator), f"presence {locator}")
         except TimeoutException:
             logging.error(f"Element not found: {locator}")
             raise
@@ -23,7 +23,7 @@ class BasePage:
     def find_elements(self, locator):
         """Find multiple elements"""
         try:
-            return self.wait.until(EC.presence_of_all_elements_located(locator))
+            return wait_until(self.driver, EC.presence_of_all_elements_located(locator), f"all {locator}")
         except TimeoutException:
             logging.error(f"Elements not found: {locator}")
             return []
@@ -31,7 +31,7 @@ class BasePage:
     def click_element(self, locator):
         """Click element with explicit wait"""
         try:
-            element = self.wait.until(EC.element_to_be_clickable(locator))
+            element = wait_until(self.driver, EC.element_to_be_clickable(locator), f"clickable {locator}")
             element.click()
             return True
         except TimeoutException:
@@ -59,19 +59,29 @@ class BasePage:
             return ""
             
     def is_element_present(self, locator):
-        """Check if element is present"""
+        """Check if element is present, waiting up to EXPLICIT_WAIT (use is_optional_present when absence is normal)"""
         try:
             self.find_element(locator)
             return True
         except TimeoutException:
             return False
             
-    def wait_for_element_visible(self, locator, timeout=10):
+    def find_optional(self, locator, timeout=None):
+        """Elements present now, or [] once the DOM settles without them; never waits EXPLICIT_WAIT"""
+        return probe(self.driver, locator, f"optional {locator}", timeout)
+            
+    def is_optional_present(self, locator, timeout=None):
+        """Fast presence check for elements that are often legitimately missing"""
+        return bool(self.find_optional(locator, timeout))
+            
+    def is_element_absent(self, locator, timeout=None):
+        """True once the DOM has settled without the element"""
+        return not self.find_optional(locator, timeout)
+            
+    def wait_for_element_visible(self, locator, timeout=None):
         """Wait for element to be visible"""
         try:
-            WebDriverWait(self.driver, timeout).until(
-                EC.visibility_of_element_located(locator)
-            )
+            wait_until(self.driver, EC.visibility_of_element_located(locator), f"visible {locator}", timeout)
             return True
         except TimeoutException:
             return False
@@ -81,9 +91,20 @@ class BasePage:
         try:
             element = self.find_element(locator)
             self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            time.sleep(1)
+            self.pause(1)
+            return True
+        except TimeoutException:
+            return False
+            
+    def click_first(self, locators):
+        """Click whichever locator becomes clickable first, in one wait instead of one per fallback"""
+        try:
+            element = wait_until(self.driver, EC.any_of(*[EC.element_to_be_clickable(locator) for locator in locators]),
+                                 f"first clickable of {locators}")
+            element.click()
             return True
         except TimeoutException:
+            logging.error(f"None of the locators clickable: {locators}")
             return False
             
     def hover_element(self, locator):
@@ -95,6 +116,10 @@ class BasePage:
         except TimeoutException:
             return False
             
+    def pause(self, seconds):
+        """Fixed settle delay, scaled by SLEEP_SCALE and capped by the step's wait budget"""
+        pause(seconds)
+        
     def get_current_url(self):
         """Get current URL"""
         return self.driver.current_url
@@ -102,6 +127,8 @@ class BasePage:
     def navigate_to(self, url):
         """Navigate to URL"""
         self.driver.get(url)
+        OverlayGuard.ensure(self.driver)
+        PageMetricsCollector.collect(self.driver)
         
     def refresh_page(self):
         """Refresh current page"""
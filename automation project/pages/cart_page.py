@@ -1,9 +1,109 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
+from pages.homepage import HomePage
+from pages.product_page import ProductPage
+from config.config import Config
 import logging
-import time
+
+# Runs in the page (execute_async_script): removes every line through the cart's own
+# remove forms with fetch(), one request after another, then reloads the cart once
+# and reports what is left
+CLEAR_CART_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var cartUrl = arguments[0], removeXpath = arguments[1], itemXpath = arguments[2], emptyXpath = arguments[3];
+function load() {
+    return fetch(cartUrl, {credentials: 'same-origin', cache: 'no-store'}).then(function (response) {
+        return response.text();
+    }).then(function (markup) {
+        return new DOMParser().parseFromString(markup, 'text/html');
+    });
+}
+function all(doc, xpath) {
+    var found = doc.evaluate(xpath, doc, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < found.snapshotLength; i++) { nodes.push(found.snapshotItem(i)); }
+    return nodes;
+}
+load().then(function (doc) {
+    var forms = [];
+    all(doc, removeXpath).forEach(function (button) {
+        if (button.form && forms.indexOf(button.form) < 0) { forms.push(button.form); }
+    });
+    return forms.reduce(function (previous, form) {
+        return previous.then(function () {
+            return fetch(new URL(form.getAttribute('action') || cartUrl, cartUrl).href, {
+                method: 'POST', credentials: 'same-origin', body: new URLSearchParams(new FormData(form))});
+        });
+    }, Promise.resolve()).then(function () { return forms.length; });
+}).then(function (removed) {
+    return load().then(function (doc) {
+        done({removed: removed, lines: all(doc, itemXpath).length, empty_message: all(doc, emptyXpath).length > 0});
+    });
+}).catch(function (error) { done({error: String(error)}); });
+"""
+
+# Runs in the page (execute_async_script): for each item, finds the product page (its
+# URL, or the site's search form and the first result link naming the product) and
+# posts that page's add-to-cart form with the item's quantity and variant fields
+SEED_CART_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var baseUrl = arguments[0], items = arguments[1];
+var searchXpath = arguments[2], addXpath = arguments[3], quantityXpath = arguments[4];
+var added = [];
+function load(url) {
+    return fetch(url, {credentials: 'same-origin'}).then(function (response) {
+        return response.text().then(function (markup) {
+            return {url: response.url, doc: new DOMParser().parseFromString(markup, 'text/html')};
+        });
+    });
+}
+function first(doc, xpath, context) {
+    return doc.evaluate(xpath, context || doc, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function productPage(item) {
+    if (item.url) { return load(new URL(item.url, baseUrl).href); }
+    return load(baseUrl).then(function (home) {
+        var input = first(home.doc, searchXpath);
+        if (!input || !input.form) { throw new Error('search form not found'); }
+        var url = new URL(input.form.getAttribute('action') || home.url, home.url);
+        url.searchParams.set(input.name, item.search);
+        return load(url.href);
+    }).then(function (results) {
+        var name = item.name.toLowerCase();
+        var link = Array.prototype.filter.call(results.doc.querySelectorAll('a[href]'), function (a) {
+            return a.textContent.toLowerCase().indexOf(name) >= 0;
+        })[0];
+        if (!link) { throw new Error('no search result for ' + item.name); }
+        return load(new URL(link.getAttribute('href'), results.url).href);
+    });
+}
+function add(item) {
+    return productPage(item).then(function (page) {
+        var button = first(page.doc, addXpath);
+        if (!button || !button.form) { throw new Error('add-to-cart form not found for ' + (item.url || item.name)); }
+        var data = new FormData(button.form);
+        if (button.name) { data.append(button.name, button.value); }
+        var quantity = first(page.doc, '.' + quantityXpath, button.form);
+        if (item.qty && quantity && quantity.name) { data.set(quantity.name, String(item.qty)); }
+        Object.keys(item.variant || {}).forEach(function (key) { data.set(key, item.variant[key]); });
+        var action = new URL(button.form.getAttribute('action') || page.url, page.url).href;
+        return fetch(action, {method: 'POST', credentials: 'same-origin', body: new URLSearchParams(data)});
+    }).then(function (response) {
+        if (!response.ok) { throw new Error('add-to-cart for ' + (item.url || item.name) + ' returned ' + response.status); }
+        added.push(item.url || item.name);
+    });
+}
+items.reduce(function (previous, item) {
+    return previous.then(function () { return add(item); });
+}, Promise.resolve()).then(function () {
+    done({added: added});
+}).catch(function (error) { done({added: added, error: String(error)}); });
+"""
 
 class CartPage(BasePage):
+    # Max total cost of this page's locators on a stored snapshot (audit_locators.py)
+    LOCATOR_BUDGET_MS = 12.0
+
     # Locators
     CART_ITEMS = (By.XPATH, "//div[contains(@class, 'cart-item') or contains(@class, 'item')]")
     REMOVE_BUTTON = (By.XPATH, "//button[contains(text(), 'Remove') or contains(@class, 'remove')]")
@@ -15,6 +115,9 @@ class CartPage(BasePage):
     PRODUCT_NAME = (By.XPATH, "//a[contains(@class, 'product-name') or contains(@class, 'title')]")
     PRODUCT_PRICE = (By.XPATH, "//span[contains(@class, 'price')]")
     EMPTY_CART_MESSAGE = (By.XPATH, "//div[contains(text(), 'empty') or contains(text(), 'no items')]")
+    CART_PATH = "/cart"
+    # Upper bound on remove clicks when clear_cart falls back to the UI
+    MAX_CART_LINES = 20
     
     def __init__(self, driver):
         super().__init__(driver)
@@ -22,7 +125,8 @@ class CartPage(BasePage):
     def get_cart_items(self):
         """Get all cart items"""
         try:
-            return self.find_elements(self.CART_ITEMS)
+            # An empty cart is a normal answer
+            return self.find_optional(self.CART_ITEMS)
         except Exception as e:
             logging.error(f"Failed to get cart items: {e}")
             return []
@@ -46,7 +150,7 @@ class CartPage(BasePage):
                     if product_name.lower() in item_name_element.text.lower():
                         remove_button = item.find_element(*self.REMOVE_BUTTON)
                         remove_button.click()
-                        time.sleep(2)  # Wait for removal
+                        self.pause(2)  # Wait for removal
                         return True
                 except:
                     continue
@@ -63,13 +167,80 @@ class CartPage(BasePage):
             if items:
                 remove_button = items[0].find_element(*self.REMOVE_BUTTON)
                 remove_button.click()
-                time.sleep(2)  # Wait for removal
+                self.pause(2)  # Wait for removal
                 return True
             return False
         except Exception as e:
             logging.error(f"Failed to remove first item: {e}")
             return False
             
+    def clear_cart(self, base_url=None, fallback=True):
+        """Empty the cart through its remove endpoints in one in-page pass; True when verified empty.
+        A failed script is logged as an error; with `fallback` the rows are then removed through the UI"""
+        base_url = (base_url or Config.BASE_URL).rstrip("/")
+        cart_url = f"{base_url}{self.CART_PATH}"
+        try:
+            # fetch() needs a page of the site's origin
+            if not self.driver.current_url.startswith(base_url):
+                self.navigate_to(base_url)
+            result = self.driver.execute_async_script(CLEAR_CART_SCRIPT, cart_url, self.REMOVE_BUTTON[1],
+                                                      self.CART_ITEMS[1], self.EMPTY_CART_MESSAGE[1])
+        except Exception as e:
+            result = {"error": str(e)}
+        if result is None:
+            result = {"error": "cart reset script returned nothing"}
+        if "error" in result:
+            logging.error(f"Cart reset script failed: {result['error']}")
+        else:
+            emptied = result["empty_message"] or result["lines"] == 0
+            logging.info(f"Cart reset removed {result['removed']} lines; empty: {emptied}")
+            if emptied:
+                return True
+        if not fallback:
+            return False
+        logging.warning("Emptying the cart through the UI instead")
+        return self.remove_all_items(cart_url)
+
+    def seed_cart(self, items, base_url=None):
+        """Add items with the add-to-cart form's own requests; True when all were added"""
+        # Item: {"url": product page} or {"search": term, "name": product}, plus optional
+        # "qty" and "variant" (add-to-cart form field -> value, e.g. {"color": "Silver"})
+        for item in items:
+            if not item.get("url") and not (item.get("search") and item.get("name")):
+                raise ValueError(f"Cart seed item needs a url, or a search term and product name: {item}")
+        base_url = (base_url or Config.BASE_URL).rstrip("/")
+        try:
+            if not self.driver.current_url.startswith(base_url):
+                self.navigate_to(base_url)
+            result = self.driver.execute_async_script(SEED_CART_SCRIPT, base_url + "/", items, HomePage.SEARCH_BOX[1],
+                                                      ProductPage.ADD_TO_CART_BUTTON[1],
+                                                      ProductPage.QUANTITY_INPUT[1])
+        except Exception as e:
+            result = {"added": [], "error": str(e)}
+        if result is None:
+            result = {"added": [], "error": "cart seed script returned nothing"}
+        if "error" in result:
+            logging.error(f"Cart seeding stopped after {len(result['added'])} of {len(items)} items: {result['error']}")
+            return False
+        logging.info(f"Seeded cart with {len(items)} items")
+        return True
+
+    def open_cart(self, base_url=None):
+        """Navigate straight to the cart page"""
+        self.navigate_to(f"{(base_url or Config.BASE_URL).rstrip('/')}{self.CART_PATH}")
+
+    def remove_all_items(self, cart_url=None):
+        """Remove cart lines one at a time through the UI"""
+        try:
+            self.navigate_to(cart_url or f"{Config.BASE_URL.rstrip('/')}{self.CART_PATH}")
+            for _ in range(self.MAX_CART_LINES):
+                if self.is_cart_empty() or not self.remove_first_item():
+                    break
+            return self.is_cart_empty()
+        except Exception as e:
+            logging.error(f"Failed to remove cart items: {e}")
+            return False
+
     def update_item_quantity(self, item_index, new_quantity):
         """Update quantity of specific item"""
         try:
@@ -86,7 +257,7 @@ class CartPage(BasePage):
                 except:
                     pass  # Some sites update automatically
                     
-                time.sleep(1)
+                self.pause(1)
                 return True
             return False
         except Exception as e:
@@ -120,7 +291,7 @@ class CartPage(BasePage):
     def is_cart_empty(self):
         """Check if cart is empty"""
         try:
-            return self.is_element_present(self.EMPTY_CART_MESSAGE) or self.get_cart_item_count() == 0
+            return self.is_optional_present(self.EMPTY_CART_MESSAGE) or self.get_cart_item_count() == 0
         except Exception as e:
             logging.error(f"Failed to check if cart is empty: {e}")
             return False
@@ -3,6 +3,9 @@ from pages.base_page import BasePage
 import logging
 
 class HomePage(BasePage):
+    # Max total cost of this page's locators on a stored snapshot (audit_locators.py)
+    LOCATOR_BUDGET_MS = 8.0
+
     # Locators
     LAPTOPS_TAB = (By.XPATH, "//a[contains(text(), 'Laptops') or contains(@href, 'laptop')]")
     SMARTWATCHES_TAB = (By.XPATH, "//a[contains(text(), 'Smartwatches') or contains(text(), 'Smart Watch') or contains(@href, 'smartwatch')]")
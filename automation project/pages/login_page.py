@@ -1,9 +1,11 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
 import logging
-import time
 
 class LoginPage(BasePage):
+    # Max total cost of this page's locators on a stored snapshot (audit_locators.py)
+    LOCATOR_BUDGET_MS = 10.0
+
     # Locators - Based on Cartlow website inspection
     ACCOUNT_BUTTON = (By.XPATH, "//span[contains(text(), 'Account')]")
     LOGIN_BUTTON = (By.XPATH, "//button[contains(text(), 'Login') or contains(text(), 'Sign In') or contains(text(), 'Log In')]")
@@ -15,6 +17,9 @@ class LoginPage(BasePage):
     LOGOUT_BUTTON = (By.XPATH, "//a[contains(text(), 'Logout') or contains(text(), 'Sign Out') or contains(text(), 'Log Out')]")
     ERROR_MESSAGE = (By.XPATH, "//div[contains(@class, 'error') or contains(@class, 'alert') or contains(@class, 'message')]")
     LOGIN_FORM = (By.XPATH, "//form[contains(@class, 'login') or contains(@class, 'signin')]")
+
+    # Fallback order for opening the login form - Account button found visible in inspection
+    LOGIN_STRATEGIES = [ACCOUNT_BUTTON, LOGIN_BUTTON, LOGIN_LINK]
     
     def __init__(self, driver):
         super().__init__(driver)
@@ -22,20 +27,10 @@ class LoginPage(BasePage):
     def click_login_button(self):
         """Click the login button to open login form"""
         try:
-            # Try different login button strategies - prioritize Account button based on inspection
-            strategies = [
-                self.ACCOUNT_BUTTON,  # This was found to be visible in inspection
-                self.LOGIN_BUTTON,
-                self.LOGIN_LINK
-            ]
-            
-            for strategy in strategies:
-                try:
-                    if self.click_element(strategy):
-                        time.sleep(3)  # Wait for login form to appear
-                        return True
-                except:
-                    continue
+            # All strategies are polled in one wait - Account button preferred based on inspection
+            if self.click_first(self.LOGIN_STRATEGIES):
+                self.pause(3)  # Wait for login form to appear
+                return True
             
             logging.error("Failed to find any login button")
             return False
@@ -77,11 +72,11 @@ class LoginPage(BasePage):
             
             # Try to open login form
             if self.click_login_button():
-                time.sleep(3)  # Wait for login form to appear
+                self.pause(3)  # Wait for login form to appear
                 
                 # Try to find and fill login form
                 if self.enter_email(email) and self.enter_password(password):
-                    time.sleep(1)
+                    self.pause(1)
                     return self.click_submit()
                 else:
                     logging.error("Failed to enter login credentials")
@@ -96,7 +91,8 @@ class LoginPage(BasePage):
     def is_logged_in(self):
         """Check if user is logged in"""
         try:
-            return self.is_element_present(self.USER_MENU)
+            # Logged out is a normal answer, so do not wait the full timeout for the menu
+            return self.is_optional_present(self.USER_MENU)
         except Exception as e:
             logging.error(f"Failed to check login status: {e}")
             return False
@@ -105,7 +101,7 @@ class LoginPage(BasePage):
         """Logout user"""
         try:
             if self.hover_element(self.USER_MENU):
-                time.sleep(1)
+                self.pause(1)
                 return self.click_element(self.LOGOUT_BUTTON)
             return False
         except Exception as e:
@@ -1,9 +1,11 @@
 from selenium.webdriver.common.by import By
 from pages.base_page import BasePage
 import logging
-import time
 
 class ProductPage(BasePage):
+    # Max total cost of this page's locators on a stored snapshot (audit_locators.py)
+    LOCATOR_BUDGET_MS = 16.0
+
     # Locators
     PRODUCT_TITLE = (By.XPATH, "//h1[contains(@class, 'product-title') or contains(@class, 'title')]")
     ADD_TO_CART_BUTTON = (By.XPATH, "//button[contains(text(), 'Add to Cart') or contains(@class, 'add-to-cart')]")
@@ -31,11 +33,12 @@ class ProductPage(BasePage):
     def select_color(self, color):
         """Select product color"""
         try:
-            color_buttons = self.find_elements(self.COLOR_OPTIONS)
+            # Variant pickers exist only on some products
+            color_buttons = self.find_optional(self.COLOR_OPTIONS)
             for button in color_buttons:
                 if color.lower() in button.get_attribute("title").lower() or color.lower() in button.text.lower():
                     button.click()
-                    time.sleep(1)
+                    self.pause(1)
                     return True
             logging.warning(f"Color '{color}' not found")
             return False
@@ -46,11 +49,11 @@ class ProductPage(BasePage):
     def select_size(self, size):
         """Select product size"""
         try:
-            size_buttons = self.find_elements(self.SIZE_OPTIONS)
+            size_buttons = self.find_optional(self.SIZE_OPTIONS)
             for button in size_buttons:
                 if size in button.text or size in button.get_attribute("value"):
                     button.click()
-                    time.sleep(1)
+                    self.pause(1)
                     return True
             logging.warning(f"Size '{size}' not found")
             return False
@@ -61,11 +64,11 @@ class ProductPage(BasePage):
     def select_connectivity(self, connectivity):
         """Select connectivity option"""
         try:
-            connectivity_buttons = self.find_elements(self.CONNECTIVITY_OPTIONS)
+            connectivity_buttons = self.find_optional(self.CONNECTIVITY_OPTIONS)
             for button in connectivity_buttons:
                 if connectivity.lower() in button.text.lower():
                     button.click()
-                    time.sleep(1)
+                    self.pause(1)
                     return True
             logging.warning(f"Connectivity '{connectivity}' not found")
             return False
@@ -77,7 +80,7 @@ class ProductPage(BasePage):
         """Set product quantity"""
         try:
             # Try to find quantity input first
-            if self.is_element_present(self.QUANTITY_INPUT):
+            if self.is_optional_present(self.QUANTITY_INPUT):
                 return self.send_keys(self.QUANTITY_INPUT, str(quantity))
             else:
                 # Use plus/minus buttons
@@ -85,11 +88,11 @@ class ProductPage(BasePage):
                 if quantity > current_qty:
                     for _ in range(quantity - current_qty):
                         self.click_element(self.QUANTITY_PLUS)
-                        time.sleep(0.5)
+                        self.pause(0.5)
                 elif quantity < current_qty:
                     for _ in range(current_qty - quantity):
                         self.click_element(self.QUANTITY_MINUS)
-                        time.sleep(0.5)
+                        self.pause(0.5)
                 return True
         except Exception as e:
             logging.error(f"Failed to set quantity: {e}")
@@ -99,7 +102,7 @@ class ProductPage(BasePage):
         """Add product to cart"""
         try:
             if self.click_element(self.ADD_TO_CART_BUTTON):
-                time.sleep(2)  # Wait for cart update
+                self.pause(2)  # Wait for cart update
                 return True
             return False
         except Exception as e:
@@ -115,6 +118,12 @@ class ProductPage(BasePage):
             logging.error(f"Failed to get cart count: {e}")
             return 0
             
+    def cart_count_now(self):
+        """Cart count shown in the header now, or None when no count is shown"""
+        counts = self.find_optional(self.CART_COUNT)
+        text = counts[0].text.strip() if counts else ""
+        return int(text) if text.isdigit() else None
+            
     def get_product_price(self):
         """Get product price"""
         try:
@@ -0,0 +1,181 @@
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from config.config import Config
+from pages.base_page import BasePage
+from utils.product_match import MIN_SCORE, parse_price, rank
+from utils.wait_budget import wait_until
+import time
+import logging
+
+# Reads result cards: the card's first link, its title (heading, else the link text),
+# price and availability text. Cards nested in another card are skipped.
+CARD_READER = """
+var xpaths = arguments[0];
+function all(xpath, context) {
+    var found = document.evaluate(xpath, context, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < found.snapshotLength; i++) { nodes.push(found.snapshotItem(i)); }
+    return nodes;
+}
+function text(node) {
+    return node ? (node.innerText || node.textContent || '').replace(/\\s+/g, ' ').trim() : '';
+}
+function topCards() {
+    var cards = all(xpaths.card, document), members = new Set(cards);
+    return cards.filter(function (card) {
+        for (var parent = card.parentNode; parent; parent = parent.parentNode) {
+            if (members.has(parent)) { return false; }
+        }
+        return true;
+    });
+}
+function read(cards) {
+    return cards.map(function (card) {
+        var link = all(xpaths.link, card)[0];
+        if (!link) { return null; }
+        return {element: link, url: link.href,
+                title: text(all(xpaths.title, card)[0]) || text(link) || link.getAttribute('title') || '',
+                price: text(all(xpaths.price, card)[0]), availability: text(all(xpaths.availability, card)[0])};
+    }).filter(function (result) { return result; });
+}
+"""
+
+# Every result card in one call
+RESULTS_SCRIPT = CARD_READER + "return read(topCards());"
+
+# One scan round: the cards from index arguments[1] on, the card count and the next-page
+# link. Then scrolls to the end, so an infinite-scroll list starts loading the next chunk.
+SCAN_SCRIPT = CARD_READER + """
+var cards = topCards(), next = all(xpaths.next, document)[0];
+var batch = {results: read(cards.slice(arguments[1])), total: cards.length, next: next ? next.href : null};
+var root = document.scrollingElement || document.documentElement;
+root.scrollTop = root.scrollHeight;
+return batch;
+"""
+
+class SearchResultsPage(BasePage):
+    # Max total cost of this page's locators on a stored snapshot (audit_locators.py)
+    LOCATOR_BUDGET_MS = 12.0
+
+    # Locators - a result card and, relative to it, its parts
+    RESULT_CARD = (By.XPATH, "//div[@data-product-id or contains(@class, 'product-card') or contains(@class, 'product-item') or contains(@class, 'product-box')] | //li[contains(@class, 'product')]")
+    CARD_LINK = (By.XPATH, ".//a[@href]")
+    CARD_TITLE = (By.XPATH, ".//h2 | .//h3 | .//h4")
+    CARD_PRICE = (By.XPATH, ".//span[contains(@class, 'price')] | .//div[contains(@class, 'price')]")
+    CARD_AVAILABILITY = (By.XPATH, ".//span[contains(@class, 'availab') or contains(@class, 'stock')] | .//div[contains(@class, 'availab') or contains(@class, 'stock')]")
+    NEXT_PAGE = (By.XPATH, "//a[@href][@rel='next' or contains(@class, 'next')]")
+
+    def __init__(self, driver):
+        super().__init__(driver)
+        # Figures of the last scan_for call
+        self.last_scan = None
+
+    def _xpaths(self):
+        return {"card": self.RESULT_CARD[1], "link": self.CARD_LINK[1], "title": self.CARD_TITLE[1],
+                "price": self.CARD_PRICE[1], "availability": self.CARD_AVAILABILITY[1], "next": self.NEXT_PAGE[1]}
+
+    def get_results(self):
+        """All result cards as {"element", "url", "title", "price", "price_value", "availability"}"""
+        try:
+            results = self.driver.execute_script(RESULTS_SCRIPT, self._xpaths())
+            if results is None:
+                logging.error("Search results script returned nothing")
+                return []
+            for result in results:
+                result["price_value"] = parse_price(result["price"])
+            return results
+        except Exception as e:
+            logging.error(f"Failed to read search results: {e}")
+            return []
+
+    def find_best_match(self, product_name, timeout=None, min_score=MIN_SCORE):
+        """Best-ranked result for a product name as (result, score); result is None below min_score"""
+        seen = {"titles": None}
+
+        def ranked(driver):
+            # Done once a result matches, or the results stopped changing between two polls
+            results = self.get_results()
+            titles = [result["title"] for result in results]
+            scored = rank(results, product_name)
+            if scored and (scored[0][0] >= min_score or titles == seen["titles"]):
+                return scored
+            seen["titles"] = titles
+            return False
+
+        try:
+            scored = wait_until(self.driver, ranked, f"search result '{product_name}'", timeout)
+        except TimeoutException:
+            logging.warning(f"No search results for '{product_name}'")
+            return None, 0.0
+        score, best = scored[0]
+        if score < min_score:
+            logging.warning(f"No result matches '{product_name}' (best: '{best['title']}' at {score:.2f})")
+            return None, score
+        logging.info(f"Matched '{product_name}' to '{best['title']}' ({score:.2f})")
+        return best, score
+
+    def scan_for(self, product_name, max_results=None, max_pages=None, min_score=MIN_SCORE, timeout=None):
+        """Scroll or page through the results until one matches; (result, score), result None when none did"""
+        max_results = max_results or Config.SCAN_MAX_RESULTS
+        max_pages = max_pages or Config.SCAN_MAX_PAGES
+        xpaths = self._xpaths()
+        seen = set()
+        state = {"start": 0, "pages": 1, "rounds": 0}
+        best_score, best = 0.0, None
+        outcome = "exhausted"
+        started = time.monotonic()
+
+        def next_batch(driver):
+            # Ready once new cards rendered, or there is a next page to go to
+            batch = driver.execute_script(SCAN_SCRIPT, xpaths, state["start"])
+            if batch is None:
+                raise WebDriverException("scan script returned nothing")
+            if batch and (batch["results"] or batch["next"]):
+                return batch
+            return False
+
+        try:
+            # The first round waits for the results to render; later ones only for the next chunk
+            round_timeout = timeout
+            while True:
+                try:
+                    batch = wait_until(self.driver, next_batch, "next search results", round_timeout)
+                except TimeoutException:
+                    break
+                state["rounds"] += 1
+                round_timeout = Config.ABSENCE_TIMEOUT
+                state["start"] = batch["total"]
+                fresh = [result for result in batch["results"] if result["url"] not in seen]
+                seen.update(result["url"] for result in fresh)
+                scored = rank(fresh, product_name)
+                if scored and scored[0][0] > best_score:
+                    best_score, best = scored[0]
+                if best_score >= min_score:
+                    outcome = "found"
+                    break
+                if len(seen) >= max_results:
+                    outcome = "limit"
+                    break
+                if not batch["results"]:
+                    if state["pages"] >= max_pages:
+                        outcome = "limit"
+                        break
+                    self.navigate_to(batch["next"])
+                    state["start"], state["pages"] = 0, state["pages"] + 1
+        except Exception as e:
+            logging.error(f"Failed to scan search results: {e}")
+            outcome = "error"
+
+        seconds = time.monotonic() - started
+        self.last_scan = {"target": product_name, "outcome": outcome, "scanned": len(seen), "rounds": state["rounds"],
+                          "pages": state["pages"], "seconds": round(seconds, 3),
+                          "cards_per_second": round(len(seen) / seconds, 1) if seconds > 0 else None}
+        logging.info(f"Scanned {len(seen)} results for '{product_name}' in {seconds:.2f}s "
+                     f"({self.last_scan['cards_per_second']} cards/s, {state['rounds']} rounds, "
+                     f"{state['pages']} pages): {outcome}")
+        if best_score < min_score:
+            logging.warning(f"No result matches '{product_name}'"
+                            + (f" (best: '{best['title']}' at {best_score:.2f})" if best else ""))
+            return None, best_score
+        logging.info(f"Matched '{product_name}' to '{best['title']}' ({best_score:.2f})")
+        return best, best_score
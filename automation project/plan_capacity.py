@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Host capacity planner for concurrent browser sessions
+
+Ramps concurrent real-browser sessions running the reference shopping flow
+(against the local stand-in site by default) and records per-session memory,
+CPU, step latency and failures at each level. The recommended maximum
+parallelism is written to config/capacity.json, where Config reads the
+PARALLEL_WORKERS and DRIVER_POOL_SIZE defaults.
+"""
+
+import sys
+import json
+import logging
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from config.config import Config, CAPACITY_FILE
+from utils.capacity_planner import CapacityPlanner, DEFAULT_LEVELS
+from utils.stand_in_site import StandInServer
+
+
+def print_levels(plan):
+    """Print one row per measured concurrency level"""
+    print(f"\n{'level':>6}{'fail %':>8}{'step p50':>10}{'step p95':>10}{'startup p95':>13}"
+          f"{'MB/session':>12}{'CPU mean':>10}{'CPU peak':>10}")
+    print("-" * 79)
+    for row in plan["levels"]:
+        cells = [f"{row[key]:>{width}.1f}" if row[key] is not None else f"{'-':>{width}}"
+                 for key, width in (("step_p50_ms", 10), ("step_p95_ms", 10), ("startup_p95_ms", 13),
+                                    ("rss_per_session_mb", 12), ("cpu_mean_percent", 10),
+                                    ("cpu_peak_percent", 10))]
+        print(f"{row['level']:>6}{row['failure_rate'] * 100:>8.1f}{''.join(cells)}")
+        for error in row["errors"]:
+            print(f"  ERROR: {error}")
+    print(f"\nRecommended parallelism: {plan['parallel_workers']} ({plan['reason']})")
+
+
+def run(args, base_url):
+    """Configure and run the planner"""
+    planner = CapacityPlanner(
+        base_url,
+        levels=[int(level) for level in args.levels.split(",")],
+        iterations=args.iterations,
+        browser_name=args.browser,
+        max_failure_rate=args.max_failure_rate,
+        max_latency_factor=args.max_latency_factor,
+        max_cpu_percent=args.max_cpu,
+        memory_headroom=args.memory_headroom,
+    )
+    return planner.run()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Measure how many concurrent browser sessions this host sustains')
+    parser.add_argument('--base-url', help='Target URL (default: start the local stand-in site)')
+    parser.add_argument('--browser', choices=['chrome', 'firefox', 'edge'],
+                        default=Config.BROWSER.lower(), help='Browser to use')
+    parser.add_argument('--levels', default=",".join(str(level) for level in DEFAULT_LEVELS),
+                        help='Comma-separated concurrency levels to measure')
+    parser.add_argument('--iterations', type=int, default=1, help='Flow iterations per session')
+    parser.add_argument('--max-failure-rate', type=float, default=0.05, help='Highest acceptable step failure rate')
+    parser.add_argument('--max-latency-factor', type=float, default=2.0,
+                        help='Highest acceptable step p95 relative to one session')
+    parser.add_argument('--max-cpu', type=float, default=90.0, help='Highest acceptable mean host CPU (%%)')
+    parser.add_argument('--memory-headroom', type=float, default=0.2,
+                        help='Fraction of available memory to leave free')
+    parser.add_argument('--output', default=str(CAPACITY_FILE), help='Where to write the capacity plan')
+    parser.add_argument('--no-write', action='store_true', help='Print the plan without writing it')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    print("Cartlow Capacity Planner")
+    print("=" * 50)
+
+    if args.base_url:
+        print(f"Target: {args.base_url}")
+        plan = run(args, args.base_url)
+    else:
+        with StandInServer() as server:
+            print(f"Stand-in site: {server.base_url}")
+            plan = run(args, server.base_url)
+
+    print_levels(plan)
+
+    if args.no_write:
+        print(json.dumps({key: plan[key] for key in ("parallel_workers", "driver_pool_size")}, indent=2))
+    else:
+        path = CapacityPlanner.write(plan, args.output)
+        print(f"Capacity plan written to {path}")
+
+    if plan["levels"][0]["failure_rate"] >= 1:
+        print("[FAILED] No browser session completed the flow")
+        return False
+    print("[SUCCESS] Capacity measured")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark runner for the Cartlow automation framework
+
+Starts the local stand-in site, runs the framework micro-benchmarks, appends
+the results to reports/benchmark_history.json and fails when a metric
+regresses past the threshold against the stored baseline.
+"""
+
+import sys
+import logging
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from config.config import Config, EMULATION_PROFILES
+from utils.benchmark import BenchmarkSuite, BenchmarkHistory, HISTORY_FILE
+from utils.stand_in_site import StandInServer
+from utils.emulation import Emulation
+
+
+def print_results(metrics, errors):
+    """Print a table of metric summaries"""
+    print(f"\n{'metric':<34}{'median':>10}{'p90':>10}{'p95':>10}{'n':>5}")
+    print("-" * 69)
+    for name, stats in sorted(metrics.items()):
+        print(f"{name:<34}{stats['median']:>10.1f}{stats['p90']:>10.1f}{stats['p95']:>10.1f}{stats['n']:>5}")
+    for name, error in sorted(errors.items()):
+        print(f"{name:<34}  ERROR: {error}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Run Cartlow framework micro-benchmarks')
+    parser.add_argument('--repeat', type=int, default=5, help='Measured iterations per metric')
+    parser.add_argument('--warmup', type=int, default=1, help='Unmeasured warmup iterations per metric')
+    parser.add_argument('--only', nargs='*', default=[],
+                        help='Metric name prefixes to run (e.g. lookup navigation)')
+    parser.add_argument('--browser', choices=['chrome', 'firefox', 'edge'],
+                        default=Config.BROWSER.lower(), help='Browser to use')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed median slowdown against the baseline (0.25 = 25%%)')
+    parser.add_argument('--history', default=str(HISTORY_FILE), help='JSON history file')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='Store this run as the new baseline')
+    parser.add_argument('--emulation', default=None,
+                        help=f"Network/CPU emulation profiles, comma-separated ({', '.join(EMULATION_PROFILES)})")
+
+    args = parser.parse_args()
+    if args.emulation:
+        try:
+            Config.apply(overrides={"EMULATION": args.emulation})
+            Emulation.resolve()
+        except ValueError as e:
+            parser.error(str(e))
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    print("Cartlow Framework Benchmarks")
+    print("=" * 50)
+
+    with StandInServer() as server:
+        print(f"Stand-in site: {server.base_url}")
+        print(f"Emulation requested: {Emulation.tag()}")
+        suite = BenchmarkSuite(server.base_url, repeat=args.repeat, warmup=args.warmup,
+                               browser=args.browser, only=args.only)
+        try:
+            metrics = suite.run()
+        except Exception as e:
+            print(f"❌ Benchmarks could not run: {e}")
+            sys.exit(2)
+
+    # Compared and recorded under the emulation the driver ran with (none where CDP is missing)
+    print(f"Emulation applied: {suite.emulation}")
+    print_results(metrics, suite.errors)
+
+    history = BenchmarkHistory(args.history)
+    regressions = history.compare(metrics, threshold=args.threshold, emulation=suite.emulation)
+    missing = history.missing(metrics, only=args.only, emulation=suite.emulation)
+    history.record(metrics, suite.errors, update_baseline=args.update_baseline, emulation=suite.emulation)
+    print(f"\n📊 History written to {args.history}")
+
+    if suite.errors:
+        print(f"\n❌ {len(suite.errors)} benchmark(s) failed: {', '.join(sorted(suite.errors))}")
+    if missing:
+        print(f"\n❌ Baseline metrics missing from this run: {', '.join(missing)}")
+    if regressions:
+        print("\n❌ Regressions against baseline:")
+        for name, baseline, current, ratio in regressions:
+            print(f"  {name}: {baseline:.1f} ms -> {current:.1f} ms ({ratio}x)")
+    if suite.errors or missing or regressions:
+        sys.exit(1)
+
+    print("\n✅ No regressions against baseline")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
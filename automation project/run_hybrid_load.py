@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Hybrid load runner: a few real browsers plus many HTTP virtual users
+
+Real DriverFactory browsers run the page-object flow while an asyncio HTTP
+population runs the same scenario; both report into one timeline showing
+how browser-measured step latency degrades as background load rises.
+Results go to reports/hybrid_<timestamp>.json.
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from config.config import Config
+from utils.hybrid_load import HybridRunner
+from utils.load_generator import parse_stages
+from utils.stand_in_site import StandInServer
+
+
+def print_report(report):
+    """Print the timeline and the browser latency per load band"""
+    print(f"\n{'t (s)':>7}{'http users':>12}{'http steps':>12}{'http p95':>10}"
+          f"{'br steps':>10}{'br p50':>9}{'br p95':>9}{'errors':>8}")
+    print("-" * 77)
+    for row in report["windows"]:
+        cells = [f"{row[key]:>9.1f}" if row[key] is not None else f"{'-':>9}"
+                 for key in ("browser_p50_ms", "browser_p95_ms")]
+        http_p95 = f"{row['http_p95_ms']:>10.1f}" if row["http_p95_ms"] is not None else f"{'-':>10}"
+        print(f"{row['start_s']:>7.1f}{row['http_users']:>12}{row['http_steps']:>12}{http_p95}"
+              f"{row['browser_steps']:>10}{''.join(cells)}{row['errors']:>8}")
+
+    print(f"\nBrowser step latency by background HTTP users")
+    print(f"{'http users':<14}{'n':>6}{'p50':>10}{'p95':>10}")
+    for row in report["browser_by_load"]:
+        print(f"{row['http_users']:<14}{row['n']:>6}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}")
+    if report["browser_degradation"]:
+        print(f"\nBrowser p50 at peak load is {report['browser_degradation']}x the lightest band")
+    for error in report["browser_errors"]:
+        print(f"  ERROR: {error}")
+
+
+def run(args, base_url):
+    """Configure and run the hybrid load"""
+    runner = HybridRunner(
+        base_url,
+        browsers=args.browsers,
+        browser_name=args.browser,
+        window_s=args.window,
+        users=args.users,
+        ramp_up=args.ramp_up,
+        duration=args.duration,
+        think_time=(args.think_min, args.think_max),
+        stages=parse_stages(args.stages) if args.stages else None,
+    )
+    return runner.run()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Run real browsers alongside HTTP virtual users')
+    parser.add_argument('--base-url', default=Config.BASE_URL, help='Storefront URL')
+    parser.add_argument('--stand-in', action='store_true', help='Start and target the local stand-in site')
+    parser.add_argument('--browsers', type=int, default=2, help='Real browser sessions')
+    parser.add_argument('--browser', choices=['chrome', 'firefox', 'edge'],
+                        default=Config.BROWSER.lower(), help='Browser to use')
+    parser.add_argument('--users', type=int, default=50, help='HTTP virtual users')
+    parser.add_argument('--ramp-up', type=float, default=60.0, help='Seconds to reach --users')
+    parser.add_argument('--duration', type=float, default=60.0, help='Seconds to hold load after ramp-up')
+    parser.add_argument('--stages', help="HTTP ramp profile 'seconds:users,...' (overrides --users/--ramp-up)")
+    parser.add_argument('--think-min', type=float, default=1.0, help='Minimum HTTP think time (s)')
+    parser.add_argument('--think-max', type=float, default=3.0, help='Maximum HTTP think time (s)')
+    parser.add_argument('--window', type=float, default=5.0, help='Timeline window (s)')
+    parser.add_argument('--output', help='Result file (default reports/hybrid_<timestamp>.json)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    print("Cartlow Hybrid Load Run")
+    print("=" * 50)
+
+    if args.stand_in:
+        with StandInServer() as server:
+            print(f"Stand-in site: {server.base_url}")
+            report = run(args, server.base_url)
+    else:
+        print(f"Target: {args.base_url}")
+        report = run(args, args.base_url)
+
+    print_report(report)
+
+    output = Path(args.output or f"reports/hybrid_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResult written to {output}")
+
+    if report["browser_errors"] or not report["browser_by_load"]:
+        print("[FAILED] Browser users did not complete any steps")
+        return False
+    print("[SUCCESS] Hybrid load run completed")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
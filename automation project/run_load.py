@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+HTTP load runner for the Cartlow 8-step scenario
+
+Replays the shopping flow with asyncio virtual users at HTTP level, prints
+per-step p50/p95/p99 latencies and writes the full result (with histograms)
+to reports/load_<timestamp>.json. Use --stand-in to size capacity against the
+local stand-in site.
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from config.config import Config
+from utils.load_generator import LoadRunner, parse_stages
+from utils.stand_in_site import StandInServer
+
+
+def print_summary(result):
+    """Print the per-step latency table"""
+    print(f"\nUsers: {result['users_started']}  iterations: {result['iterations_completed']}  "
+          f"steps/s: {result['steps_per_s']}  errors: {result['error_count']} ({result['error_rate']:.2%})")
+    print(f"\n{'step':<20}{'count':>7}{'errors':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    print("-" * 75)
+    for name, stats in result["steps"].items():
+        values = [f"{stats[key]:>10.1f}" if stats[key] is not None else f"{'-':>10}"
+                  for key in ("p50", "p95", "p99", "max")]
+        print(f"{name:<20}{stats['count']:>7}{stats['errors']:>8}{''.join(values)}")
+    for error in result["errors"]:
+        print(f"  ERROR: {error}")
+
+
+def run(args, base_url):
+    """Configure and run the load"""
+    runner = LoadRunner(
+        base_url,
+        users=args.users,
+        ramp_up=args.ramp_up,
+        duration=args.duration,
+        iterations=args.iterations,
+        think_time=(args.think_min, args.think_max),
+        stages=parse_stages(args.stages) if args.stages else None,
+        connection_limit=args.connections,
+        seed=args.seed,
+    )
+    return runner.run()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Run HTTP-level virtual-user load on the shopping flow')
+    parser.add_argument('--base-url', default=Config.BASE_URL, help='Storefront URL')
+    parser.add_argument('--stand-in', action='store_true', help='Start and target the local stand-in site')
+    parser.add_argument('--users', type=int, default=10, help='Concurrent virtual users')
+    parser.add_argument('--ramp-up', type=float, default=0.0, help='Seconds to reach --users')
+    parser.add_argument('--duration', type=float, help='Seconds to hold load after ramp-up')
+    parser.add_argument('--iterations', type=int, help='Flow iterations per user (default 1 without --duration)')
+    parser.add_argument('--stages', help="Ramp profile 'seconds:users,...' (overrides --users/--ramp-up)")
+    parser.add_argument('--think-min', type=float, default=1.0, help='Minimum think time between steps (s)')
+    parser.add_argument('--think-max', type=float, default=3.0, help='Maximum think time between steps (s)')
+    parser.add_argument('--connections', type=int, default=100, help='Connection pool size')
+    parser.add_argument('--seed', type=int, help='Random seed for think times')
+    parser.add_argument('--max-error-rate', type=float, default=0.01,
+                        help='Fail when the step error rate exceeds this (0.01 = 1%%)')
+    parser.add_argument('--output', help='Result file (default reports/load_<timestamp>.json)')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    print("Cartlow HTTP Load Run")
+    print("=" * 50)
+
+    if args.stand_in:
+        with StandInServer() as server:
+            print(f"Stand-in site: {server.base_url}")
+            result = run(args, server.base_url)
+    else:
+        print(f"Target: {args.base_url}")
+        result = run(args, args.base_url)
+
+    print_summary(result)
+
+    output = Path(args.output or f"reports/load_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"\nResult written to {output}")
+
+    if result["error_rate"] > args.max_error_rate:
+        print(f"[FAILED] Error rate {result['error_rate']:.2%} exceeds {args.max_error_rate:.2%}")
+        return False
+    print("[SUCCESS] Load run completed")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
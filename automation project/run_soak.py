@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Soak runner: loop the 8-step shopping flow on one browser and track leaks
+
+Replays the flow for --duration minutes (or --iterations) on a single
+long-lived driver, samples browser and host counters after every iteration
+and reports counters that grow monotonically and iteration latency drift.
+The full report goes to reports/soak_<timestamp>.json. Use --stand-in to
+soak against the local stand-in site.
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from config.config import Config
+from utils.account_pool import AccountPool
+from utils.driver_factory import DriverFactory
+from utils.soak import ALPHA, METRICS, WARMUP_ITERATIONS, SoakRunner
+from utils.stand_in_site import StandInServer
+
+
+def print_summary(report):
+    """Print the growth table of every counter and the latency"""
+    print(f"\nIterations: {report['iterations']}  failures: {report['failures']}  "
+          f"elapsed: {report['elapsed_s'] / 60:.1f} min  stopped by: {report['stop_reason']}  "
+          f"emulation: {report['emulation']}")
+    print(f"\n{'series':<20}{'start':>16}{'last':>16}{'slope/iter':>14}{'growth':>10}{'p':>10}  verdict")
+    print("-" * 96)
+    rows = [(name, report["trends"][name]) for name in METRICS] + [("latency_ms", report["latency"])]
+    for name, result in rows:
+        if result["growing"] is None:
+            print(f"{name:<20}{'not enough samples':>16}")
+            continue
+        relative = f"{result['relative_growth']:.1%}" if result["relative_growth"] is not None else "-"
+        verdict = "GROWING" if result["growing"] else "stable"
+        print(f"{name:<20}{result['start']:>16.1f}{result['last']:>16.1f}{result['slope_per_iteration']:>14.2f}"
+              f"{relative:>10}{result['p']:>10.4f}  {verdict}")
+
+
+def soak(args, base_url):
+    """Run the soak loop on one driver, signed in as a leased account"""
+    with AccountPool().lease(holder="soak-runner") as lease:
+        driver = DriverFactory.create_driver(args.browser)
+        try:
+            runner = SoakRunner(driver, base_url, duration=args.duration * 60, max_iterations=args.iterations,
+                                email=lease.email, password=lease.password, warmup=args.warmup, alpha=args.alpha)
+            return runner.run()
+        finally:
+            driver.quit()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Loop the shopping flow on one browser and detect leaks')
+    parser.add_argument('--base-url', default=None, help='Storefront URL (default BASE_URL)')
+    parser.add_argument('--stand-in', action='store_true', help='Start and target the local stand-in site')
+    parser.add_argument('--duration', type=float, default=60.0, help='Minutes to keep looping')
+    parser.add_argument('--iterations', type=int, help='Stop after this many iterations')
+    parser.add_argument('--browser', choices=['chrome', 'firefox', 'edge'], default=None, help='Browser to use')
+    parser.add_argument('--profile', help='Settings profile from config/profiles.json')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                        help='Override one setting, e.g. --set EMULATION=slow-4g (repeatable)')
+    parser.add_argument('--warmup', type=int, default=WARMUP_ITERATIONS,
+                        help='First iterations left out of the trend analysis')
+    parser.add_argument('--alpha', type=float, default=ALPHA, help='Significance level of the growth test')
+    parser.add_argument('--max-failure-rate', type=float, default=0.05,
+                        help='Fail when more iterations than this fail (0.05 = 5%%)')
+    parser.add_argument('--output', help='Report file (default reports/soak_<timestamp>.json)')
+
+    args = parser.parse_args()
+    try:
+        Config.apply(args.profile, dict(item.split('=', 1) for item in args.set))
+    except ValueError as e:
+        parser.error(f"Invalid settings: {e}")
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    print("Cartlow Soak Run")
+    print("=" * 50)
+
+    if args.stand_in:
+        with StandInServer() as server:
+            print(f"Stand-in site: {server.base_url}")
+            report = soak(args, server.base_url)
+    else:
+        print(f"Target: {args.base_url or Config.BASE_URL}")
+        report = soak(args, args.base_url)
+
+    print_summary(report)
+
+    output = Path(args.output or f"reports/soak_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nReport written to {output}")
+
+    failure_rate = report["failures"] / report["iterations"] if report["iterations"] else 1.0
+    problems = [f"{name} grows" for name in report["leaks"]]
+    if report["latency_drift"]:
+        problems.append("iteration latency drifts upward")
+    if failure_rate > args.max_failure_rate:
+        problems.append(f"{failure_rate:.1%} of iterations failed")
+    if problems:
+        print(f"[FAILED] {'; '.join(problems)}")
+        return False
+    print("[SUCCESS] No growth detected")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -8,6 +8,8 @@ import sys
 import subprocess
 import argparse
 from pathlib import Path
+from config.config import Config
+from utils.account_pool import load_accounts
 
 def create_directories():
     """Create necessary directories"""
@@ -16,7 +18,8 @@ def create_directories():
         Path(directory).mkdir(exist_ok=True)
         print(f"Created directory: {directory}")
 
-def run_tests(test_type="all", browser="chrome", headless=False, verbose=True):
+def run_tests(test_type="all", browser="chrome", headless=False, verbose=True, workers=None,
+              profile=None, overrides=None, impacted_since=None, record_impact=False):
     """Run tests with specified parameters"""
     
     # Create necessary directories
@@ -25,7 +28,9 @@ def run_tests(test_type="all", browser="chrome", headless=False, verbose=True):
     # Set environment variables
     env = os.environ.copy()
     env['BROWSER'] = browser
-    env['HEADLESS'] = str(headless).lower()
+    if headless:
+        # Otherwise HEADLESS comes from the profile or .env
+        env['HEADLESS'] = 'true'
     
     # Build pytest command
     cmd = ['python', '-m', 'pytest']
@@ -40,6 +45,29 @@ def run_tests(test_type="all", browser="chrome", headless=False, verbose=True):
     if verbose:
         cmd.append('-v')
     
+    # Settings profile and per-setting overrides, applied again inside pytest
+    if profile:
+        cmd.extend(['--profile', profile])
+    for override in overrides or []:
+        cmd.extend(['--set', override])
+    
+    # Test impact analysis: record the map, or run only tests touching changed code
+    if impacted_since:
+        cmd.extend(['--impacted-since', impacted_since])
+    if record_impact:
+        cmd.append('--record-impact')
+    
+    # Parallel workers (pytest-xdist); defaults to the profile or measured capacity plan
+    # (recording coverage contexts needs a single process)
+    workers = 1 if record_impact else workers or Config.PARALLEL_WORKERS
+    # Each worker leases its own test account, so more workers than accounts would only queue
+    accounts = len(load_accounts())
+    if workers > accounts:
+        print(f"Limiting workers from {workers} to {accounts}: one test account per worker (see ACCOUNTS)")
+        workers = accounts
+    if workers > 1:
+        cmd.extend(['-n', str(workers)])
+    
     # Add HTML report
     cmd.extend(['--html=reports/report.html', '--self-contained-html'])
     
@@ -50,6 +78,8 @@ def run_tests(test_type="all", browser="chrome", headless=False, verbose=True):
     print(f"Running command: {' '.join(cmd)}")
     print(f"Browser: {browser}")
     print(f"Headless: {headless}")
+    print(f"Profile: {Config.PROFILE}")
+    print(f"Workers: {workers}")
     print("-" * 50)
     
     try:
@@ -78,9 +108,23 @@ def main():
                        help='Run in headless mode')
     parser.add_argument('--quiet', action='store_true', 
                        help='Run in quiet mode (less verbose)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Parallel pytest workers (default: PARALLEL_WORKERS from the profile or config/capacity.json)')
+    parser.add_argument('--profile', help='Settings profile from config/profiles.json (fast-local, ci-parallel, debug-slow, slow-shopper)')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE',
+                       help='Override one setting, e.g. --set EXPLICIT_WAIT=5 (repeatable)')
+    parser.add_argument('--impacted-since', metavar='REF',
+                       help='Run only tests that execute code changed since a git ref (e.g. origin/main)')
+    parser.add_argument('--record-impact', action='store_true',
+                       help='Record reports/impact_map.json for --impacted-since')
     
     args = parser.parse_args()
     
+    try:
+        Config.apply(args.profile, dict(item.split('=', 1) for item in args.set))
+    except ValueError as e:
+        parser.error(f"Invalid settings: {e}")
+    
     print("🚀 Cartlow E2E Automation Test Runner")
     print("=" * 50)
     
@@ -88,7 +132,12 @@ def main():
         test_type=args.test_type,
         browser=args.browser,
         headless=args.headless,
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        workers=args.workers,
+        profile=args.profile,
+        overrides=args.set,
+        impacted_since=args.impacted_since,
+        record_impact=args.record_impact
     )
     
     sys.exit(0 if success else 1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Warm runner: keep imports and signed-in browsers alive between test runs
+
+    python run_warm.py start                  # daemon with a warm driver pool
+    python run_warm.py run tests/test_x.py -k cart
+    python run_warm.py status
+    python run_warm.py stop
+
+`run` forwards its arguments to pytest inside the daemon and streams the
+results back, so a re-run skips interpreter start-up, imports, driver
+resolution, browser launch and login.
+"""
+
+import os
+import sys
+import logging
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from config.config import Config
+from utils.account_pool import AccountPool
+from utils.driver_pool import DriverPool, sign_in
+from utils.fake_webdriver import FakeWebDriver
+from utils.runner_daemon import DEFAULT_PORT, RunnerDaemon, send_request
+from utils.stand_in_site import StandInSite
+
+
+def start(args):
+    """Start the daemon in the foreground"""
+    os.chdir(Path(__file__).parent)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.stand_in:
+        # In-process fake browsers on the stand-in storefront, for offline locator work
+        site = StandInSite()
+        os.environ["BASE_URL"] = "http://stand-in.local"
+        Config.apply()
+        create_driver = lambda: FakeWebDriver(site)
+    else:
+        if args.browser:
+            os.environ["BROWSER"] = args.browser
+            Config.apply()
+        create_driver = None
+
+    # The pooled drivers sign in as one leased account for the daemon's lifetime
+    # (set in the environment: each run's pytest_configure re-applies the settings layers)
+    with AccountPool().lease(holder="warm-runner") as lease:
+        os.environ["EMAIL"], os.environ["PASSWORD"] = lease.email, lease.password
+        Config.apply()
+
+        print("Cartlow Warm Runner")
+        print("=" * 50)
+        pool = DriverPool(size=args.pool, create_driver=create_driver, warm_up=None if args.no_login else sign_in)
+        pool.start()
+        daemon = RunnerDaemon(pool, port=args.port)
+        print(f"Pool: {pool.status()['idle']} warm drivers ({Config.BASE_URL}) as {lease.email}")
+        print(f"Listening on 127.0.0.1:{daemon.port} - stop with: python run_warm.py stop")
+        daemon.serve_forever()
+    return True
+
+
+def print_event(event):
+    """Print one streamed event from the daemon"""
+    if event["event"] == "collected":
+        print(f"collected {event['count']} items")
+    elif event["event"] == "test":
+        phase = "" if event["when"] == "call" else f" ({event['when']})"
+        print(f"{event['outcome'].upper():<8} {event['nodeid']}{phase} [{event['duration']:.2f}s]")
+        if event["longrepr"]:
+            print(event["longrepr"])
+
+
+def run(args):
+    """Send the pytest arguments to the daemon and stream results"""
+    try:
+        done = send_request({"command": "run", "args": args.pytest_args}, port=args.port, on_event=print_event)
+    except ConnectionError as e:
+        print(f"[FAILED] Runner daemon not reachable on port {args.port}: {e}")
+        print("Start it with: python run_warm.py start")
+        return False
+    if done.get("error"):
+        print(f"[FAILED] {done['error']}")
+    print(f"\nExit code {done['exit_code']} in {done.get('elapsed_s', 0):.2f}s (warm)")
+    return done["exit_code"] == 0
+
+
+def control(args):
+    """status / stop"""
+    try:
+        done = send_request({"command": args.command}, port=args.port, timeout=10)
+    except (ConnectionError, OSError) as e:
+        print(f"Runner daemon not reachable on port {args.port}: {e}")
+        return False
+    if "status" in done:
+        for key, value in done["status"].items():
+            print(f"{key}: {value}")
+    else:
+        print("Runner daemon stopping")
+    return done["exit_code"] == 0
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Warm test runner daemon and client')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Local daemon port')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    start_parser = commands.add_parser('start', help='Start the daemon with a warm driver pool')
+    start_parser.add_argument('--pool', type=int, default=None, help='Warm drivers (default: DRIVER_POOL_SIZE)')
+    start_parser.add_argument('--browser', choices=['chrome', 'firefox', 'edge'], help='Browser to use')
+    start_parser.add_argument('--no-login', action='store_true', help='Do not sign the pooled drivers in')
+    start_parser.add_argument('--stand-in', action='store_true', help='Use in-process fake browsers on the stand-in site')
+
+    run_parser = commands.add_parser('run', help='Run pytest arguments in the daemon')
+    run_parser.add_argument('pytest_args', nargs='*', help='Arguments passed to pytest (options included)')
+
+    commands.add_parser('status', help='Show daemon and pool status')
+    commands.add_parser('stop', help='Stop the daemon and quit its drivers')
+
+    # Unrecognised options after `run` belong to pytest
+    args, extra = parser.parse_known_args()
+    if extra and args.command != 'run':
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    if args.command == 'start':
+        return start(args)
+    if args.command == 'run':
+        # Forward everything after `run` in its original order
+        args.pytest_args = sys.argv[sys.argv.index('run') + 1:]
+        return run(args)
+    return control(args)
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
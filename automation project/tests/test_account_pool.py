@@ -0,0 +1,89 @@
+"""
+Test-account leases: exclusivity across processes, expiry and cart reset
+"""
+
+import sys
+import json
+import subprocess
+from pathlib import Path
+import pytest
+from utils.account_pool import AccountLeaseError, AccountPool, load_accounts, reset_cart
+
+ACCOUNTS = [("a@example.com", "pa"), ("b@example.com", "pb"), ("c@example.com", "pc")]
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Lease one account, report it, and hold it until stdin closes
+HOLDER = """
+import sys
+sys.path.insert(0, {root!r})
+from utils.account_pool import AccountPool
+pool = AccountPool(accounts={accounts!r}, path={path!r})
+lease = pool.acquire(timeout=10)
+print(lease.email, flush=True)
+sys.stdin.read()
+pool.release(lease)
+"""
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAccountPool:
+    """Each holder gets its own account until it releases it or the lease expires"""
+
+    def test_leases_are_exclusive_until_released(self, tmp_path):
+        pool = AccountPool(ACCOUNTS[:2], path=tmp_path / "leases.json")
+        first, second = pool.acquire(timeout=0), pool.acquire(timeout=0)
+        assert {first.email, second.email} == {"a@example.com", "b@example.com"}
+        with pytest.raises(AccountLeaseError, match="all 2 are leased"):
+            pool.acquire(timeout=0)
+        pool.release(first)
+        assert pool.acquire(timeout=0).email == first.email
+
+    def test_expired_lease_is_reclaimed_and_lost_to_its_holder(self, tmp_path):
+        clock = FakeClock()
+        pool = AccountPool(ACCOUNTS[:1], path=tmp_path / "leases.json", lease_seconds=60, clock=clock)
+        stale = pool.acquire(timeout=0)
+        clock.now += 30
+        assert pool.renew(stale)
+        clock.now += 61
+        fresh = pool.acquire(holder="gw1", timeout=0)
+        assert fresh.email == stale.email and not pool.renew(stale)
+        pool.release(stale)
+        assert pool.status()["leased"] == {"a@example.com": "gw1"}
+
+    def test_processes_coordinate_through_the_lease_file(self, tmp_path):
+        script = HOLDER.format(root=str(PROJECT_ROOT), accounts=ACCOUNTS, path=str(tmp_path / "leases.json"))
+        holders = [subprocess.Popen([sys.executable, "-c", script], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                    text=True, cwd=PROJECT_ROOT) for _ in ACCOUNTS]
+        try:
+            emails = [holder.stdout.readline().strip() for holder in holders]
+            assert sorted(emails) == [email for email, _ in ACCOUNTS]
+            with pytest.raises(AccountLeaseError):
+                AccountPool(ACCOUNTS, path=tmp_path / "leases.json").acquire(timeout=0)
+        finally:
+            for holder in holders:
+                holder.communicate(timeout=30)
+        assert json.loads((tmp_path / "leases.json").read_text()) == {"leases": {}}
+
+    def test_reset_signs_in_and_empties_the_accounts_cart(self, fake_driver):
+        site = fake_driver.site
+        site.sessions["seeded"] = {"user": "a@example.com"}
+        site.add_to_cart("seeded", "1001")
+        site.add_to_cart("seeded", "2003")
+        assert reset_cart(fake_driver, "a@example.com", "pa", fake_driver.base_url)
+        assert site.cart_count("seeded") == 0
+
+    def test_accounts_from_settings_file_or_single_account(self, tmp_path):
+        path = tmp_path / "accounts.json"
+        assert load_accounts(path, ["x@example.com:p:1", "x@example.com:p2"]) == [("x@example.com", "p2")]
+        path.write_text(json.dumps([{"email": "f@example.com", "password": "pf"}]))
+        assert load_accounts(path, []) == [("f@example.com", "pf")]
+        with pytest.raises(ValueError):
+            load_accounts(path, ["no-password"])
+        assert len(load_accounts(tmp_path / "missing.json", [])) == 1
@@ -0,0 +1,83 @@
+"""
+Benchmark statistics, the JSON history and its baseline comparison
+"""
+
+import json
+import pytest
+from config.config import Config
+from utils import benchmark
+from utils.benchmark import BenchmarkHistory, BenchmarkSuite, percentile, summarize
+from utils.driver_factory import DriverFactory
+from utils.shopping_flow import ShoppingFlow
+
+
+def stats(median):
+    return {"n": 5, "median": median, "p90": median, "p95": median, "min": median, "max": median}
+
+
+class TestBenchmark:
+    """Percentiles, summaries, failed measurements and regressions against the stored baseline"""
+
+    def test_percentile_interpolates_between_samples(self):
+        assert percentile([], 0.5) is None
+        assert percentile([7.0], 0.95) == 7.0
+        assert percentile([4, 1, 3, 2], 0.5) == 2.5
+        assert percentile([10, 20, 30, 40, 50], 0.9) == pytest.approx(46.0)
+        assert percentile([10, 20], 0.0) == 10 and percentile([10, 20], 1.0) == 20
+
+    def test_summarize_rounds_to_microseconds(self):
+        assert summarize([1.23456, 2.0, 3.0, 4.0]) == {
+            "n": 4, "median": 2.5, "p90": 3.7, "p95": 3.85, "min": 1.235, "max": 4.0}
+
+    def test_failed_measurements_are_errors(self, fake_driver, monkeypatch):
+        suite = BenchmarkSuite("http://stand-in.local", repeat=2, warmup=0)
+        assert suite.measure("lookup.css", lambda: None)["n"] == 2
+        # A flow that stops early without a failed step still fails the metric
+        monkeypatch.setattr(ShoppingFlow, "run", lambda self: [{"step": 1, "passed": True, "error": None}])
+        suite.bench_full_flow(fake_driver)
+        assert suite.errors == {"flow.8_steps": f"Flow ran 1 of {len(ShoppingFlow.STEPS)} steps"}
+        assert list(suite.results) == ["lookup.css"]
+
+    def test_first_run_becomes_the_baseline_and_history_is_capped(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(benchmark, "MAX_RUNS_KEPT", 2)
+        path = tmp_path / "history.json"
+        history = BenchmarkHistory(path)
+        history.record({"lookup.css": stats(10.0)})
+        history.record({"lookup.css": stats(30.0)}, errors={"lookup.xpath": "timed out"})
+        assert history.data["baseline"]["metrics"]["lookup.css"]["median"] == 10.0
+
+        history.record({"lookup.css": stats(12.0)}, update_baseline=True)
+        saved = json.loads(path.read_text(encoding="utf-8"))
+        assert saved["baseline"]["metrics"]["lookup.css"]["median"] == 12.0
+        assert [run["metrics"]["lookup.css"]["median"] for run in saved["runs"]] == [30.0, 12.0]
+        assert saved["runs"][0]["errors"] == {"lookup.xpath": "timed out"} and saved["runs"][0]["emulation"] == "none"
+
+    def test_compare_needs_both_a_relative_and_an_absolute_slowdown(self, tmp_path):
+        history = BenchmarkHistory(tmp_path / "history.json")
+        history.record({"lookup.css": stats(2.0), "navigation.home": stats(100.0), "flow.8_steps": stats(100.0)})
+        regressions = history.compare({"lookup.css": stats(4.0), "navigation.home": stats(130.0),
+                                       "flow.8_steps": stats(120.0)}, threshold=0.25)
+        # lookup.css doubled but by less than min_delta_ms; flow.8_steps is within the threshold
+        assert regressions == [("navigation.home", 100.0, 130.0, 1.3)]
+
+    def test_missing_lists_baseline_metrics_the_run_did_not_produce(self, tmp_path):
+        history = BenchmarkHistory(tmp_path / "history.json")
+        assert history.missing({"lookup.css": stats(1.0)}) == []
+        history.record({"lookup.css": stats(1.0), "lookup.xpath": stats(1.0), "flow.8_steps": stats(90.0)})
+        assert history.compare({"lookup.css": stats(1.0)}) == []
+        assert history.missing({"lookup.css": stats(1.0)}) == ["flow.8_steps", "lookup.xpath"]
+        assert history.missing({"lookup.css": stats(1.0)}, only=["lookup"]) == ["lookup.xpath"]
+
+    def test_runs_are_kept_under_the_emulation_the_driver_ran_with(self, fake_driver, tmp_path, monkeypatch):
+        monkeypatch.setattr(Config, "EMULATION", ["3g"])
+        suite = BenchmarkSuite(fake_driver.base_url, repeat=1, warmup=0, only=["lookup.css"])
+        suite.run(create_driver=lambda browser: DriverFactory.apply_profile(fake_driver))
+        assert suite.emulation == "3g" and list(suite.results) == ["lookup.css"]
+
+        history = BenchmarkHistory(tmp_path / "history.json")
+        history.record({"lookup.css": stats(10.0)})
+        history.record({"lookup.css": stats(100.0)}, emulation=suite.emulation)
+        assert history.data["runs"][-1]["emulation"] == "3g"
+        assert history.data["baseline:3g"]["metrics"]["lookup.css"]["median"] == 100.0
+        assert history.compare({"lookup.css": stats(100.0)}, emulation="3g") == []
+        assert history.compare({"lookup.css": stats(100.0)}) == [("lookup.css", 10.0, 100.0, 10.0)]
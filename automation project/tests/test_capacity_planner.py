@@ -0,0 +1,61 @@
+"""
+Capacity planner tests with fake browsers on a virtual clock
+"""
+
+import json
+from config.config import load_capacity
+from utils.capacity_planner import CapacityPlanner
+from utils.fake_webdriver import FakeWebDriver, VirtualClock
+from utils.stand_in_site import StandInSite
+
+
+class VirtualTimeCapacityPlanner(CapacityPlanner):
+    """Sessions on the fake driver, with page-object sleeps on a virtual clock"""
+
+    def _session(self, index, level, record):
+        with VirtualClock():
+            super()._session(index, level, record)
+
+
+def level(number, failure_rate=0.0, p95=100.0, rss=200.0, cpu=20.0):
+    return {"level": number, "failure_rate": failure_rate, "step_p95_ms": p95,
+            "rss_per_session_mb": rss, "cpu_mean_percent": cpu}
+
+
+class TestCapacityPlanner:
+    """Level measurement and the recommendation rules"""
+
+    def test_levels_are_measured_and_written(self, tmp_path):
+        site = StandInSite()
+        planner = VirtualTimeCapacityPlanner("http://stand-in.local", levels=[1, 2],
+                                             create_driver=lambda: FakeWebDriver(site), sample_interval=0.01,
+                                             # Host CPU and millisecond latencies are runner noise here
+                                             max_cpu_percent=100.0, max_latency_factor=100.0)
+        plan = planner.run()
+        assert [row["level"] for row in plan["levels"]] == [1, 2]
+        assert all(row["failure_rate"] == 0 for row in plan["levels"]), plan["levels"]
+        assert plan["parallel_workers"] == plan["driver_pool_size"] == 2
+
+        path = CapacityPlanner.write(plan, tmp_path / "capacity.json")
+        assert load_capacity(path) == {"parallel_workers": 2, "driver_pool_size": 2}
+
+    def test_recommendation_stops_at_first_level_over_limits(self):
+        planner = CapacityPlanner("http://stand-in.local", max_latency_factor=2.0)
+        results = [level(1), level(2, p95=150.0), level(4, p95=250.0), level(8)]
+        assert planner.recommend(results, available_bytes=2 ** 40) == (2, "level 4: step p95 2.5x the single-session baseline")
+        failing = [level(1), level(2, failure_rate=0.5)]
+        assert planner.recommend(failing, available_bytes=2 ** 40)[0] == 1
+
+    def test_memory_caps_the_recommendation(self):
+        planner = CapacityPlanner("http://stand-in.local", memory_headroom=0.5)
+        results = [level(1, rss=256.0), level(4, rss=256.0)]
+        assert planner.recommend(results, available_bytes=1024 * 2 ** 20) == (2, "memory: 256.0 MB per session")
+
+    def test_load_capacity_ignores_missing_or_bad_files(self, tmp_path):
+        assert load_capacity(tmp_path / "missing.json") == {}
+        broken = tmp_path / "broken.json"
+        broken.write_text("{not json")
+        assert load_capacity(broken) == {}
+        partial = tmp_path / "partial.json"
+        partial.write_text(json.dumps({"parallel_workers": "3"}))
+        assert load_capacity(partial) == {"parallel_workers": 3}
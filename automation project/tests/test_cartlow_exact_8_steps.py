@@ -11,14 +11,17 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.common.keys import Keys
 from config.config import Config
+from pages.product_page import ProductPage
 from utils.test_helpers import TestHelpers
 
 class TestCartlowExact8Steps:
     """Exact 8-step E2E test following user's specific requirements"""
     
-    def test_exact_8_step_cartlow_flow(self, driver):
-        """Exact 8-step shopping flow as requested by user"""
+    def test_exact_8_step_cartlow_flow(self, driver, account_lease, step_retry):
+        """Exact 8-step shopping flow as requested by user; a failed step is retried in place"""
         
+        # Add steps are retried only while the cart count is what it was before them
+        cart_count = ProductPage(driver).cart_count_now
         try:
             logging.info("Starting exact 8-step Cartlow E2E test")
             
@@ -33,44 +36,37 @@ class TestCartlowExact8Steps:
             
             # Step 2: Sign in with email and password
             logging.info("Step 2: Signing in with email and password")
-            signin_success = self._step2_sign_in(driver)
-            assert signin_success, "Step 2 FAILED: Sign in failed"
+            step_retry.run("sign_in", lambda: self._step2_sign_in(driver))
             logging.info("Step 2 SUCCESS: Signed in successfully")
             
             # Step 3: Search for laptop Dell Latitude
             logging.info("Step 3: Searching for Dell Latitude laptop")
-            search_success = self._step3_search_dell_latitude(driver)
-            assert search_success, "Step 3 FAILED: Dell Latitude search failed"
+            step_retry.run("search_laptop", lambda: self._step3_search_dell_latitude(driver))
             logging.info("Step 3 SUCCESS: Dell Latitude search completed")
             
             # Step 4: Add Dell Latitude to cart
             logging.info("Step 4: Adding Dell Latitude to cart")
-            add_laptop_success = self._step4_add_dell_latitude_to_cart(driver)
-            assert add_laptop_success, "Step 4 FAILED: Failed to add Dell Latitude to cart"
+            step_retry.run("add_laptop", lambda: self._step4_add_dell_latitude_to_cart(driver), state=cart_count)
             logging.info("Step 4 SUCCESS: Dell Latitude added to cart")
             
             # Step 5: Open cart to see Dell Latitude
             logging.info("Step 5: Opening cart to see Dell Latitude")
-            cart1_success = self._step5_open_cart_see_laptop(driver)
-            assert cart1_success, "Step 5 FAILED: Failed to see Dell Latitude in cart"
+            step_retry.run("open_cart_laptop", lambda: self._step5_open_cart_see_laptop(driver))
             logging.info("Step 5 SUCCESS: Dell Latitude visible in cart")
             
             # Step 6: Search for Apple Smartwatch Series 6
             logging.info("Step 6: Searching for Apple Smartwatch Series 6")
-            search_watch_success = self._step6_search_apple_watch_series6(driver)
-            assert search_watch_success, "Step 6 FAILED: Apple Watch Series 6 search failed"
+            step_retry.run("search_watch", lambda: self._step6_search_apple_watch_series6(driver))
             logging.info("Step 6 SUCCESS: Apple Watch Series 6 search completed")
             
             # Step 7: Add Apple Watch Series 6 to cart
             logging.info("Step 7: Adding Apple Watch Series 6 to cart")
-            add_watch_success = self._step7_add_apple_watch_to_cart(driver)
-            assert add_watch_success, "Step 7 FAILED: Failed to add Apple Watch to cart"
+            step_retry.run("add_watch", lambda: self._step7_add_apple_watch_to_cart(driver), state=cart_count)
             logging.info("Step 7 SUCCESS: Apple Watch Series 6 added to cart")
             
             # Step 8: Open cart to see both products
             logging.info("Step 8: Opening cart to see both products")
-            cart2_success = self._step8_open_cart_see_both_products(driver)
-            assert cart2_success, "Step 8 FAILED: Failed to see both products in cart"
+            step_retry.run("open_cart_both", lambda: self._step8_open_cart_see_both_products(driver))
             logging.info("Step 8 SUCCESS: Both products visible in cart")
             
             logging.info("All 8 steps completed successfully!")
@@ -140,7 +136,7 @@ class TestCartlowExact8Steps:
             
             # Enter email
             email_field.clear()
-            email_field.send_keys("prof.m.gaber@gmail.com")
+            email_field.send_keys(Config.EMAIL)
             time.sleep(1)
             
             # Find password field
@@ -167,7 +163,7 @@ class TestCartlowExact8Steps:
             
             # Enter password
             password_field.clear()
-            password_field.send_keys("123456789@Tt")
+            password_field.send_keys(Config.PASSWORD)
             time.sleep(1)
             
             # Find submit button
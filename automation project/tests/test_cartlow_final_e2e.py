@@ -13,6 +13,11 @@ from selenium.webdriver.common.keys import Keys
 from config.config import Config
 from utils.test_helpers import TestHelpers
 
+# Cart contents for tests that start on the cart page (see the seeded_cart fixture)
+LAPTOP = {"search": Config.LAPTOP_SEARCH_TERM, "name": "Dell Latitude 7490"}
+WATCH = {"search": Config.WATCH_SEARCH_TERM, "name": "Apple Watch Series 6", "qty": 2,
+         "variant": {"connectivity": Config.WATCH_CONNECTIVITY, "color": Config.WATCH_COLOR, "size": Config.WATCH_SIZE}}
+
 class TestCartlowFinalE2E:
     """Final E2E test for Cartlow website that handles actual behavior"""
     
@@ -86,6 +91,20 @@ class TestCartlowFinalE2E:
             TestHelpers.take_screenshot(driver, "final_e2e_test_failure")
             raise
     
+    @pytest.mark.cart_seed([LAPTOP])
+    def test_remove_laptop_from_seeded_cart(self, driver, seeded_cart):
+        """Start on a cart holding the laptop and remove it"""
+        assert not seeded_cart.is_cart_empty(), "Seeded laptop not in cart"
+        assert self._remove_laptop_from_cart(driver), "Remove button not found"
+        seeded_cart.open_cart()
+        assert seeded_cart.is_cart_empty(), "Laptop still in cart after removal"
+    
+    @pytest.mark.cart_seed([LAPTOP, WATCH])
+    def test_checkout_from_seeded_cart(self, driver, seeded_cart):
+        """Start on a cart holding both products and proceed to checkout"""
+        assert self._proceed_to_checkout(driver), "Checkout button not found"
+        assert "checkout" in driver.current_url.lower(), f"Not on checkout: {driver.current_url}"
+    
     def _handle_authentication(self, driver):
         """Handle authentication with Cartlow"""
         try:
@@ -0,0 +1,85 @@
+"""
+Layered settings and profile tests
+"""
+
+import json
+import threading
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from config.config import SETTINGS, Config, coerce, resolve_settings
+from pages.base_page import BasePage
+from utils.fake_webdriver import VirtualClock
+
+
+@pytest.fixture
+def files(tmp_path):
+    profiles = tmp_path / "profiles.json"
+    profiles.write_text(json.dumps({"quick": {"EXPLICIT_WAIT": 5, "PARALLEL_WORKERS": 3, "HEADLESS": True}}))
+    capacity = tmp_path / "capacity.json"
+    capacity.write_text(json.dumps({"parallel_workers": 2, "driver_pool_size": 6}))
+    return {"profiles_file": profiles, "capacity_file": capacity}
+
+
+@pytest.fixture
+def restore_config():
+    saved = {name: getattr(Config, name) for name in list(SETTINGS) + ["PROFILE"]}
+    yield
+    for name, value in saved.items():
+        setattr(Config, name, value)
+
+
+class TestSettingsLayers:
+    """defaults < capacity plan < profile < environment < CLI overrides"""
+
+    def test_each_layer_overrides_the_one_below(self, files):
+        settings = resolve_settings(environ={}, **files)
+        assert settings["EXPLICIT_WAIT"] == 20
+        assert settings["DRIVER_POOL_SIZE"] == 6
+        assert settings["PROFILE"] == "default"
+
+        settings = resolve_settings("quick", environ={"EXPLICIT_WAIT": "7"}, **files)
+        assert settings["PARALLEL_WORKERS"] == 3
+        assert settings["HEADLESS"] is True
+        assert settings["EXPLICIT_WAIT"] == 7
+
+        settings = resolve_settings(environ={"PROFILE": "quick", "EXPLICIT_WAIT": "7"},
+                                    overrides={"explicit-wait": "9"}, **files)
+        assert settings["PROFILE"] == "quick"
+        assert settings["EXPLICIT_WAIT"] == 9
+
+    def test_invalid_values_are_rejected(self, files):
+        assert coerce("BLOCK_RESOURCES", "*.png, *.woff") == ["*.png", "*.woff"]
+        assert coerce("HEADLESS", "yes") is True
+        for name, value in [("EXPLICIT_WAIT", "soon"), ("HEADLESS", "maybe"), ("PAGE_LOAD_STRATEGY", "lazy"),
+                            ("PARALLEL_WORKERS", 0), ("POLL_INTERVAL", -1), ("NO_SUCH_SETTING", 1)]:
+            with pytest.raises(ValueError):
+                coerce(name, value)
+        with pytest.raises(ValueError, match="available: quick"):
+            resolve_settings("missing", environ={}, **files)
+
+    def test_shipped_profiles_are_valid(self):
+        for name in ("fast-local", "ci-parallel", "debug-slow"):
+            settings = resolve_settings(name, environ={})
+            assert settings["PROFILE"] == name
+        assert resolve_settings("fast-local", environ={})["SLEEP_SCALE"] < 1 < \
+            resolve_settings("debug-slow", environ={})["SLEEP_SCALE"]
+
+
+class TestPageTimings:
+    """Page objects take their waits and settle delays from the active profile"""
+
+    def test_waits_and_pauses_follow_the_profile(self, fake_driver, restore_config):
+        Config.apply(overrides={"EXPLICIT_WAIT": 3, "POLL_INTERVAL": 0.25, "SLEEP_SCALE": 0.5})
+        page = BasePage(fake_driver)
+        fake_driver.get(fake_driver.base_url)
+        clock = VirtualClock._active[threading.get_ident()]
+
+        started = clock.offset
+        page.pause(2)
+        assert clock.offset - started == 1.0
+
+        started = clock.offset
+        with pytest.raises(TimeoutException):
+            page.find_element((By.ID, "never-rendered"))
+        assert 3.0 <= clock.offset - started < 3.5
@@ -0,0 +1,77 @@
+"""
+Watch mode tests: impact mapping and resuming the flow from checkpoints
+"""
+
+import os
+import pytest
+from utils.dependency_graph import DependencyGraph
+from utils.driver_pool import DriverPool
+from utils.watch_runner import FileWatcher, WatchRunner
+
+
+@pytest.fixture
+def project(tmp_path):
+    files = {
+        "pages/__init__.py": "",
+        "pages/login.py": "class Login:\n    pass\n",
+        "pages/home.py": "from .login import Login\n\nclass Home:\n    pass\n",
+        "tests/__init__.py": "",
+        "tests/test_site.py": (
+            "from pages.home import Home\nfrom pages.login import Login\n\n"
+            "class TestSite:\n"
+            "    def test_home(self):\n        Home()\n"
+            "    def test_login(self):\n        self._login()\n"
+            "    def _login(self):\n        Login()\n"
+            "    def test_plain(self):\n        pass\n"
+        ),
+    }
+    for name, source in files.items():
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_text(source)
+    return tmp_path
+
+
+class TestDependencyGraph:
+    """Changed files mapped to modules, tests and flow steps"""
+
+    def test_impact_follows_imports_and_helper_calls(self, project):
+        graph = DependencyGraph(project)
+        assert graph.impacted_modules([project / "pages/login.py"]) == {"pages.login", "pages.home", "tests.test_site"}
+        assert graph.impacted_tests([project / "pages/home.py"]) == ["tests/test_site.py::TestSite::test_home"]
+        assert graph.impacted_tests([project / "pages/login.py"]) == [
+            "tests/test_site.py::TestSite::test_home", "tests/test_site.py::TestSite::test_login"]
+        assert graph.impacted_tests([project / "tests/test_site.py"]) == ["tests/test_site.py"]
+
+    def test_flow_steps_of_the_project(self):
+        graph = DependencyGraph()
+        steps = lambda path: graph.impacted_methods("utils.shopping_flow", "ShoppingFlow", [path], prefix="step_")
+        assert steps("pages/login_page.py") == ["step_sign_in"]
+        assert steps("utils/test_helpers.py") == ["step_search_laptop", "step_search_watch"]
+        assert len(steps("config/profiles.json")) == 8
+        assert "tests/test_cartlow_exact_8_steps.py::TestCartlowExact8Steps::test_exact_8_step_cartlow_flow" \
+            in graph.impacted_tests(["pages/login_page.py"])
+
+    def test_watcher_reports_edits(self, project):
+        watcher = FileWatcher(project)
+        assert watcher.changes() == []
+        path = project / "pages/login.py"
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert watcher.changes() == [path]
+
+
+class TestWatchRunner:
+    """Impacted steps resume from the checkpoint on the open driver"""
+
+    def test_only_impacted_steps_rerun_from_checkpoint(self, fake_driver):
+        pool = DriverPool(size=1, create_driver=lambda: fake_driver, warm_up=None).start()
+        ran = []
+        runner = WatchRunner(pool, run_tests=False, reload=False, emit=ran.append, base_url=fake_driver.base_url)
+        try:
+            assert all(result["passed"] for result in runner.flow())
+            ran.clear()
+            outcome = runner.handle(["pages/login_page.py"])
+        finally:
+            pool.close()
+        assert outcome["steps"] == ["sign_in"]
+        assert [event.get("name") for event in ran] == [None, "sign_in"]
+        assert all(result["passed"] for result in outcome["step_results"])
@@ -0,0 +1,85 @@
+"""
+Network/CPU emulation: CDP commands, the fake driver's slow network and report tags
+"""
+
+import sqlite3
+import pytest
+from config.config import Config
+from utils.driver_factory import DriverFactory
+from utils.emulation import Emulation
+from utils.page_metrics import PageMetricsCollector
+from utils.shopping_flow import ShoppingFlow
+
+
+class ChromiumStub:
+    """Records CDP commands"""
+
+    name = "chrome"
+
+    def __init__(self):
+        self.cdp = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+
+
+class TestEmulation:
+    """Profiles applied through CDP and carried into step results and page metrics"""
+
+    def test_profiles_become_cdp_commands_and_a_tag(self):
+        driver = ChromiumStub()
+        assert Emulation.apply(driver, ["slow-4g", "cpu-4x"])
+        assert driver.cdp == [
+            ("Network.enable", {}),
+            ("Network.emulateNetworkConditions", {"offline": False, "latency": 562.5,
+                                                  "downloadThroughput": 180000, "uploadThroughput": 84375}),
+            ("Emulation.setCPUThrottlingRate", {"rate": 4}),
+        ]
+        assert Emulation.active(driver) == "slow-4g+cpu-4x"
+        assert not Emulation.apply(driver, []) and Emulation.active(driver) == "none"
+        with pytest.raises(ValueError, match="two network profiles"):
+            Emulation.resolve(["3g", "slow-4g"])
+
+    def test_flow_steps_take_longer_on_a_slow_network(self, fake_driver, monkeypatch):
+        fast = ShoppingFlow(fake_driver, base_url=fake_driver.base_url).run(steps=["open_home", "sign_in"])
+        monkeypatch.setattr(Config, "EMULATION", ["3g"])
+        DriverFactory.apply_profile(fake_driver)
+        assert fake_driver.network_conditions["latency"] == 2000
+        fake_driver.delete_all_cookies()
+        slow = ShoppingFlow(fake_driver, base_url=fake_driver.base_url).run(steps=["open_home", "sign_in"])
+        assert all(result["passed"] for result in fast + slow)
+        assert [result["emulation"] for result in fast + slow] == ["none", "none", "3g", "3g"]
+        for before, after in zip(fast, slow):
+            # At least one 2 s round trip per step on the virtual clock
+            assert after["budget"]["spent_s"] >= before["budget"]["spent_s"] + 2.0
+
+    def test_page_metrics_are_tagged_in_older_histories(self, tmp_path):
+        path = tmp_path / "page_metrics.db"
+        connection = sqlite3.connect(path)
+        connection.execute("CREATE TABLE page_metrics (id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT NOT NULL, "
+                           "page_type TEXT NOT NULL, url TEXT, recorded_at REAL, ttfb_ms REAL, "
+                           "dom_content_loaded_ms REAL, load_ms REAL, lcp_ms REAL, cls REAL, "
+                           "js_heap_used_bytes INTEGER, resource_count INTEGER, resource_bytes INTEGER, raw TEXT)")
+        connection.execute("INSERT INTO page_metrics (run_id, page_type) VALUES ('old', 'home')")
+        connection.commit()
+        connection.close()
+        PageMetricsCollector.record({"page_type": "home", "emulation": "3g+cpu-4x"}, run="slow", db_path=path)
+        tags = {run: emulation for run, _, _, emulation in PageMetricsCollector.runs(path)}
+        assert tags == {"old": "none", "slow": "3g+cpu-4x"}
+
+    def test_invalid_profiles_fail_before_a_browser_starts(self, fake_driver, monkeypatch):
+        launched = []
+        monkeypatch.setattr(DriverFactory, "_create_driver", lambda browser=None: launched.append(fake_driver) or fake_driver)
+        monkeypatch.setattr(Config, "EMULATION", ["3g", "slow-4g"])
+        with pytest.raises(ValueError, match="two network profiles"):
+            DriverFactory.create_driver()
+        assert launched == []
+
+        # A driver that fails its set-up is quit, not leaked
+        monkeypatch.setattr(Config, "EMULATION", ["3g"])
+        quit_calls = []
+        monkeypatch.setattr(fake_driver, "quit", lambda: quit_calls.append(True))
+        monkeypatch.setattr(fake_driver, "set_page_load_timeout", lambda seconds: 1 / 0)
+        with pytest.raises(ZeroDivisionError):
+            DriverFactory.create_driver()
+        assert launched == [fake_driver] and quit_calls == [True]
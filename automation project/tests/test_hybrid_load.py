@@ -0,0 +1,63 @@
+"""
+Hybrid load tests: fake browsers plus HTTP users on one timeline
+"""
+
+from utils.fake_webdriver import FakeWebDriver, VirtualClock
+from utils.hybrid_load import HybridRunner, Timeline
+from utils.stand_in_site import StandInServer
+
+
+class VirtualTimeHybridRunner(HybridRunner):
+    """Browser users on the fake driver, with page-object sleeps on a virtual clock"""
+
+    def _browser_user(self, index):
+        with VirtualClock():
+            super()._browser_user(index)
+
+
+class TestHybridRunner:
+    """Browser and HTTP populations reporting into one timeline"""
+
+    def test_both_sources_share_the_timeline(self):
+        with StandInServer() as server:
+            runner = VirtualTimeHybridRunner(
+                server.base_url, browsers=2, create_driver=lambda: FakeWebDriver(server.site),
+                window_s=0.25, gauge_interval=0.05,
+                stages=[(0.3, 10), (0.3, 10), (0.1, 0)], think_time=(0.01, 0.02),
+            )
+            report = runner.run()
+        assert report["browser_errors"] == []
+        assert report["browser_iterations"] >= 2
+        assert report["http_summary"]["error_count"] == 0
+        assert set(report["browser"]) == set(report["http"])
+        assert any(row["http_users"] > 0 and row["browser_steps"] > 0 for row in report["windows"])
+        assert sum(row["n"] for row in report["browser_by_load"]) == sum(
+            stats["count"] - stats["errors"] for stats in report["browser"].values())
+
+    def test_browser_failures_are_reported(self):
+        def broken_driver():
+            raise RuntimeError("no browser here")
+
+        with StandInServer() as server:
+            report = HybridRunner(server.base_url, browsers=1, create_driver=broken_driver,
+                                  users=2, think_time=0).run()
+        assert report["browser_errors"] == ["browser 0: no browser here"]
+        assert report["http_summary"]["iterations_completed"] == 2
+
+
+class TestTimeline:
+    """Banding of browser samples by background load"""
+
+    def test_browser_latency_by_http_users(self):
+        timeline = Timeline()
+        timeline.gauge = [(0.0, 0), (1.0, 50), (2.0, 100)]
+        timeline.samples = [
+            {"t": 0.5, "source": "browser", "user": 0, "step": "open_home", "ms": 100.0, "ok": True, "error": None},
+            {"t": 2.5, "source": "browser", "user": 0, "step": "open_home", "ms": 300.0, "ok": True, "error": None},
+            {"t": 2.6, "source": "http", "user": 3, "step": "open_home", "ms": 5.0, "ok": True, "error": None},
+        ]
+        report = timeline.report(window_s=1.0)
+        assert [row["http_users"] for row in report["browser_by_load"]] == ["0-19", "100-119"]
+        assert report["browser_degradation"] == 3.0
+        assert [row["http_users"] for row in report["windows"]] == [0, 50, 100]
+        assert report["windows"][2]["http_steps"] == 1
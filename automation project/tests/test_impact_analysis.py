@@ -0,0 +1,85 @@
+"""
+Test impact analysis: recording executed units and selecting tests from a diff
+"""
+
+import subprocess
+import importlib.util
+import pytest
+from utils.test_impact import ImpactRecorder, changed_lines, changed_units, select_tests
+
+PAGE = '''from selenium.webdriver.common.by import By
+
+
+class CartPage:
+    CART_ICON = (By.CSS_SELECTOR, "a.cart")
+    CHECKOUT = (By.CSS_SELECTOR, "a.checkout")
+
+    def open_cart(self):
+        return self.CART_ICON
+
+    def checkout(self):
+        return self.CHECKOUT
+'''
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "pages").mkdir()
+    (tmp_path / "pages" / "impact_cart.py").write_text(PAGE)
+    return tmp_path
+
+
+class TestImpactMapping:
+    """Changed lines mapped to the functions and locators that use them"""
+
+    def test_changed_lines_become_units(self, project):
+        units, files, tests = changed_units({"pages/impact_cart.py": {9}, "tests/test_cart.py": {3}}, project)
+        assert units == {"pages/impact_cart.py::CartPage.open_cart"} and not files
+        assert tests == {"tests/test_cart.py"}
+
+    def test_changed_locator_selects_its_readers(self, project):
+        units, files, _ = changed_units({"pages/impact_cart.py": {6}}, project)
+        assert units == {"pages/impact_cart.py::CartPage.checkout"} and not files
+        assert changed_units({"pages/impact_cart.py": {1}}, project)[1] == {"pages/impact_cart.py"}
+        assert changed_units({"conftest.py": {1}}, project) is None
+        assert changed_units({"README.md": {1}, "reports/impact_map.json": None}, project) == (set(), set(), set())
+
+    def test_selection(self, project):
+        impact_map = {"tests": {
+            "tests/test_cart.py::test_open": ["pages/impact_cart.py::CartPage.open_cart"],
+            "tests/test_cart.py::test_checkout": ["pages/impact_cart.py::CartPage.checkout"],
+            "tests/test_flow.py::test_flow": [],
+        }}
+        nodeids = list(impact_map["tests"]) + ["tests/test_new.py::test_new"]
+        selected, reasons = select_tests(nodeids, impact_map, {"pages/impact_cart.py": {6}},
+                                         safety=["tests/test_flow.py"], root=project)
+        assert selected == ["tests/test_cart.py::test_checkout", "tests/test_flow.py::test_flow",
+                            "tests/test_new.py::test_new"]
+        assert reasons["tests/test_new.py::test_new"] == "not in impact map"
+        assert select_tests(nodeids, None, {}, root=project)[0] == nodeids
+
+    def test_recorder_maps_tests_to_executed_units(self, project):
+        spec = importlib.util.spec_from_file_location("impact_cart", project / "pages" / "impact_cart.py")
+        module = importlib.util.module_from_spec(spec)
+        recorder = ImpactRecorder(root=project, path=project / "impact_map.json", sources=("pages",))
+        recorder.nodeids = ["tests/test_cart.py::test_open"]
+        recorder.coverage.start()
+        try:
+            spec.loader.exec_module(module)
+            recorder.coverage.switch_context("tests/test_cart.py::test_open")
+            module.CartPage().open_cart()
+            recorder.coverage.switch_context("")
+            module.CartPage().checkout()
+        finally:
+            recorder.coverage.stop()
+        tests = recorder.build(recorder.coverage.get_data())
+        assert tests == {"tests/test_cart.py::test_open": ["pages/impact_cart.py::CartPage.open_cart"]}
+
+    def test_changed_lines_from_git(self, project):
+        git = ["git", "-c", "user.email=ci@example.com", "-c", "user.name=ci"]
+        subprocess.run(git + ["init", "-q"], cwd=project, check=True)
+        subprocess.run(git + ["add", "."], cwd=project, check=True)
+        subprocess.run(git + ["commit", "-qm", "base"], cwd=project, check=True)
+        (project / "pages" / "impact_cart.py").write_text(PAGE.replace('"a.checkout"', '"button.checkout"'))
+        (project / "pages" / "impact_new.py").write_text("X = 1\n")
+        assert changed_lines("HEAD", project) == {"pages/impact_cart.py": {6}, "pages/impact_new.py": None}
@@ -0,0 +1,65 @@
+"""
+HTTP load generator tests against the local stand-in server
+"""
+
+import pytest
+from utils.load_generator import LoadRunner, histogram, parse_stages, target_users
+from utils.shopping_flow import ShoppingFlow
+from utils.stand_in_site import StandInServer, StandInSite
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    with StandInServer() as server:
+        yield server
+
+
+class TestLoadRunner:
+    """Virtual users replaying the 8-step flow over HTTP"""
+
+    def test_concurrent_users_complete_the_flow(self, stand_in):
+        result = LoadRunner(stand_in.base_url, users=25, ramp_up=0.2, iterations=2, think_time=0).run()
+        assert result["users_started"] == 25
+        assert result["error_count"] == 0, result["errors"]
+        assert result["iterations_completed"] == 50
+        assert list(result["steps"]) == [name for name, _ in ShoppingFlow.STEPS]
+        for stats in result["steps"].values():
+            assert stats["count"] == 50
+            assert stats["p50"] <= stats["p95"] <= stats["p99"] <= stats["max"]
+            assert sum(stats["histogram"].values()) == 50
+
+    def test_failures_are_counted_per_step(self):
+        site = StandInSite(accounts={"someone@example.com": "secret"})
+        with StandInServer(site) as server:
+            result = LoadRunner(server.base_url, users=3, think_time=0).run()
+        assert result["steps"]["sign_in"]["errors"] == 3
+        assert "search_laptop" not in result["steps"]
+        assert result["error_rate"] == 0.5
+
+    def test_stages_hold_then_stop(self, stand_in):
+        result = LoadRunner(stand_in.base_url, stages=[(0.2, 4), (0.5, 4), (0.1, 0)],
+                            think_time=(0.01, 0.02), seed=3).run()
+        assert result["users_started"] == 4
+        assert result["error_count"] == 0
+        assert 0.7 <= result["elapsed_s"] < 5
+
+
+class TestLoadProfile:
+    """Ramp profile and histogram helpers"""
+
+    def test_target_users_interpolates_stages(self):
+        stages = parse_stages("10:100, 20:100, 10:0")
+        assert stages == [(10.0, 100), (20.0, 100), (10.0, 0)]
+        assert target_users(stages, 0) == 0
+        assert target_users(stages, 5) == 50
+        assert target_users(stages, 25) == 100
+        assert target_users(stages, 35) == 50
+        assert target_users(stages, 60) == 0
+        assert target_users([(0, 20)], 0) == 20
+
+    def test_histogram_buckets(self):
+        counts = histogram([1, 5, 6, 30, 9000])
+        assert counts["<=5"] == 2
+        assert counts["<=10"] == 1
+        assert counts["<=50"] == 1
+        assert counts[">5000"] == 1
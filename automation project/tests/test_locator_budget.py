@@ -0,0 +1,75 @@
+"""
+Locator cost gate for every page object: per-page budgets, full scans and the static cost model
+
+The millisecond budgets depend on the machine, so audit_locators.py enforces
+them; here costs come from the locators' shape, counted in full document scans.
+"""
+
+import pytest
+from selenium.webdriver.common.by import By
+from utils.locator_engine import load_snapshots, page_object_classes
+from utils.locator_audit import LocatorAudit, xpath_to_css, tighten_css, scan_flags, static_cost
+
+# Most one locator, and a page's locators together, may cost in full document scans (static model)
+MAX_LOCATOR_COST = 2
+MAX_PAGE_COST = 20
+
+
+@pytest.fixture(scope="module")
+def audit_report():
+    # Nothing here depends on the timings, so one evaluation each is enough
+    return LocatorAudit(load_snapshots(include_stand_in=True), repeat=1, confirm_runs=0).run()
+
+
+class TestLocatorBudget:
+    """Page objects declare their own LOCATOR_BUDGET_MS and stay cheap next to a full document scan"""
+
+    def test_every_page_object_is_audited(self, audit_report):
+        assert {page["page"] for page in audit_report} == {cls.__name__ for cls in page_object_classes()}
+
+    def test_every_page_object_declares_its_budget(self):
+        assert [cls.__name__ for cls in page_object_classes() if "LOCATOR_BUDGET_MS" not in vars(cls)] == []
+
+    def test_no_locator_matches_any_element(self, audit_report):
+        any_element = [entry["name"] for page in audit_report for entry in page["locators"]
+                       if "full_scan_any_element" in entry["flags"]]
+        assert any_element == []
+
+    @pytest.mark.parametrize("page_name", [cls.__name__ for cls in page_object_classes()])
+    def test_page_object_static_cost(self, audit_report, page_name):
+        page = next(page for page in audit_report if page["page"] == page_name)
+        costly = [(entry["name"], entry["static_cost"]) for entry in page["locators"]
+                  if entry["static_cost"] > MAX_LOCATOR_COST]
+        assert costly == [], f"Locators costing more than {MAX_LOCATOR_COST} full document scans"
+        assert page["static_cost"] <= MAX_PAGE_COST, (
+            f"{page_name} locators cost {page['static_cost']} full document scans (at most {MAX_PAGE_COST})"
+        )
+
+
+class TestCssProposals:
+    """XPath to CSS translation used for proposals"""
+
+    def test_alternatives_become_selector_list(self):
+        css = xpath_to_css("//span[contains(@class, 'price') or contains(@class, 'cost')]")
+        assert css == "span[class*='price'], span[class*='cost']"
+        assert tighten_css(css) == "span.price, span.cost"
+
+    def test_nested_steps_and_attribute_equality(self):
+        assert xpath_to_css("//div[contains(@class, 'color')]//button") == "div[class*='color'] button"
+        assert xpath_to_css("//input[@type='number' and @name='qty']") == "input[type='number'][name='qty']"
+
+    def test_text_predicates_are_not_translated(self):
+        assert xpath_to_css("//button[contains(text(), 'Remove') or contains(@class, 'remove')]") is None
+        assert xpath_to_css("//h3[contains(text(), 'x')]//parent::a") is None
+
+    def test_static_cost_counts_document_scans(self):
+        assert static_cost((By.XPATH, "//div[contains(@class, 'color')]//button")) == 2
+        assert static_cost((By.XPATH, "//button[contains(text(), 'Remove') or @type='submit']")) == 2
+        assert static_cost((By.XPATH, ".//h2 | .//h3")) == 0
+        assert static_cost((By.XPATH, "//h3[contains(text(), 'x')]//parent::a")) == 3
+        assert static_cost((By.CSS_SELECTOR, "div.color button")) == 1
+
+    def test_flags_descendant_scans(self):
+        flags = scan_flags((By.XPATH, "//div[contains(@class, 'color')]//button"))
+        assert "full_scan" in flags and "nested_descendant_scan" in flags
+        assert scan_flags((By.CSS_SELECTOR, "div.color button")) == []
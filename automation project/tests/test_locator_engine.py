@@ -0,0 +1,53 @@
+"""
+Offline locator engine tests against stand-in snapshots
+"""
+
+from selenium.webdriver.common.by import By
+from pages.cart_page import CartPage
+from pages.login_page import LoginPage
+from utils.locator_engine import SnapshotDocument, LocatorEngine, collect_locators
+from utils.stand_in_site import StandInSite
+
+
+class TestLocatorEngine:
+    """Locator evaluation without a browser"""
+
+    def setup_method(self):
+        self.snapshots = StandInSite().snapshots()
+
+    def test_counts_first_match_and_ambiguity(self):
+        document = SnapshotDocument(self.snapshots["cart"], name="cart")
+        result = document.evaluate(CartPage.CART_ITEMS)
+        assert result.count == 2
+        assert result.ambiguous
+        assert result.first["tag"] == "div"
+        assert "Dell Latitude 7490" in result.first["text"]
+
+    def test_supports_selenium_strategies(self):
+        document = SnapshotDocument(self.snapshots["login"], name="login")
+        assert document.evaluate((By.ID, "email")).count == 1
+        assert document.evaluate((By.NAME, "password")).count == 1
+        assert document.evaluate((By.CSS_SELECTOR, "form.login-form button[type='submit']")).count == 1
+        assert document.evaluate((By.LINK_TEXT, "Sign In")).count == 1
+        assert document.evaluate((By.XPATH, "//input[@type='email'")).error
+
+    def test_fallback_list_resolves_first_matching_entry(self):
+        document = SnapshotDocument(self.snapshots["home"], name="home")
+        resolved, results = document.evaluate_fallbacks(LoginPage.LOGIN_STRATEGIES)
+        assert resolved is None
+        document = SnapshotDocument(self.snapshots["login"], name="login")
+        resolved, results = document.evaluate_fallbacks(LoginPage.LOGIN_STRATEGIES)
+        assert resolved == 0
+        assert [result.count for result in results] == [1, 1, 1]
+
+    def test_collects_page_object_locators(self):
+        single, fallbacks = collect_locators()
+        assert single["CartPage.CART_ITEMS"] == CartPage.CART_ITEMS
+        assert fallbacks["LoginPage.LOGIN_STRATEGIES"] == LoginPage.LOGIN_STRATEGIES
+
+    def test_report_covers_every_snapshot(self):
+        documents = [SnapshotDocument(markup, name=name) for name, markup in self.snapshots.items()]
+        report = LocatorEngine(documents).evaluate_all(["//h1"])
+        assert [snapshot["snapshot"] for snapshot in report] == list(self.snapshots)
+        adhoc = next(result for result in report[0]["locators"] if result["name"] == "adhoc[0]")
+        assert adhoc["count"] == 1
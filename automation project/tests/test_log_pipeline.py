@@ -0,0 +1,119 @@
+"""
+Logging pipeline: JSON lines with test context, per-worker rotation, the merged log and run pruning
+"""
+
+import os
+import json
+import logging
+import pytest
+from utils.log_pipeline import LogContext, LogPipeline
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    """The pipeline restarted into tmp_path as run "run-1"; the session's own pipeline resumes afterwards"""
+    LogPipeline.stop()
+    monkeypatch.setenv("TEST_RUN_ID", "run-1")
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+    yield tmp_path
+    LogPipeline.stop()
+    monkeypatch.undo()
+    LogPipeline.start()
+
+
+def read(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def entry(ts, worker, message, **fields):
+    return json.dumps({"ts": ts, "level": "INFO", "worker_id": worker, "test_id": None, "step": None,
+                       "message": message, **fields}) + "\n"
+
+
+class TestLogPipeline:
+    """Records keep their context and traceback, workers rotate apart and merge back in time order"""
+
+    def test_records_carry_the_test_context_and_the_traceback(self, log_dir):
+        LogPipeline.start(log_dir, console=False)
+        LogContext.begin_test("tests/test_cart.py::test_add")
+        try:
+            logging.info("Step 3: Adding laptop to cart")
+            try:
+                raise ValueError("add-to-cart button not found")
+            except ValueError:
+                logging.exception("Add to cart failed")
+        finally:
+            LogContext.end_test()
+        LogPipeline.stop()
+
+        step, failure = read(log_dir / "run-1" / "test_execution.gw0.jsonl")
+        assert step["test_id"] == "tests/test_cart.py::test_add" and step["step"] == 3
+        assert step["worker_id"] == "gw0" and step["level"] == "INFO" and step["elapsed_ms"] >= 0
+        assert "exception" not in step
+        assert failure["message"] == "Add to cart failed" and failure["level"] == "ERROR" and failure["step"] == 3
+        assert failure["exception"].startswith("Traceback")
+        assert failure["exception"].endswith("ValueError: add-to-cart button not found")
+
+    def test_each_worker_rotates_its_own_file(self, log_dir, monkeypatch):
+        for worker in ("gw0", "gw1"):
+            monkeypatch.setenv("PYTEST_XDIST_WORKER", worker)
+            LogPipeline.start(log_dir, console=False, max_bytes=400, backup_count=5)
+            for number in range(4):
+                logging.info(f"{worker} record {number}")
+            LogPipeline.stop()
+
+        run_dir = log_dir / "run-1"
+        for worker in ("gw0", "gw1"):
+            assert (run_dir / f"test_execution.{worker}.jsonl.1").exists()
+            assert all(record["worker_id"] == worker for path in run_dir.glob(f"test_execution.{worker}.*")
+                       for record in read(path))
+
+        assert LogPipeline.merge_worker_logs(log_dir) == 8
+        merged = [record["message"] for record in read(run_dir / "test_execution.jsonl")]
+        assert merged == [f"{worker} record {number}" for worker in ("gw0", "gw1") for number in range(4)]
+        assert len((run_dir / "test_execution.log").read_text(encoding="utf-8").splitlines()) == 8
+
+    def test_handlers_the_pipeline_did_not_install_stay_attached(self, log_dir):
+        own = logging.NullHandler()
+        root = logging.getLogger()
+        root.addHandler(own)
+        try:
+            queue_handler = LogPipeline.start(log_dir, console=False)
+            assert own in root.handlers and queue_handler in root.handlers
+            LogPipeline.stop()
+            assert own in root.handlers and queue_handler not in root.handlers
+        finally:
+            root.removeHandler(own)
+
+    def test_console_output_is_written_by_the_logging_thread(self, log_dir, capsys):
+        LogPipeline.start(log_dir)
+        logging.info("Step 5: Opening cart")
+        # Written before the call returns, so pytest captures it with the test that logged it
+        assert capsys.readouterr().err.endswith(" - INFO - [gw0] Step 5: Opening cart\n")
+        LogPipeline.stop()
+        logging.info("after stop")
+        assert "after stop" not in capsys.readouterr().err
+
+    def test_merge_interleaves_the_workers_by_time(self, log_dir):
+        run_dir = log_dir / "run-1"
+        run_dir.mkdir()
+        (run_dir / "test_execution.gw0.jsonl.1").write_text(entry(1.0, "gw0", "first"), encoding="utf-8")
+        (run_dir / "test_execution.gw0.jsonl").write_text(entry(3.0, "gw0", "third") + "not json\n", encoding="utf-8")
+        (run_dir / "test_execution.gw1.jsonl").write_text(
+            entry(2.0, "gw1", "second", test_id="t.py::test_a", step=2, exception="Traceback: boom"), encoding="utf-8")
+
+        text = log_dir / "merged.log"
+        assert LogPipeline.merge_worker_logs(log_dir, text_output=text) == 3
+        assert [record["ts"] for record in read(run_dir / "test_execution.jsonl")] == [1.0, 2.0, 3.0]
+        lines = text.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 4 and lines[1].endswith(" - INFO - [gw1 t.py::test_a step=2] second")
+        assert lines[2] == "Traceback: boom" and lines[3].endswith("[gw0] third")
+
+    def test_prune_keeps_the_newest_runs(self, tmp_path):
+        for mtime, name in [(1000, "run-c"), (900, "run-b"), (800, "run-a")]:
+            (tmp_path / name).mkdir()
+            os.utime(tmp_path / name, (mtime, mtime))
+        (tmp_path / "test_execution.log").write_text("", encoding="utf-8")
+
+        LogPipeline.prune_runs(tmp_path, keep=2)
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["run-b", "run-c", "test_execution.log"]
@@ -0,0 +1,108 @@
+"""
+Overlay guard: installation per document and its dismissal log
+"""
+
+import json
+import shutil
+import subprocess
+import pytest
+from config.config import Config
+from pages.base_page import BasePage
+from utils.overlay_guard import GENERIC_GUARD_SCRIPT, GUARD_RULES, GUARD_SCRIPT, LOG_KEY, OverlayGuard
+
+# Minimal DOM for running the guard script under node: a cookie banner, a dialog the
+# test opened on purpose and its backdrop
+DOM_HARNESS = """
+const store = {};
+global.sessionStorage = {getItem: k => store[k] || null, setItem: (k, v) => { store[k] = v; }};
+global.location = {href: 'https://stand-in.local/'};
+const observers = [];
+const clicked = [];
+const box = () => ({width: 300, height: 200});
+const overlay = (name, closable) => ({style: {setProperty(property, value) { this.display = value; }},
+                                      getBoundingClientRect: box,
+                                      querySelector: () => closable ? {click: () => clicked.push(name)} : null});
+const backdrop = overlay('backdrop', false);
+let open = [];
+global.document = {readyState: 'complete', addEventListener() {},
+                   querySelectorAll: selector => open.filter(o => selector.includes(o.match)).map(o => o.el)};
+global.window = {getComputedStyle: () => ({visibility: 'visible', display: 'block'})};
+global.MutationObserver = class { constructor(callback) { observers.push(callback); } observe() {} };
+const guard = require('fs').readFileSync(0, 'utf8');
+eval(guard);
+open = [{match: '#onetrust-banner-sdk', el: overlay('cookie-banner', true)},
+        {match: '.modal.show', el: overlay('modal', true)}, {match: '.modal-backdrop', el: backdrop}];
+observers.forEach(callback => callback());
+setTimeout(() => {
+    eval(guard);
+    console.log(JSON.stringify({clicked, backdrop: backdrop.style.display || null, observers: observers.length,
+                                log: JSON.parse(store[%s])}));
+}, 10);
+""" % json.dumps(LOG_KEY)
+
+
+def run_guard(script):
+    """What the guard script dismissed in DOM_HARNESS"""
+    result = subprocess.run(["node", "-e", DOM_HARNESS], input=script, capture_output=True,
+                            text=True, timeout=30, check=True)
+    return json.loads(result.stdout)
+
+
+class ChromiumStub:
+    """Records CDP commands and scripts"""
+
+    def __init__(self):
+        self.cdp = []
+        self.scripts = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if "sessionStorage.getItem" in script:
+            return json.dumps([{"rule": "cookie-banner", "action": "clicked", "url": "https://x/", "at": 1}])
+
+
+class TestOverlayGuard:
+    """Registered once per document on Chromium, injected per navigation elsewhere"""
+
+    def test_chromium_registers_for_new_documents(self):
+        driver = ChromiumStub()
+        OverlayGuard.install(driver)
+        assert driver.cdp == [("Page.addScriptToEvaluateOnNewDocument", {"source": GUARD_SCRIPT})]
+        assert driver.scripts == [GUARD_SCRIPT]
+        assert OverlayGuard.ensure(driver) is False
+        assert OverlayGuard.read_log(driver)[0]["rule"] == "cookie-banner"
+
+    def test_other_browsers_get_it_after_each_navigation(self, fake_driver):
+        OverlayGuard.install(fake_driver)
+        assert fake_driver.overlay_guard == "inject"
+        injected = []
+        execute_script = fake_driver.execute_script
+        fake_driver.execute_script = lambda script, *args: injected.append(script) or execute_script(script, *args)
+        BasePage(fake_driver).navigate_to(fake_driver.base_url)
+        assert GUARD_SCRIPT in injected
+        assert OverlayGuard.read_log(fake_driver) == []
+
+    def test_generic_rules_are_opt_in(self, monkeypatch):
+        monkeypatch.setattr(Config, "OVERLAY_GUARD_GENERIC", True)
+        driver = ChromiumStub()
+        OverlayGuard.install(driver)
+        assert driver.cdp == [("Page.addScriptToEvaluateOnNewDocument", {"source": GENERIC_GUARD_SCRIPT})]
+        assert {rule["name"] for rule in GUARD_RULES} == {"cookie-banner", "newsletter", "promo"}
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+    def test_script_dismisses_overlays_as_they_appear(self):
+        outcome = run_guard(GUARD_SCRIPT)
+        # The dialog and its backdrop are the page's own and stay open
+        assert outcome["clicked"] == ["cookie-banner"] and outcome["backdrop"] is None
+        assert outcome["observers"] == 1, "re-injecting must not install a second observer"
+        assert [(entry["rule"], entry["action"]) for entry in outcome["log"]] == [("cookie-banner", "clicked")]
+
+    @pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+    def test_generic_script_also_closes_dialogs_and_backdrops(self):
+        outcome = run_guard(GENERIC_GUARD_SCRIPT)
+        assert outcome["clicked"] == ["cookie-banner", "modal"] and outcome["backdrop"] == "none"
+        assert [(entry["rule"], entry["action"]) for entry in outcome["log"]] == [
+            ("cookie-banner", "clicked"), ("modal", "clicked"), ("backdrop", "hidden")]
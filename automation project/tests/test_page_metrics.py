@@ -0,0 +1,113 @@
+"""
+Page metrics: collection after a navigation, the SQLite history and the compare command line
+"""
+
+import sqlite3
+import pytest
+from config.config import Config
+from utils.page_metrics import METRICS_SCRIPT, PageMetricsCollector, classify_page, main
+
+
+def page_metrics(url, time_origin, ttfb_ms=40.0, load_ms=900.0, lcp_ms=1200.0, resources=12):
+    """What METRICS_SCRIPT reports for one document"""
+    return {
+        "url": url, "time_origin": time_origin,
+        "navigation": {"type": "navigate", "ttfb_ms": ttfb_ms, "dom_content_loaded_ms": load_ms / 2,
+                       "load_ms": load_ms, "transfer_bytes": 5000},
+        "resources": {"count": resources, "transfer_bytes": resources * 1000, "by_type": {}, "slowest": []},
+        "lcp_ms": lcp_ms, "cls": 0.02,
+        "js_heap": {"used_bytes": 8000000, "total_bytes": 12000000},
+    }
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """A collector writing into a fresh database under tmp_path"""
+    path = tmp_path / "page_metrics.db"
+    monkeypatch.setattr(PageMetricsCollector, "db_path", path)
+    monkeypatch.setattr(Config, "COLLECT_PAGE_METRICS", True)
+    return path
+
+
+class TestPageMetrics:
+    """One row per document, medians per page type, and run comparison from the command line"""
+
+    def test_collect_records_each_document_once(self, fake_driver, history, monkeypatch):
+        documents = {"count": 0}
+
+        def read_metrics(script, *args):
+            assert script == METRICS_SCRIPT
+            return page_metrics(fake_driver.current_url, time_origin=1000.0 + documents["count"])
+
+        monkeypatch.setattr(fake_driver, "execute_async_script", read_metrics)
+        monkeypatch.setenv("TEST_RUN_ID", "run-a")
+        fake_driver.get(fake_driver.base_url + "/cart")
+        metrics = PageMetricsCollector.collect(fake_driver)
+        assert metrics["page_type"] == "cart" and metrics["emulation"] == "none"
+        # navigate_to and wait_for_page_load both report the same document
+        assert PageMetricsCollector.collect(fake_driver) is None
+        documents["count"] += 1
+        assert PageMetricsCollector.collect(fake_driver, page_type="checkout")["page_type"] == "checkout"
+        # The setting is read on each call, so --set and profiles apply
+        monkeypatch.setattr(Config, "COLLECT_PAGE_METRICS", False)
+        documents["count"] += 1
+        assert PageMetricsCollector.collect(fake_driver) is None
+
+        connection = sqlite3.connect(history)
+        rows = connection.execute("SELECT run_id, page_type, ttfb_ms, load_ms, lcp_ms, js_heap_used_bytes, "
+                                  "resource_count, resource_bytes, emulation FROM page_metrics").fetchall()
+        connection.close()
+        assert rows == [("run-a", "cart", 40.0, 900.0, 1200.0, 8000000, 12, 12000, "none"),
+                        ("run-a", "checkout", 40.0, 900.0, 1200.0, 8000000, 12, 12000, "none")]
+
+    def test_collect_never_raises(self, fake_driver, history, monkeypatch):
+        # The fake driver runs no page scripts, so there is nothing to record
+        assert PageMetricsCollector.collect(fake_driver) is None
+
+        def broken(script, *args):
+            raise RuntimeError("script timeout")
+
+        monkeypatch.setattr(fake_driver, "execute_async_script", broken)
+        assert PageMetricsCollector.collect(fake_driver) is None
+        assert PageMetricsCollector.runs() == []
+
+    def test_history_summarises_runs_by_page_type(self, history):
+        for ttfb_ms in (30.0, 50.0, 70.0):
+            PageMetricsCollector.record({**page_metrics("/search?q=dell", 1.0, ttfb_ms=ttfb_ms),
+                                         "page_type": "search"}, run="run-a")
+        PageMetricsCollector.record({**page_metrics("/product/dell", 2.0, lcp_ms=None),
+                                     "page_type": "product"}, run="run-a")
+        PageMetricsCollector.record({**page_metrics("/search?q=dell", 3.0, ttfb_ms=90.0),
+                                     "page_type": "search", "emulation": "slow-4g"}, run="run-b")
+
+        assert [(run, count, emulation) for run, _, count, emulation in PageMetricsCollector.runs()] == [
+            ("run-b", 1, "slow-4g"), ("run-a", 4, "none")]
+        summary = PageMetricsCollector.summary("run-a")
+        assert summary["search"]["samples"] == 3 and summary["search"]["ttfb_ms"] == 50.0
+        assert summary["product"]["lcp_ms"] is None and summary["product"]["load_ms"] == 900.0
+
+        comparison = PageMetricsCollector.compare("run-a", "run-b")
+        assert comparison["search"]["ttfb_ms"] == (50.0, 90.0, 40.0)
+        assert comparison["product"]["samples"] == (1, None, None)
+
+    def test_compare_command_resolves_run_aliases(self, history, capsys):
+        with pytest.raises(SystemExit, match="No previous run recorded"):
+            main(["--db", str(history), "compare", "previous", "latest"])
+        PageMetricsCollector.record({**page_metrics("/cart", 1.0, load_ms=800.0), "page_type": "cart"}, run="run-a")
+        PageMetricsCollector.record({**page_metrics("/cart", 2.0, load_ms=1100.0), "page_type": "cart"}, run="run-b")
+
+        assert main(["--db", str(history), "compare", "previous", "latest"]) == 0
+        output = capsys.readouterr().out
+        assert output.startswith("Comparing run-a (a) -> run-b (b)")
+        load = next(line.split() for line in output.splitlines() if line.strip().startswith("load_ms"))
+        assert load == ["load_ms", "800.0", "1100.0", "300.0"]
+
+        assert main(["--db", str(history), "runs"]) == 0
+        assert [line.split()[0] for line in capsys.readouterr().out.splitlines()] == ["run-b", "run-a"]
+
+    def test_urls_map_to_page_types(self):
+        assert classify_page("https://cartlow.com/uae/en/") == "home"
+        assert classify_page("https://cartlow.com/uae/en/search?q=dell") == "search"
+        assert classify_page("https://cartlow.com/uae/en/product/dell-latitude-7490") == "product"
+        assert classify_page("https://cartlow.com/uae/en/login") == "login"
+        assert classify_page("https://cartlow.com/uae/en/about-us") == "other"
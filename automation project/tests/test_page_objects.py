@@ -0,0 +1,210 @@
+"""
+Page-object unit tests on the in-process fake WebDriver
+"""
+
+import pytest
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from config.config import Config
+from pages.homepage import HomePage
+from pages.login_page import LoginPage
+from pages.product_page import ProductPage
+from pages.cart_page import CartPage
+from pages.search_results_page import SCAN_SCRIPT, SearchResultsPage
+from utils.fake_webdriver import FakeWebDriver, VirtualClock
+from utils.shopping_flow import ShoppingFlow
+from utils.test_helpers import TestHelpers
+from utils.stand_in_site import StandInSite
+
+WATCH_SLUG = StandInSite().by_id["2001"]["slug"]
+
+
+class TestFakeWebDriver:
+    """Selenium surface implemented on the parsed DOM"""
+
+    def test_text_is_a_property_of_visible_text(self, fake_driver):
+        fake_driver.get("/login")
+        form = fake_driver.find_element(By.CSS_SELECTOR, "form.login-form")
+        assert form.text == "Login"
+        assert fake_driver.find_element(By.NAME, "email").text == ""
+        assert fake_driver.title == "Sign In | Cartlow"
+
+    def test_typing_keeps_form_state_and_enter_submits(self, fake_driver):
+        fake_driver.get("/")
+        search_box = fake_driver.find_element(By.NAME, "q")
+        search_box.send_keys("Dell Latitu", Keys.BACKSPACE, "ude")
+        assert search_box.get_attribute("value") == "Dell Latitude"
+        search_box.send_keys(Keys.ENTER)
+        assert fake_driver.current_url.endswith("/search?q=Dell+Latitude")
+
+    def test_elements_go_stale_after_navigation(self, fake_driver):
+        fake_driver.get("/")
+        cart_link = fake_driver.find_element(By.CSS_SELECTOR, "a.cart-link")
+        cart_link.click()
+        assert fake_driver.current_url.endswith("/cart")
+        with pytest.raises(StaleElementReferenceException):
+            cart_link.text
+        with pytest.raises(NoSuchElementException):
+            fake_driver.find_element(By.ID, "missing")
+
+    def test_windows_history_and_cookies(self, fake_driver):
+        fake_driver.get("/")
+        fake_driver.get("/cart")
+        fake_driver.back()
+        assert fake_driver.current_url.endswith("/")
+        fake_driver.execute_script("window.open('/login')")
+        assert len(fake_driver.window_handles) == 2
+        fake_driver.switch_to.window(fake_driver.window_handles[1])
+        assert fake_driver.current_url.endswith("/login")
+        assert fake_driver.get_cookie("cartlow_session")
+        assert fake_driver.execute_script("return document.readyState") == "complete"
+
+    def test_static_snapshot(self):
+        driver = FakeWebDriver.from_snapshot(StandInSite().snapshots()["search"])
+        assert HomePage(driver).is_homepage_loaded()
+        assert len(driver.find_elements(By.CSS_SELECTOR, "div.product-card")) >= 1
+
+
+class TestLoginPage:
+    """LoginPage against the stand-in login form"""
+
+    def test_login_opens_form_and_submits(self, fake_driver):
+        fake_driver.get("/")
+        login_page = LoginPage(fake_driver)
+        assert not login_page.is_logged_in()
+        assert login_page.login("user@example.com", "secret")
+        assert login_page.is_logged_in()
+
+    def test_rejected_credentials_show_error(self):
+        driver = FakeWebDriver(StandInSite(accounts={"user@example.com": "secret"}))
+        with VirtualClock():
+            driver.get("/")
+            login_page = LoginPage(driver)
+            assert login_page.login("user@example.com", "wrong")
+            assert not login_page.is_logged_in()
+            assert login_page.get_error_message() == "Invalid email or password"
+
+
+class TestProductPage:
+    """Option selection, quantity and add to cart"""
+
+    def test_configure_and_add_to_cart(self, fake_driver):
+        fake_driver.get(f"/product/{WATCH_SLUG}")
+        product_page = ProductPage(fake_driver)
+        assert "Apple Watch Series 6" in product_page.get_product_title()
+        assert product_page.configure_and_add_to_cart(
+            quantity=2, color=Config.WATCH_COLOR, size=Config.WATCH_SIZE,
+            connectivity=Config.WATCH_CONNECTIVITY
+        )
+        assert product_page.get_cart_count() == 2
+        cart_page = CartPage(fake_driver)
+        fake_driver.get("/cart")
+        variant = fake_driver.find_element(By.CSS_SELECTOR, "div.cart-item span.variant").text
+        assert variant == f"{Config.WATCH_CONNECTIVITY}, {Config.WATCH_COLOR}, {Config.WATCH_SIZE}"
+        assert cart_page.get_cart_item_count() == 1
+
+    def test_missing_option_is_reported(self, fake_driver):
+        fake_driver.get(f"/product/{WATCH_SLUG}")
+        assert not ProductPage(fake_driver).select_color("Purple")
+
+
+class TestSearchResultsPage:
+    """Result cards read and ranked against the wanted product"""
+
+    def test_results_are_extracted_with_their_fields(self, fake_driver):
+        fake_driver.get("/search?q=Dell+Latitude")
+        results = SearchResultsPage(fake_driver).get_results()
+        assert [result["title"][:18] for result in results] == ["Dell Latitude 7490", "Dell Latitude 5490"]
+        assert results[0]["url"].endswith(f"/product/{StandInSite().by_id['1001']['slug']}")
+        assert results[0]["price_value"] == 1899.0 and results[0]["availability"] == "In stock"
+
+    def test_best_match_survives_quotes_and_rejects_other_models(self, fake_driver):
+        fake_driver.get("/search?q=Dell+Latitude")
+        page = SearchResultsPage(fake_driver)
+        best, score = page.find_best_match(Config.LAPTOP_NAME.replace("Display,", "Display -"))
+        assert best["title"] == Config.LAPTOP_NAME and score > 0.9
+        assert page.find_best_match("Dell Latitude 7480")[0] is None
+        TestHelpers.find_product_by_name(fake_driver, "Dell Latitude 5490").click()
+        assert "5490" in fake_driver.title
+
+    def test_scan_reads_each_card_once_through_an_infinite_scroll_list(self, fake_driver):
+        fake_driver.site = StandInSite(extra_results=3000, listing="scroll")
+        target = fake_driver.site.search("refurbished")[2997]
+        fake_driver.get("/search?q=refurbished")
+        read = []
+        execute_script = fake_driver.execute_script
+
+        def counting(script, *args):
+            batch = execute_script(script, *args)
+            if script == SCAN_SCRIPT:
+                read.extend(result["url"] for result in batch["results"])
+            return batch
+        fake_driver.execute_script = counting
+        page = SearchResultsPage(fake_driver)
+        best, score = page.scan_for(target["name"], max_results=5000)
+        assert best["url"].endswith(target["slug"]) and score == 1.0
+        assert len(read) == len(set(read)) == page.last_scan["scanned"] == 3000
+        assert page.last_scan["rounds"] == 125 and page.last_scan["cards_per_second"] > 0
+        assert page.scan_for("Dell XPS 13", max_results=100)[0] is None
+        assert page.last_scan["outcome"] == "limit"
+
+    def test_scan_follows_next_page_links(self, fake_driver):
+        fake_driver.site = StandInSite(extra_results=100, listing="pages", page_size=10)
+        target = fake_driver.site.search("refurbished")[99]
+        fake_driver.get("/search?q=refurbished")
+        page = SearchResultsPage(fake_driver)
+        best, _ = page.scan_for(target["name"])
+        best["element"].click()
+        assert target["name"] in fake_driver.title
+        assert page.last_scan["pages"] == 10 and page.last_scan["scanned"] == 100
+
+    def test_scripts_that_return_nothing_are_errors(self, fake_driver, monkeypatch):
+        fake_driver.get("/search?q=Dell+Latitude")
+        monkeypatch.setattr(fake_driver, "execute_script", lambda script, *args: None)
+        page = SearchResultsPage(fake_driver)
+        assert page.get_results() == []
+        assert page.scan_for("Dell Latitude 7490") == (None, 0.0)
+        assert page.last_scan["outcome"] == "error" and page.last_scan["rounds"] == 0
+
+
+class TestCartPage:
+    """Cart listing, quantity update and removal"""
+
+    def _fill_cart(self, driver):
+        flow = ShoppingFlow(driver, base_url=driver.base_url, email="user@example.com", password="secret")
+        results = flow.run()
+        assert all(result["passed"] for result in results), results
+        return CartPage(driver)
+
+    def test_full_flow_fills_cart(self, fake_driver):
+        cart_page = self._fill_cart(fake_driver)
+        assert cart_page.get_cart_item_count() == 2
+        assert cart_page.get_item_details(0)["price"] == "AED 1,899.00"
+        assert cart_page.get_cart_total() == "AED 3,697.00"
+
+    def test_update_and_remove(self, fake_driver):
+        cart_page = self._fill_cart(fake_driver)
+        assert cart_page.update_item_quantity(0, 3)
+        assert cart_page.get_cart_total() == "AED 7,495.00"
+        assert cart_page.remove_item_by_name("Dell Latitude")
+        assert cart_page.remove_first_item()
+        assert cart_page.is_cart_empty()
+
+    def test_failed_cart_reset_script_is_logged_before_the_ui_fallback(self, fake_driver, monkeypatch, caplog):
+        cart_page = self._fill_cart(fake_driver)
+        fake_driver.get("/")
+        monkeypatch.setattr(fake_driver, "execute_async_script", lambda script, *args: None)
+        assert not cart_page.clear_cart(fake_driver.base_url, fallback=False)
+        assert "Cart reset script failed: cart reset script returned nothing" in caplog.messages
+        assert cart_page.clear_cart(fake_driver.base_url)
+        assert fake_driver.current_url.endswith("/cart") and cart_page.is_cart_empty()
+
+    def test_seed_cart_checks_items_and_fails_without_a_script_result(self, fake_driver, monkeypatch, caplog):
+        fake_driver.get("/")
+        cart_page = CartPage(fake_driver)
+        with pytest.raises(ValueError):
+            cart_page.seed_cart([{"name": "no page"}])
+        monkeypatch.setattr(fake_driver, "execute_async_script", lambda script, *args: None)
+        assert not cart_page.seed_cart([{"url": f"product/{WATCH_SLUG}"}], fake_driver.base_url)
+        assert caplog.messages[-1].endswith("cart seed script returned nothing")
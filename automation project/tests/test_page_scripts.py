@@ -0,0 +1,182 @@
+"""
+Page-object scripts against their contract: each test runs on the fake driver, whose
+handlers stand in for the scripts, and in headless Chrome, which runs the scripts
+themselves against the served stand-in site (skipped when Chrome is not installed)
+"""
+
+import shutil
+from contextlib import contextmanager
+import pytest
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from config.config import Config
+from pages.cart_page import CLEAR_CART_SCRIPT, CartPage
+from pages.search_results_page import SCAN_SCRIPT, SearchResultsPage
+from utils.soak import SAMPLE_SCRIPT
+from utils.fake_webdriver import FakeWebDriver
+from utils.stand_in_site import SESSION_COOKIE, StandInServer, StandInSite
+
+CHROME_BINARIES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+CHROME = next(filter(None, map(shutil.which, CHROME_BINARIES)), None)
+
+
+@pytest.fixture(scope="module")
+def chrome():
+    """One headless Chrome for the module's tests"""
+    if CHROME is None:
+        pytest.skip("Chrome is not installed")
+    options = webdriver.ChromeOptions()
+    options.binary_location = CHROME
+    for argument in ("--headless=new", "--no-sandbox", "--disable-dev-shm-usage"):
+        options.add_argument(argument)
+    driver = webdriver.Chrome(options=options)
+    driver.implicitly_wait(0)
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture(params=["fake", "chrome"])
+def browser(request):
+    """The fake driver, then Chrome"""
+    # The fake driver's virtual clock must not be running while Chrome is polled
+    return request.getfixturevalue("fake_driver" if request.param == "fake" else "chrome")
+
+
+@contextmanager
+def serving(driver, site):
+    """The site's base URL for the driver: the fake driver's own site, or the site served over HTTP"""
+    if isinstance(driver, FakeWebDriver):
+        driver.site = site
+        yield driver.base_url
+    else:
+        with StandInServer(site) as server:
+            yield server.base_url
+
+
+class BoxedCardSite(StandInSite):
+    """Stand-in site whose result cards are each wrapped in another card"""
+
+    def _product_card(self, product):
+        return f'<div class="product-box">{super()._product_card(product)}</div>'
+
+
+def logged(site):
+    """The site, recording (method, path) of each request it handles in site.requests"""
+    handle = site.handle
+    site.requests = []
+
+    def logging_handle(method, path, *args, **kwargs):
+        site.requests.append((method, path))
+        return handle(method, path, *args, **kwargs)
+    site.handle = logging_handle
+    return site
+
+
+def open_session(driver, base_url):
+    """Open the site's home page; the id of the browser's session there"""
+    driver.get(base_url + "/")
+    return driver.get_cookie(SESSION_COOKIE)["value"]
+
+
+class TestSearchResultScripts:
+    """Result cards read in one call, and scanned round by round"""
+
+    def test_results_are_read_with_their_fields_and_nested_cards_once(self, browser):
+        site = BoxedCardSite()
+        with serving(browser, site) as base_url:
+            browser.get(base_url + "/search?q=Dell+Latitude")
+            results = SearchResultsPage(browser).get_results()
+            assert [(result["title"], result["url"], result["price"], result["price_value"], result["availability"])
+                    for result in results] == [
+                (product["name"], f"{base_url}/product/{product['slug']}", f"AED {product['price']:,.2f}",
+                 product["price"], "In stock") for product in site.search("Dell Latitude")]
+            results[1]["element"].click()
+            assert results[1]["title"] in browser.title
+
+    def test_scan_reads_each_card_once_through_an_infinite_scroll_list(self, browser, monkeypatch):
+        site = StandInSite(extra_results=300, listing="scroll")
+        target = site.search("refurbished")[297]
+        read = []
+        execute_script = browser.execute_script
+
+        def counting(script, *args):
+            batch = execute_script(script, *args)
+            if script == SCAN_SCRIPT:
+                read.extend(result["url"] for result in batch["results"])
+            return batch
+        monkeypatch.setattr(browser, "execute_script", counting)
+        with serving(browser, site) as base_url:
+            browser.get(base_url + "/search?q=refurbished")
+            page = SearchResultsPage(browser)
+            best, score = page.scan_for(target["name"], max_results=1000)
+            assert best["url"].endswith(target["slug"]) and score == 1.0
+            assert len(read) == len(set(read)) == page.last_scan["scanned"] == 300
+            assert page.last_scan["rounds"] == 13
+
+    def test_scan_follows_next_page_links(self, browser):
+        site = StandInSite(extra_results=100, listing="pages", page_size=10)
+        target = site.search("refurbished")[99]
+        with serving(browser, site) as base_url:
+            browser.get(base_url + "/search?q=refurbished")
+            page = SearchResultsPage(browser)
+            best, _ = page.scan_for(target["name"])
+            assert page.last_scan["pages"] == 10 and page.last_scan["scanned"] == 100
+            best["element"].click()
+            assert target["name"] in browser.title
+
+
+class TestCartScripts:
+    """Cart reset and seeding through the cart's own forms"""
+
+    def test_clear_cart_posts_each_remove_form_once(self, browser):
+        site = logged(StandInSite())
+        with serving(browser, site) as base_url:
+            session = open_session(browser, base_url)
+            site.add_to_cart(session, "1001")
+            site.add_to_cart(session, "2001", qty=2)
+            site.requests.clear()
+            assert CartPage(browser).clear_cart(base_url, fallback=False)
+            assert site.cart_count(session) == 0
+            # fetch() follows each remove form's redirect back to the cart
+            assert [request for request in site.requests if request[1].startswith("/cart")] == [
+                ("GET", "/cart"), ("POST", "/cart/remove"), ("GET", "/cart"),
+                ("POST", "/cart/remove"), ("GET", "/cart"), ("GET", "/cart")]
+            assert browser.current_url == base_url + "/"
+
+    def test_clear_cart_script_reports_a_failed_fetch(self, browser):
+        with serving(browser, StandInSite()) as base_url:
+            browser.get(base_url + "/")
+            result = browser.execute_async_script(CLEAR_CART_SCRIPT, "http://elsewhere.invalid/cart",
+                                                  CartPage.REMOVE_BUTTON[1], CartPage.CART_ITEMS[1],
+                                                  CartPage.EMPTY_CART_MESSAGE[1])
+            assert set(result) == {"error"}
+
+    def test_seed_cart_posts_the_add_to_cart_forms(self, browser):
+        site = StandInSite()
+        watch = site.by_id["2001"]
+        with serving(browser, site) as base_url:
+            session = open_session(browser, base_url)
+            cart_page = CartPage(browser)
+            assert cart_page.seed_cart([
+                {"search": Config.LAPTOP_SEARCH_TERM, "name": "Dell Latitude 7490"},
+                {"url": f"product/{watch['slug']}", "qty": 2,
+                 "variant": {"color": Config.WATCH_COLOR, "size": Config.WATCH_SIZE}},
+            ], base_url)
+            assert [(line["product_id"], line["qty"], line["variant"]) for line in site.cart(session)] == [
+                ("1001", 1, {}), ("2001", 2, {"color": Config.WATCH_COLOR, "size": Config.WATCH_SIZE})]
+            assert browser.current_url == base_url + "/"
+            assert not cart_page.seed_cart([{"url": "product/missing"}], base_url)
+            assert site.cart_count(session) == 3
+
+
+class TestSoakScripts:
+    """Browser counters read by a page script when CDP metrics are not available"""
+
+    def test_sample_counts_the_live_elements(self, browser):
+        with serving(browser, StandInSite()) as base_url:
+            browser.get(base_url + "/search?q=Dell+Latitude")
+            counters = browser.execute_script(SAMPLE_SCRIPT)
+            assert counters["dom_nodes"] == len(browser.find_elements(By.XPATH, "//*"))
+            # performance.memory is Chromium-only
+            assert counters["js_heap_bytes"] is None or counters["js_heap_bytes"] > 0
+            assert counters["js_listeners"] is None and counters["documents"] is None
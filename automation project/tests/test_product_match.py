@@ -0,0 +1,25 @@
+"""
+Fuzzy product-title matching
+"""
+
+from config.config import Config
+from utils.product_match import MIN_SCORE, match_score, parse_price, rank
+
+
+class TestProductMatch:
+    """Token scores tolerate punctuation and spelling but not other model numbers"""
+
+    def test_punctuation_order_and_spelling(self):
+        title = "Dell Latitude 7490 - Intel Core i7 8650U, 14 inch FHD Display, 16GB RAM, 512GB SSD, Windows 10 Pro"
+        assert match_score(Config.LAPTOP_NAME, title) > 0.9
+        assert match_score("Dell Lattitude 7490", "Latitude 7490 by Dell") > MIN_SCORE
+        assert match_score("Dell Latitude 7490", "Dell Latitude 5490 Intel Core i5") < MIN_SCORE
+        assert match_score("Apple Watch Series 6", "") == 0.0
+
+    def test_rank_prefers_the_closest_title(self):
+        results = [{"title": "Apple Watch SE (44mm, GPS)"}, {"title": Config.WATCH_NAME},
+                   {"title": "Apple Watch Series 6 (44mm, GPS) Blue"}]
+        scored = rank(results, "Apple Watch Series 6 (40mm, GPS + Cellular)")
+        assert scored[0][1]["title"] == Config.WATCH_NAME
+        assert [score for score, _ in scored] == sorted((score for score, _ in scored), reverse=True)
+        assert parse_price("AED 1,899.00") == 1899.0 and parse_price("Sold out") is None
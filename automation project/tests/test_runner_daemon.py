@@ -0,0 +1,109 @@
+"""
+Warm runner tests: driver pool and the daemon's socket protocol
+"""
+
+import sys
+import threading
+import pytest
+from config.config import Config
+from utils.driver_pool import DriverPool, sign_in
+from utils.fake_webdriver import FakeWebDriver, VirtualClock
+from utils.runner_daemon import RunnerDaemon, purge_project_modules, send_request
+from utils.stand_in_site import StandInSite
+
+
+def virtual_sign_in(driver):
+    """Warm-up on a virtual clock in whichever thread the pool launches from"""
+    with VirtualClock():
+        sign_in(driver)
+
+
+@pytest.fixture
+def pool():
+    site = StandInSite()
+    pool = DriverPool(size=2, create_driver=lambda: FakeWebDriver(site), warm_up=virtual_sign_in).start()
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def daemon():
+    def runner(args, emit):
+        emit({"event": "collected", "count": len(args)})
+        for nodeid in args:
+            emit({"event": "test", "nodeid": nodeid, "when": "call", "outcome": "failed" if "bad" in nodeid else "passed",
+                  "duration": 0.01, "longrepr": None})
+        return 1 if any("bad" in nodeid for nodeid in args) else 0
+
+    daemon = RunnerDaemon(port=0, runner=runner)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon
+    daemon.server.shutdown()
+    thread.join()
+
+
+class TestDriverPool:
+    """Warm, signed-in drivers leased and returned"""
+
+    def test_leased_drivers_are_warm_and_returned(self, pool):
+        assert DriverPool.active is pool
+        with pool.lease() as driver:
+            assert driver.get_cookies(), "warm-up should have signed in"
+            assert pool.status()["idle"] == 1
+            driver.execute_script("window.open('/cart', '_blank');")
+        assert pool.status() == {"size": 2, "idle": 2, "leased": 1, "replaced": 0}
+        with pool.lease() as again:
+            assert len(again.window_handles) == 1
+
+    def test_dead_session_is_replaced(self, pool):
+        first = pool.acquire()
+        first.quit()
+        pool.release(first)
+        second = pool.acquire()
+        other = pool.acquire()
+        assert first not in (second, other)
+        assert pool.replaced == 1
+
+    def test_close_deactivates(self, pool):
+        pool.close()
+        assert DriverPool.active is None
+
+
+class TestRunnerDaemon:
+    """Requests over the local socket with streamed results"""
+
+    def test_run_streams_events_and_exit_code(self, daemon):
+        events = []
+        done = send_request({"command": "run", "args": ["tests/a.py::ok", "tests/b.py::bad"]},
+                            port=daemon.port, on_event=events.append)
+        assert [event["event"] for event in events] == ["started", "collected", "test", "test", "done"]
+        assert done["exit_code"] == 1
+        assert send_request({"command": "status"}, port=daemon.port)["status"]["runs"] == 1
+
+    def test_unknown_command(self, daemon):
+        assert send_request({"command": "explode"}, port=daemon.port)["exit_code"] == 4
+
+    def test_purge_reloads_only_project_modules(self, tmp_path, monkeypatch):
+        (tmp_path / "edited_page.py").write_text("LOCATOR = 'old'\n")
+        (tmp_path / "warm_state.py").write_text("POOL = object()\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        import edited_page, warm_state
+        (tmp_path / "edited_page.py").write_text("LOCATOR = 'new'\n")
+
+        purged = purge_project_modules(root=tmp_path, keep={"warm_state"})
+        assert purged == ["edited_page"]
+        assert sys.modules["warm_state"] is warm_state and "pytest" in sys.modules
+        import edited_page
+        assert edited_page.LOCATOR == "new"
+        del sys.modules["edited_page"], sys.modules["warm_state"]
+
+    def test_purge_keeps_the_config_the_pool_was_set_up_from(self):
+        saved = dict(sys.modules)
+        try:
+            purged = purge_project_modules()
+            from config.config import Config as current
+            assert "pages.login_page" in purged and "config.config" not in purged
+            assert current is Config and sys.modules["utils.driver_pool"].Config is Config
+        finally:
+            sys.modules.update(saved)
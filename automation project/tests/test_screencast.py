@@ -0,0 +1,113 @@
+"""
+Rolling screencast: the frame ring buffer, the CDP capture loop and clips of failed tests
+"""
+
+import time
+import base64
+import struct
+from contextlib import asynccontextmanager
+import trio
+from selenium.webdriver.common.devtools import v119 as devtools
+from utils import screencast
+from utils.screencast import FrameBuffer, ScreencastRecorder, jpeg_size, resample
+
+
+def jpeg(width, height, marker=b""):
+    """Start of a JPEG: SOI, a start-of-frame segment with the size, then `marker` and EOI"""
+    sof = b"\xff\xc0\x00\x11\x08" + struct.pack(">HH", height, width) + b"\x03" + b"\0" * 9
+    return b"\xff\xd8\xff\xe0\x00\x04JF" + sof + marker + b"\xff\xd9"
+
+
+class ScreencastSession:
+    """CDP session that sends a frame, and the next one only once it was acked, like Chromium"""
+
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.commands = []
+        self.sender = None
+
+    def listen(self, event_type, buffer_size=10):
+        self.sender, receiver = trio.open_memory_channel(buffer_size)
+        return receiver
+
+    def _send_next(self):
+        if self.frames:
+            self.sender.send_nowait(self.frames.pop(0))
+
+    async def execute(self, command):
+        request = next(command)
+        self.commands.append(request["method"])
+        if request["method"] in ("Page.startScreencast", "Page.screencastFrameAck"):
+            self._send_next()
+
+
+class ChromiumStub:
+    """Driver with CDP and a bidi connection to a ScreencastSession"""
+
+    name = "chrome"
+
+    def __init__(self, session):
+        self.session = session
+
+    def execute_cdp_cmd(self, command, params):
+        return {}
+
+    @asynccontextmanager
+    async def bidi_connection(self):
+        yield type("Connection", (), {"session": self.session, "devtools": devtools})()
+
+
+def frame(number, timestamp, data):
+    metadata = devtools.page.ScreencastFrameMetadata(0, 1, 800, 600, 0, 0, devtools.network.TimeSinceEpoch(timestamp))
+    return devtools.page.ScreencastFrame(base64.b64encode(data).decode("ascii"), metadata, number)
+
+
+class TestScreencast:
+    """Frames stay within the window, are acked one by one, and become a clip only for a failed test"""
+
+    def test_buffer_keeps_the_last_seconds_and_resamples_to_a_steady_rate(self):
+        buffer = FrameBuffer(seconds=1)
+        for timestamp, data in [(0.0, b"a"), (0.5, b"b"), (1.0, b"c"), (1.6, b"d")]:
+            buffer.add(timestamp, data)
+        assert [data for _, data in buffer.snapshot()] == [b"c", b"d"]
+        assert resample(buffer.snapshot(), fps=5) == [b"c", b"c", b"c", b"d"]
+        assert resample(buffer.snapshot(), fps=5, start=0.0, end=2.0) == [b"c"] * 3 + [b"d"] * 3
+        buffer.keep_last()
+        assert buffer.snapshot() == [(1.6, b"d")]
+        assert jpeg_size(jpeg(640, 360)) == (640, 360) and jpeg_size(b"\xff\xd8") is None
+
+    def test_capture_acks_frames_and_saves_a_clip_only_on_failure(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(screencast, "VIDEO_DIR", tmp_path)
+        started = time.time() - 1
+        images = [jpeg(400, 300, bytes([number])) for number in range(3)]
+        session = ScreencastSession(frame(number, started + number * 0.2, image) for number, image in enumerate(images))
+        recorder = ScreencastRecorder(ChromiumStub(session), seconds=5)
+        assert recorder.start()
+        deadline = time.monotonic() + 5
+        while recorder.frames < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        passed = recorder.finish_test("test_passes", failed=False)
+        assert passed["frames"] == 3 and passed["clip"] is None and list(tmp_path.iterdir()) == []
+        assert session.commands == ["Page.startScreencast"] + ["Page.screencastFrameAck"] * 3
+
+        failed = recorder.finish_test("test_fails[param]", failed=True)
+        clip = tmp_path / failed["clip"].split("/")[-1]
+        assert clip.name.startswith("test_fails_param_") and clip.suffix == ".avi"
+        data = clip.read_bytes()
+        assert data[:4] == b"RIFF" and data[8:12] == b"AVI " and struct.unpack("<I", data[4:8])[0] == len(data) - 8
+        assert struct.unpack("<II", data[64:72]) == (400, 300)
+        movi = data.index(b"movi")
+        index = data[data.index(b"idx1") + 8:]
+        entries = [struct.unpack("<4sIII", index[i:i + 16]) for i in range(0, len(index), 16)]
+        # One second of frames at 10 fps, each entry pointing at a JPEG in the movi list
+        assert len(entries) >= 10
+        shown = [data[movi + offset + 8:movi + offset + 8 + size] for _, _, offset, size in entries]
+        assert set(shown) == set(images) and shown[0] == images[0] and shown[-1] == images[-1]
+
+        recorder.stop()
+        assert not recorder._thread.is_alive() and session.commands[-1] == "Page.stopScreencast"
+
+    def test_drivers_without_cdp_are_not_recorded(self, fake_driver):
+        assert ScreencastRecorder.install(fake_driver) is None
+        assert ScreencastRecorder.of(fake_driver) is None
@@ -0,0 +1,50 @@
+"""
+Soak runs: growth detection and the flow loop on the fake driver
+"""
+
+import random
+from utils.shopping_flow import ShoppingFlow
+from utils.soak import SAMPLE_SCRIPT, SoakRunner, trend
+
+
+class TestSoak:
+    """Monotonic growth is told apart from noise, and leaks show up in the loop's samples"""
+
+    def test_growth_is_detected_through_noise(self):
+        rng = random.Random(7)
+        leaking = [50e6 + 400e3 * i + rng.gauss(0, 2e6) for i in range(40)]
+        noisy = [50e6 + rng.gauss(0, 2e6) for _ in range(40)]
+        assert trend(leaking)["growing"] and 300e3 < trend(leaking)["slope_per_iteration"] < 500e3
+        assert not trend(noisy)["growing"]
+        # Significant but negligible: one extra node per iteration on a 5000-node page
+        assert not trend([5000 + i for i in range(40)])["growing"]
+        assert trend([1, 2, 3])["growing"] is None
+
+    def test_flow_loop_reports_a_window_leak(self, fake_driver, monkeypatch):
+        runner = SoakRunner(fake_driver, fake_driver.base_url, max_iterations=8, email="u@example.com", password="p")
+        report = runner.run()
+        assert report["iterations"] == 8 and report["failures"] == 0
+        assert report["leaks"] == [] and not report["latency_drift"]
+        # The fake driver has no CDP metrics, so the counters come from the sample script
+        assert report["samples"][0]["dom_nodes"] > 0 and report["trends"]["dom_nodes"]["missing"] == 0
+        assert report["samples"][-1]["dom_nodes"] == report["samples"][0]["dom_nodes"]
+
+        # A flow that opens a tab every iteration and never closes it
+        open_home = ShoppingFlow.step_open_home
+
+        def leaky_open_home(flow):
+            flow.driver.switch_to.new_window("tab")
+            open_home(flow)
+        monkeypatch.setattr(ShoppingFlow, "step_open_home", leaky_open_home)
+        report = SoakRunner(fake_driver, fake_driver.base_url, max_iterations=8).run()
+        assert report["failures"] == 0 and report["leaks"] == ["windows"]
+        assert report["trends"]["windows"]["slope_per_iteration"] == 1.0
+
+    def test_unsampled_counters_are_reported(self, fake_driver, monkeypatch, caplog):
+        execute_script = fake_driver.execute_script
+        monkeypatch.setattr(fake_driver, "execute_script",
+                            lambda script, *args: None if script == SAMPLE_SCRIPT else execute_script(script, *args))
+        report = SoakRunner(fake_driver, fake_driver.base_url, max_iterations=6, warmup=0).run()
+        assert report["samples"][0]["dom_nodes"] is None and report["trends"]["dom_nodes"]["missing"] == 6
+        assert any("sample script returned nothing" in message for message in caplog.messages)
+        assert "Soak counter dom_nodes not sampled in 6 of 6 analysed iterations" in caplog.messages
@@ -0,0 +1,107 @@
+"""
+Step-level retry: backoff, in-place state reset and flakiness statistics
+"""
+
+import random
+import pytest
+from pages.product_page import ProductPage
+from utils.step_retry import FlakinessStats, StepFailed, StepQuarantined, StepRetry, backoff_delay
+from utils.stand_in_site import SESSION_COOKIE
+from utils.wait_budget import WaitBudget
+
+
+@pytest.fixture
+def stats(tmp_path):
+    return FlakinessStats(tmp_path / "flakiness.json")
+
+
+def history(stats, name, first_try=0, after_retry=0, failed=0):
+    for attempts, passed, count in ((1, True, first_try), (2, True, after_retry), (2, False, failed)):
+        for _ in range(count):
+            stats.record_step(name, attempts, passed)
+
+
+class TestStepRetry:
+    """Failed steps retried on the same driver from the state before the step"""
+
+    def test_backoff_is_jittered_and_capped(self):
+        rng = random.Random(7)
+        delays = [backoff_delay(attempt, base=1.0, cap=5.0, rng=rng) for attempt in range(6)]
+        assert all(0 <= delay <= min(5.0, 2 ** attempt) for attempt, delay in enumerate(delays))
+        assert len(set(delays)) == len(delays)
+
+    def test_retry_resets_page_state_and_records(self, fake_driver, stats):
+        fake_driver.get(fake_driver.base_url)
+        home = fake_driver.current_url
+        calls = []
+
+        def flaky_step():
+            calls.append((fake_driver.current_url, fake_driver.get_cookie("tracking")))
+            fake_driver.add_cookie({"name": "tracking", "value": "half-done"})
+            fake_driver.get(f"{fake_driver.base_url}/cart")
+            if len(calls) == 1:
+                raise StepFailed("transient")
+            return True
+
+        with WaitBudget("step", 30) as budget:
+            assert StepRetry(fake_driver, stats=stats, retries=2).run("open_cart", flaky_step) is True
+        assert calls == [(home, None), (home, None)]
+        assert stats.step("open_cart") == {"runs": 1, "first_try": 0, "after_retry": 1, "failed": 0, "attempts": 2}
+        assert any(entry["lookup"] == "retry backoff open_cart" for entry in budget.ledger)
+
+    def test_add_step_is_retried_only_while_the_cart_is_unchanged(self, fake_driver, stats):
+        fake_driver.get(fake_driver.base_url)
+        session = fake_driver.get_cookie(SESSION_COOKIE)["value"]
+        cart_count = ProductPage(fake_driver).cart_count_now
+        calls = []
+
+        def add_then_fail(adds):
+            calls.append(cart_count())
+            if adds:
+                fake_driver.site.add_to_cart(session, "1001")
+            raise StepFailed("confirmation not shown")
+
+        retry = StepRetry(fake_driver, stats=stats, retries=2)
+        with pytest.raises(StepFailed):
+            retry.run("add_laptop", lambda: add_then_fail(adds=False), state=cart_count)
+        assert calls == [0, 0, 0]
+        calls.clear()
+        with pytest.raises(StepFailed):
+            retry.run("add_laptop", lambda: add_then_fail(adds=True), state=cart_count)
+        assert calls == [0] and retry.last_attempts == 1
+        assert fake_driver.site.cart_count(session) == 1
+
+    def test_final_failure_raises_the_last_error(self, fake_driver, stats):
+        retry = StepRetry(fake_driver, stats=stats, retries=1)
+        with pytest.raises(StepFailed, match="did not succeed"):
+            retry.run("sign_in", lambda: False)
+        assert retry.last_attempts == 2 and stats.step("sign_in")["failed"] == 1
+
+
+class TestFlakinessStats:
+    """History turns into tighter waits or quarantine and is merged on save"""
+
+    def test_flaky_step_gets_an_extra_attempt_with_a_budget_share(self, stats):
+        history(stats, "add_watch", first_try=6, after_retry=4)
+        policy = stats.policy("add_watch")
+        assert policy["attempts"] == stats.policy("new_step")["attempts"] + 1
+        assert policy["budget_share"] == pytest.approx(1 / policy["attempts"])
+        assert not policy["quarantined"]
+
+    def test_chronic_failure_is_quarantined(self, fake_driver, stats):
+        history(stats, "search_watch", first_try=2, failed=4)
+        with pytest.raises(StepQuarantined):
+            StepRetry(fake_driver, stats=stats, retries=0).run("search_watch", lambda: False)
+
+    def test_save_merges_with_the_file(self, stats):
+        history(stats, "sign_in", first_try=2)
+        stats.record_lookups([{"lookup": "LOGIN_BUTTON", "seconds": 5.0, "outcome": "timeout"},
+                              {"lookup": "LOGIN_BUTTON", "seconds": 0.1, "outcome": "found"},
+                              {"lookup": "pause", "seconds": 1.0, "outcome": "slept"}])
+        stats.save()
+        other = FlakinessStats(stats.path)
+        history(other, "sign_in", after_retry=1)
+        other.save()
+        reloaded = FlakinessStats(stats.path)
+        assert reloaded.step("sign_in")["runs"] == 3
+        assert reloaded.flaky_locators(min_lookups=1) == [("LOGIN_BUTTON", 0.5, 2)]
@@ -0,0 +1,104 @@
+"""
+Wait budget tests on the fake driver and a virtual clock
+"""
+
+import itertools
+import pytest
+from selenium.webdriver.common.by import By
+from config.config import Config
+from pages.base_page import BasePage
+from pages.login_page import LoginPage
+from utils.driver_factory import DriverFactory
+from utils.shopping_flow import ShoppingFlow
+from utils.fake_webdriver import FakeWebDriver, VirtualClock
+from utils.stand_in_site import StandInSite
+from utils.wait_budget import BudgetExhausted, WaitBudget, probe
+
+MISSING = (By.ID, "never-rendered")
+
+
+class TestWaitBudget:
+    """Lookups and pauses draw from one deadline per step"""
+
+    def test_fallback_lookups_stop_at_the_deadline(self, fake_driver):
+        fake_driver.get(fake_driver.base_url)
+        page = BasePage(fake_driver)
+        with WaitBudget("fallbacks", 5) as budget:
+            assert page.find_elements(MISSING) == []
+            assert page.is_element_present(MISSING) is False
+            with pytest.raises(BudgetExhausted):
+                page.find_element(MISSING)
+            page.pause(10)
+        assert budget.elapsed() <= 5 + 0.5
+        assert [entry["outcome"] for entry in budget.ledger] == ["timeout", "exhausted", "exhausted", "slept"]
+        assert budget.ledger[-1]["seconds"] == 0.0
+        assert "fallbacks" in budget.report() and "never-rendered" in budget.report()
+
+    def test_nested_budget_is_capped_by_its_parent(self, fake_driver):
+        with WaitBudget("step", 4) as step:
+            with WaitBudget("lookup", 30) as lookup:
+                assert lookup.remaining() <= 4
+                assert lookup.parent is step
+        assert WaitBudget.current() is None
+
+    def test_login_fallbacks_share_one_wait(self, fake_driver):
+        fake_driver.get(fake_driver.base_url)
+        with WaitBudget("open login", 10) as budget:
+            assert LoginPage(fake_driver).click_login_button()
+        lookups = [entry for entry in budget.ledger if entry["outcome"] != "slept"]
+        assert len(lookups) == 1 and lookups[0]["outcome"] == "found"
+
+    def test_failed_step_reports_its_ledger(self):
+        site = StandInSite(accounts={"someone@example.com": "secret"})
+        with VirtualClock():
+            driver = FakeWebDriver(site)
+            results = ShoppingFlow(driver, base_url=driver.base_url).run()
+        sign_in = results[-1]
+        assert sign_in["name"] == "sign_in" and not sign_in["passed"]
+        assert sign_in["budget"]["spent_s"] <= ShoppingFlow.BUDGETS["sign_in"] + 0.5
+        # The missing user menu is probed and settles absent instead of timing out
+        assert any(entry["outcome"] == "absent" and "optional" in entry["lookup"]
+                   for entry in sign_in["budget"]["lookups"])
+
+    def test_drivers_have_no_implicit_wait(self, fake_driver):
+        fake_driver.implicitly_wait(10)
+        DriverFactory.apply_profile(fake_driver)
+        assert fake_driver.timeouts["implicit"] == 0
+
+
+class ChangingPage:
+    """Driver whose DOM never settles and never contains the element"""
+
+    def __init__(self):
+        self.mutations = itertools.count()
+
+    def find_elements(self, by, value):
+        return []
+
+    def execute_script(self, script, *args):
+        return ["complete", next(self.mutations), 100]
+
+
+class TestOptionalPresence:
+    """Absence is answered after DOM quiescence, not after the full wait"""
+
+    def test_logged_out_check_settles_quickly(self, fake_driver):
+        fake_driver.get(fake_driver.base_url)
+        with WaitBudget("probe", 30) as budget:
+            assert LoginPage(fake_driver).is_logged_in() is False
+        assert budget.elapsed() < Config.ABSENCE_TIMEOUT < Config.EXPLICIT_WAIT
+        assert [entry["outcome"] for entry in budget.ledger] == ["absent"]
+
+    def test_present_elements_return_without_polling(self, fake_driver):
+        fake_driver.get(fake_driver.base_url)
+        page = BasePage(fake_driver)
+        with WaitBudget("probe", 30) as budget:
+            assert page.find_optional((By.TAG_NAME, "body"))
+            assert page.is_element_absent(MISSING)
+        assert budget.ledger[0]["outcome"] == "present" and budget.ledger[0]["seconds"] == 0
+
+    def test_changing_dom_stops_at_the_absence_timeout(self):
+        with VirtualClock(), WaitBudget("probe", 30) as budget:
+            assert probe(ChangingPage(), MISSING, "busy page", timeout=2) == []
+            assert 2 <= budget.elapsed() <= 2 + Config.POLL_INTERVAL
+        assert budget.ledger[0]["outcome"] == "absent-timeout"
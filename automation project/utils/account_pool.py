@@ -0,0 +1,254 @@
+"""
+Exclusive test-account leases shared by every process on this host
+
+Carts live on the server per account, so two runs signed in as the same
+account corrupt each other's cart assertions. Each pytest worker (and the
+warm runner) leases its own account from a pool of credentials for as long
+as it runs:
+
+- The pool comes from ACCOUNTS ("email:password" entries), otherwise
+  config/accounts.json ([{"email": ..., "password": ...}]), otherwise the
+  single EMAIL/PASSWORD account.
+- Leases are kept in cartlow_account_leases.json in the system temp
+  directory, outside the checkout. Every read-modify-write of that file
+  happens under an exclusive OS file lock, so processes and threads (and
+  checkouts) on the host coordinate through it.
+- A lease expires ACCOUNT_LEASE_SECONDS after it was taken or last renewed;
+  holders renew it in the background while they run. A lease whose process
+  is gone on this host is reclaimed right away.
+- Only tests that sign in take a lease: the clean_cart and seeded_cart
+  fixtures sign in as the leased account and empty its cart (reset_cart).
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from config.config import Config
+from pages.login_page import LoginPage
+from pages.cart_page import CartPage
+from utils.log_pipeline import worker_id
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+ACCOUNTS_FILE = PROJECT_ROOT / "config" / "accounts.json"
+LEASE_FILE = Path(tempfile.gettempdir()) / "cartlow_account_leases.json"
+# Seconds between checks while every account is leased
+LEASE_POLL = 1.0
+
+
+class AccountLeaseError(Exception):
+    """No account became free in time, or a lease was lost to expiry"""
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock on `path` (blocks until other processes release it)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+") as handle:
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def load_accounts(path=ACCOUNTS_FILE, entries=None):
+    """Pool credentials as (email, password) pairs; ValueError on a malformed entry"""
+    entries = Config.ACCOUNTS if entries is None else entries
+    accounts = []
+    for entry in entries:
+        email, separator, password = entry.partition(":")
+        if not separator or not email.strip():
+            raise ValueError(f"ACCOUNTS entries must be email:password, got {email!r}")
+        accounts.append((email.strip(), password))
+    if not accounts and Path(path).exists():
+        try:
+            accounts = [(account["email"], account["password"]) for account in json.loads(Path(path).read_text())]
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"{path}: expected a list of {{\"email\", \"password\"}} objects ({e})")
+    # One entry per email
+    unique = list(dict(accounts).items())
+    return unique or [(Config.EMAIL, Config.PASSWORD)]
+
+
+def _process_alive(pid):
+    if os.name != "posix":
+        # os.kill(pid, 0) would terminate the process on Windows; rely on expiry there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def reset_cart(driver, email=None, password=None, base_url=None):
+    """Sign the driver in (the configured account by default) and empty its cart; True when verified empty"""
+    email = email or Config.EMAIL
+    driver.get(base_url or Config.BASE_URL)
+    login_page = LoginPage(driver)
+    if not login_page.login(email, password or Config.PASSWORD) or not login_page.is_logged_in():
+        logging.warning(f"Cart not reset: could not sign in as {email}")
+        return False
+    if not CartPage(driver).clear_cart(base_url):
+        logging.warning(f"Cart of {email} is not empty after reset")
+        return False
+    return True
+
+
+class Lease:
+    """One account held exclusively until released or expired"""
+
+    def __init__(self, email, password, token, holder, expires):
+        self.email = email
+        self.password = password
+        self.token = token
+        self.holder = holder
+        self.expires = expires
+
+    def __repr__(self):
+        return f"Lease({self.email!r}, holder={self.holder!r})"
+
+
+class AccountPool:
+    """Lease pool accounts through a lock-protected file shared by all processes"""
+
+    def __init__(self, accounts=None, path=LEASE_FILE, lease_seconds=None, clock=time.time):
+        self.accounts = accounts if accounts is not None else load_accounts()
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(".lock")
+        self.lease_seconds = lease_seconds or Config.ACCOUNT_LEASE_SECONDS
+        # Wall clock: expiry times are compared across processes
+        self.clock = clock
+        self.host = socket.gethostname()
+
+    def _read(self):
+        try:
+            return json.loads(self.path.read_text()).get("leases", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, leases):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps({"leases": leases}, indent=1, sort_keys=True))
+
+    def _stale(self, entry, now):
+        if entry["expires"] <= now:
+            return "expired"
+        if entry.get("host") == self.host and not _process_alive(entry.get("pid", 0)):
+            return "holder exited"
+        return None
+
+    def _live_leases(self, now):
+        leases = self._read()
+        for email, entry in list(leases.items()):
+            reason = self._stale(entry, now)
+            if reason:
+                logging.warning(f"Reclaiming lease on {email} from {entry.get('holder')} ({reason})")
+                del leases[email]
+        return leases
+
+    def try_acquire(self, holder=None):
+        """Lease a free account right away, or return None"""
+        holder = holder or worker_id()
+        with file_lock(self.lock_path):
+            now = self.clock()
+            leases = self._live_leases(now)
+            for email, password in self.accounts:
+                if email in leases:
+                    continue
+                lease = Lease(email, password, uuid.uuid4().hex, holder, now + self.lease_seconds)
+                leases[email] = {"token": lease.token, "holder": holder, "host": self.host, "pid": os.getpid(),
+                                 "acquired": now, "expires": lease.expires}
+                self._write(leases)
+                return lease
+            self._write(leases)
+        return None
+
+    def acquire(self, holder=None, timeout=None):
+        """Lease a free account, waiting up to `timeout` seconds (ACCOUNT_WAIT) for one"""
+        timeout = Config.ACCOUNT_WAIT if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            lease = self.try_acquire(holder)
+            if lease:
+                logging.info(f"Leased test account {lease.email} to {lease.holder}")
+                return lease
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise AccountLeaseError(f"No free test account within {timeout:g}s: "
+                                        f"all {len(self.accounts)} are leased ({self.status()['leased']})")
+            time.sleep(min(LEASE_POLL, remaining))
+
+    def renew(self, lease):
+        """Push the lease's expiry out again; False when it was lost"""
+        with file_lock(self.lock_path):
+            leases = self._read()
+            entry = leases.get(lease.email)
+            if not entry or entry["token"] != lease.token:
+                return False
+            lease.expires = entry["expires"] = self.clock() + self.lease_seconds
+            self._write(leases)
+        return True
+
+    def release(self, lease):
+        """Give the account back (no-op when the lease already expired and moved on)"""
+        with file_lock(self.lock_path):
+            leases = self._read()
+            entry = leases.get(lease.email)
+            if entry and entry["token"] == lease.token:
+                del leases[lease.email]
+                self._write(leases)
+                logging.info(f"Released test account {lease.email}")
+
+    def keep_alive(self, lease):
+        """Renew the lease every third of its lifetime until the returned event is set"""
+        stop = threading.Event()
+
+        def renew():
+            while not stop.wait(self.lease_seconds / 3):
+                if not self.renew(lease):
+                    logging.error(f"Lease on {lease.email} was lost; another worker may be using the account")
+                    return
+
+        threading.Thread(target=renew, name=f"lease-{lease.email}", daemon=True).start()
+        return stop
+
+    @contextmanager
+    def lease(self, holder=None, timeout=None):
+        """Hold an account (renewed in the background) for the duration of the block"""
+        lease = self.acquire(holder, timeout)
+        stop = self.keep_alive(lease)
+        try:
+            yield lease
+        finally:
+            stop.set()
+            self.release(lease)
+
+    def status(self):
+        with file_lock(self.lock_path):
+            leases = self._live_leases(self.clock())
+        return {"accounts": len(self.accounts), "leased": {email: entry["holder"] for email, entry in leases.items()}}
@@ -0,0 +1,261 @@
+"""
+Framework micro-benchmarks against the local stand-in site
+
+Measures the framework layers (driver creation, navigation, element lookup,
+fallback resolution, cart extraction and the full 8-step flow), keeps a JSON
+history and compares each run against a stored baseline.
+"""
+
+import json
+import time
+import logging
+import platform
+import subprocess
+from pathlib import Path
+from selenium.webdriver.common.by import By
+from config.config import Config
+from pages.base_page import BasePage
+from pages.login_page import LoginPage
+from pages.product_page import ProductPage
+from pages.cart_page import CartPage
+from utils.driver_factory import DriverFactory
+from utils.robust_driver_factory import RobustDriverFactory
+from utils.shopping_flow import ShoppingFlow
+from utils.emulation import Emulation, NO_EMULATION
+
+HISTORY_FILE = Path("reports/benchmark_history.json")
+MAX_RUNS_KEPT = 50
+
+
+def percentile(samples, fraction):
+    """Linear-interpolated percentile of a list of numbers"""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples):
+    """Summary statistics (ms) for one metric"""
+    return {
+        "n": len(samples),
+        "median": round(percentile(samples, 0.5), 3),
+        "p90": round(percentile(samples, 0.9), 3),
+        "p95": round(percentile(samples, 0.95), 3),
+        "min": round(min(samples), 3),
+        "max": round(max(samples), 3),
+    }
+
+
+class BenchmarkSuite:
+    """Repeat each measurement and collect per-metric summaries"""
+
+    # Equivalent locators for the header search box, one per locator style
+    LOOKUP_STYLES = {
+        "xpath": (By.XPATH, "//input[@type='search' or @placeholder='Search']"),
+        "css": (By.CSS_SELECTOR, "input[type='search']"),
+        "name": (By.NAME, "q"),
+        "tag": (By.TAG_NAME, "input"),
+    }
+
+    DRIVER_APPROACHES = {
+        "system_driver": RobustDriverFactory._try_system_driver,
+        "webdriver_manager": RobustDriverFactory._try_webdriver_manager,
+        "driver_factory": lambda browser: DriverFactory.create_driver(browser),
+    }
+
+    def __init__(self, base_url, repeat=5, warmup=1, browser=None, only=None):
+        self.base_url = base_url.rstrip("/")
+        self.repeat = repeat
+        self.warmup = warmup
+        self.browser = browser or Config.BROWSER.lower()
+        self.only = only or []
+        self.results = {}
+        self.errors = {}
+        # What the measured driver actually ran under, not just what was asked for
+        self.emulation = NO_EMULATION
+
+    def _selected(self, name):
+        return not self.only or any(name.startswith(prefix) for prefix in self.only)
+
+    def measure(self, name, action, setup=None, repeat=None):
+        """Time action() over warmup + repeat iterations, in milliseconds"""
+        if not self._selected(name):
+            return None
+        samples = []
+        try:
+            for iteration in range(self.warmup + (repeat or self.repeat)):
+                if setup:
+                    setup()
+                started = time.perf_counter()
+                action()
+                elapsed = (time.perf_counter() - started) * 1000
+                if iteration >= self.warmup:
+                    samples.append(elapsed)
+        except Exception as e:
+            logging.error(f"Benchmark {name} failed: {e}")
+            self.errors[name] = str(e)
+            return None
+        self.results[name] = summarize(samples)
+        logging.info(f"{name}: median {self.results[name]['median']} ms")
+        return self.results[name]
+
+    # -------------------------------------------------------------- metrics
+
+    def bench_driver_creation(self):
+        """Launch and quit a driver per creation approach"""
+        for approach, create in self.DRIVER_APPROACHES.items():
+            def launch(create=create, approach=approach):
+                driver = create(self.browser)
+                if not driver:
+                    raise Exception(f"{approach} returned no driver")
+                driver.quit()
+            # Browser launches dominate wall time, so keep this metric short
+            self.measure(f"driver_creation.{approach}", launch, repeat=min(self.repeat, 3))
+
+    def bench_navigation(self, driver):
+        page = BasePage(driver)
+        self.measure("navigation.home", lambda: page.navigate_to(self.base_url))
+        self.measure("navigation.search",
+                     lambda: page.navigate_to(f"{self.base_url}/search?q={Config.LAPTOP_SEARCH_TERM}"))
+
+    def bench_lookup(self, driver):
+        page = BasePage(driver)
+        page.navigate_to(self.base_url)
+        for style, locator in self.LOOKUP_STYLES.items():
+            self.measure(f"lookup.{style}", lambda locator=locator: page.find_element(locator))
+
+    def bench_fallback_resolution(self, driver):
+        """Resolve the first present locator of LoginPage's login strategies"""
+        page = LoginPage(driver)
+        page.navigate_to(self.base_url)
+        strategies = page.LOGIN_STRATEGIES
+
+        def resolve():
+            for strategy in strategies:
+                if page.is_element_present(strategy):
+                    return strategy
+            raise Exception("No login strategy resolved")
+
+        self.measure("fallback.login_strategies", resolve)
+
+    def bench_cart_extraction(self, driver):
+        """Read name and price for every cart row"""
+        product = ProductPage(driver)
+        cart = CartPage(driver)
+        if self._selected("cart.extract"):
+            for slug_term, match in ((Config.LAPTOP_SEARCH_TERM, ShoppingFlow.LAPTOP_MATCH),
+                                     (Config.WATCH_SEARCH_TERM, ShoppingFlow.WATCH_MATCH)):
+                flow = ShoppingFlow(driver, self.base_url)
+                flow._open_search_result(slug_term, match)
+                product.add_to_cart()
+        cart.navigate_to(f"{self.base_url}/cart")
+
+        def extract():
+            count = cart.get_cart_item_count()
+            details = [cart.get_item_details(index) for index in range(count)]
+            if not details:
+                raise Exception("Cart is empty")
+
+        self.measure("cart.extract", extract)
+
+    def bench_full_flow(self, driver):
+        """Run the 8-step flow from a fresh session"""
+        def fresh_session():
+            driver.get(self.base_url)
+            driver.delete_all_cookies()
+
+        def run_flow():
+            # A retried step would hide its failure inside the timing
+            results = ShoppingFlow(driver, self.base_url, retries=0).run()
+            failed = [result for result in results if not result["passed"]]
+            if failed:
+                raise Exception(f"Flow failed at step {failed[0]['step']}: {failed[0]['error']}")
+            if len(results) != len(ShoppingFlow.STEPS):
+                raise Exception(f"Flow ran {len(results)} of {len(ShoppingFlow.STEPS)} steps")
+
+        self.measure("flow.8_steps", run_flow, setup=fresh_session, repeat=min(self.repeat, 3))
+
+    def run(self, create_driver=None):
+        """Run every selected benchmark and return the metric summaries"""
+        self.bench_driver_creation()
+        driver = (create_driver or DriverFactory.create_driver)(self.browser)
+        self.emulation = Emulation.active(driver)
+        try:
+            self.bench_navigation(driver)
+            self.bench_lookup(driver)
+            self.bench_fallback_resolution(driver)
+            self.bench_cart_extraction(driver)
+            self.bench_full_flow(driver)
+        finally:
+            driver.quit()
+        return self.results
+
+
+class BenchmarkHistory:
+    """JSON history of benchmark runs plus the stored baseline"""
+
+    def __init__(self, path=HISTORY_FILE):
+        self.path = Path(path)
+        self.data = {"baseline": None, "runs": []}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as handle:
+                self.data = json.load(handle)
+
+    @staticmethod
+    def _git_revision():
+        try:
+            return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                  text=True, timeout=5).stdout.strip() or None
+        except Exception:
+            return None
+
+    @staticmethod
+    def _baseline_key(emulation):
+        # Runs under network/CPU emulation are compared with their own baseline
+        return "baseline" if emulation == NO_EMULATION else f"baseline:{emulation}"
+
+    def record(self, metrics, errors=None, update_baseline=False, emulation=NO_EMULATION):
+        """Append a run and optionally make it the new baseline; `emulation` is the tag the driver ran under"""
+        run = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": self._git_revision(),
+            "host": platform.node(),
+            "browser": Config.BROWSER,
+            "emulation": emulation,
+            "metrics": metrics,
+            "errors": errors or {},
+        }
+        self.data["runs"] = (self.data["runs"] + [run])[-MAX_RUNS_KEPT:]
+        key = self._baseline_key(emulation)
+        if update_baseline or not self.data.get(key):
+            self.data[key] = {"timestamp": run["timestamp"], "revision": run["revision"],
+                              "emulation": run["emulation"], "metrics": metrics}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as handle:
+            json.dump(self.data, handle, indent=2)
+        return run
+
+    def compare(self, metrics, threshold=0.25, min_delta_ms=5.0, emulation=NO_EMULATION):
+        """Return (metric, baseline median, current median, ratio) for regressions"""
+        baseline = (self.data.get(self._baseline_key(emulation)) or {}).get("metrics", {})
+        regressions = []
+        for name, current in metrics.items():
+            reference = baseline.get(name)
+            if not reference:
+                continue
+            delta = current["median"] - reference["median"]
+            # Tiny metrics jitter by whole milliseconds; require an absolute delta too
+            if delta > min_delta_ms and current["median"] > reference["median"] * (1 + threshold):
+                regressions.append((name, reference["median"], current["median"],
+                                    round(current["median"] / reference["median"], 2)))
+        return regressions
+
+    def missing(self, metrics, only=None, emulation=NO_EMULATION):
+        """Baseline metrics (within the `only` name prefixes) that this run did not produce"""
+        baseline = (self.data.get(self._baseline_key(emulation)) or {}).get("metrics", {})
+        return sorted(name for name in baseline if name not in metrics
+                      and (not only or any(name.startswith(prefix) for prefix in only)))
@@ -0,0 +1,211 @@
+"""
+Host capacity planner for concurrent browser sessions
+
+Ramps the number of concurrent DriverFactory sessions, each running the
+reference ShoppingFlow on a local target, and measures per-session RSS of
+the driver/browser process trees, host CPU, step latency and failure rate at
+every level. The highest level that stays within the limits (and fits in
+available memory) is written to config/capacity.json, where Config reads the
+PARALLEL_WORKERS and DRIVER_POOL_SIZE defaults.
+"""
+
+import json
+import time
+import logging
+import platform
+import threading
+from pathlib import Path
+import psutil
+from config.config import CAPACITY_FILE
+from utils.benchmark import percentile
+from utils.driver_factory import DriverFactory
+from utils.shopping_flow import ShoppingFlow
+
+DEFAULT_LEVELS = [1, 2, 4, 6, 8]
+
+
+def driver_processes(driver):
+    """psutil processes of a driver service and the browser it launched"""
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    if process is None:
+        return []
+    try:
+        root = psutil.Process(process.pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def tree_rss(processes):
+    """Summed resident memory (bytes) of live processes"""
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            continue
+    return total
+
+
+class CapacityPlanner:
+    """Measure each concurrency level and recommend a maximum parallelism"""
+
+    def __init__(self, base_url, levels=None, iterations=1, browser_name=None, create_driver=None,
+                 max_failure_rate=0.05, max_latency_factor=2.0, max_cpu_percent=90.0,
+                 memory_headroom=0.2, sample_interval=0.5):
+        self.base_url = base_url.rstrip("/")
+        self.levels = levels or DEFAULT_LEVELS
+        self.iterations = iterations
+        self.create_driver = create_driver or (lambda: DriverFactory.create_driver(browser_name))
+        self.max_failure_rate = max_failure_rate
+        self.max_latency_factor = max_latency_factor
+        self.max_cpu_percent = max_cpu_percent
+        self.memory_headroom = memory_headroom
+        self.sample_interval = sample_interval
+        self.results = []
+
+    def _session(self, index, level, record):
+        """One concurrent session: create a driver and run the reference flow"""
+        driver = None
+        try:
+            started = time.perf_counter()
+            driver = self.create_driver()
+            record["startup_ms"].append((time.perf_counter() - started) * 1000)
+            with record["lock"]:
+                record["processes"].extend(driver_processes(driver))
+            # Failures are a capacity limit, so steps are not retried
+            flow = ShoppingFlow(driver, base_url=self.base_url, email=f"capacity-{level}-{index}@example.com",
+                                retries=0)
+            for _ in range(self.iterations):
+                driver.delete_all_cookies()
+                for result in flow.run():
+                    record["steps"].append(result)
+        except Exception as e:
+            logging.error(f"Capacity session {index} at level {level} failed: {e}")
+            record["session_errors"].append(str(e))
+        finally:
+            if driver:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+
+    def _sample(self, record, done):
+        psutil.cpu_percent(interval=None)
+        while not done.wait(self.sample_interval):
+            with record["lock"]:
+                processes = list(record["processes"])
+            record["rss"].append(tree_rss(processes))
+            record["cpu"].append(psutil.cpu_percent(interval=None))
+
+    def measure_level(self, level):
+        """Run `level` concurrent sessions and summarise resources and latency"""
+        record = {"lock": threading.Lock(), "processes": [], "steps": [], "session_errors": [],
+                  "startup_ms": [], "rss": [], "cpu": []}
+        done = threading.Event()
+        sampler = threading.Thread(target=self._sample, args=(record, done), daemon=True)
+        sampler.start()
+        started = time.perf_counter()
+        sessions = [threading.Thread(target=self._session, args=(index, level, record), daemon=True)
+                    for index in range(level)]
+        for session in sessions:
+            session.start()
+        for session in sessions:
+            session.join()
+        done.set()
+        sampler.join()
+
+        steps = record["steps"]
+        latencies = [step["duration_ms"] for step in steps if step["passed"]]
+        failed_steps = sum(1 for step in steps if not step["passed"])
+        expected_steps = level * self.iterations * len(ShoppingFlow.STEPS)
+        # Steps never reached after a failure or a session crash count as failures
+        failures = failed_steps + max(0, expected_steps - len(steps))
+        peak_rss = max(record["rss"], default=0)
+        result = {
+            "level": level,
+            "elapsed_s": round(time.perf_counter() - started, 2),
+            "sessions_failed": len(record["session_errors"]),
+            "failure_rate": round(failures / expected_steps, 4) if expected_steps else 0.0,
+            "step_p50_ms": round(percentile(latencies, 0.5), 1) if latencies else None,
+            "step_p95_ms": round(percentile(latencies, 0.95), 1) if latencies else None,
+            "startup_p95_ms": round(percentile(record["startup_ms"], 0.95), 1) if record["startup_ms"] else None,
+            "peak_rss_mb": round(peak_rss / 2 ** 20, 1),
+            "rss_per_session_mb": round(peak_rss / level / 2 ** 20, 1) if peak_rss else None,
+            "cpu_mean_percent": round(sum(record["cpu"]) / len(record["cpu"]), 1) if record["cpu"] else None,
+            "cpu_peak_percent": max(record["cpu"], default=None),
+            "errors": record["session_errors"][:5],
+        }
+        logging.info(f"Capacity level {level}: failure rate {result['failure_rate']}, "
+                     f"step p95 {result['step_p95_ms']} ms, {result['rss_per_session_mb']} MB/session, "
+                     f"CPU {result['cpu_mean_percent']}%")
+        return result
+
+    def within_limits(self, result, baseline):
+        """Reason a level is over the limits, or None when it is acceptable"""
+        if result["failure_rate"] > self.max_failure_rate:
+            return f"failure rate {result['failure_rate']:.1%} > {self.max_failure_rate:.1%}"
+        if baseline and baseline.get("step_p95_ms") and result["step_p95_ms"]:
+            factor = result["step_p95_ms"] / baseline["step_p95_ms"]
+            if factor > self.max_latency_factor:
+                return f"step p95 {factor:.1f}x the single-session baseline"
+        if result["cpu_mean_percent"] is not None and result["cpu_mean_percent"] > self.max_cpu_percent:
+            return f"mean CPU {result['cpu_mean_percent']}% > {self.max_cpu_percent}%"
+        return None
+
+    def memory_cap(self, rss_per_session_mb, available_bytes=None):
+        """Sessions that fit in available memory after the headroom, or None if unmeasured"""
+        if not rss_per_session_mb:
+            return None
+        available = available_bytes if available_bytes is not None else psutil.virtual_memory().available
+        return max(1, int(available * (1 - self.memory_headroom) / (rss_per_session_mb * 2 ** 20)))
+
+    def recommend(self, results, available_bytes=None):
+        """Highest acceptable level, capped by memory; (recommendation, reason)"""
+        recommended, reason = 0, "no level completed"
+        baseline = results[0] if results else None
+        for result in results:
+            problem = self.within_limits(result, baseline)
+            if problem:
+                reason = f"level {result['level']}: {problem}"
+                break
+            recommended = result["level"]
+            reason = "all measured levels within limits"
+        per_session = max((result["rss_per_session_mb"] or 0 for result in results), default=0)
+        cap = self.memory_cap(per_session, available_bytes)
+        if cap is not None and cap < recommended:
+            recommended, reason = cap, f"memory: {per_session} MB per session"
+        return max(1, recommended), reason
+
+    def run(self):
+        """Measure levels in order, stopping after the first one over the limits"""
+        self.results = []
+        for level in self.levels:
+            result = self.measure_level(level)
+            self.results.append(result)
+            if self.within_limits(result, self.results[0]):
+                break
+        recommended, reason = self.recommend(self.results)
+        return {
+            "parallel_workers": recommended,
+            "driver_pool_size": recommended,
+            "reason": reason,
+            "measured_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "host": {
+                "hostname": platform.node(),
+                "cpus": psutil.cpu_count(logical=True),
+                "memory_total_mb": round(psutil.virtual_memory().total / 2 ** 20),
+            },
+            "target": self.base_url,
+            "levels": self.results,
+        }
+
+    @staticmethod
+    def write(plan, path=CAPACITY_FILE):
+        """Store the plan where Config reads its parallelism defaults"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(plan, indent=2))
+        logging.info(f"Capacity plan written to {path}")
+        return path
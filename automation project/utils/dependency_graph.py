@@ -0,0 +1,205 @@
+"""
+Static dependency graph of the project's modules, tests and flow steps
+
+Imports are read with ast (nothing is executed). A change to a module
+impacts every module that imports it, transitively. Tests and ShoppingFlow
+steps are resolved at name level: a test method or step is impacted when
+it, a helper method it calls on self, an attribute it uses from __init__,
+or a conftest fixture it requests refers to a name bound to an impacted
+module. Steps that only use the home page are therefore not re-run when
+pages/login_page.py changes.
+"""
+
+import ast
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SKIP_DIRS = {"__pycache__", "logs", "reports", "screenshots", ".pytest_cache", "venv", ".venv"}
+# Non-Python files whose edits behave like a change to a module
+DATA_FILES = {"config": "config.config"}
+
+
+def module_name(path, root=PROJECT_ROOT):
+    """Dotted module name of a project file ("pages/login_page.py" -> "pages.login_page")"""
+    parts = list(Path(path).resolve().relative_to(root).with_suffix("").parts)
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join(parts)
+
+
+def _names_in(node):
+    """Bare names and self attributes referenced anywhere under an AST node"""
+    names, self_attrs = set(), set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            names.add(child.id)
+        elif isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name) and child.value.id == "self":
+            self_attrs.add(child.attr)
+    return names, self_attrs
+
+
+class ModuleInfo:
+    """Imports and per-function references of one source file"""
+
+    def __init__(self, name, path, tree, known_modules):
+        self.name = name
+        self.path = path
+        self.bindings = {}
+        self.imports = set()
+        self.functions = {}
+        self.classes = {}
+        package = name if path.name == "__init__.py" else name.rpartition(".")[0]
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    self.imports.add(alias.name)
+                    self.bindings[alias.asname or alias.name.split(".")[0]] = alias.name
+            elif isinstance(node, ast.ImportFrom):
+                base = node.module or ""
+                if node.level:
+                    anchor = package.split(".")[:len(package.split(".")) - node.level + 1] if package else []
+                    base = ".".join(part for part in anchor + [base] if part)
+                for alias in node.names:
+                    submodule = f"{base}.{alias.name}"
+                    target = submodule if submodule in known_modules else base
+                    self.imports.add(target)
+                    self.bindings[alias.asname or alias.name] = target
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.functions[node.name] = node
+            elif isinstance(node, ast.ClassDef):
+                self.classes[node.name] = {item.name: item for item in node.body
+                                           if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))}
+
+    def method_names(self, class_name, method_name):
+        """Names a method refers to, following self.helper() calls and self.attr set in __init__"""
+        methods = self.classes[class_name]
+        init_attrs = {}
+        if "__init__" in methods:
+            for node in ast.walk(methods["__init__"]):
+                if isinstance(node, ast.Assign):
+                    for target in node.targets:
+                        if isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name) \
+                                and target.value.id == "self":
+                            init_attrs[target.attr] = _names_in(node.value)[0]
+        names, seen, pending = set(), set(), [method_name]
+        while pending:
+            current = pending.pop()
+            if current in seen or current not in methods:
+                continue
+            seen.add(current)
+            found, self_attrs = _names_in(methods[current])
+            names |= found
+            for attr in self_attrs:
+                if attr in methods:
+                    pending.append(attr)
+                names |= init_attrs.get(attr, set())
+            # Fixture arguments of test methods
+            names |= {arg.arg for arg in methods[current].args.args}
+        return names
+
+
+class DependencyGraph:
+    """Module import graph with name-level impact for tests and flow steps"""
+
+    def __init__(self, root=PROJECT_ROOT, test_dir="tests"):
+        self.root = Path(root).resolve()
+        self.test_dir = test_dir
+        self.modules = {}
+        self.importers = {}
+        self.build()
+
+    def _sources(self):
+        for path in sorted(self.root.rglob("*.py")):
+            if not SKIP_DIRS.intersection(path.relative_to(self.root).parts):
+                yield path
+
+    def build(self):
+        """Parse every project module; files that do not parse are skipped"""
+        paths = {module_name(path, self.root): path for path in self._sources()}
+        self.modules, self.importers = {}, {}
+        for name, path in paths.items():
+            try:
+                tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+            except (SyntaxError, UnicodeDecodeError):
+                continue
+            self.modules[name] = ModuleInfo(name, path, tree, paths)
+        for name, info in self.modules.items():
+            for imported in info.imports:
+                if imported in self.modules:
+                    self.importers.setdefault(imported, set()).add(name)
+        return self
+
+    def changed_modules(self, paths):
+        """Module names for changed files (data files map to the module that reads them)"""
+        names = set()
+        for path in paths:
+            path = (self.root / path).resolve()
+            if path.suffix == ".py":
+                names.add(module_name(path, self.root))
+            else:
+                folder = path.parent.relative_to(self.root).parts[:1]
+                if folder and folder[0] in DATA_FILES:
+                    names.add(DATA_FILES[folder[0]])
+        return names
+
+    def impacted_modules(self, paths):
+        """Changed modules plus everything that imports them, transitively"""
+        impacted = set()
+        pending = list(self.changed_modules(paths))
+        while pending:
+            name = pending.pop()
+            if name in impacted:
+                continue
+            impacted.add(name)
+            pending.extend(self.importers.get(name, ()))
+        return impacted
+
+    def _refers_to(self, info, names, impacted):
+        return any(info.bindings.get(name) in impacted for name in names)
+
+    def _fixture_names(self, impacted):
+        """conftest fixtures whose bodies refer to impacted modules"""
+        conftest = self.modules.get("conftest")
+        if not conftest:
+            return set()
+        return {name for name, node in conftest.functions.items()
+                if self._refers_to(conftest, _names_in(node)[0], impacted)}
+
+    def impacted_tests(self, paths):
+        """pytest node ids of the tests that depend on the changed files"""
+        impacted = self.impacted_modules(paths)
+        changed = self.changed_modules(paths)
+        fixtures = self._fixture_names(impacted)
+        selected = []
+        for name, info in sorted(self.modules.items()):
+            if not (name.startswith(f"{self.test_dir}.") and info.path.name.startswith("test_")):
+                continue
+            relative = info.path.relative_to(self.root).as_posix()
+            if name in changed or "conftest" in changed:
+                selected.append(relative)
+                continue
+            if name not in impacted and not fixtures:
+                continue
+            for class_name, methods in info.classes.items():
+                for method_name in methods:
+                    if not method_name.startswith("test"):
+                        continue
+                    names = info.method_names(class_name, method_name)
+                    if self._refers_to(info, names, impacted) or names & fixtures:
+                        selected.append(f"{relative}::{class_name}::{method_name}")
+            for function_name, node in info.functions.items():
+                if function_name.startswith("test"):
+                    names = _names_in(node)[0] | {arg.arg for arg in node.args.args}
+                    if self._refers_to(info, names, impacted) or names & fixtures:
+                        selected.append(f"{relative}::{function_name}")
+        return selected
+
+    def impacted_methods(self, module, class_name, paths, prefix=""):
+        """Methods of one class (e.g. ShoppingFlow step_*) that depend on the changed files"""
+        info = self.modules[module]
+        impacted = self.impacted_modules(paths)
+        if module in self.changed_modules(paths):
+            return [name for name in info.classes[class_name] if name.startswith(prefix)]
+        return [name for name in info.classes[class_name]
+                if name.startswith(prefix) and self._refers_to(info, info.method_names(class_name, name), impacted)]
@@ -10,12 +10,45 @@ from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from config.config import Config
 import logging
 from pathlib import Path
+from .overlay_guard import OverlayGuard
+from .emulation import Emulation
 from .robust_driver_factory import RobustDriverFactory
 
 class DriverFactory:
     @staticmethod
     def create_driver(browser_name=None):
         """Create and return a WebDriver instance using robust approach"""
+        # Unknown or clashing EMULATION profiles fail before a browser is launched
+        Emulation.resolve()
+        driver = DriverFactory._create_driver(browser_name)
+        try:
+            return DriverFactory.apply_profile(driver)
+        except Exception:
+            driver.quit()
+            raise
+    
+    @staticmethod
+    def apply_profile(driver):
+        """Apply the active profile's timeouts, resource blocking and emulation to a started driver"""
+        # Lookups wait explicitly against the step's budget (utils.wait_budget); an implicit
+        # wait would stall every missed find_element on top of that
+        driver.implicitly_wait(0)
+        driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+        if Config.BLOCK_RESOURCES:
+            if hasattr(driver, "execute_cdp_cmd"):
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": Config.BLOCK_RESOURCES})
+            else:
+                logging.info(f"Resource blocking needs a Chromium browser; not applied to {driver.name}")
+        Emulation.apply(driver)
+        if Config.OVERLAY_GUARD:
+            OverlayGuard.install(driver)
+        logging.info(f"Driver configured for profile {Config.PROFILE}")
+        return driver
+    
+    @staticmethod
+    def _create_driver(browser_name=None):
+        """Create a WebDriver with the robust factory, falling back to per-browser setup"""
         try:
             # Try the robust driver factory first
             return RobustDriverFactory.create_driver(browser_name)
@@ -57,9 +90,7 @@ class DriverFactory:
         """Create Chrome driver with options"""
         try:
             chrome_options = Options()
-            
-            if Config.HEADLESS:
-                chrome_options.add_argument("--headless")
+            RobustDriverFactory.apply_profile_options(chrome_options)
             
             # Common Chrome options for better stability
             chrome_options.add_argument("--no-sandbox")
@@ -104,7 +135,6 @@ class DriverFactory:
                 logging.error(f"Chrome driver setup failed: {e}")
                 raise
             driver = webdriver.Chrome(service=service, options=chrome_options)
-            driver.implicitly_wait(Config.IMPLICIT_WAIT)
             driver.maximize_window()
             
             logging.info("Chrome driver created successfully")
@@ -119,16 +149,13 @@ class DriverFactory:
         """Create Firefox driver with options"""
         try:
             firefox_options = FirefoxOptions()
-            
-            if Config.HEADLESS:
-                firefox_options.add_argument("--headless")
+            RobustDriverFactory.apply_profile_options(firefox_options)
             
             firefox_options.add_argument("--width=1920")
             firefox_options.add_argument("--height=1080")
             
             service = Service(GeckoDriverManager().install())
             driver = webdriver.Firefox(service=service, options=firefox_options)
-            driver.implicitly_wait(Config.IMPLICIT_WAIT)
             driver.maximize_window()
             
             logging.info("Firefox driver created successfully")
@@ -143,9 +170,7 @@ class DriverFactory:
         """Create Edge driver with options"""
         try:
             edge_options = EdgeOptions()
-            
-            if Config.HEADLESS:
-                edge_options.add_argument("--headless")
+            RobustDriverFactory.apply_profile_options(edge_options)
             
             # Common Edge options for better stability
             edge_options.add_argument("--no-sandbox")
@@ -186,7 +211,6 @@ class DriverFactory:
                 logging.error(f"Edge driver setup failed: {e}")
                 raise
             driver = webdriver.Edge(service=service, options=edge_options)
-            driver.implicitly_wait(Config.IMPLICIT_WAIT)
             driver.maximize_window()
             
             logging.info("Edge driver created successfully")
@@ -0,0 +1,127 @@
+"""
+Pool of warm, optionally logged-in WebDriver sessions
+
+Browsers are launched (in parallel) and signed in once, then leased to tests
+and returned. A session that stops responding is replaced on the next
+lease. While a pool is active (DriverPool.active), the conftest driver
+fixtures lease from it instead of launching a browser per test.
+"""
+
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from config.config import Config
+from pages.login_page import LoginPage
+from utils.driver_factory import DriverFactory
+
+
+def sign_in(driver):
+    """Warm-up: open the storefront and log in with the configured account"""
+    driver.get(Config.BASE_URL)
+    if not LoginPage(driver).login(Config.EMAIL, Config.PASSWORD):
+        logging.warning("Warm-up login failed; the pooled driver is not signed in")
+
+
+class DriverPool:
+    """Fixed-size pool of started drivers leased one test at a time"""
+
+    active = None
+
+    def __init__(self, size=None, create_driver=None, warm_up=sign_in):
+        self.size = size or Config.DRIVER_POOL_SIZE
+        self.create_driver = create_driver or DriverFactory.create_driver
+        self.warm_up = warm_up
+        self.idle = queue.Queue()
+        self.leased = 0
+        self.replaced = 0
+        self._lock = threading.Lock()
+
+    def _new_driver(self):
+        driver = self.create_driver()
+        if self.warm_up:
+            try:
+                self.warm_up(driver)
+            except Exception as e:
+                logging.warning(f"Driver warm-up failed: {e}")
+        return driver
+
+    def start(self):
+        """Launch and warm every driver in parallel; becomes DriverPool.active"""
+        errors = []
+
+        def launch():
+            try:
+                self.idle.put(self._new_driver())
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=launch, daemon=True) for _ in range(self.size)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if self.idle.empty():
+            raise Exception(f"Driver pool could not start any driver: {errors[0] if errors else 'unknown'}")
+        if errors:
+            logging.warning(f"Driver pool started {self.idle.qsize()} of {self.size} drivers: {errors[0]}")
+        DriverPool.active = self
+        logging.info(f"Driver pool ready with {self.idle.qsize()} warm drivers")
+        return self
+
+    @staticmethod
+    def _healthy(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout=None):
+        """Take an idle driver, replacing it if the session died"""
+        driver = self.idle.get(timeout=timeout)
+        if not self._healthy(driver):
+            logging.warning("Pooled driver stopped responding; launching a replacement")
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            driver = self._new_driver()
+            self.replaced += 1
+        with self._lock:
+            self.leased += 1
+        return driver
+
+    def release(self, driver):
+        """Close windows the test opened and return the driver (cookies and login kept)"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+        except Exception as e:
+            logging.warning(f"Could not reset pooled driver: {e}")
+        self.idle.put(driver)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def status(self):
+        return {"size": self.size, "idle": self.idle.qsize(), "leased": self.leased, "replaced": self.replaced}
+
+    def close(self):
+        """Quit every idle driver and deactivate the pool"""
+        while not self.idle.empty():
+            driver = self.idle.get_nowait()
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        if DriverPool.active is self:
+            DriverPool.active = None
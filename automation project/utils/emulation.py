@@ -0,0 +1,81 @@
+"""
+Network and CPU emulation for performance-under-constraint runs
+
+EMULATION names profiles from config.EMULATION_PROFILES, e.g.
+EMULATION=slow-4g,cpu-4x. DriverFactory.apply_profile applies them to every
+new Chromium driver through CDP (Network.emulateNetworkConditions and
+Emulation.setCPUThrottlingRate). At most one network profile and one CPU
+profile can be combined.
+
+The applied profile is kept on the driver as `driver.emulation` ("none" when
+nothing is emulated), and page metrics, flow step results and benchmark
+history are tagged with it, so slow-shopper runs are compared only with
+each other.
+"""
+
+import logging
+from config.config import Config, EMULATION_PROFILES
+
+NO_EMULATION = "none"
+
+
+class Emulation:
+    """Resolve EMULATION profiles and apply them to a driver"""
+
+    @staticmethod
+    def resolve(names=None):
+        """{"network": {...} or None, "cpu": rate} for profile names; ValueError on unknown or clashing names"""
+        names = Config.EMULATION if names is None else names
+        settings = {"network": None, "cpu": 1}
+        for name in names:
+            if name not in EMULATION_PROFILES:
+                raise ValueError(f"Unknown emulation profile '{name}' (available: {', '.join(EMULATION_PROFILES)})")
+            profile = EMULATION_PROFILES[name]
+            if "network" in profile:
+                if settings["network"] is not None:
+                    raise ValueError(f"Emulation combines two network profiles: {', '.join(names)}")
+                settings["network"] = profile["network"]
+            if "cpu" in profile:
+                if settings["cpu"] != 1:
+                    raise ValueError(f"Emulation combines two CPU profiles: {', '.join(names)}")
+                settings["cpu"] = profile["cpu"]
+        return settings
+
+    @staticmethod
+    def tag(names=None):
+        """Report tag of the profiles, e.g. "slow-4g+cpu-4x", or "none\""""
+        names = Config.EMULATION if names is None else names
+        return "+".join(names) or NO_EMULATION
+
+    @staticmethod
+    def active(driver):
+        """Tag of the emulation applied to a driver"""
+        return getattr(driver, "emulation", NO_EMULATION)
+
+    @staticmethod
+    def apply(driver, names=None):
+        """Emulate the profiles on a Chromium driver; True when applied"""
+        names = Config.EMULATION if names is None else names
+        settings = Emulation.resolve(names)
+        driver.emulation = NO_EMULATION
+        if not names:
+            return False
+        if not hasattr(driver, "execute_cdp_cmd"):
+            logging.info(f"Emulation needs a Chromium browser; {Emulation.tag(names)} not applied to {driver.name}")
+            return False
+        try:
+            network = settings["network"]
+            if network:
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+                    "offline": False, "latency": network["latency"],
+                    "downloadThroughput": network["download"], "uploadThroughput": network["upload"],
+                })
+            if settings["cpu"] != 1:
+                driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": settings["cpu"]})
+        except Exception as e:
+            logging.warning(f"Emulation {Emulation.tag(names)} not applied: {e}")
+            return False
+        driver.emulation = Emulation.tag(names)
+        logging.info(f"Emulating {driver.emulation}")
+        return True
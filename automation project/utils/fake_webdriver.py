@@ -0,0 +1,1004 @@
+"""
+In-process fake WebDriver over a parsed HTML DOM
+
+Implements the part of the Selenium surface the page objects and helpers use
+(find_element(s), explicit waits, clicks and typing with form state, form
+submission, window handles, cookies and the common execute_script snippets)
+on lxml documents, so LoginPage, ProductPage and CartPage logic can be
+unit-tested without a browser. The page objects' own scripts are answered
+by handlers that return what the script returns in a browser; both sides of
+each contract are tested in tests/test_page_scripts.py.
+
+Documents come either from a site object with a StandInSite-style
+handle(method, path, query, form, session_id) method, or from static
+snapshots mapped by URL. VirtualClock makes fixed sleeps and WebDriverWait
+timeouts advance virtual time instead of blocking, per thread.
+
+Network emulation set through execute_cdp_cmd is modelled by sleeping one
+round trip plus the transfer time of each request; CPU throttling is only
+recorded.
+"""
+
+import re
+import json
+import time
+import base64
+import logging
+import itertools
+import threading
+from html import escape
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit, urlunsplit, urlencode, parse_qsl
+from lxml import etree, html
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import (
+    NoSuchElementException, StaleElementReferenceException, NoSuchWindowException,
+    NoSuchFrameException, NoAlertPresentException, ElementNotInteractableException,
+    InvalidSelectorException, WebDriverException
+)
+from utils.locator_engine import compile_locator
+from pages.cart_page import CLEAR_CART_SCRIPT, SEED_CART_SCRIPT
+from pages.search_results_page import RESULTS_SCRIPT, SCAN_SCRIPT
+from utils.soak import SAMPLE_SCRIPT
+from utils.stand_in_site import SESSION_COOKIE
+
+DEFAULT_BASE_URL = "http://stand-in.local"
+BLANK_PAGE = "<html><head></head><body></body></html>"
+NOT_FOUND_PAGE = "<html><head><title>404 Not Found</title></head><body><h1>Not Found</h1></body></html>"
+MAX_REDIRECTS = 10
+USER_AGENT = "Mozilla/5.0 (FakeWebDriver)"
+
+# 1x1 transparent PNG returned for screenshots
+BLANK_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+NOT_RENDERED = {"head", "script", "style", "title", "meta", "link", "template", "noscript"}
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+    "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "tr", "ul",
+}
+SUBMIT_TYPES = {"submit", "image"}
+
+_SCOPED_XPATH = {
+    By.ID: ".//*[@id=$value]",
+    By.NAME: ".//*[@name=$value]",
+    By.LINK_TEXT: ".//a[normalize-space(.)=$value]",
+    By.PARTIAL_LINK_TEXT: ".//a[contains(., $value)]",
+}
+_LOCATION_ASSIGNMENT = re.compile(r"(?:window\.|document\.)?location(?:\.href)?\s*=\s*['\"]([^'\"]+)['\"]")
+_DISPLAY_NONE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden")
+
+
+def _tag(node):
+    return node.tag.lower() if isinstance(node.tag, str) else ""
+
+
+def _is_rendered_self(node):
+    """False when the node itself would not be rendered"""
+    tag = _tag(node)
+    if tag in NOT_RENDERED or node.get("hidden") is not None:
+        return False
+    if tag == "input" and (node.get("type") or "").lower() == "hidden":
+        return False
+    return not _DISPLAY_NONE.search(node.get("style") or "")
+
+
+def _is_rendered(node):
+    """False when the node or an ancestor would not be rendered"""
+    return all(_is_rendered_self(current) for current in itertools.chain([node], node.iterancestors()))
+
+
+def _visible_text(node):
+    """Rendered text of a node, with block elements on their own lines"""
+    parts = []
+
+    def walk(current):
+        if not isinstance(current.tag, str) or not _is_rendered_self(current):
+            return
+        block = _tag(current) in BLOCK_TAGS
+        if block:
+            parts.append("\n")
+        if current.text:
+            parts.append(current.text)
+        for child in current:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if block:
+            parts.append("\n")
+
+    if not _is_rendered(node):
+        return ""
+    walk(node)
+    lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _find_nodes(root, by, value, scoped):
+    """Evaluate a locator on a document root or, when scoped, below an element"""
+    try:
+        if not scoped:
+            nodes = compile_locator((by, value))(root)
+        elif by == By.XPATH:
+            nodes = root.xpath(value)
+        elif by in _SCOPED_XPATH:
+            nodes = etree.XPath(_SCOPED_XPATH[by])(root, value=value)
+        else:
+            nodes = [node for node in compile_locator((by, value))(root) if node is not root]
+    except (etree.XPathError, SyntaxError, ValueError) as e:
+        raise InvalidSelectorException(f"Invalid locator ({by}, {value}): {e}")
+    if not isinstance(nodes, list):
+        nodes = []
+    if any(not isinstance(node, etree._Element) for node in nodes):
+        raise InvalidSelectorException(f"Locator does not select elements: ({by}, {value})")
+    return [node for node in nodes if isinstance(node.tag, str)]
+
+
+class VirtualClock:
+    """Make time.sleep and time.monotonic virtual for the threads that enter the clock
+
+    Sleeps advance the clock instead of blocking, so fixed sleeps and
+    WebDriverWait timeouts take no wall time; other threads keep real time.
+    """
+
+    _lock = threading.Lock()
+    _active = {}
+    _saved = None
+
+    def __init__(self):
+        self.offset = 0.0
+
+    @staticmethod
+    def _sleep(seconds):
+        clock = VirtualClock._active.get(threading.get_ident())
+        if clock is None:
+            return VirtualClock._saved[0](seconds)
+        clock.offset += max(0.0, seconds)
+
+    @staticmethod
+    def _monotonic():
+        clock = VirtualClock._active.get(threading.get_ident())
+        return VirtualClock._saved[1]() + (clock.offset if clock else 0.0)
+
+    def __enter__(self):
+        with VirtualClock._lock:
+            if not VirtualClock._active:
+                VirtualClock._saved = (time.sleep, time.monotonic)
+                time.sleep, time.monotonic = VirtualClock._sleep, VirtualClock._monotonic
+            VirtualClock._active[threading.get_ident()] = self
+        return self
+
+    def __exit__(self, *exc_info):
+        with VirtualClock._lock:
+            VirtualClock._active.pop(threading.get_ident(), None)
+            if not VirtualClock._active:
+                time.sleep, time.monotonic = VirtualClock._saved
+        return False
+
+
+class _Window:
+    """One browsing context: its history and current document"""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.history = []
+        self.index = -1
+        self.url = "about:blank"
+        self.document = html.document_fromstring(BLANK_PAGE)
+        self.generation = 0
+
+
+class FakeWebElement(WebElement):
+    """WebElement backed by an lxml node of the current document"""
+
+    def __init__(self, driver, node, window, generation):
+        path = node.getroottree().getpath(node)
+        super().__init__(driver, f"{window.handle}:{generation}:{path}")
+        self._node = node
+        self._window = window
+        self._generation = generation
+
+    def __repr__(self):
+        return f"<FakeWebElement {self._node.tag} id={self._id}>"
+
+    def _live(self):
+        """Return the node, raising like a browser when its document is gone"""
+        if self._window.generation != self._generation or self._window.handle not in self._parent._windows:
+            raise StaleElementReferenceException(f"Element {self._id} is no longer attached to the DOM")
+        return self._node
+
+    def _interactable(self):
+        node = self._live()
+        if not _is_rendered(node):
+            raise ElementNotInteractableException(f"Element <{node.tag}> is not displayed")
+        return node
+
+    @property
+    def tag_name(self):
+        return _tag(self._live())
+
+    @property
+    def text(self):
+        return _visible_text(self._live())
+
+    @property
+    def location(self):
+        self._live()
+        return {"x": 0, "y": 0}
+
+    @property
+    def size(self):
+        self._live()
+        return {"width": 100, "height": 20}
+
+    @property
+    def rect(self):
+        return {**self.location, **self.size}
+
+    @property
+    def location_once_scrolled_into_view(self):
+        return self.location
+
+    def get_dom_attribute(self, name):
+        return self._live().get(name)
+
+    def get_property(self, name):
+        node = self._live()
+        tag = _tag(node)
+        if name == "value":
+            if tag == "textarea":
+                return node.text or ""
+            if tag == "select":
+                selected = self._selected_options(node)
+                return selected[0].get("value", selected[0].text_content()) if selected else ""
+            if tag in ("input", "button", "option"):
+                return node.get("value", "on" if (node.get("type") or "") in ("checkbox", "radio") else "")
+        if name in ("checked", "selected", "disabled", "hidden", "required", "readOnly"):
+            return node.get(name.lower()) is not None
+        if name == "textContent":
+            return node.text_content()
+        if name == "innerText":
+            return _visible_text(node)
+        if name == "outerHTML":
+            return etree.tostring(node, method="html", encoding="unicode", with_tail=False)
+        if name == "innerHTML":
+            return (node.text or "") + "".join(
+                etree.tostring(child, method="html", encoding="unicode") for child in node
+            )
+        if name in ("href", "src", "action") and node.get(name) is not None:
+            return urljoin(self._window.url, node.get(name))
+        if name == "tagName":
+            return node.tag.upper()
+        if name == "className":
+            return node.get("class", "")
+        return node.get(name)
+
+    def get_attribute(self, name):
+        """Property when the node has one (like Selenium's getAttribute atom), else the attribute"""
+        value = self.get_property(name)
+        if isinstance(value, bool):
+            return "true" if value else None
+        return value if value is not None else self._node.get(name)
+
+    def is_displayed(self):
+        return _is_rendered(self._live())
+
+    def is_enabled(self):
+        return self._live().get("disabled") is None
+
+    def is_selected(self):
+        node = self._live()
+        return node.get("checked") is not None or node.get("selected") is not None
+
+    def value_of_css_property(self, property_name):
+        node = self._live()
+        style = dict(
+            (part.split(":", 1)[0].strip().lower(), part.split(":", 1)[1].strip())
+            for part in (node.get("style") or "").split(";") if ":" in part
+        )
+        return style.get(property_name.lower(), "")
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: ({by}, {value})")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        nodes = _find_nodes(self._live(), by, value, scoped=True)
+        return [self._parent._wrap(node) for node in nodes]
+
+    def clear(self):
+        node = self._interactable()
+        if _tag(node) == "textarea":
+            node.text = ""
+        else:
+            node.set("value", "")
+
+    def send_keys(self, *value):
+        node = self._interactable()
+        if node.get("disabled") is not None or node.get("readonly") is not None:
+            raise ElementNotInteractableException(f"Element <{node.tag}> is not editable")
+        typed = "".join(str(part) for part in value)
+        current = self.get_property("value") or ""
+        for char in typed:
+            if char in (Keys.ENTER, Keys.RETURN):
+                self._store_value(node, current)
+                form = self._parent._form_of(node)
+                if form is not None:
+                    self._parent._submit_form(form)
+                return
+            if char == Keys.BACKSPACE:
+                current = current[:-1]
+            elif "\ue000" <= char <= "\uf8ff":
+                continue
+            else:
+                current += char
+        self._store_value(node, current)
+
+    @staticmethod
+    def _store_value(node, value):
+        if _tag(node) == "textarea":
+            node.text = value
+        else:
+            node.set("value", value)
+
+    @staticmethod
+    def _selected_options(select):
+        options = select.xpath(".//option")
+        selected = [option for option in options if option.get("selected") is not None]
+        return selected or options[:1]
+
+    def click(self):
+        self._parent._activate(self._interactable())
+
+    def submit(self):
+        node = self._live()
+        form = node if _tag(node) == "form" else self._parent._form_of(node)
+        if form is None:
+            raise WebDriverException("Element is not in a form")
+        self._parent._submit_form(form)
+
+    @property
+    def screenshot_as_png(self):
+        self._live()
+        return BLANK_PNG
+
+    @property
+    def screenshot_as_base64(self):
+        return base64.b64encode(self.screenshot_as_png).decode("ascii")
+
+    def screenshot(self, filename):
+        Path(filename).write_bytes(self.screenshot_as_png)
+        return True
+
+
+class _SwitchTo:
+    """driver.switch_to for the fake driver"""
+
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, window_name):
+        if window_name not in self._driver._windows:
+            raise NoSuchWindowException(f"No window with handle {window_name}")
+        self._driver._current = window_name
+
+    def new_window(self, type_hint=None):
+        self._driver._current = self._driver._open_window().handle
+
+    def default_content(self):
+        return None
+
+    def parent_frame(self):
+        return None
+
+    def frame(self, frame_reference):
+        raise NoSuchFrameException(f"FakeWebDriver has no frames: {frame_reference}")
+
+    @property
+    def active_element(self):
+        window = self._driver._window()
+        body = window.document.find("body")
+        return self._driver._wrap(body if body is not None else window.document)
+
+    @property
+    def alert(self):
+        raise NoAlertPresentException("No alert is open")
+
+
+class FakeWebDriver:
+    """Selenium-compatible driver running page objects against lxml documents"""
+
+    name = "fake"
+    # (compiled pattern, handler(driver, match, args)) tried in order by execute_script
+    SCRIPT_HANDLERS = []
+    # Page-object scripts, by their exact text
+    PAGE_SCRIPTS = {}
+
+    def __init__(self, site=None, pages=None, base_url=DEFAULT_BASE_URL):
+        self.site = site
+        self.base_url = base_url.rstrip("/")
+        self.pages = {}
+        for url, source in (pages or {}).items():
+            self.pages[self._absolute(url)] = source
+        self.session_id = f"fake-{id(self):x}"
+        self.capabilities = {"browserName": "fake", "platformName": "any"}
+        self.cookies = {}
+        self.local_storage = {}
+        self.timeouts = {"implicit": 0, "pageLoad": 300, "script": 30}
+        self.window_size = {"width": 1920, "height": 1080}
+        self.requests = []
+        # HTTP status of the last response from the stand-in site
+        self.last_status = 200
+        # Set through execute_cdp_cmd (Network.emulateNetworkConditions, Emulation.setCPUThrottlingRate)
+        self.network_conditions = None
+        self.cpu_throttling_rate = 1
+        self._handles = (f"fake-window-{index}" for index in itertools.count(1))
+        self._generations = itertools.count(1)
+        self._windows = {}
+        self._current = self._open_window().handle
+        self.switch_to = _SwitchTo(self)
+
+    @staticmethod
+    def from_snapshot(source, url=None):
+        """Driver with a single snapshot (path or markup) loaded"""
+        url = url or DEFAULT_BASE_URL + "/"
+        driver = FakeWebDriver(pages={url: source})
+        driver.get(url)
+        return driver
+
+    @staticmethod
+    def register_script(pattern):
+        """Decorator adding an execute_script handler for scripts matching a regex"""
+        def decorator(handler):
+            FakeWebDriver.SCRIPT_HANDLERS.append((re.compile(pattern, re.S), handler))
+            return handler
+        return decorator
+
+    @staticmethod
+    def register_page_script(script):
+        """Decorator adding the execute_script handler for one page-object script"""
+        def decorator(handler):
+            FakeWebDriver.PAGE_SCRIPTS[script] = handler
+            return handler
+        return decorator
+
+    # -------------------------------------------------------------- internals
+
+    def _absolute(self, url):
+        if re.match(r"^[a-z][a-z0-9+.-]*:", url):
+            return url
+        return urljoin(self.base_url + "/", url.lstrip("/") if url != "/" else "")
+
+    def _resolve(self, url):
+        """Resolve a URL against the current document, or the base URL before any navigation"""
+        current = self._windows.get(getattr(self, "_current", None))
+        if current is not None and re.match(r"^(https?|file):", current.url):
+            return urljoin(current.url, url)
+        return self._absolute(url)
+
+    def _open_window(self, url=None):
+        window = _Window(next(self._handles))
+        if url:
+            self._navigate(window, "GET", self._resolve(url))
+        self._windows[window.handle] = window
+        return window
+
+    def _window(self):
+        if self._current not in self._windows:
+            raise NoSuchWindowException("Current window was closed")
+        return self._windows[self._current]
+
+    def _wrap(self, node):
+        window = self._window()
+        return FakeWebElement(self, node, window, window.generation)
+
+    def _fetch(self, method, url, form=None):
+        """Resolve a URL to (final url, markup), following redirects, at the emulated network speed"""
+        final_url, markup = self._exchange(method, url, form)
+        conditions = self.network_conditions
+        if conditions:
+            sent = len(urlencode(form or {}))
+            seconds = conditions["latency"] / 1000.0
+            if conditions.get("downloadThroughput", -1) > 0:
+                seconds += len(markup) / conditions["downloadThroughput"]
+            if conditions.get("uploadThroughput", -1) > 0:
+                seconds += sent / conditions["uploadThroughput"]
+            time.sleep(seconds)
+        return final_url, markup
+
+    def _exchange(self, method, url, form=None):
+        for _ in range(MAX_REDIRECTS):
+            self.requests.append((method, url))
+            parts = urlsplit(url)
+            if url == "about:blank":
+                return url, BLANK_PAGE
+            if parts.scheme == "file":
+                path = Path(parts.path)
+                return url, path.read_text(encoding="utf-8") if path.exists() else NOT_FOUND_PAGE
+            if self.site is not None:
+                response = self.site.handle(method, parts.path or "/", dict(parse_qsl(parts.query)),
+                                            form or {}, self.cookies.get(SESSION_COOKIE))
+                self.cookies.update(response.set_cookies)
+                self.last_status = response.status
+                location = response.headers.get("Location")
+                if response.status in (301, 302, 303, 307, 308) and location:
+                    url = urljoin(url, location)
+                    if response.status != 307 and response.status != 308:
+                        method, form = "GET", None
+                    continue
+                body = response.body
+                if "html" not in response.content_type:
+                    body = f"<html><body><pre>{escape(body)}</pre></body></html>"
+                return url, body
+            source = self.pages.get(url) or self.pages.get(urlunsplit(parts._replace(query="", fragment="")))
+            if source is None:
+                return url, NOT_FOUND_PAGE
+            if isinstance(source, Path):
+                source = source.read_text(encoding="utf-8")
+            return url, source
+        raise WebDriverException(f"Too many redirects for {url}")
+
+    def _load(self, window, url, markup):
+        window.url = url
+        window.document = html.document_fromstring(markup or BLANK_PAGE)
+        window.generation = next(self._generations)
+
+    def _navigate(self, window, method, url, form=None, record=True):
+        final_url, markup = self._fetch(method, url, form)
+        self._load(window, final_url, markup)
+        if record:
+            del window.history[window.index + 1:]
+            window.history.append(final_url)
+            window.index = len(window.history) - 1
+        logging.debug(f"FakeWebDriver {method} {url} -> {final_url}")
+
+    def _form_of(self, node):
+        form_id = node.get("form")
+        if form_id:
+            matches = node.getroottree().xpath("//form[@id=$id]", id=form_id)
+            return matches[0] if matches else None
+        for ancestor in node.iterancestors("form"):
+            return ancestor
+        return None
+
+    def _form_fields(self, form, submitter=None):
+        """Name/value pairs a browser would submit for a form"""
+        controls = list(form.iter("input", "select", "textarea", "button"))
+        form_id = form.get("id")
+        if form_id:
+            controls += [node for node in form.getroottree().xpath("//*[@form=$id]", id=form_id)
+                         if node not in controls]
+        fields = []
+        for control in controls:
+            name = control.get("name")
+            if not name or control.get("disabled") is not None:
+                continue
+            tag = _tag(control)
+            kind = (control.get("type") or ("submit" if tag == "button" else "text")).lower()
+            if tag == "button" or kind in SUBMIT_TYPES | {"button", "reset"}:
+                if control is submitter:
+                    fields.append((name, control.get("value", "")))
+            elif kind in ("checkbox", "radio"):
+                if control.get("checked") is not None:
+                    fields.append((name, control.get("value", "on")))
+            elif tag == "select":
+                fields += [(name, option.get("value", option.text_content()))
+                           for option in FakeWebElement._selected_options(control)]
+            elif tag == "textarea":
+                fields.append((name, control.text or ""))
+            else:
+                fields.append((name, control.get("value", "")))
+        return fields
+
+    def _submit_form(self, form, submitter=None):
+        window = self._window()
+        override = submitter if submitter is not None else {}
+        method = (override.get("formmethod") or form.get("method") or "get").upper()
+        action = urljoin(window.url, override.get("formaction") or form.get("action") or window.url)
+        fields = self._form_fields(form, submitter)
+        if method == "GET":
+            parts = urlsplit(action)
+            self._navigate(window, "GET", urlunsplit(parts._replace(query=urlencode(fields), fragment="")))
+        else:
+            self._navigate(window, "POST", action, dict(fields))
+
+    def _activate(self, node):
+        """Default click behaviour: inline navigation, links, toggles and form submission"""
+        window = self._window()
+        generation = window.generation
+        for target in itertools.chain([node], node.iterancestors()):
+            match = _LOCATION_ASSIGNMENT.search(target.get("onclick") or "")
+            if match:
+                self._navigate(window, "GET", urljoin(window.url, match.group(1)))
+                return
+        if window.generation != generation:
+            return
+
+        tag = _tag(node)
+        kind = (node.get("type") or "").lower()
+        if node.get("disabled") is not None:
+            return
+        if tag == "input" and kind in ("checkbox", "radio"):
+            if kind == "radio":
+                form = self._form_of(node)
+                scope = form if form is not None else window.document
+                for other in scope.xpath(".//input[@type='radio' and @name=$name]", name=node.get("name") or ""):
+                    other.attrib.pop("checked", None)
+                node.set("checked", "checked")
+            elif node.get("checked") is not None:
+                del node.attrib["checked"]
+            else:
+                node.set("checked", "checked")
+            return
+        if (tag == "button" and kind in ("", "submit")) or (tag == "input" and kind in SUBMIT_TYPES):
+            form = self._form_of(node)
+            if form is not None:
+                self._submit_form(form, node)
+            return
+        for link in itertools.chain([node], node.iterancestors()):
+            if _tag(link) == "a" and link.get("href"):
+                href = link.get("href")
+                if href.startswith("javascript:") or href.startswith("#"):
+                    return
+                if link.get("target") == "_blank":
+                    self._open_window(href)
+                    return
+                self._navigate(window, "GET", urljoin(window.url, href))
+                return
+
+    # ------------------------------------------------------------ WebDriver API
+
+    @property
+    def current_url(self):
+        return self._window().url
+
+    @property
+    def title(self):
+        title = self._window().document.find(".//title")
+        return " ".join((title.text_content() if title is not None else "").split())
+
+    @property
+    def page_source(self):
+        return etree.tostring(self._window().document, method="html", encoding="unicode", doctype="<!DOCTYPE html>")
+
+    @property
+    def window_handles(self):
+        return list(self._windows)
+
+    @property
+    def current_window_handle(self):
+        return self._window().handle
+
+    def get(self, url):
+        self._navigate(self._window(), "GET", self._resolve(url))
+
+    def back(self):
+        window = self._window()
+        if window.index > 0:
+            window.index -= 1
+            self._navigate(window, "GET", window.history[window.index], record=False)
+
+    def forward(self):
+        window = self._window()
+        if window.index < len(window.history) - 1:
+            window.index += 1
+            self._navigate(window, "GET", window.history[window.index], record=False)
+
+    def refresh(self):
+        window = self._window()
+        self._navigate(window, "GET", window.url, record=False)
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: ({by}, {value})")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        window = self._window()
+        return [self._wrap(node) for node in _find_nodes(window.document, by, value, scoped=False)]
+
+    def execute_script(self, script, *args):
+        """Run a recognised script snippet; unrecognised scripts return None"""
+        if script in self.PAGE_SCRIPTS:
+            return self.PAGE_SCRIPTS[script](self, None, list(args))
+        for pattern, handler in self.SCRIPT_HANDLERS:
+            match = pattern.search(script)
+            if match:
+                return handler(self, match, list(args))
+        logging.debug(f"FakeWebDriver ignored script: {script.strip()[:60]}")
+        return None
+
+    def execute_async_script(self, script, *args):
+        return self.execute_script(script, *args)
+
+    def execute(self, driver_command, params=None):
+        """Accept W3C action chains (hover, drag) as no-ops; reject other raw commands"""
+        if driver_command in (Command.W3C_ACTIONS, Command.W3C_CLEAR_ACTIONS):
+            return {"value": None}
+        raise WebDriverException(f"FakeWebDriver does not support command {driver_command}")
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        """Accept the Network and Emulation commands the factory sends; reject other CDP commands"""
+        if cmd == "Network.emulateNetworkConditions":
+            self.network_conditions = dict(cmd_args)
+        elif cmd == "Emulation.setCPUThrottlingRate":
+            self.cpu_throttling_rate = cmd_args["rate"]
+        elif cmd not in ("Network.enable", "Network.setBlockedURLs"):
+            raise WebDriverException(f"FakeWebDriver does not support CDP command {cmd}")
+        return {}
+
+    def implicitly_wait(self, time_to_wait):
+        self.timeouts["implicit"] = time_to_wait
+
+    def set_page_load_timeout(self, time_to_wait):
+        self.timeouts["pageLoad"] = time_to_wait
+
+    def set_script_timeout(self, time_to_wait):
+        self.timeouts["script"] = time_to_wait
+
+    def maximize_window(self):
+        return None
+
+    def set_window_size(self, width, height, windowHandle="current"):
+        self.window_size = {"width": width, "height": height}
+
+    def get_window_size(self, windowHandle="current"):
+        return dict(self.window_size)
+
+    def get_cookies(self):
+        host = urlsplit(self.current_url).hostname
+        return [{"name": name, "value": value, "path": "/", "domain": host} for name, value in self.cookies.items()]
+
+    def get_cookie(self, name):
+        return next((cookie for cookie in self.get_cookies() if cookie["name"] == name), None)
+
+    def add_cookie(self, cookie_dict):
+        self.cookies[cookie_dict["name"]] = cookie_dict["value"]
+
+    def delete_cookie(self, name):
+        self.cookies.pop(name, None)
+
+    def delete_all_cookies(self):
+        self.cookies.clear()
+
+    def get_screenshot_as_png(self):
+        self._window()
+        return BLANK_PNG
+
+    def get_screenshot_as_base64(self):
+        return base64.b64encode(self.get_screenshot_as_png()).decode("ascii")
+
+    def get_screenshot_as_file(self, filename):
+        Path(filename).write_bytes(self.get_screenshot_as_png())
+        return True
+
+    def save_screenshot(self, filename):
+        return self.get_screenshot_as_file(filename)
+
+    def close(self):
+        self._windows.pop(self._window().handle)
+
+    def quit(self):
+        self._windows.clear()
+
+
+# ---------------------------------------------------------------- script snippets
+
+@FakeWebDriver.register_script(r"return\s+document\.readyState")
+def _ready_state(driver, match, args):
+    return "complete"
+
+
+@FakeWebDriver.register_script(r"return\s+document\.title")
+def _document_title(driver, match, args):
+    return driver.title
+
+
+@FakeWebDriver.register_script(r"return\s+(?:window\.location\.href|location\.href|document\.URL)")
+def _location(driver, match, args):
+    return driver.current_url
+
+
+@FakeWebDriver.register_script(r"return\s+navigator\.userAgent")
+def _user_agent(driver, match, args):
+    return USER_AGENT
+
+
+@FakeWebDriver.register_script(r"return\s+document\.documentElement\.outerHTML")
+def _outer_html(driver, match, args):
+    return driver.page_source
+
+
+@FakeWebDriver.register_script(r"arguments\[0\]\.scrollIntoView")
+def _scroll_into_view(driver, match, args):
+    args[0]._live()
+    return None
+
+
+@FakeWebDriver.register_script(r"arguments\[0\]\.click\(\)")
+def _script_click(driver, match, args):
+    # Script clicks skip the visibility check a user click has
+    driver._activate(args[0]._live())
+    return None
+
+
+@FakeWebDriver.register_script(r"return\s+arguments\[0\]\.(innerText|textContent|innerHTML|outerHTML|value)\b")
+def _element_property(driver, match, args):
+    return args[0].get_property(match.group(1))
+
+
+@FakeWebDriver.register_script(r"window\.open\(\s*(?:['\"]([^'\"]*)['\"])?")
+def _window_open(driver, match, args):
+    driver._open_window(match.group(1) or "about:blank")
+    return None
+
+
+@FakeWebDriver.register_script(r"return\s+(?:window\.pageYOffset|window\.scrollY|document\.body\.scrollHeight)")
+def _scroll_metrics(driver, match, args):
+    return 0
+
+
+def _load_more(driver):
+    # Stand-in for the page's scroll loader: append the next chunk of an infinite-scroll list
+    window = driver._window()
+    for grid in window.document.xpath("//*[@data-more]")[:1]:
+        _, markup = driver._fetch("GET", urljoin(window.url, grid.get("data-more")))
+        chunk = html.fragment_fromstring(markup)
+        grid.append(chunk)
+        if chunk.get("data-more"):
+            grid.set("data-more", chunk.get("data-more"))
+        else:
+            del grid.attrib["data-more"]
+
+
+@FakeWebDriver.register_script(r"window\.scroll(?:To|By)?\(")
+def _scroll(driver, match, args):
+    _load_more(driver)
+    return None
+
+
+@FakeWebDriver.register_script(r"window\.__domMutations")
+def _dom_signature(driver, match, args):
+    # Fake documents only change by navigation or form handling, which replace the generation
+    window = driver._window()
+    return ["complete", window.generation, sum(1 for _ in window.document.iter())]
+
+
+@FakeWebDriver.register_script(r"return\s+JSON\.stringify\((?:window\.)?localStorage\)")
+def _dump_storage(driver, match, args):
+    return json.dumps(driver.local_storage)
+
+
+@FakeWebDriver.register_script(r"localStorage\.setItem\(")
+def _set_storage(driver, match, args):
+    for key, value in (args[0] if args and isinstance(args[0], dict) else {}).items():
+        driver.local_storage[key] = str(value)
+    return None
+
+
+@FakeWebDriver.register_script(r"(?:localStorage|sessionStorage)\.clear\(\)")
+def _clear_storage(driver, match, args):
+    driver.local_storage.clear()
+    return None
+
+
+def _top_cards(driver, xpaths):
+    # Cards nested in another card are part of that one
+    cards = driver._window().document.xpath(xpaths["card"])
+    members = set(cards)
+    return [card for card in cards if not any(ancestor in members for ancestor in card.iterancestors())]
+
+
+def _read_cards(driver, xpaths, cards):
+    window = driver._window()
+
+    def text(nodes):
+        return " ".join(_visible_text(nodes[0]).split()) if nodes else ""
+
+    results = []
+    for card in cards:
+        links = card.xpath(xpaths["link"])
+        if not links:
+            continue
+        results.append({"element": driver._wrap(links[0]), "url": urljoin(window.url, links[0].get("href")),
+                        "title": text(card.xpath(xpaths["title"])) or text(links) or links[0].get("title", ""),
+                        "price": text(card.xpath(xpaths["price"])),
+                        "availability": text(card.xpath(xpaths["availability"]))})
+    return results
+
+
+@FakeWebDriver.register_page_script(RESULTS_SCRIPT)
+def _search_results(driver, match, args):
+    return _read_cards(driver, args[0], _top_cards(driver, args[0]))
+
+
+@FakeWebDriver.register_page_script(SCAN_SCRIPT)
+def _scan_results(driver, match, args):
+    xpaths, start = args
+    window = driver._window()
+    cards = _top_cards(driver, xpaths)
+    next_links = window.document.xpath(xpaths["next"])
+    batch = {"results": _read_cards(driver, xpaths, cards[start:]), "total": len(cards),
+             "next": urljoin(window.url, next_links[0].get("href")) if next_links else None}
+    # The script scrolls to the end, which makes the page's loader append the next chunk
+    _load_more(driver)
+    return batch
+
+
+@FakeWebDriver.register_page_script(CLEAR_CART_SCRIPT)
+def _clear_cart(driver, match, args):
+    # The requests the script's fetch() calls make; the current document is left alone
+    cart_url, remove_xpath, item_xpath, empty_xpath = args[:4]
+    if urlsplit(cart_url)[:2] != urlsplit(driver.current_url)[:2]:
+        return {"error": "TypeError: Failed to fetch"}
+    document = html.document_fromstring(driver._fetch("GET", cart_url)[1])
+    forms = []
+    for button in document.xpath(remove_xpath):
+        form = driver._form_of(button)
+        if form is not None and form not in forms:
+            forms.append(form)
+    for form in forms:
+        driver._fetch("POST", urljoin(cart_url, form.get("action") or cart_url), dict(driver._form_fields(form)))
+    document = html.document_fromstring(driver._fetch("GET", cart_url)[1])
+    return {"removed": len(forms), "lines": len(document.xpath(item_xpath)),
+            "empty_message": bool(document.xpath(empty_xpath))}
+
+
+@FakeWebDriver.register_page_script(SEED_CART_SCRIPT)
+def _seed_cart(driver, match, args):
+    # The requests the script's fetch() calls make; the current document is left alone
+    base_url, items, search_xpath, add_xpath, quantity_xpath = args[:5]
+    if urlsplit(base_url)[:2] != urlsplit(driver.current_url)[:2]:
+        return {"added": [], "error": "TypeError: Failed to fetch"}
+
+    def load(url, method="GET", form=None):
+        final_url, markup = driver._fetch(method, url, form)
+        return final_url, html.document_fromstring(markup)
+
+    added = []
+    for item in items:
+        label = item.get("url") or item.get("name")
+        if item.get("url"):
+            page_url, page = load(urljoin(base_url, item["url"]))
+        else:
+            home_url, home = load(base_url)
+            inputs = home.xpath(search_xpath)
+            form = driver._form_of(inputs[0]) if inputs else None
+            if form is None:
+                return {"added": added, "error": "Error: search form not found"}
+            action = urljoin(home_url, form.get("action") or home_url)
+            results_url, results = load(f"{action}?{urlencode({inputs[0].get('name'): item['search']})}")
+            links = [link for link in results.xpath("//a[@href]")
+                     if item["name"].lower() in link.text_content().lower()]
+            if not links:
+                return {"added": added, "error": f"Error: no search result for {item['name']}"}
+            page_url, page = load(urljoin(results_url, links[0].get("href")))
+        buttons = page.xpath(add_xpath)
+        form = driver._form_of(buttons[0]) if buttons else None
+        if form is None:
+            return {"added": added, "error": f"Error: add-to-cart form not found for {label}"}
+        fields = dict(driver._form_fields(form, buttons[0]))
+        quantity = form.xpath("." + quantity_xpath)
+        if item.get("qty") and quantity and quantity[0].get("name"):
+            fields[quantity[0].get("name")] = str(item["qty"])
+        fields.update(item.get("variant") or {})
+        load(urljoin(page_url, form.get("action") or page_url), "POST", fields)
+        if not 200 <= driver.last_status < 300:
+            return {"added": added, "error": f"Error: add-to-cart for {label} returned {driver.last_status}"}
+        added.append(label)
+    return {"added": added}
+
+
+@FakeWebDriver.register_page_script(SAMPLE_SCRIPT)
+def _soak_sample(driver, match, args):
+    # What the script reports on a browser without performance.memory
+    return {"js_heap_bytes": None, "dom_nodes": len(driver._window().document.xpath("//*")),
+            "js_listeners": None, "documents": None}
@@ -0,0 +1,205 @@
+"""
+Hybrid load: a few real browsers plus many HTTP-level virtual users
+
+A small pool of DriverFactory browsers runs the page-object ShoppingFlow and
+measures user-perceived step latency, while a LoadRunner drives a large
+asyncio HTTP population through the same scenario. Both feed one Timeline,
+which reports per-window activity and how browser step latency changes as
+background load rises.
+"""
+
+import math
+import time
+import bisect
+import logging
+import asyncio
+import threading
+from utils.benchmark import percentile
+from utils.driver_factory import DriverFactory
+from utils.load_generator import LoadRunner, summarize_samples
+from utils.shopping_flow import ShoppingFlow
+
+
+def _p(values, fraction):
+    return round(percentile(values, fraction), 2) if values else None
+
+
+class Timeline:
+    """Thread-safe step samples from both sources plus an HTTP active-user gauge"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.samples = []
+        self.gauge = []
+        self._lock = threading.Lock()
+
+    def now(self):
+        return time.perf_counter() - self.started
+
+    def add(self, source, user, step, ms, ok, error=None):
+        """Record a step that just finished; t is its start offset"""
+        sample = {
+            "t": round(self.now() - ms / 1000, 4),
+            "source": source,
+            "user": user,
+            "step": step,
+            "ms": ms,
+            "ok": ok,
+            "error": error,
+        }
+        with self._lock:
+            self.samples.append(sample)
+        return sample
+
+    def record_users(self, users):
+        with self._lock:
+            self.gauge.append((round(self.now(), 4), users))
+
+    def users_at(self, t):
+        """HTTP users active at offset t (last gauge reading before t)"""
+        times = [reading[0] for reading in self.gauge]
+        index = bisect.bisect_right(times, t) - 1
+        return self.gauge[index][1] if index >= 0 else 0
+
+    def windows(self, window_s):
+        """Per-window HTTP users and throughput with browser and HTTP latency"""
+        end = max([sample["t"] for sample in self.samples] + [reading[0] for reading in self.gauge] + [0])
+        rows = []
+        for index in range(int(end // window_s) + 1):
+            low, high = index * window_s, (index + 1) * window_s
+            in_window = [sample for sample in self.samples if low <= sample["t"] < high]
+            http_ok = [sample["ms"] for sample in in_window if sample["source"] == "http" and sample["ok"]]
+            browser_ok = [sample["ms"] for sample in in_window if sample["source"] == "browser" and sample["ok"]]
+            readings = [users for t, users in self.gauge if low <= t < high]
+            rows.append({
+                "start_s": round(low, 2),
+                "http_users": max(readings) if readings else self.users_at(low),
+                "http_steps": sum(1 for sample in in_window if sample["source"] == "http"),
+                "http_p95_ms": _p(http_ok, 0.95),
+                "browser_steps": sum(1 for sample in in_window if sample["source"] == "browser"),
+                "browser_p50_ms": _p(browser_ok, 0.5),
+                "browser_p95_ms": _p(browser_ok, 0.95),
+                "errors": sum(1 for sample in in_window if not sample["ok"]),
+            })
+        return rows
+
+    def browser_by_load(self, bands=5):
+        """Browser step latency grouped by the HTTP user level it ran under"""
+        browser = [sample for sample in self.samples if sample["source"] == "browser" and sample["ok"]]
+        peak = max([users for _, users in self.gauge] + [0])
+        size = max(1, math.ceil(peak / bands))
+        grouped = {}
+        for sample in browser:
+            band = self.users_at(sample["t"]) // size * size
+            grouped.setdefault(band, []).append(sample)
+        rows = []
+        for band in sorted(grouped):
+            samples = grouped[band]
+            latencies = [sample["ms"] for sample in samples]
+            rows.append({
+                "http_users": f"{band}-{band + size - 1}",
+                "n": len(samples),
+                "p50_ms": _p(latencies, 0.5),
+                "p95_ms": _p(latencies, 0.95),
+                "steps": {name: _p([sample["ms"] for sample in samples if sample["step"] == name], 0.5)
+                          for name, _ in ShoppingFlow.STEPS
+                          if any(sample["step"] == name for sample in samples)},
+            })
+        return rows
+
+    def report(self, window_s=5.0):
+        by_load = self.browser_by_load()
+        degradation = None
+        if len(by_load) > 1 and by_load[0]["p50_ms"]:
+            degradation = round(by_load[-1]["p50_ms"] / by_load[0]["p50_ms"], 2)
+        return {
+            "windows": self.windows(window_s),
+            "browser_by_load": by_load,
+            # Browser p50 under the heaviest band relative to the lightest
+            "browser_degradation": degradation,
+            "browser": summarize_samples([sample for sample in self.samples if sample["source"] == "browser"]),
+            "http": summarize_samples([sample for sample in self.samples if sample["source"] == "http"]),
+        }
+
+
+class HybridRunner:
+    """Run browser users and an HTTP LoadRunner side by side into one Timeline"""
+
+    def __init__(self, base_url, browsers=2, browser_name=None, create_driver=None,
+                 gauge_interval=0.25, window_s=5.0, **load_options):
+        self.base_url = base_url.rstrip("/")
+        self.browsers = browsers
+        self.browser_name = browser_name
+        self.create_driver = create_driver or (lambda: DriverFactory.create_driver(self.browser_name))
+        self.gauge_interval = gauge_interval
+        self.window_s = window_s
+        self.timeline = Timeline()
+        self.load = LoadRunner(base_url, on_sample=self._on_http_sample, **load_options)
+        self.browser_iterations = {}
+        self.browser_errors = []
+        self._done = threading.Event()
+
+    def _on_http_sample(self, sample):
+        self.timeline.add("http", sample["user"], sample["step"], sample["ms"], sample["ok"], sample["error"])
+
+    def _browser_user(self, index):
+        """Loop the page-object flow on one browser until the HTTP load ends"""
+        driver = None
+        try:
+            driver = self.create_driver()
+            # Failures under load are the measurement, so steps are not retried
+            flow = ShoppingFlow(driver, base_url=self.base_url, email=f"browser-{index}@example.com", retries=0)
+
+            def on_step(result):
+                self.timeline.add("browser", index, result["name"], result["duration_ms"],
+                                  result["passed"], result["error"])
+
+            while not self._done.is_set():
+                driver.delete_all_cookies()
+                flow.run(on_step=on_step)
+                self.browser_iterations[index] = self.browser_iterations.get(index, 0) + 1
+        except Exception as e:
+            logging.error(f"Browser user {index} stopped: {e}")
+            self.browser_errors.append(f"browser {index}: {e}")
+        finally:
+            if driver:
+                driver.quit()
+
+    def _monitor(self):
+        while not self._done.is_set():
+            self.timeline.record_users(self.load.active_users)
+            self._done.wait(self.gauge_interval)
+        self.timeline.record_users(0)
+
+    def run(self):
+        """Run both populations; returns the combined report"""
+        http_result = {}
+
+        def run_http():
+            try:
+                http_result.update(asyncio.run(self.load.run_async()))
+            finally:
+                self._done.set()
+
+        threads = [threading.Thread(target=self._monitor, name="hybrid-gauge", daemon=True)]
+        threads += [threading.Thread(target=self._browser_user, args=(index,), name=f"hybrid-browser-{index}",
+                                     daemon=True) for index in range(self.browsers)]
+        for thread in threads:
+            thread.start()
+        http_thread = threading.Thread(target=run_http, name="hybrid-http", daemon=True)
+        http_thread.start()
+        http_thread.join()
+        for thread in threads:
+            thread.join()
+
+        report = self.timeline.report(self.window_s)
+        report.update({
+            "base_url": self.base_url,
+            "browsers": self.browsers,
+            "browser_iterations": sum(self.browser_iterations.values()),
+            "browser_errors": self.browser_errors,
+            "http_summary": {key: value for key, value in http_result.items() if key != "steps"},
+        })
+        logging.info(f"Hybrid run finished: {report['browser_iterations']} browser iterations, "
+                     f"{http_result.get('iterations_completed')} HTTP iterations")
+        return report
@@ -0,0 +1,297 @@
+"""
+HTTP-level virtual-user load generator for the 8-step shopping scenario
+
+Replays the ShoppingFlow steps (home, sign in, search, product, add to cart,
+cart) as plain HTTP requests from asyncio virtual users that share one pooled
+aiohttp connector, with think times, ramp-up stages and per-step latency
+percentiles and histograms. Requests follow the routes of the stand-in
+storefront (utils/stand_in_site.py), so capacity can be sized locally
+without launching browsers.
+"""
+
+import time
+import random
+import asyncio
+import logging
+from urllib.parse import urljoin, urlencode
+import aiohttp
+from lxml import html
+from config.config import Config
+from utils.benchmark import percentile
+from utils.shopping_flow import ShoppingFlow, StepFailed
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+HISTOGRAM_BOUNDS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def parse_stages(text):
+    """Parse 'seconds:users,...' (e.g. '10:50,30:50,10:0') into [(seconds, users)]"""
+    stages = []
+    for part in filter(None, (item.strip() for item in text.split(","))):
+        seconds, users = part.split(":")
+        stages.append((float(seconds), int(users)))
+    return stages
+
+
+def target_users(stages, elapsed):
+    """Active-user target at elapsed seconds, interpolated linearly within each stage"""
+    previous = 0
+    for seconds, users in stages:
+        if elapsed < seconds:
+            fraction = elapsed / seconds if seconds else 1.0
+            return int(round(previous + (users - previous) * fraction))
+        elapsed -= seconds
+        previous = users
+    return previous
+
+
+def histogram(samples, bounds=HISTOGRAM_BOUNDS_MS):
+    """Count samples per latency bucket, keyed '<=bound' plus '>last'"""
+    counts = {f"<={bound}": 0 for bound in bounds}
+    counts[f">{bounds[-1]}"] = 0
+    for value in samples:
+        bound = next((bound for bound in bounds if value <= bound), None)
+        counts[f"<={bound}" if bound is not None else f">{bounds[-1]}"] += 1
+    return counts
+
+
+def summarize_samples(samples):
+    """Per-step latency percentiles, error counts and histograms from sample dicts"""
+    steps = {}
+    for name, _ in ShoppingFlow.STEPS:
+        step_samples = [sample for sample in samples if sample["step"] == name]
+        if not step_samples:
+            continue
+        latencies = [sample["ms"] for sample in step_samples if sample["ok"]]
+        steps[name] = {
+            "count": len(step_samples),
+            "errors": sum(1 for sample in step_samples if not sample["ok"]),
+            "p50": round(percentile(latencies, 0.5), 2) if latencies else None,
+            "p95": round(percentile(latencies, 0.95), 2) if latencies else None,
+            "p99": round(percentile(latencies, 0.99), 2) if latencies else None,
+            "max": round(max(latencies), 2) if latencies else None,
+            "histogram": histogram(latencies),
+        }
+    return steps
+
+
+class HttpShoppingFlow:
+    """The ShoppingFlow steps as HTTP requests on one aiohttp session"""
+
+    def __init__(self, session, base_url, email, password):
+        self.session = session
+        self.base_url = base_url.rstrip("/") + "/"
+        self.email = email
+        self.password = password
+        self.product_url = None
+
+    async def _request(self, method, path, data=None):
+        async with self.session.request(method, urljoin(self.base_url, path.lstrip("/")), data=data) as response:
+            body = await response.text()
+            if response.status != 200:
+                raise StepFailed(f"{method} {path} returned {response.status}")
+            return html.fromstring(body), str(response.url)
+
+    async def step_open_home(self):
+        page, _ = await self._request("GET", "/")
+        if "Cartlow" not in (page.findtext(".//title") or ""):
+            raise StepFailed("Home page title does not mention Cartlow")
+
+    async def step_sign_in(self):
+        await self._request("GET", "/login")
+        page, _ = await self._request("POST", "/login", {"email": self.email, "password": self.password})
+        if not page.xpath("//div[contains(@class, 'user-menu')]"):
+            raise StepFailed("User menu not shown after login")
+
+    async def _open_search_result(self, term, match):
+        page, url = await self._request("GET", f"/search?{urlencode({'q': term})}")
+        links = [link for link in page.xpath("//div[contains(@class, 'product')]//a[@href]")
+                 if match.lower() in link.text_content().lower()]
+        if not links:
+            raise StepFailed(f"No '{match}' found in search results")
+        page, self.product_url = await self._request("GET", urljoin(url, links[0].get("href")))
+        return page
+
+    async def _add_to_cart(self, quantity, options=None):
+        page, _ = await self._request("GET", self.product_url)
+        product_id = page.xpath("//form[contains(@class, 'add-to-cart')]//input[@name='product_id']/@value")
+        if not product_id:
+            raise StepFailed("Add to cart form not found")
+        form = {"product_id": product_id[0], "qty": str(quantity)}
+        form.update({key: value for key, value in (options or {}).items() if value})
+        page, _ = await self._request("POST", "/cart/add", form)
+        if not page.xpath("//div[contains(@class, 'added')]"):
+            raise StepFailed("Cart did not confirm the item")
+
+    async def _open_cart_expecting(self, *names):
+        page, _ = await self._request("GET", "/cart")
+        in_cart = " | ".join(link.text_content() for link in page.xpath("//a[contains(@class, 'product-name')]")).lower()
+        missing = [name for name in names if name.lower() not in in_cart]
+        if missing:
+            raise StepFailed(f"Not in cart: {', '.join(missing)}")
+
+    async def step_search_laptop(self):
+        await self._open_search_result(Config.LAPTOP_SEARCH_TERM, ShoppingFlow.LAPTOP_MATCH)
+
+    async def step_add_laptop(self):
+        await self._add_to_cart(1)
+
+    async def step_open_cart_laptop(self):
+        await self._open_cart_expecting(ShoppingFlow.LAPTOP_MATCH)
+
+    async def step_search_watch(self):
+        await self._open_search_result(Config.WATCH_SEARCH_TERM, ShoppingFlow.WATCH_MATCH)
+
+    async def step_add_watch(self):
+        await self._add_to_cart(2, {
+            "connectivity": Config.WATCH_CONNECTIVITY,
+            "color": Config.WATCH_COLOR,
+            "size": Config.WATCH_SIZE,
+        })
+
+    async def step_open_cart_both(self):
+        await self._open_cart_expecting(ShoppingFlow.LAPTOP_MATCH, ShoppingFlow.WATCH_MATCH)
+
+
+class LoadRunner:
+    """Run virtual users through the HTTP shopping flow and collect step samples"""
+
+    def __init__(self, base_url, users=10, ramp_up=0.0, duration=None, iterations=None,
+                 think_time=(1.0, 3.0), stages=None, connection_limit=100, timeout=30,
+                 credentials=None, seed=None, on_sample=None):
+        self.base_url = base_url.rstrip("/")
+        # Either explicit stages, or a linear ramp to `users` followed by a hold
+        self.stages = stages or [(ramp_up, users)]
+        self.duration = duration
+        self.iterations = iterations if iterations is not None or duration or stages else 1
+        self.think_time = think_time
+        self.connection_limit = connection_limit
+        self.timeout = timeout
+        # Each virtual user gets its own account by default, so carts do not collide
+        self.credentials = credentials or (lambda index: (f"loadtest+{index}@example.com", Config.PASSWORD))
+        self.rng = random.Random(seed)
+        self.on_sample = on_sample
+        self.samples = []
+        self.started_at = None
+        self.active_users = 0
+        self._stop = None
+        self._limit = 0
+
+    def _deadline(self):
+        """Seconds after which users stop starting new iterations, or None"""
+        if self.duration is not None:
+            return sum(seconds for seconds, _ in self.stages) + self.duration
+        if len(self.stages) > 1 or self.stages[-1][1] == 0:
+            return sum(seconds for seconds, _ in self.stages)
+        return None
+
+    def _should_stop(self, index):
+        return self._stop.is_set() or index >= self._limit
+
+    async def _think(self):
+        low, high = self.think_time if isinstance(self.think_time, (tuple, list)) else (self.think_time,) * 2
+        if high > 0:
+            await asyncio.sleep(self.rng.uniform(low, high))
+
+    def _record(self, index, iteration, name, started, error):
+        sample = {
+            "t": round(started - self.started_at, 4),
+            "source": "http",
+            "user": index,
+            "iteration": iteration,
+            "step": name,
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+            "ok": error is None,
+            "error": error,
+        }
+        self.samples.append(sample)
+        if self.on_sample:
+            self.on_sample(sample)
+
+    async def _virtual_user(self, index, connector):
+        """One shopper looping over the flow; returns True once its iterations are done"""
+        email, password = self.credentials(index)
+        jar = aiohttp.CookieJar(unsafe=True)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+        async with aiohttp.ClientSession(connector=connector, connector_owner=False,
+                                         cookie_jar=jar, timeout=timeout) as session:
+            iteration = 0
+            while not self._should_stop(index):
+                flow = HttpShoppingFlow(session, self.base_url, email, password)
+                jar.clear()
+                for name, _ in ShoppingFlow.STEPS:
+                    started = time.perf_counter()
+                    error = None
+                    try:
+                        await getattr(flow, f"step_{name}")()
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        error = str(e) or e.__class__.__name__
+                    self._record(index, iteration, name, started, error)
+                    if error or self._stop.is_set():
+                        break
+                    await self._think()
+                iteration += 1
+                if self.iterations and iteration >= self.iterations:
+                    return True
+        return False
+
+    async def run_async(self):
+        """Ramp users per the stages until the deadline (or iterations) and return the summary"""
+        self.samples = []
+        self._stop = asyncio.Event()
+        self.started_at = time.perf_counter()
+        deadline = self._deadline()
+        connector = aiohttp.TCPConnector(limit=self.connection_limit)
+        tasks, finished, started = {}, set(), 0
+        try:
+            while True:
+                elapsed = time.perf_counter() - self.started_at
+                if deadline is not None and elapsed >= deadline:
+                    self._stop.set()
+                    break
+                self._limit = target_users(self.stages, elapsed)
+                for index in range(self._limit):
+                    task = tasks.get(index)
+                    if task is not None and task.done() and task.exception() is None and task.result() is True:
+                        finished.add(index)
+                    # Slots freed by a ramp-down are refilled when the target rises again
+                    if index not in finished and (task is None or task.done()):
+                        tasks[index] = asyncio.ensure_future(self._virtual_user(index, connector))
+                        started += 1
+                self.active_users = sum(1 for task in tasks.values() if not task.done())
+                ramping = elapsed < sum(seconds for seconds, _ in self.stages)
+                if deadline is None and not ramping and all(task.done() for task in tasks.values()):
+                    break
+                await asyncio.sleep(0.05)
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        finally:
+            self.active_users = 0
+            await connector.close()
+        return self.summary(started)
+
+    def run(self):
+        """Blocking entry point"""
+        return asyncio.run(self.run_async())
+
+    def summary(self, users_started=None):
+        """Aggregate samples into per-step statistics"""
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        completed = sum(1 for sample in self.samples if sample["step"] == ShoppingFlow.STEPS[-1][0] and sample["ok"])
+        errors = [sample for sample in self.samples if not sample["ok"]]
+        result = {
+            "base_url": self.base_url,
+            "users_started": users_started,
+            "elapsed_s": round(elapsed, 2),
+            "steps_per_s": round(len(self.samples) / elapsed, 2) if elapsed else None,
+            "iterations_completed": completed,
+            "samples": len(self.samples),
+            "error_count": len(errors),
+            "error_rate": round(len(errors) / len(self.samples), 4) if self.samples else 0.0,
+            "errors": sorted({sample["error"] for sample in errors})[:20],
+            "steps": summarize_samples(self.samples),
+        }
+        logging.info(f"Load run finished: {users_started} users, {completed} iterations, "
+                     f"{len(errors)} errors in {result['elapsed_s']} s")
+        return result
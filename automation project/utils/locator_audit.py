@@ -0,0 +1,329 @@
+"""
+Locator cost and selectivity audit for the page objects
+
+Measures evaluation time and match cardinality of every locator attribute on
+the BasePage subclasses against stored snapshots, flags descendant-axis full
+document scans and broad matches, proposes CSS equivalents (plus a tighter
+class-token variant) with their measured speedup, and checks each page
+object's total cost against its LOCATOR_BUDGET_MS. Each total is also given
+relative to a full document scan ('//*') measured alongside, and as a static
+cost in full document scans read off the locator's shape, which is the same
+on every machine.
+
+Timings are measured with lxml by default, which ranks locators relative to
+each other; pass a driver to measure document.evaluate / querySelectorAll in a
+real browser, where CSS proposals usually gain the most.
+"""
+
+import gc
+import re
+import time
+import tempfile
+from pathlib import Path
+from lxml import html
+from selenium.webdriver.common.by import By
+from utils.locator_engine import collect_locators, page_object_classes
+
+BROAD_MATCH_THRESHOLD = 5
+# Unit for relative costs: every element of the document
+REFERENCE_LOCATOR = (By.XPATH, "//*")
+
+BROWSER_COST_SCRIPT = """
+var kind = arguments[0], expression = arguments[1], iterations = arguments[2];
+var count = 0, started = performance.now();
+for (var i = 0; i < iterations; i++) {
+    if (kind === 'xpath') {
+        count = document.evaluate(expression, document, null,
+            XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+    } else {
+        count = document.querySelectorAll(expression).length;
+    }
+}
+return [(performance.now() - started) / iterations, count];
+"""
+
+_STRING = r"'([^']*)'|\"([^\"]*)\""
+_PREDICATE_PATTERNS = [
+    (re.compile(rf"^contains\(\s*@([\w-]+)\s*,\s*(?:{_STRING})\s*\)$"), "[{attr}*='{value}']"),
+    (re.compile(rf"^starts-with\(\s*@([\w-]+)\s*,\s*(?:{_STRING})\s*\)$"), "[{attr}^='{value}']"),
+    (re.compile(rf"^@([\w-]+)\s*=\s*(?:{_STRING})$"), "[{attr}='{value}']"),
+    (re.compile(r"^@([\w-]+)$"), "[{attr}]"),
+]
+_STEP = re.compile(r"^([\w*-]+)(?:\[(.*)\])?$")
+
+
+def _split_top_level(expression, keyword):
+    """Split on ' or ' / ' and ' outside parentheses and quotes"""
+    parts, depth, quote, start = [], 0, None, 0
+    token = f" {keyword} "
+    index = 0
+    while index < len(expression):
+        char = expression[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif depth == 0 and expression.startswith(token, index):
+            parts.append(expression[start:index].strip())
+            index += len(token)
+            start = index
+            continue
+        index += 1
+    parts.append(expression[start:].strip())
+    return parts
+
+
+def _split_steps(xpath):
+    """Split '//a[..]//b' into ['a[..]', 'b'] for descendant-only paths, else None"""
+    if not xpath.startswith("//"):
+        return None
+    steps, depth, quote, current = [], 0, None, ""
+    index = 2
+    while index < len(xpath):
+        char = xpath[index]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"":
+            quote = char
+        elif char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+        elif depth == 0 and char == "/":
+            if not xpath.startswith("//", index):
+                return None
+            steps.append(current)
+            current = ""
+            index += 2
+            continue
+        current += char
+        index += 1
+    steps.append(current)
+    return steps
+
+
+def _predicate_to_css(predicate):
+    for pattern, template in _PREDICATE_PATTERNS:
+        match = pattern.match(predicate.strip())
+        if match:
+            groups = [group for group in match.groups() if group is not None]
+            attr = groups[0]
+            value = groups[1] if len(groups) > 1 else ""
+            if "'" in value:
+                return None
+            return template.format(attr=attr, value=value)
+    return None
+
+
+def xpath_to_css(xpath):
+    """Translate a descendant-only XPath with attribute predicates to CSS, or None"""
+    steps = _split_steps(xpath)
+    if not steps:
+        return None
+    # Each step expands to alternatives; 'or' inside a predicate becomes a selector list
+    selectors = [""]
+    for step in steps:
+        match = _STEP.match(step)
+        if not match:
+            return None
+        tag, predicate = match.group(1), match.group(2)
+        tag = "" if tag == "*" else tag
+        alternatives = [tag]
+        if predicate:
+            alternatives = []
+            for branch in _split_top_level(predicate, "or"):
+                css = tag
+                for term in _split_top_level(branch, "and"):
+                    term = term.strip()
+                    if term.startswith("(") and term.endswith(")"):
+                        term = term[1:-1]
+                    translated = _predicate_to_css(term)
+                    if translated is None:
+                        return None
+                    css += translated
+                alternatives.append(css or "*")
+        selectors = [f"{prefix} {alternative}".strip() for prefix in selectors for alternative in alternatives]
+    return ", ".join(selectors)
+
+
+def tighten_css(css):
+    """Narrow substring class matches ([class*='x']) to class-token matches (.x)"""
+    if not css:
+        return None
+    tight = re.sub(r"\[class\*='([\w-]+)'\]", r".\1", css)
+    return tight if tight != css else None
+
+
+def static_cost(locator):
+    """Cost of a locator in full document scans, from its shape alone.
+
+    A '//' step from the root walks the document, each further '//' step walks
+    the subtree of every match before it (counted as another scan), and a
+    text() predicate reads the text of every candidate (one more). Steps below
+    a found element ('.//') walk only that element and cost nothing here. Each
+    branch of an XPath union is evaluated on its own; every other lookup is one
+    native pass.
+    """
+    by, value = locator
+    if by != By.XPATH:
+        return 1
+    cost = 0
+    for branch in _split_top_level(value, "|"):
+        scans = branch.count("//") - (1 if branch.startswith(".//") else 0)
+        cost += scans + (1 if scans and "text()" in branch else 0)
+    return cost
+
+
+def scan_flags(locator):
+    """Static cost flags for a locator"""
+    by, value = locator
+    flags = []
+    if by != By.XPATH:
+        return flags
+    if value.startswith("//*"):
+        flags.append("full_scan_any_element")
+    elif value.startswith("//"):
+        flags.append("full_scan")
+    if value.count("//") > 1:
+        flags.append("nested_descendant_scan")
+    if "text()" in value:
+        flags.append("text_predicate")
+    if " or " in value:
+        flags.append(f"alternatives:{value.count(' or ') + 1}")
+    if not re.search(r"@id\s*=", value) and not re.search(r"@name\s*=", value):
+        flags.append("no_unique_anchor")
+    return flags
+
+
+class LocatorAudit:
+    """Audit every page-object locator over a set of snapshots"""
+
+    def __init__(self, documents, repeat=15, broad_threshold=BROAD_MATCH_THRESHOLD, driver=None, confirm_runs=2):
+        self.documents = documents
+        self.repeat = repeat
+        self.confirm_runs = confirm_runs
+        self.broad_threshold = broad_threshold
+        self.driver = driver
+        self._loaded = None
+
+    def _browser_ms(self, document, locator):
+        """Average in-page evaluation time, loading the snapshot into the browser once"""
+        if self._loaded != document.name:
+            path = Path(tempfile.gettempdir()) / f"locator-audit-{abs(hash(document.name))}.html"
+            path.write_bytes(html.tostring(document.tree))
+            self.driver.get(path.as_uri())
+            self._loaded = document.name
+        kind = "xpath" if locator[0] == By.XPATH else "css"
+        elapsed, count = self.driver.execute_script(BROWSER_COST_SCRIPT, kind, locator[1], self.repeat)
+        return elapsed, count
+
+    def _best_ms(self, document, locator):
+        """Fastest of repeated evaluations (least affected by machine load) and match count"""
+        if self.driver and locator[0] in (By.XPATH, By.CSS_SELECTOR):
+            return self._browser_ms(document, locator)
+        samples, count = [], 0
+        # Like timeit, keep collector pauses out of the samples
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for _ in range(self.repeat):
+                started = time.perf_counter()
+                count = len(document.find_all(locator))
+                samples.append((time.perf_counter() - started) * 1000)
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        return min(samples), count
+
+    def measure(self, locator):
+        """Per-snapshot (ms, count) for a locator; errors yield None"""
+        measurements = {}
+        for document in self.documents:
+            try:
+                measurements[document.name] = self._best_ms(document, locator)
+            except Exception:
+                measurements[document.name] = None
+        return measurements
+
+    def audit_locator(self, name, locator):
+        """Cost, cardinality, flags and CSS proposal for one locator"""
+        measurements = self.measure(locator)
+        valid = [value for value in measurements.values() if value]
+        cost_ms = max((ms for ms, _ in valid), default=0.0)
+        max_matches = max((count for _, count in valid), default=0)
+        flags = scan_flags(locator)
+        if max_matches > self.broad_threshold:
+            flags.append("broad")
+
+        entry = {
+            "name": name,
+            "by": locator[0],
+            "value": locator[1],
+            "cost_ms": round(cost_ms, 4),
+            "static_cost": static_cost(locator),
+            "max_matches": max_matches,
+            "matches": {snapshot: value[1] if value else None for snapshot, value in measurements.items()},
+            "flags": flags,
+            "proposals": [],
+        }
+
+        css = xpath_to_css(locator[1]) if locator[0] == By.XPATH else None
+        for kind, candidate in (("css", css), ("tight_css", tighten_css(css))):
+            if not candidate:
+                continue
+            proposed = self.measure((By.CSS_SELECTOR, candidate))
+            proposed_valid = [value for value in proposed.values() if value]
+            if not proposed_valid:
+                continue
+            proposed_cost = max(ms for ms, _ in proposed_valid)
+            entry["proposals"].append({
+                "kind": kind,
+                "selector": candidate,
+                "cost_ms": round(proposed_cost, 4),
+                "speedup": round(cost_ms / proposed_cost, 2) if proposed_cost else None,
+                "max_matches": max(count for _, count in proposed_valid),
+                # An equivalent must match as many nodes as the XPath on every snapshot
+                "same_count": all(
+                    (proposed.get(snapshot) or (None, None))[1] == (value[1] if value else None)
+                    for snapshot, value in measurements.items()
+                ),
+            })
+        return entry
+
+    def reference_ms(self):
+        """Cost of a full document scan on the snapshots"""
+        return max((ms for ms, _ in filter(None, self.measure(REFERENCE_LOCATOR).values())), default=0.0)
+
+    def run(self, classes=None):
+        """Audit all page objects; returns a list of per-class reports"""
+        report = []
+        reference = self.reference_ms()
+        for cls in classes or page_object_classes():
+            single, _ = collect_locators([cls])
+            budget = getattr(cls, "LOCATOR_BUDGET_MS", None)
+            entries = [self.audit_locator(name, locator) for name, locator in single.items()]
+            total = sum(entry["cost_ms"] for entry in entries)
+            for _ in range(self.confirm_runs):
+                if budget is None or total <= budget:
+                    break
+                # Confirm before failing: a slow spell on a shared runner inflates a whole page,
+                # so re-measure and keep each locator's best run
+                retry = [self.audit_locator(name, locator) for name, locator in single.items()]
+                entries = [min(pair, key=lambda entry: entry["cost_ms"]) for pair in zip(entries, retry)]
+                total = sum(entry["cost_ms"] for entry in entries)
+            report.append({
+                "page": cls.__name__,
+                "budget_ms": budget,
+                "total_cost_ms": round(total, 4),
+                "relative_cost": round(total / reference, 2) if reference else None,
+                "static_cost": sum(entry["static_cost"] for entry in entries),
+                "within_budget": budget is None or total <= budget,
+                "locators": sorted(entries, key=lambda entry: -entry["cost_ms"]),
+            })
+        return report
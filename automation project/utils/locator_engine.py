@@ -0,0 +1,240 @@
+"""
+Offline locator evaluation against saved DOM snapshots
+
+Parses saved page sources (e.g. cartlow_page_source.html, or pages rendered by
+the stand-in site) with lxml and evaluates Selenium-style locators in-process,
+so checking page-object locators and fallback lists needs no browser.
+"""
+
+import time
+import logging
+import importlib
+import pkgutil
+from pathlib import Path
+from lxml import etree, html
+from lxml.cssselect import CSSSelector
+from selenium.webdriver.common.by import By
+
+import pages
+from pages.base_page import BasePage
+
+DEFAULT_SNAPSHOTS = [Path("cartlow_page_source.html")]
+SNAPSHOT_DIR = Path("snapshots")
+
+_compiled = {}
+
+
+def compile_locator(locator):
+    """Compile a (By, value) locator into a callable evaluated against a tree"""
+    if locator in _compiled:
+        return _compiled[locator]
+    by, value = locator
+    if by == By.XPATH:
+        compiled = etree.XPath(value)
+    elif by == By.CSS_SELECTOR:
+        compiled = CSSSelector(value, translator="html")
+    elif by == By.ID:
+        compiled = etree.XPath("//*[@id=$value]")
+    elif by == By.NAME:
+        compiled = etree.XPath("//*[@name=$value]")
+    elif by == By.CLASS_NAME:
+        compiled = CSSSelector(f".{value}", translator="html")
+    elif by == By.TAG_NAME:
+        compiled = CSSSelector(value, translator="html")
+    elif by == By.LINK_TEXT:
+        compiled = etree.XPath("//a[normalize-space(.)=$value]")
+    elif by == By.PARTIAL_LINK_TEXT:
+        compiled = etree.XPath("//a[contains(., $value)]")
+    else:
+        raise ValueError(f"Unsupported locator strategy: {by}")
+    if by in (By.ID, By.NAME, By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        xpath = compiled
+        compiled = lambda tree, xpath=xpath, value=value: xpath(tree, value=value)
+    _compiled[locator] = compiled
+    return compiled
+
+
+def is_locator(value):
+    """True for (By, str) tuples as used by the page objects"""
+    return (isinstance(value, tuple) and len(value) == 2
+            and isinstance(value[0], str) and isinstance(value[1], str)
+            and value[0] in vars(By).values())
+
+
+def describe_element(element):
+    """Short description of a matched node"""
+    if not isinstance(element, etree._Element):
+        return {"tag": None, "text": str(element)[:80]}
+    text = " ".join((element.text_content() if hasattr(element, "text_content") else element.text or "").split())
+    return {
+        "tag": element.tag,
+        "id": element.get("id"),
+        "class": element.get("class"),
+        "text": text[:80],
+    }
+
+
+class LocatorResult:
+    """Outcome of evaluating one locator against one snapshot"""
+
+    def __init__(self, name, locator, matches=None, elapsed_ms=0.0, error=None):
+        self.name = name
+        self.locator = locator
+        self.matches = matches or []
+        self.elapsed_ms = elapsed_ms
+        self.error = error
+
+    @property
+    def count(self):
+        return len(self.matches)
+
+    @property
+    def first(self):
+        return describe_element(self.matches[0]) if self.matches else None
+
+    @property
+    def ambiguous(self):
+        return self.count > 1
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "by": self.locator[0],
+            "value": self.locator[1],
+            "count": self.count,
+            "ambiguous": self.ambiguous,
+            "first": self.first,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "error": self.error,
+        }
+
+
+class SnapshotDocument:
+    """A parsed DOM snapshot that locators can be evaluated against"""
+
+    def __init__(self, source, name=None):
+        if isinstance(source, Path) or (isinstance(source, str) and not source.lstrip().startswith("<")):
+            path = Path(source)
+            self.name = name or path.name
+            started = time.perf_counter()
+            self.tree = html.parse(str(path)).getroot()
+        else:
+            self.name = name or "inline"
+            started = time.perf_counter()
+            self.tree = html.document_fromstring(source)
+        self.parse_ms = (time.perf_counter() - started) * 1000
+
+    def find_all(self, locator):
+        """Return all nodes matching a locator"""
+        return compile_locator(locator)(self.tree)
+
+    def evaluate(self, locator, name=None):
+        """Evaluate one locator and time it"""
+        started = time.perf_counter()
+        try:
+            matches = self.find_all(locator)
+            error = None
+        except Exception as e:
+            matches, error = [], str(e)
+        elapsed = (time.perf_counter() - started) * 1000
+        if not isinstance(matches, list):
+            matches = [matches] if matches not in (None, False, "") else []
+        return LocatorResult(name or locator[1], locator, matches, elapsed, error)
+
+    def evaluate_fallbacks(self, locators, name=None):
+        """Evaluate a fallback list; return (index of first match or None, per-entry results)"""
+        results = [self.evaluate(locator, f"{name}[{index}]" if name else None)
+                   for index, locator in enumerate(locators)]
+        resolved = next((index for index, result in enumerate(results) if result.count), None)
+        return resolved, results
+
+
+def load_snapshots(paths=None, include_stand_in=False):
+    """Load snapshot files (default: cartlow_page_source.html and snapshots/*.html)"""
+    if paths:
+        candidates = [Path(path) for path in paths]
+    else:
+        candidates = list(DEFAULT_SNAPSHOTS)
+        if SNAPSHOT_DIR.exists():
+            candidates += sorted(SNAPSHOT_DIR.glob("*.html"))
+    documents = [SnapshotDocument(path) for path in candidates if path.exists()]
+    if include_stand_in:
+        from utils.stand_in_site import StandInSite
+        for page_type, markup in StandInSite().snapshots().items():
+            documents.append(SnapshotDocument(markup, name=f"stand-in:{page_type}"))
+    return documents
+
+
+def page_object_classes():
+    """Import every module in pages/ and return the BasePage subclasses"""
+    for module in pkgutil.iter_modules(pages.__path__):
+        importlib.import_module(f"pages.{module.name}")
+    found = []
+    pending = list(BasePage.__subclasses__())
+    while pending:
+        cls = pending.pop(0)
+        found.append(cls)
+        pending.extend(cls.__subclasses__())
+    return sorted(found, key=lambda cls: cls.__name__)
+
+
+def collect_locators(classes=None):
+    """Return ({"Page.NAME": locator}, {"Page.NAME": [locators]}) from class attributes"""
+    single, fallbacks = {}, {}
+    for cls in classes or page_object_classes():
+        for attribute, value in vars(cls).items():
+            if attribute.startswith("_"):
+                continue
+            if is_locator(value):
+                single[f"{cls.__name__}.{attribute}"] = value
+            elif isinstance(value, (list, tuple)) and value and all(is_locator(item) for item in value):
+                fallbacks[f"{cls.__name__}.{attribute}"] = list(value)
+    return single, fallbacks
+
+
+def collect_helper_fallbacks():
+    """Fallback XPath lists defined on TestHelpers"""
+    from utils.test_helpers import TestHelpers
+    return {
+        f"TestHelpers.{attribute}": [(By.XPATH, xpath) for xpath in value]
+        for attribute, value in vars(TestHelpers).items()
+        if attribute.isupper() and isinstance(value, list) and all(isinstance(item, str) for item in value)
+    }
+
+
+class LocatorEngine:
+    """Evaluate all page-object locators and fallback lists over snapshots"""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def evaluate_all(self, extra_xpaths=None):
+        """Return a report dict per snapshot"""
+        single, fallbacks = collect_locators()
+        fallbacks.update(collect_helper_fallbacks())
+        for index, xpath in enumerate(extra_xpaths or []):
+            single[f"adhoc[{index}]"] = (By.XPATH, xpath)
+
+        report = []
+        for document in self.documents:
+            started = time.perf_counter()
+            locators = [document.evaluate(locator, name).as_dict() for name, locator in single.items()]
+            fallback_report = []
+            for name, entries in fallbacks.items():
+                resolved, results = document.evaluate_fallbacks(entries, name)
+                fallback_report.append({
+                    "name": name,
+                    "resolved_index": resolved,
+                    "resolved": results[resolved].as_dict() if resolved is not None else None,
+                    "entries": [result.as_dict() for result in results],
+                })
+            report.append({
+                "snapshot": document.name,
+                "parse_ms": round(document.parse_ms, 3),
+                "evaluate_ms": round((time.perf_counter() - started) * 1000, 3),
+                "locators": locators,
+                "fallbacks": fallback_report,
+            })
+            logging.info(f"Evaluated {len(locators)} locators and {len(fallback_report)} fallback lists "
+                         f"on {document.name}")
+        return report
@@ -0,0 +1,300 @@
+"""
+Queue-based structured logging pipeline for test execution
+
+Log calls only enqueue the record; a single listener thread per process
+formats it as a JSON line into a size-rotated per-worker file. After the run
+the per-worker streams are merged into one chronological log in the run's
+folder. Handlers already on the root logger (pytest's, or the caller's own)
+stay attached. Console output is written by the emitting thread, so pytest's
+capture attributes it to the test that logged it.
+"""
+
+import os
+import re
+import sys
+import copy
+import json
+import time
+import heapq
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+import shutil
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+LOG_DIR = PROJECT_ROOT / "logs"
+MERGED_JSONL = "test_execution.jsonl"
+MERGED_TEXT = "test_execution.log"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUP_COUNT = 5
+KEEP_RUNS = 10
+
+_process_context = {"test_id": None, "step": None, "started": None}
+_thread_context = threading.local()
+
+
+def worker_id():
+    """Return the id of the current worker process ('main' when not parallel)"""
+    return os.getenv("PYTEST_XDIST_WORKER", "main")
+
+
+def run_id():
+    """Return the id shared by all workers of this run.
+
+    The controller sets it before workers are spawned, and workers inherit it
+    through the environment, so every process writes into the same run folder.
+    """
+    return os.environ.setdefault("TEST_RUN_ID", time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}")
+
+
+class LogContext:
+    """Test id / step context attached to every record emitted by this process"""
+
+    @staticmethod
+    def _target():
+        # Threads that opened their own context (e.g. pooled browser sessions)
+        # log against it; everything else shares the process-level test context
+        return getattr(_thread_context, "context", None) or _process_context
+
+    @staticmethod
+    def begin_test(test_id, thread_local=False):
+        """Start a new test context and reset the elapsed clock"""
+        context = {"test_id": test_id, "step": None, "started": time.monotonic()}
+        if thread_local:
+            _thread_context.context = context
+        else:
+            _process_context.update(context)
+
+    @staticmethod
+    def end_test():
+        """Clear the current test context"""
+        if getattr(_thread_context, "context", None):
+            _thread_context.context = None
+        else:
+            _process_context.update({"test_id": None, "step": None, "started": None})
+
+    @staticmethod
+    def set_step(step):
+        """Explicitly set the current step"""
+        LogContext._target()["step"] = step
+
+    @staticmethod
+    def current():
+        """Return a copy of the active context"""
+        return dict(LogContext._target())
+
+
+class StructuredContextFilter(logging.Filter):
+    """Stamp records with test id, step, worker id and elapsed ms.
+
+    Runs in the emitting thread (before the record is queued) so the context
+    matches the code that logged it. Messages like "Step 3: ..." update the
+    current step automatically, matching how the flows already log.
+    """
+
+    STEP_PATTERN = re.compile(r"^Step (\d+)\b")
+
+    def filter(self, record):
+        context = LogContext._target()
+        if isinstance(record.msg, str) and record.msg.startswith("Step"):
+            match = self.STEP_PATTERN.match(record.getMessage())
+            if match:
+                context["step"] = int(match.group(1))
+        started = context.get("started")
+        record.test_id = context.get("test_id")
+        record.step = context.get("step")
+        record.worker_id = worker_id()
+        record.elapsed_ms = round((time.monotonic() - started) * 1000, 1) if started else None
+        return True
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Format a record as a single JSON line"""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "worker_id": getattr(record, "worker_id", worker_id()),
+            "test_id": getattr(record, "test_id", None),
+            "step": getattr(record, "step", None),
+            "elapsed_ms": getattr(record, "elapsed_ms", None),
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class StructuredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that keeps the traceback apart from the message.
+
+    The stock prepare() formats the traceback into the message and drops
+    exc_info, which would leave the JSON "exception" field always empty.
+    Here the traceback is rendered to exc_text before queueing (exc_info
+    itself does not survive a queue), and the message stays as logged.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """Stream handler writing to the current sys.stderr, so output follows pytest's capture"""
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class LogPipeline:
+    """Owns the queue, the listener thread and the per-worker file"""
+
+    _listener = None
+    _queue_handler = None
+    _console_handler = None
+
+    @staticmethod
+    def run_log_dir(log_dir=LOG_DIR):
+        """Return the folder holding this run's per-worker streams"""
+        return Path(log_dir) / run_id()
+
+    @staticmethod
+    def worker_log_path(log_dir=LOG_DIR, worker=None):
+        """Return the JSONL path used by a worker"""
+        return LogPipeline.run_log_dir(log_dir) / f"test_execution.{worker or worker_id()}.jsonl"
+
+    @staticmethod
+    def start(log_dir=LOG_DIR, level=logging.INFO, max_bytes=MAX_BYTES,
+              backup_count=BACKUP_COUNT, console=True):
+        """Route the root logger through a queue to a JSONL listener thread"""
+        if LogPipeline._listener:
+            return LogPipeline._queue_handler
+
+        LogPipeline.run_log_dir(log_dir).mkdir(parents=True, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            LogPipeline.worker_log_path(log_dir),
+            maxBytes=max_bytes,
+            backupCount=backup_count,
+            encoding="utf-8",
+            delay=True
+        )
+        file_handler.setFormatter(JsonLineFormatter())
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = StructuredQueueHandler(log_queue)
+        queue_handler.addFilter(StructuredContextFilter())
+
+        root = logging.getLogger()
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+
+        if console:
+            console_handler = ConsoleHandler()
+            console_handler.setFormatter(logging.Formatter(
+                "%(asctime)s - %(levelname)s - [%(worker_id)s] %(message)s"
+            ))
+            console_handler.addFilter(StructuredContextFilter())
+            root.addHandler(console_handler)
+            LogPipeline._console_handler = console_handler
+
+        listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+
+        LogPipeline._listener = listener
+        LogPipeline._queue_handler = queue_handler
+        atexit.register(LogPipeline.stop)
+        return queue_handler
+
+    @staticmethod
+    def stop():
+        """Flush the queue and stop the listener thread"""
+        listener = LogPipeline._listener
+        if not listener:
+            return
+        LogPipeline._listener = None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+        root = logging.getLogger()
+        for handler in (LogPipeline._queue_handler, LogPipeline._console_handler):
+            if handler in root.handlers:
+                root.removeHandler(handler)
+        LogPipeline._queue_handler = None
+        LogPipeline._console_handler = None
+
+    @staticmethod
+    def _worker_files(log_dir):
+        """Group per-worker files, oldest rotated file first"""
+        groups = {}
+        for path in Path(log_dir).glob("test_execution.*.jsonl*"):
+            base, _, suffix = path.name.partition(".jsonl")
+            rotation = int(suffix.lstrip(".")) if suffix.lstrip(".").isdigit() else 0
+            groups.setdefault(base, []).append((rotation, path))
+        return [[path for _, path in sorted(files, reverse=True)] for files in groups.values()]
+
+    @staticmethod
+    def _read_stream(paths):
+        """Yield (ts, line) for one worker across its rotated files"""
+        for path in paths:
+            with open(path, encoding="utf-8") as handle:
+                for line in handle:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line).get("ts", 0), line
+                    except ValueError:
+                        continue
+
+    @staticmethod
+    def prune_runs(log_dir=LOG_DIR, keep=KEEP_RUNS):
+        """Delete all but the most recent run folders"""
+        runs = sorted((path for path in Path(log_dir).iterdir() if path.is_dir()),
+                      key=lambda path: path.stat().st_mtime)
+        for path in runs[:-keep] if keep else runs:
+            shutil.rmtree(path, ignore_errors=True)
+
+    @staticmethod
+    def merge_worker_logs(log_dir=LOG_DIR, jsonl_output=None, text_output=None):
+        """Merge this run's per-worker streams into one chronological JSONL and text log (in the run folder by default)"""
+        run_dir = LogPipeline.run_log_dir(log_dir)
+        jsonl_output = Path(jsonl_output or run_dir / MERGED_JSONL)
+        text_output = Path(text_output or run_dir / MERGED_TEXT)
+        streams = [LogPipeline._read_stream(paths) for paths in LogPipeline._worker_files(run_dir)]
+        if not streams:
+            return 0
+
+        count = 0
+        with open(jsonl_output, "w", encoding="utf-8") as jsonl, \
+                open(text_output, "w", encoding="utf-8") as text:
+            # Each worker stream is already in time order, so a k-way merge suffices
+            for ts, line in heapq.merge(*streams, key=lambda item: item[0]):
+                entry = json.loads(line)
+                jsonl.write(line + "\n")
+                stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+                step = f" step={entry['step']}" if entry.get("step") is not None else ""
+                test = f" {entry['test_id']}" if entry.get("test_id") else ""
+                text.write(f"{stamp},{int((ts % 1) * 1000):03d} - {entry['level']} - "
+                           f"[{entry['worker_id']}{test}{step}] {entry['message']}\n")
+                if entry.get("exception"):
+                    text.write(entry["exception"] + "\n")
+                count += 1
+        LogPipeline.prune_runs(log_dir)
+        return count
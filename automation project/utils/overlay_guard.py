@@ -0,0 +1,151 @@
+"""
+In-page overlay guard
+
+A script installed once per document dismisses cookie banners, newsletter
+and promotion popups as they appear, so clicks do not land on overlays and
+no step pays for probing them. On Chromium it is registered with CDP
+Page.addScriptToEvaluateOnNewDocument and runs before the site's own
+scripts on every navigation; on other browsers ensure() injects it into the
+current document (BasePage.navigate_to calls it after each navigation).
+
+The script watches the DOM with a MutationObserver, clicks the rule's close
+button (backdrops, which have none, are hidden) and appends each dismissal
+to sessionStorage, where read_log() picks it up across navigations.
+
+The generic rules (any open modal, popup or backdrop) would also close
+dialogs a test opened on purpose, so they only run with OVERLAY_GUARD_GENERIC.
+"""
+
+import json
+import logging
+from config.config import Config
+
+# name, overlay selector, close control inside it (None: hide the overlay)
+GUARD_RULES = [
+    {"name": "cookie-banner", "overlay": "#onetrust-banner-sdk, [id*='cookie' i][class*='banner' i], "
+                                         "[class*='cookie-consent' i], [class*='cookie-banner' i]",
+     "dismiss": "#onetrust-accept-btn-handler, button[class*='accept' i], button[id*='accept' i]"},
+    {"name": "newsletter", "overlay": "[class*='newsletter' i][class*='popup' i], [class*='newsletter' i][class*='modal' i], "
+                                      "[id*='newsletter' i][class*='modal' i]",
+     "dismiss": "[class*='close' i], [aria-label='Close' i], [data-dismiss='modal']"},
+    {"name": "promo", "overlay": "[class*='promo' i][class*='popup' i], [class*='promo' i][class*='modal' i], "
+                                 "[id*='promo' i][class*='modal' i]",
+     "dismiss": "[class*='close' i], [aria-label='Close' i], [data-dismiss='modal']"},
+]
+# Opt-in (OVERLAY_GUARD_GENERIC): these match the site's own dialogs as well
+GENERIC_RULES = [
+    {"name": "modal", "overlay": ".modal.show, .modal.in, [role='dialog'][aria-modal='true']",
+     "dismiss": "[data-dismiss='modal'], [data-bs-dismiss='modal'], [aria-label='Close' i], button[class*='close' i]"},
+    {"name": "popup", "overlay": "[class*='popup' i]:not(body):not(html)",
+     "dismiss": "button[class*='close' i], [class*='popup-close' i], [aria-label='Close' i]"},
+    {"name": "backdrop", "overlay": ".modal-backdrop, [class*='overlay' i][class*='backdrop' i]", "dismiss": None},
+]
+LOG_KEY = "__overlayGuardLog"
+LOG_LIMIT = 200
+
+_SCRIPT = """
+(function (rules, logKey, logLimit) {
+    if (window.__overlayGuard) { window.__overlayGuard.scan(); return; }
+    function visible(el) {
+        var rect = el.getBoundingClientRect();
+        var style = window.getComputedStyle(el);
+        return rect.width > 0 && rect.height > 0 && style.visibility !== 'hidden' && style.display !== 'none';
+    }
+    function record(rule, action) {
+        try {
+            var log = JSON.parse(sessionStorage.getItem(logKey) || '[]');
+            log.push({rule: rule.name, action: action, url: location.href, at: Date.now()});
+            sessionStorage.setItem(logKey, JSON.stringify(log.slice(-logLimit)));
+        } catch (e) { /* storage blocked: dismissal still happens */ }
+    }
+    function scan() {
+        rules.forEach(function (rule) {
+            var overlays;
+            try { overlays = document.querySelectorAll(rule.overlay); } catch (e) { return; }
+            Array.prototype.forEach.call(overlays, function (overlay) {
+                if (overlay.__overlayGuarded || !visible(overlay)) { return; }
+                if (!rule.dismiss) {
+                    overlay.__overlayGuarded = true;
+                    overlay.style.setProperty('display', 'none', 'important');
+                    record(rule, 'hidden');
+                    return;
+                }
+                // Without its close control yet, leave the overlay for a later mutation
+                var control = overlay.querySelector(rule.dismiss);
+                if (control) {
+                    overlay.__overlayGuarded = true;
+                    control.click();
+                    record(rule, 'clicked');
+                }
+            });
+        });
+    }
+    var pending = false;
+    function schedule() {
+        if (pending) { return; }
+        pending = true;
+        setTimeout(function () { pending = false; scan(); }, 0);
+    }
+    window.__overlayGuard = {scan: scan};
+    new MutationObserver(schedule).observe(document, {childList: true, subtree: true, attributes: true,
+                                                      attributeFilter: ['class', 'style', 'aria-modal']});
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', scan);
+    } else {
+        scan();
+    }
+})(%s, %s, %d);
+"""
+GUARD_SCRIPT = _SCRIPT % (json.dumps(GUARD_RULES), json.dumps(LOG_KEY), LOG_LIMIT)
+GENERIC_GUARD_SCRIPT = _SCRIPT % (json.dumps(GUARD_RULES + GENERIC_RULES), json.dumps(LOG_KEY), LOG_LIMIT)
+
+
+class OverlayGuard:
+    """Install the guard on a driver and read what it dismissed"""
+
+    @staticmethod
+    def script():
+        """The guard for the configured rules"""
+        return GENERIC_GUARD_SCRIPT if Config.OVERLAY_GUARD_GENERIC else GUARD_SCRIPT
+
+    @staticmethod
+    def install(driver):
+        """Register the guard for every new document (Chromium) and run it on the current one"""
+        if hasattr(driver, "execute_cdp_cmd"):
+            try:
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": OverlayGuard.script()})
+                driver.overlay_guard = "cdp"
+            except Exception as e:
+                logging.warning(f"Overlay guard not registered via CDP: {e}")
+        if getattr(driver, "overlay_guard", None) != "cdp":
+            driver.overlay_guard = "inject"
+        OverlayGuard.ensure(driver, force=True)
+        return driver
+
+    @staticmethod
+    def ensure(driver, force=False):
+        """Inject the guard into the current document when CDP does not do it per document"""
+        mode = getattr(driver, "overlay_guard", None)
+        if mode is None or (mode == "cdp" and not force):
+            return False
+        try:
+            driver.execute_script(OverlayGuard.script())
+            return True
+        except Exception as e:
+            logging.debug(f"Overlay guard not injected: {e}")
+            return False
+
+    @staticmethod
+    def read_log(driver):
+        """Dismissals in this tab's session: [{"rule", "action", "url", "at"}]"""
+        try:
+            return json.loads(driver.execute_script(f"return sessionStorage.getItem('{LOG_KEY}');") or "[]")
+        except Exception as e:
+            logging.debug(f"Overlay guard log not readable: {e}")
+            return []
+
+    @staticmethod
+    def log_dismissals(driver):
+        """Log the dismissals so far"""
+        for entry in OverlayGuard.read_log(driver):
+            logging.info(f"Overlay guard {entry['action']} {entry['rule']} on {entry['url']}")
@@ -0,0 +1,310 @@
+"""
+Browser-side page performance metrics with a local SQLite history
+
+After a navigation settles, one async script call reads Navigation Timing,
+a resource timing summary, LCP/CLS (buffered PerformanceObserver entries) and
+JS heap size. Rows are keyed by run id and page type so runs can be compared
+to separate site slowness from framework slowness, and tagged with the
+network/CPU emulation the driver ran under.
+
+Compare runs with: python -m utils.page_metrics compare <run-a> <run-b>
+"""
+
+import re
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import statistics
+from pathlib import Path
+from config.config import Config
+from utils.log_pipeline import run_id
+from utils.emulation import Emulation, NO_EMULATION
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+METRICS_DB = PROJECT_ROOT / "reports" / "page_metrics.db"
+
+PAGE_TYPES = [
+    ("login", re.compile(r"/(login|signin|sign-in)\b")),
+    ("search", re.compile(r"/search\b|[?&](q|query|search)=")),
+    ("product", re.compile(r"/product/")),
+    ("cart", re.compile(r"/cart\b")),
+    ("checkout", re.compile(r"/checkout\b")),
+    ("category", re.compile(r"/category/|/c/")),
+]
+
+METRICS_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var result = {url: location.href, time_origin: performance.timeOrigin};
+var observers = [];
+try {
+    var nav = performance.getEntriesByType('navigation')[0];
+    if (nav) {
+        result.navigation = {
+            type: nav.type,
+            dns_ms: nav.domainLookupEnd - nav.domainLookupStart,
+            connect_ms: nav.connectEnd - nav.connectStart,
+            ttfb_ms: nav.responseStart - nav.requestStart,
+            response_ms: nav.responseEnd - nav.responseStart,
+            dom_interactive_ms: nav.domInteractive,
+            dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+            load_ms: nav.loadEventEnd,
+            transfer_bytes: nav.transferSize
+        };
+    }
+    var summary = {count: 0, transfer_bytes: 0, by_type: {}, slowest: []};
+    performance.getEntriesByType('resource').forEach(function (entry) {
+        summary.count += 1;
+        summary.transfer_bytes += entry.transferSize || 0;
+        var bucket = summary.by_type[entry.initiatorType] || {count: 0, transfer_bytes: 0, duration_ms: 0};
+        bucket.count += 1;
+        bucket.transfer_bytes += entry.transferSize || 0;
+        bucket.duration_ms += entry.duration;
+        summary.by_type[entry.initiatorType] = bucket;
+        summary.slowest.push({name: entry.name, duration_ms: entry.duration});
+    });
+    summary.slowest.sort(function (a, b) { return b.duration_ms - a.duration_ms; });
+    summary.slowest = summary.slowest.slice(0, 5);
+    result.resources = summary;
+    result.lcp_ms = null;
+    result.cls = 0;
+    var supported = (window.PerformanceObserver && PerformanceObserver.supportedEntryTypes) || [];
+    if (supported.indexOf('largest-contentful-paint') >= 0) {
+        var lcp = new PerformanceObserver(function (list) {
+            var entries = list.getEntries();
+            result.lcp_ms = entries[entries.length - 1].startTime;
+        });
+        lcp.observe({type: 'largest-contentful-paint', buffered: true});
+        observers.push(lcp);
+    }
+    if (supported.indexOf('layout-shift') >= 0) {
+        var cls = new PerformanceObserver(function (list) {
+            list.getEntries().forEach(function (entry) {
+                if (!entry.hadRecentInput) { result.cls += entry.value; }
+            });
+        });
+        cls.observe({type: 'layout-shift', buffered: true});
+        observers.push(cls);
+    }
+    result.js_heap = performance.memory ? {
+        used_bytes: performance.memory.usedJSHeapSize,
+        total_bytes: performance.memory.totalJSHeapSize
+    } : null;
+} catch (e) {
+    result.error = String(e);
+}
+// Buffered observer entries are delivered asynchronously; give them a tick
+setTimeout(function () {
+    observers.forEach(function (observer) { observer.disconnect(); });
+    done(result);
+}, 50);
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS page_metrics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    url TEXT,
+    recorded_at REAL,
+    ttfb_ms REAL,
+    dom_content_loaded_ms REAL,
+    load_ms REAL,
+    lcp_ms REAL,
+    cls REAL,
+    js_heap_used_bytes INTEGER,
+    resource_count INTEGER,
+    resource_bytes INTEGER,
+    emulation TEXT,
+    raw TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_page_metrics_run ON page_metrics (run_id, page_type);
+"""
+
+COMPARED_COLUMNS = ["ttfb_ms", "dom_content_loaded_ms", "load_ms", "lcp_ms", "cls",
+                    "js_heap_used_bytes", "resource_count", "resource_bytes"]
+
+
+def classify_page(url):
+    """Map a URL to a page type used as the history key"""
+    path = re.sub(r"^https?://[^/]+", "", url or "")
+    for page_type, pattern in PAGE_TYPES:
+        if pattern.search(path):
+            return page_type
+    stripped = path.split("?")[0].rstrip("/")
+    if stripped in ("", "/uae/en", "/uae/ar"):
+        return "home"
+    return "other"
+
+
+class PageMetricsCollector:
+    """Collect metrics after navigations and store them in SQLite"""
+
+    db_path = METRICS_DB
+    _last_document = {}
+
+    @staticmethod
+    def _connect(db_path=None):
+        path = Path(db_path or PageMetricsCollector.db_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(path, timeout=10)
+        connection.executescript(SCHEMA)
+        # Histories recorded before the emulation tag existed
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(page_metrics)")]
+        if "emulation" not in columns:
+            connection.execute(f"ALTER TABLE page_metrics ADD COLUMN emulation TEXT DEFAULT '{NO_EMULATION}'")
+        return connection
+
+    @staticmethod
+    def collect(driver, page_type=None):
+        """Read metrics for the current document and record them; never raises"""
+        if not Config.COLLECT_PAGE_METRICS:
+            return None
+        try:
+            metrics = driver.execute_async_script(METRICS_SCRIPT)
+        except Exception as e:
+            logging.debug(f"Page metrics unavailable: {e}")
+            return None
+        if not isinstance(metrics, dict):
+            return None
+
+        # navigate_to and wait_for_page_load can both fire for one document
+        document = (metrics.get("url"), metrics.get("time_origin"))
+        if PageMetricsCollector._last_document.get(id(driver)) == document:
+            return None
+        PageMetricsCollector._last_document[id(driver)] = document
+
+        metrics["page_type"] = page_type or classify_page(metrics.get("url"))
+        metrics["emulation"] = Emulation.active(driver)
+        try:
+            PageMetricsCollector.record(metrics)
+        except Exception as e:
+            logging.warning(f"Could not store page metrics: {e}")
+        return metrics
+
+    @staticmethod
+    def record(metrics, run=None, db_path=None):
+        """Insert one metrics row"""
+        navigation = metrics.get("navigation") or {}
+        resources = metrics.get("resources") or {}
+        heap = metrics.get("js_heap") or {}
+        connection = PageMetricsCollector._connect(db_path)
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT INTO page_metrics (run_id, page_type, url, recorded_at, ttfb_ms, "
+                    "dom_content_loaded_ms, load_ms, lcp_ms, cls, js_heap_used_bytes, "
+                    "resource_count, resource_bytes, emulation, raw) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run or run_id(), metrics.get("page_type"), metrics.get("url"), time.time(),
+                     navigation.get("ttfb_ms"), navigation.get("dom_content_loaded_ms"),
+                     navigation.get("load_ms"), metrics.get("lcp_ms"), metrics.get("cls"),
+                     heap.get("used_bytes"), resources.get("count"), resources.get("transfer_bytes"),
+                     metrics.get("emulation", NO_EMULATION), json.dumps(metrics))
+                )
+        finally:
+            connection.close()
+
+    @staticmethod
+    def runs(db_path=None):
+        """Return (run_id, first recorded_at, row count, emulation tags) for every run, newest first"""
+        connection = PageMetricsCollector._connect(db_path)
+        try:
+            return connection.execute(
+                "SELECT run_id, MIN(recorded_at), COUNT(*), GROUP_CONCAT(DISTINCT emulation) FROM page_metrics "
+                "GROUP BY run_id ORDER BY MIN(recorded_at) DESC"
+            ).fetchall()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def summary(run, db_path=None):
+        """Median of each metric per page type for one run"""
+        connection = PageMetricsCollector._connect(db_path)
+        try:
+            rows = connection.execute(
+                f"SELECT page_type, {', '.join(COMPARED_COLUMNS)} FROM page_metrics WHERE run_id = ?",
+                (run,)
+            ).fetchall()
+        finally:
+            connection.close()
+        grouped = {}
+        for row in rows:
+            grouped.setdefault(row[0], []).append(row[1:])
+        summary = {}
+        for page_type, values in grouped.items():
+            summary[page_type] = {"samples": len(values)}
+            for index, column in enumerate(COMPARED_COLUMNS):
+                present = [value[index] for value in values if value[index] is not None]
+                summary[page_type][column] = statistics.median(present) if present else None
+        return summary
+
+    @staticmethod
+    def compare(run_a, run_b, db_path=None):
+        """Return {page_type: {metric: (a, b, delta)}} for two runs"""
+        first = PageMetricsCollector.summary(run_a, db_path)
+        second = PageMetricsCollector.summary(run_b, db_path)
+        comparison = {}
+        for page_type in sorted(set(first) | set(second)):
+            comparison[page_type] = {}
+            for column in ["samples"] + COMPARED_COLUMNS:
+                a = first.get(page_type, {}).get(column)
+                b = second.get(page_type, {}).get(column)
+                delta = b - a if a is not None and b is not None else None
+                comparison[page_type][column] = (a, b, delta)
+        return comparison
+
+
+def _resolve_run(name, runs):
+    """Accept 'latest' / 'previous' as aliases"""
+    aliases = {"latest": 0, "previous": 1}
+    if name in aliases:
+        if len(runs) <= aliases[name]:
+            raise SystemExit(f"No {name} run recorded")
+        return runs[aliases[name]][0]
+    return name
+
+
+def main(argv=None):
+    """Command line interface for listing and comparing runs"""
+    parser = argparse.ArgumentParser(description="Page performance metrics history")
+    parser.add_argument("--db", default=str(METRICS_DB), help="SQLite history file")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("runs", help="List recorded runs")
+    show = commands.add_parser("show", help="Per page type medians for one run")
+    show.add_argument("run", help="Run id, 'latest' or 'previous'")
+    compare = commands.add_parser("compare", help="Compare two runs")
+    compare.add_argument("run_a", help="Baseline run id, 'latest' or 'previous'")
+    compare.add_argument("run_b", help="Candidate run id, 'latest' or 'previous'")
+    args = parser.parse_args(argv)
+
+    runs = PageMetricsCollector.runs(args.db)
+    if args.command == "runs":
+        for run, started, count, emulation in runs:
+            print(f"{run:<32}{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(started))}  {count} pages"
+                  f"  [{emulation}]")
+        return 0
+
+    if args.command == "show":
+        summary = PageMetricsCollector.summary(_resolve_run(args.run, runs), args.db)
+        for page_type, values in sorted(summary.items()):
+            print(f"\n[{page_type}]")
+            for column, value in values.items():
+                print(f"  {column:<24}{'-' if value is None else round(value, 1)}")
+        return 0
+
+    run_a = _resolve_run(args.run_a, runs)
+    run_b = _resolve_run(args.run_b, runs)
+    print(f"Comparing {run_a} (a) -> {run_b} (b)")
+    for page_type, columns in PageMetricsCollector.compare(run_a, run_b, args.db).items():
+        print(f"\n[{page_type}]")
+        print(f"  {'metric':<24}{'a':>14}{'b':>14}{'delta':>14}")
+        for column, (a, b, delta) in columns.items():
+            cells = ["-" if value is None else f"{value:.1f}" for value in (a, b, delta)]
+            print(f"  {column:<24}{cells[0]:>14}{cells[1]:>14}{cells[2]:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Token-based fuzzy matching of product titles
+
+Titles and target names are compared as sets of lower-case word tokens, so
+punctuation (14", commas, brackets) and word order do not matter. Word
+tokens tolerate small spelling changes; tokens with digits (model numbers,
+sizes, capacities) must match exactly, so "Latitude 7490" never matches a
+"Latitude 5490".
+"""
+
+import re
+from difflib import SequenceMatcher
+
+# Results scoring below this are not treated as the target product
+MIN_SCORE = 0.7
+# Two word tokens this similar count as the same word
+TOKEN_SIMILARITY = 0.8
+# Share of the score from covering the target's tokens; the rest penalises extra words
+RECALL_WEIGHT = 0.8
+
+
+def tokens(text):
+    """Lower-case word tokens, punctuation dropped"""
+    return re.findall(r"[a-z0-9]+", (text or "").lower())
+
+
+def token_similarity(first, second):
+    """1.0 for equal tokens, the spelling similarity for close words, otherwise 0"""
+    if first == second:
+        return 1.0
+    if any(char.isdigit() for char in first + second):
+        return 0.0
+    ratio = SequenceMatcher(None, first, second).ratio()
+    return ratio if ratio >= TOKEN_SIMILARITY else 0.0
+
+
+def _coverage(wanted, offered):
+    return sum(max(token_similarity(token, other) for other in offered) for token in wanted) / len(wanted)
+
+
+def match_score(target, title):
+    """0..1 similarity of a title to the target name"""
+    wanted, offered = set(tokens(target)), set(tokens(title))
+    if not wanted or not offered:
+        return 0.0
+    recall = _coverage(wanted, offered)
+    precision = _coverage(offered, wanted)
+    return round(RECALL_WEIGHT * recall + (1 - RECALL_WEIGHT) * precision, 3)
+
+
+def rank(results, target, key="title"):
+    """(score, result) pairs, best first; ties keep page order"""
+    scored = [(match_score(target, result[key]), result) for result in results]
+    return sorted(scored, key=lambda pair: -pair[0])
+
+
+def parse_price(text):
+    """Amount in a price label such as "AED 1,899.00", or None"""
+    match = re.search(r"\d[\d,]*(?:\.\d+)?", text or "")
+    return float(match.group().replace(",", "")) if match else None
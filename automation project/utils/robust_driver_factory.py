@@ -17,6 +17,14 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from config.config import Config
 
 class RobustDriverFactory:
+    @staticmethod
+    def apply_profile_options(options):
+        """Profile settings that must be in place before the browser starts"""
+        options.page_load_strategy = Config.PAGE_LOAD_STRATEGY
+        if Config.HEADLESS:
+            options.add_argument("--headless")
+        return options
+    
     @staticmethod
     def create_driver(browser_name=None):
         """Create and return a WebDriver instance with fallback options"""
@@ -52,6 +60,7 @@ class RobustDriverFactory:
                 options.add_argument("--disable-dev-shm-usage")
                 options.add_argument("--disable-gpu")
                 options.add_argument("--window-size=1920,1080")
+                RobustDriverFactory.apply_profile_options(options)
                 
                 # Try to find Chrome driver in system PATH
                 driver = webdriver.Chrome(options=options)
@@ -61,6 +70,7 @@ class RobustDriverFactory:
                 options = FirefoxOptions()
                 options.add_argument("--width=1920")
                 options.add_argument("--height=1080")
+                RobustDriverFactory.apply_profile_options(options)
                 
                 driver = webdriver.Firefox(options=options)
                 return driver
@@ -71,6 +81,7 @@ class RobustDriverFactory:
                 options.add_argument("--disable-dev-shm-usage")
                 options.add_argument("--disable-gpu")
                 options.add_argument("--window-size=1920,1080")
+                RobustDriverFactory.apply_profile_options(options)
                 
                 driver = webdriver.Edge(options=options)
                 return driver
@@ -108,6 +119,7 @@ class RobustDriverFactory:
                 options.add_argument("--disable-dev-shm-usage")
                 options.add_argument("--disable-gpu")
                 options.add_argument("--window-size=1920,1080")
+                RobustDriverFactory.apply_profile_options(options)
                 
                 service = ChromeService(driver_path)
                 driver = webdriver.Chrome(service=service, options=options)
@@ -120,6 +132,7 @@ class RobustDriverFactory:
                 options = FirefoxOptions()
                 options.add_argument("--width=1920")
                 options.add_argument("--height=1080")
+                RobustDriverFactory.apply_profile_options(options)
                 
                 service = FirefoxService(driver_path)
                 driver = webdriver.Firefox(service=service, options=options)
@@ -134,6 +147,7 @@ class RobustDriverFactory:
                 options.add_argument("--disable-dev-shm-usage")
                 options.add_argument("--disable-gpu")
                 options.add_argument("--window-size=1920,1080")
+                RobustDriverFactory.apply_profile_options(options)
                 
                 service = EdgeService(driver_path)
                 driver = webdriver.Edge(service=service, options=options)
@@ -168,6 +182,7 @@ class RobustDriverFactory:
                     options.add_argument("--disable-dev-shm-usage")
                     options.add_argument("--disable-gpu")
                     options.add_argument("--window-size=1920,1080")
+                    RobustDriverFactory.apply_profile_options(options)
                     
                     driver = webdriver.Chrome(options=options)
                     return driver
@@ -0,0 +1,164 @@
+"""
+Warm test-runner daemon
+
+A long-lived process keeps Selenium, pytest and its plugins imported and a
+DriverPool of warm, signed-in browsers ready. Thin clients (run_warm.py)
+send "run these tests" requests over a local socket; the daemon runs pytest
+in-process and streams one JSON line per test report back. Project modules
+(pages, utils, tests, conftest) are dropped from sys.modules before each
+run so edits are picked up without restarting.
+
+Protocol: newline-delimited JSON. Requests are {"command": "run", "args":
+[...]}, {"command": "status"} or {"command": "stop"}; every response stream
+ends with an event of type "done".
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import threading
+import socketserver
+from pathlib import Path
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PORT = 47217
+# Modules that hold the daemon's warm state and must survive the per-run purge. The
+# pooled drivers were set up from Config, so the runs share that same class
+KEEP_MODULES = {"__main__", "config", "config.config", "utils.driver_pool", "utils.runner_daemon"}
+
+
+def purge_project_modules(root=PROJECT_ROOT, keep=KEEP_MODULES):
+    """Drop project modules from sys.modules so the next run imports current sources"""
+    purged = []
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if name in keep or not path:
+            continue
+        try:
+            Path(path).resolve().relative_to(root)
+        except ValueError:
+            continue
+        del sys.modules[name]
+        purged.append(name)
+    return purged
+
+
+class StreamPlugin:
+    """pytest plugin forwarding collection and test reports to the client"""
+
+    def __init__(self, emit):
+        self.emit = emit
+
+    def pytest_collection_finish(self, session):
+        self.emit({"event": "collected", "count": len(session.items)})
+
+    def pytest_runtest_logreport(self, report):
+        # One event per test: its call phase, or the setup/teardown phase that failed or skipped it
+        if report.when != "call" and report.passed:
+            return
+        self.emit({
+            "event": "test",
+            "nodeid": report.nodeid,
+            "when": report.when,
+            "outcome": report.outcome,
+            "duration": round(report.duration, 3),
+            "longrepr": str(report.longrepr) if report.failed else None,
+        })
+
+
+def run_pytest(args, emit):
+    """Run pytest in this process; returns its exit code"""
+    purge_project_modules()
+    os.environ["TEST_RUN_ID"] = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+    return int(pytest.main(list(args), plugins=[StreamPlugin(emit)]))
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        daemon = self.server.runner_daemon
+
+        def emit(event):
+            self.wfile.write((json.dumps(event) + "\n").encode())
+            self.wfile.flush()
+
+        try:
+            request = json.loads(self.rfile.readline() or b"{}")
+            daemon.handle(request, emit)
+        except (BrokenPipeError, ConnectionResetError):
+            logging.warning("Runner client disconnected before the run finished")
+        except Exception as e:
+            logging.error(f"Runner request failed: {e}")
+            emit({"event": "done", "exit_code": 3, "error": str(e)})
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class RunnerDaemon:
+    """Serve test runs against a warm driver pool on a local socket"""
+
+    def __init__(self, pool=None, port=DEFAULT_PORT, host="127.0.0.1", runner=run_pytest):
+        self.pool = pool
+        self.runner = runner
+        self.server = _Server((host, port), _Handler)
+        self.server.runner_daemon = self
+        self.port = self.server.server_address[1]
+        self.runs = 0
+        self.started = time.time()
+        # pytest keeps process-wide state, so runs are serialised
+        self._run_lock = threading.Lock()
+
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "runs": self.runs,
+            "pool": self.pool.status() if self.pool else None,
+        }
+
+    def handle(self, request, emit):
+        command = request.get("command")
+        if command == "run":
+            with self._run_lock:
+                started = time.perf_counter()
+                emit({"event": "started", "args": request.get("args", [])})
+                exit_code = self.runner(request.get("args", []), emit)
+                self.runs += 1
+            emit({"event": "done", "exit_code": exit_code, "elapsed_s": round(time.perf_counter() - started, 3)})
+        elif command == "status":
+            emit({"event": "done", "exit_code": 0, "status": self.status()})
+        elif command == "stop":
+            emit({"event": "done", "exit_code": 0})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            emit({"event": "done", "exit_code": 4, "error": f"Unknown command: {command}"})
+
+    def serve_forever(self):
+        logging.info(f"Runner daemon listening on 127.0.0.1:{self.port}")
+        try:
+            self.server.serve_forever()
+        finally:
+            self.server.server_close()
+            if self.pool:
+                self.pool.close()
+            logging.info("Runner daemon stopped")
+
+
+def send_request(request, port=DEFAULT_PORT, on_event=None, timeout=None):
+    """Send one request to the daemon and return its final "done" event"""
+    with socket.create_connection(("127.0.0.1", port), timeout=timeout) as connection:
+        connection.sendall((json.dumps(request) + "\n").encode())
+        stream = connection.makefile("r", encoding="utf-8")
+        for line in stream:
+            event = json.loads(line)
+            if on_event:
+                on_event(event)
+            if event["event"] == "done":
+                return event
+    raise ConnectionError("Runner daemon closed the connection before the run finished")
@@ -0,0 +1,283 @@
+"""
+Rolling screen capture: the last seconds of a test as a video, kept only when it fails
+
+Recording every test would cost too much, so the capture here is built to be
+close to free until it is needed:
+
+- On Chromium, CDP Page.startScreencast makes the browser push JPEG frames at
+  reduced size (SCREENCAST_MAX_WIDTH x SCREENCAST_MAX_HEIGHT), quality and
+  rate (every SCREENCAST_EVERY_NTH_FRAME-th frame). The browser only sends a
+  frame when the page changes, so an idle page costs nothing.
+- A background thread acks each frame and keeps it, still base64-encoded, in
+  a ring buffer that drops frames older than SCREENCAST_SECONDS.
+- Frames are decoded and written to a video only when a test fails: an MJPEG
+  AVI in screenshots/, muxed in pure Python (no encoder needed, the frames
+  already are JPEGs).
+
+The test fixtures install the recorder (benchmark, load and capacity runs do
+not, so their figures stay free of it). Each test reports the capture
+overhead on the runner: frames and bytes received, CPU time of the capture
+thread, and the time to write the clip. Browsers without CDP (and the fake
+driver) are not recorded.
+"""
+
+import time
+import base64
+import struct
+import logging
+import threading
+from pathlib import Path
+from collections import deque
+import psutil
+import trio
+from config.config import Config
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+VIDEO_DIR = PROJECT_ROOT / "screenshots"
+# Frame rate of the written clips; frames are repeated to keep their timing
+VIDEO_FPS = 10
+# Seconds to wait for the screencast to start
+START_TIMEOUT = 10.0
+
+
+def jpeg_size(data):
+    """(width, height) from a JPEG's start-of-frame segment, or None"""
+    position = 2
+    while position + 9 <= len(data):
+        if data[position] != 0xFF:
+            return None
+        marker = data[position + 1]
+        length = struct.unpack(">H", data[position + 2:position + 4])[0]
+        # SOF0..SOF15, except DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">HH", data[position + 5:position + 9])
+            return width, height
+        position += 2 + length
+    return None
+
+
+def _chunk(fourcc, payload):
+    return fourcc + struct.pack("<I", len(payload)) + payload + (b"\0" if len(payload) % 2 else b"")
+
+
+def _list(kind, payload):
+    return _chunk(b"LIST", kind + payload)
+
+
+def resample(frames, fps=VIDEO_FPS, start=None, end=None):
+    """Frames at a constant rate from (timestamp, data) pairs: each shown until the next one arrives"""
+    if not frames:
+        return []
+    start = frames[0][0] if start is None else max(start, frames[0][0])
+    end = frames[-1][0] if end is None else max(end, frames[-1][0])
+    timeline, index = [], 0
+    for step in range(int((end - start) * fps) + 1):
+        at = start + step / fps
+        while index + 1 < len(frames) and frames[index + 1][0] <= at:
+            index += 1
+        timeline.append(frames[index][1])
+    return timeline
+
+
+def write_avi(path, frames, fps=VIDEO_FPS):
+    """Write JPEG frames as an MJPEG AVI; the size comes from the first frame"""
+    width, height = jpeg_size(frames[0]) or (0, 0)
+    largest = max(len(frame) for frame in frames)
+    avih = struct.pack("<14I", 1000000 // fps, largest * fps, 0, 0x10, len(frames), 0, 1, largest,
+                       width, height, 0, 0, 0, 0)
+    strh = struct.pack("<4s4sIHHIIIIIIiI4H", b"vids", b"MJPG", 0, 0, 0, 0, 1, fps, 0, len(frames), largest, -1, 0,
+                       0, 0, width, height)
+    strf = struct.pack("<IiiHH4sIiiII", 40, width, height, 1, 24, b"MJPG", width * height * 3, 0, 0, 0, 0)
+    header = _list(b"hdrl", _chunk(b"avih", avih) + _list(b"strl", _chunk(b"strh", strh) + _chunk(b"strf", strf)))
+    chunks, index, offset = [], [], 4
+    for frame in frames:
+        chunk = _chunk(b"00dc", frame)
+        # Offsets count from the "movi" type code; 0x10 marks a key frame
+        index.append(struct.pack("<4sIII", b"00dc", 0x10, offset, len(frame)))
+        chunks.append(chunk)
+        offset += len(chunk)
+    body = b"AVI " + header + _list(b"movi", b"".join(chunks)) + _chunk(b"idx1", b"".join(index))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"RIFF" + struct.pack("<I", len(body)) + body)
+    return path
+
+
+class FrameBuffer:
+    """Frames of the last `seconds`, oldest dropped first; shared by the capture and test threads"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.frames = deque()
+        self._lock = threading.Lock()
+
+    def add(self, timestamp, data):
+        with self._lock:
+            self.frames.append((timestamp, data))
+            while timestamp - self.frames[0][0] > self.seconds:
+                self.frames.popleft()
+
+    def keep_last(self):
+        """Drop everything but the newest frame, which still shows the page at this point"""
+        with self._lock:
+            while len(self.frames) > 1:
+                self.frames.popleft()
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.frames)
+
+    def __len__(self):
+        return len(self.frames)
+
+
+class ScreencastRecorder:
+    """Record a driver's screencast into a ring buffer and save it as a clip on demand"""
+
+    def __init__(self, driver, seconds=None, max_width=None, max_height=None, every_nth_frame=None, quality=None):
+        self.driver = driver
+        self.buffer = FrameBuffer(seconds or Config.SCREENCAST_SECONDS)
+        self.max_width = max_width or Config.SCREENCAST_MAX_WIDTH
+        self.max_height = max_height or Config.SCREENCAST_MAX_HEIGHT
+        self.every_nth_frame = every_nth_frame or Config.SCREENCAST_EVERY_NTH_FRAME
+        self.quality = quality or Config.SCREENCAST_QUALITY
+        self.recording = False
+        self.frames = 0
+        self.bytes = 0
+        self._mark = {"frames": 0, "bytes": 0, "cpu": 0.0, "at": time.perf_counter()}
+        self._started = threading.Event()
+        self._thread = None
+        self._native_id = None
+        self._token = None
+        self._scope = None
+        self.error = None
+
+    @staticmethod
+    def install(driver):
+        """The driver's recorder, started on first use when SCREENCAST is on (kept as driver.screencast)"""
+        if hasattr(driver, "screencast"):
+            return driver.screencast
+        driver.screencast = None
+        if not Config.SCREENCAST:
+            return None
+        # bidi_connection exists on every remote driver, but only Chromium serves Page.startScreencast
+        if not hasattr(driver, "execute_cdp_cmd") or not hasattr(driver, "bidi_connection"):
+            logging.info(f"Screencast needs a Chromium browser; {getattr(driver, 'name', 'driver')} not recorded")
+            return None
+        recorder = ScreencastRecorder(driver)
+        if recorder.start():
+            driver.screencast = recorder
+        return driver.screencast
+
+    @staticmethod
+    def of(driver):
+        """The driver's recorder, or None when it is not recorded"""
+        return getattr(driver, "screencast", None)
+
+    def _keep(self, event):
+        # Kept base64-encoded: decoding is only paid for a failed test's clip
+        self.buffer.add(float(event.metadata.timestamp or time.time()), event.data)
+        self.frames += 1
+        self.bytes += len(event.data)
+
+    async def _capture(self):
+        self._native_id = threading.get_native_id()
+        self._token = trio.lowlevel.current_trio_token()
+        async with self.driver.bidi_connection() as connection:
+            session, devtools = connection.session, connection.devtools
+            events = session.listen(devtools.page.ScreencastFrame, buffer_size=4)
+            await session.execute(devtools.page.start_screencast(
+                format_="jpeg", quality=self.quality, max_width=self.max_width,
+                max_height=self.max_height, every_nth_frame=self.every_nth_frame))
+            self.recording = True
+            self._started.set()
+            with trio.CancelScope() as self._scope:
+                async for event in events:
+                    # The browser sends the next frame only after this one is acked
+                    await session.execute(devtools.page.screencast_frame_ack(session_id=event.session_id))
+                    self._keep(event)
+            with trio.move_on_after(1):
+                await session.execute(devtools.page.stop_screencast())
+
+    def _run(self):
+        try:
+            trio.run(self._capture)
+        except Exception as e:
+            # Also the way a recording ends when the browser quits first
+            self.error = e
+            logging.debug(f"Screencast ended: {e}")
+        finally:
+            self.recording = False
+            self._started.set()
+
+    def start(self):
+        """Start the screencast on a background thread; True once frames are requested"""
+        self._thread = threading.Thread(target=self._run, name="screencast", daemon=True)
+        self._thread.start()
+        self._started.wait(START_TIMEOUT)
+        if not self.recording:
+            logging.warning(f"Screencast not started: {self.error or 'timed out'}")
+            return False
+        logging.info(f"Recording the last {self.buffer.seconds:g}s at up to {self.max_width}x{self.max_height}, "
+                     f"every {self.every_nth_frame} frame(s)")
+        return True
+
+    def stop(self):
+        """Stop the screencast and its thread"""
+        if self._scope is not None and self._thread.is_alive():
+            try:
+                trio.from_thread.run_sync(self._scope.cancel, trio_token=self._token)
+            except (trio.RunFinishedError, RuntimeError):
+                pass
+            self._thread.join(2)
+
+    def _thread_cpu(self):
+        # User and system time of the capture thread, including its websocket reads
+        try:
+            for thread in psutil.Process().threads():
+                if thread.id == self._native_id:
+                    return thread.user_time + thread.system_time
+        except psutil.Error:
+            pass
+        return 0.0
+
+    def mark(self):
+        """Start a test: the clip and the overhead figures cover what comes after this"""
+        self.buffer.keep_last()
+        self._mark = {"frames": self.frames, "bytes": self.bytes, "cpu": self._thread_cpu(), "at": time.perf_counter()}
+
+    def overhead(self):
+        """Capture cost since the last mark: frames, bytes and capture-thread CPU, also as a share of wall time"""
+        wall = time.perf_counter() - self._mark["at"]
+        cpu = max(0.0, self._thread_cpu() - self._mark["cpu"])
+        return {"frames": self.frames - self._mark["frames"], "kept": len(self.buffer),
+                "bytes": self.bytes - self._mark["bytes"], "cpu_ms": round(cpu * 1000, 1),
+                "cpu_share": round(cpu / wall, 4) if wall > 0 else None}
+
+    def save(self, name):
+        """Write the buffered frames to screenshots/<name>_<time>.avi; (path or None, write ms)"""
+        started = time.perf_counter()
+        frames = [(timestamp, base64.b64decode(data)) for timestamp, data in self.buffer.snapshot()]
+        if not frames:
+            return None, 0.0
+        # The last frame is still on screen at the failure, so the clip runs up to now
+        end = max(time.time(), frames[-1][0])
+        safe = "".join(char if char.isalnum() or char in "-_." else "_" for char in name)
+        path = write_avi(VIDEO_DIR / f"{safe}_{int(time.time())}.avi",
+                         resample(frames, start=end - self.buffer.seconds, end=end))
+        return path, round((time.perf_counter() - started) * 1000, 1)
+
+    def finish_test(self, name, failed):
+        """Log this test's capture overhead and, when it failed, save its clip; the overhead dict"""
+        overhead = self.overhead()
+        overhead["clip"], overhead["write_ms"] = None, 0.0
+        if failed:
+            try:
+                path, overhead["write_ms"] = self.save(name)
+                overhead["clip"] = str(path) if path else None
+            except Exception as e:
+                logging.error(f"Failed to save screencast clip: {e}")
+        logging.info(f"Screencast overhead for {name}: {overhead['frames']} frames, {overhead['bytes']} bytes, "
+                     f"{overhead['cpu_ms']}ms capture CPU ({overhead['cpu_share']} of wall), "
+                     f"{overhead['write_ms']}ms to write" + (f", clip {overhead['clip']}" if overhead["clip"] else ""))
+        return overhead
@@ -0,0 +1,171 @@
+"""
+The 8-step shopping scenario expressed through the page objects
+
+Shared by the benchmark, load and soak tooling so every tool exercises the
+same steps as tests/test_cartlow_exact_8_steps.py.
+"""
+
+import time
+import logging
+from config.config import Config
+from pages.homepage import HomePage
+from pages.login_page import LoginPage
+from pages.product_page import ProductPage
+from pages.cart_page import CartPage
+from utils.test_helpers import TestHelpers
+from utils.step_retry import StepFailed, StepQuarantined, StepRetry
+from utils.wait_budget import WaitBudget, log_budget
+from utils.emulation import Emulation
+
+
+class ShoppingFlow:
+    """Drive the 8-step scenario on one driver and time each step"""
+
+    STEPS = [
+        ("open_home", "Open home page"),
+        ("sign_in", "Sign in with email and password"),
+        ("search_laptop", "Search for Dell Latitude laptop"),
+        ("add_laptop", "Add Dell Latitude to cart"),
+        ("open_cart_laptop", "Open cart to see Dell Latitude"),
+        ("search_watch", "Search for Apple Smartwatch Series 6"),
+        ("add_watch", "Add Apple Watch Series 6 to cart"),
+        ("open_cart_both", "Open cart to see both products"),
+    ]
+
+    # Seconds each step may spend in total, lookups and settle pauses included (x Config.BUDGET_SCALE)
+    BUDGETS = {
+        "open_home": 30,
+        "sign_in": 45,
+        "search_laptop": 30,
+        "add_laptop": 20,
+        "open_cart_laptop": 20,
+        "search_watch": 30,
+        "add_watch": 45,
+        "open_cart_both": 20,
+    }
+
+    # Steps that change the server-side cart; retried only while the cart count is unchanged
+    ADDS_TO_CART = ("add_laptop", "add_watch")
+
+    LAPTOP_MATCH = "Dell Latitude 7490"
+    WATCH_MATCH = "Apple Watch Series 6"
+
+    def __init__(self, driver, base_url=None, email=None, password=None, stats=None, retries=None):
+        self.driver = driver
+        self.base_url = (base_url or Config.BASE_URL).rstrip("/")
+        self.email = email or Config.EMAIL
+        self.password = password or Config.PASSWORD
+        self.home = HomePage(driver)
+        self.login_page = LoginPage(driver)
+        self.product = ProductPage(driver)
+        self.cart = CartPage(driver)
+        # Failed steps are retried in place (Config.STEP_RETRIES, or the step's flakiness history in stats)
+        self.retry = StepRetry(driver, stats=stats, retries=retries)
+
+    def run(self, steps=None, stop_on_failure=True, on_step=None):
+        """Run the steps in order and return a list of step results"""
+        selected = [step for step in self.STEPS if not steps or step[0] in steps]
+        results = []
+        for name, description in selected:
+            number = [step[0] for step in self.STEPS].index(name) + 1
+            logging.info(f"Step {number}: {description}")
+            started = time.perf_counter()
+            error = None
+            quarantined = False
+            with WaitBudget(name, self.BUDGETS[name] * Config.BUDGET_SCALE) as budget:
+                try:
+                    state = self.product.cart_count_now if name in self.ADDS_TO_CART else None
+                    self.retry.run(name, getattr(self, f"step_{name}"), state=state)
+                    if budget.overrun():
+                        raise StepFailed(f"Exceeded its {budget.seconds:g} s budget by {budget.overrun():.1f} s")
+                except Exception as e:
+                    error = str(e) or e.__class__.__name__
+                    quarantined = isinstance(e, StepQuarantined)
+                    logging.error(f"Step {number} FAILED: {error}")
+                    log_budget(budget)
+            result = {
+                "step": number,
+                "name": name,
+                "passed": error is None,
+                "attempts": self.retry.last_attempts,
+                "quarantined": quarantined,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+                "error": error,
+                "budget": budget.summary(),
+                "emulation": Emulation.active(self.driver),
+                "finished_at": time.time(),
+            }
+            results.append(result)
+            if on_step:
+                on_step(result)
+            if error and stop_on_failure:
+                break
+        return results
+
+    # ------------------------------------------------------------------ steps
+
+    def step_open_home(self):
+        """Step 1: Open home page"""
+        self.home.navigate_to(self.base_url)
+        if "Cartlow" not in self.driver.title:
+            raise StepFailed(f"Expected Cartlow in title, got: {self.driver.title}")
+
+    def step_sign_in(self):
+        """Step 2: Sign in with email and password"""
+        if not self.login_page.login(self.email, self.password):
+            raise StepFailed("Login form could not be submitted")
+        if not self.login_page.is_logged_in():
+            raise StepFailed("User menu not shown after login")
+
+    def _open_search_result(self, term, match):
+        if not self.home.search_product(term):
+            raise StepFailed(f"Search for '{term}' could not be submitted")
+        product_link = TestHelpers.find_product_by_name(self.driver, match)
+        if not product_link:
+            raise StepFailed(f"No '{match}' found in search results")
+        product_link.click()
+        if match.lower() not in self.product.get_product_title().lower():
+            raise StepFailed(f"Product page for '{match}' did not open")
+
+    def _cart_product_names(self):
+        return [element.text for element in self.cart.find_elements(self.cart.PRODUCT_NAME)]
+
+    def _open_cart_expecting(self, *names):
+        if not self.home.click_cart_icon():
+            raise StepFailed("Cart icon not clickable")
+        in_cart = " | ".join(self._cart_product_names()).lower()
+        missing = [name for name in names if name.lower() not in in_cart]
+        if missing:
+            raise StepFailed(f"Not in cart: {', '.join(missing)}")
+
+    def step_search_laptop(self):
+        """Step 3: Search for Dell Latitude laptop"""
+        self._open_search_result(Config.LAPTOP_SEARCH_TERM, self.LAPTOP_MATCH)
+
+    def step_add_laptop(self):
+        """Step 4: Add Dell Latitude to cart"""
+        if not self.product.add_to_cart():
+            raise StepFailed("Add to Cart button not clickable")
+
+    def step_open_cart_laptop(self):
+        """Step 5: Open cart to see Dell Latitude"""
+        self._open_cart_expecting(self.LAPTOP_MATCH)
+
+    def step_search_watch(self):
+        """Step 6: Search for Apple Smartwatch Series 6"""
+        self._open_search_result(Config.WATCH_SEARCH_TERM, self.WATCH_MATCH)
+
+    def step_add_watch(self):
+        """Step 7: Add Apple Watch Series 6 to cart"""
+        added = self.product.configure_and_add_to_cart(
+            quantity=2,
+            color=Config.WATCH_COLOR,
+            size=Config.WATCH_SIZE,
+            connectivity=Config.WATCH_CONNECTIVITY
+        )
+        if not added:
+            raise StepFailed("Configured watch could not be added to cart")
+
+    def step_open_cart_both(self):
+        """Step 8: Open cart to see both products"""
+        self._open_cart_expecting(self.LAPTOP_MATCH, self.WATCH_MATCH)
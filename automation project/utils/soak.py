@@ -0,0 +1,243 @@
+"""
+Soak runs: the shopping flow in a loop on one long-lived driver, with leak tracking
+
+Single-pass runs never show slow leaks. A soak run replays the 8-step flow
+for a fixed duration on the same browser session. After each iteration it
+empties the cart, returns to the home page and samples the following:
+
+- in the browser: JS heap, DOM nodes, JS event listeners and documents.
+  On Chromium these come from CDP Performance.getMetrics, after a forced
+  garbage collection, so detached nodes are counted too. Elsewhere a script
+  reads performance.memory and the live element count.
+- on the host: resident memory of the browser process tree and of this
+  process, open window handles and Python threads.
+
+Each series is tested for monotonic growth with the Mann-Kendall test. Its
+size is estimated with the Theil-Sen slope, which is robust to GC sawtooth
+and outliers. The same trend test on iteration latency reports drift. The
+first iterations warm caches and JIT, so they are left out of the analysis.
+"""
+
+import math
+import time
+import logging
+import threading
+import statistics
+import psutil
+from selenium.common.exceptions import WebDriverException
+from config.config import Config
+from pages.cart_page import CartPage
+from utils.capacity_planner import driver_processes, tree_rss
+from utils.emulation import Emulation
+from utils.shopping_flow import ShoppingFlow
+
+# One-sided significance level of the growth test
+ALPHA = 0.05
+# Fitted growth over the analysed iterations, relative to their starting level, below which
+# a significant trend is not reported as a leak (e.g. one cache entry per iteration)
+MIN_RELATIVE_GROWTH = 0.05
+# Iterations left out of the trend analysis
+WARMUP_ITERATIONS = 2
+# Consecutive failed iterations after which the run stops
+MAX_CONSECUTIVE_FAILURES = 3
+
+# Browser counters when CDP is not available; listeners cannot be counted from a page script
+SAMPLE_SCRIPT = """
+var memory = window.performance && performance.memory;
+return {js_heap_bytes: memory ? memory.usedJSHeapSize : null,
+        dom_nodes: document.getElementsByTagName('*').length,
+        js_listeners: null, documents: null};
+"""
+
+# CDP Performance.getMetrics names of the browser counters
+CDP_METRICS = {"JSHeapUsedSize": "js_heap_bytes", "Nodes": "dom_nodes",
+               "JSEventListeners": "js_listeners", "Documents": "documents"}
+
+METRICS = ["js_heap_bytes", "dom_nodes", "js_listeners", "documents",
+           "browser_rss_bytes", "runner_rss_bytes", "windows", "threads"]
+
+
+def _normal_cdf(z):
+    return 0.5 * (1 + math.erf(z / math.sqrt(2)))
+
+
+def mann_kendall(values):
+    """Mann-Kendall trend test: (S, z, one-sided p-value of an upward trend)"""
+    n = len(values)
+    s = sum((values[j] > values[i]) - (values[j] < values[i]) for i in range(n) for j in range(i + 1, n))
+    ties = {}
+    for value in values:
+        ties[value] = ties.get(value, 0) + 1
+    variance = (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in ties.values())) / 18
+    if variance <= 0:
+        return s, 0.0, 1.0
+    z = (s - 1) / math.sqrt(variance) if s > 0 else (s + 1) / math.sqrt(variance) if s < 0 else 0.0
+    return s, z, 1 - _normal_cdf(z)
+
+
+def theil_sen(values):
+    """Median slope over all pairs of points, per iteration"""
+    slopes = [(values[j] - values[i]) / (j - i) for i in range(len(values)) for j in range(i + 1, len(values))]
+    return statistics.median(slopes) if slopes else 0.0
+
+
+def trend(values, alpha=ALPHA, min_relative_growth=MIN_RELATIVE_GROWTH):
+    """Growth statistics of a series; "growing" is None when there are too few points"""
+    values = [value for value in values if value is not None]
+    if len(values) < 4:
+        return {"n": len(values), "growing": None}
+    s, z, p = mann_kendall(values)
+    slope = theil_sen(values)
+    growth = slope * (len(values) - 1)
+    # Starting level: median of the first quarter, so one noisy sample does not set the scale
+    start = statistics.median(values[:max(2, len(values) // 4)])
+    relative = growth / abs(start) if start else None
+    significant = p < alpha and growth > 0
+    return {
+        "n": len(values),
+        "start": start,
+        "last": values[-1],
+        "slope_per_iteration": round(slope, 3),
+        "growth": round(growth, 3),
+        "relative_growth": round(relative, 4) if relative is not None else None,
+        "mann_kendall_s": s,
+        "z": round(z, 3),
+        "p": round(p, 5),
+        "growing": significant and (relative is None or relative >= min_relative_growth),
+    }
+
+
+class SoakRunner:
+    """Loop the shopping flow on one driver and test its resource series for growth"""
+
+    def __init__(self, driver, base_url=None, duration=3600.0, max_iterations=None, email=None, password=None,
+                 warmup=WARMUP_ITERATIONS, alpha=ALPHA, min_relative_growth=MIN_RELATIVE_GROWTH):
+        self.driver = driver
+        self.base_url = (base_url or Config.BASE_URL).rstrip("/")
+        self.duration = duration
+        self.max_iterations = max_iterations
+        self.email = email
+        self.password = password
+        self.warmup = warmup
+        self.alpha = alpha
+        self.min_relative_growth = min_relative_growth
+        self.samples = []
+        self._cdp = None
+
+    def _browser_counters(self):
+        if self._cdp is None:
+            # Performance metrics and forced GC need CDP (Chrome and Edge)
+            try:
+                self.driver.execute_cdp_cmd("Performance.enable", {})
+                self._cdp = True
+            except Exception as e:
+                logging.info(f"Soak samples use a page script (no CDP metrics: {e})")
+                self._cdp = False
+        if self._cdp:
+            self.driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+            metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+            counters = {CDP_METRICS[metric["name"]]: metric["value"]
+                        for metric in metrics if metric["name"] in CDP_METRICS}
+            return {name: counters.get(name) for name in CDP_METRICS.values()}
+        counters = self.driver.execute_script(SAMPLE_SCRIPT)
+        if not counters:
+            raise WebDriverException("sample script returned nothing")
+        return counters
+
+    def sample(self):
+        """Browser and host counters for the current state"""
+        sample = {}
+        try:
+            sample.update(self._browser_counters())
+        except Exception as e:
+            logging.warning(f"Browser counters not sampled: {e}")
+        browser_processes = driver_processes(self.driver)
+        sample["browser_rss_bytes"] = tree_rss(browser_processes) if browser_processes else None
+        sample["runner_rss_bytes"] = psutil.Process().memory_info().rss
+        try:
+            sample["windows"] = len(self.driver.window_handles)
+        except Exception:
+            sample["windows"] = None
+        sample["threads"] = threading.active_count()
+        return {name: sample.get(name) for name in METRICS}
+
+    def _settle(self):
+        # Same state before every sample: empty cart, home page
+        try:
+            if not CartPage(self.driver).clear_cart(self.base_url):
+                logging.warning("Cart not empty between soak iterations")
+            self.driver.get(self.base_url)
+        except Exception as e:
+            logging.warning(f"Could not reset between soak iterations: {e}")
+
+    def run(self):
+        """Loop until the duration or iteration limit and return the report"""
+        # A retried step would hide its failure inside the iteration latency
+        flow = ShoppingFlow(self.driver, self.base_url, email=self.email, password=self.password, retries=0)
+        started = time.monotonic()
+        consecutive_failures = 0
+        stop_reason = "duration"
+        while True:
+            iteration = len(self.samples) + 1
+            if self.max_iterations and iteration > self.max_iterations:
+                stop_reason = "iterations"
+                break
+            if iteration > 1 and time.monotonic() - started >= self.duration:
+                break
+            iteration_started = time.monotonic()
+            results = flow.run()
+            duration_ms = round((time.monotonic() - iteration_started) * 1000, 1)
+            failed = next((result for result in results if not result["passed"]), None)
+            self._settle()
+            entry = {"iteration": iteration, "passed": failed is None, "duration_ms": duration_ms,
+                     "failed_step": failed["name"] if failed else None, "error": failed["error"] if failed else None}
+            entry.update(self.sample())
+            self.samples.append(entry)
+            logging.info(f"Soak iteration {iteration}: {'passed' if failed is None else 'FAILED'} in "
+                         f"{duration_ms / 1000:.2f}s, {entry['dom_nodes']} nodes, {entry['js_heap_bytes']} heap bytes")
+            consecutive_failures = 0 if failed is None else consecutive_failures + 1
+            if consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                stop_reason = f"{consecutive_failures} consecutive failures"
+                logging.error(f"Stopping soak run after {stop_reason}")
+                break
+        return self.report(time.monotonic() - started, stop_reason)
+
+    def analyse(self):
+        """Trend of every counter and of the latency of passed iterations, after the warm-up"""
+        analysed = self.samples[self.warmup:]
+        trends = {}
+        for name in METRICS:
+            series = [entry[name] for entry in analysed]
+            trends[name] = trend(series, self.alpha, self.min_relative_growth)
+            # The trend covers only the iterations that were sampled
+            trends[name]["missing"] = series.count(None)
+            if trends[name]["missing"]:
+                logging.warning(f"Soak counter {name} not sampled in {trends[name]['missing']} of "
+                                f"{len(series)} analysed iterations")
+        passed = [entry["duration_ms"] for entry in analysed if entry["passed"]]
+        latency = trend(passed, self.alpha, self.min_relative_growth)
+        if passed:
+            window = max(1, len(passed) // 4)
+            latency["first_quarter_median_ms"] = statistics.median(passed[:window])
+            latency["last_quarter_median_ms"] = statistics.median(passed[-window:])
+        return trends, latency
+
+    def report(self, elapsed, stop_reason):
+        """Samples, trends, leaking counters and latency drift"""
+        trends, latency = self.analyse()
+        return {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(time.time() - elapsed)),
+            "base_url": self.base_url,
+            "browser": getattr(self.driver, "name", None),
+            "emulation": Emulation.active(self.driver),
+            "elapsed_s": round(elapsed, 1),
+            "stop_reason": stop_reason,
+            "iterations": len(self.samples),
+            "failures": sum(1 for entry in self.samples if not entry["passed"]),
+            "warmup_iterations": self.warmup,
+            "leaks": [name for name, result in trends.items() if result["growing"]],
+            "latency_drift": bool(latency["growing"]),
+            "trends": trends,
+            "latency": latency,
+            "samples": self.samples,
+        }
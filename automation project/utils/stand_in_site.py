@@ -0,0 +1,556 @@
+"""
+Local stand-in for the Cartlow storefront
+
+Serves server-rendered pages whose markup matches the page-object locators
+(home, login, search, product, cart, checkout) with per-account carts, so the
+flows, benchmarks and load tools can run without the live site or network.
+
+Run standalone with: python -m utils.stand_in_site --port 8000
+"""
+
+import re
+import html
+import json
+import uuid
+import random
+import logging
+import argparse
+import threading
+from http import cookies
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, urlencode, quote
+
+from config.config import Config
+
+SESSION_COOKIE = "cartlow_session"
+# How search results are listed: all at once, in pages with a next link, or in chunks loaded on scroll
+LISTINGS = ("all", "pages", "scroll")
+
+# Loads the next chunk of results when the page is scrolled near its end (listing="scroll")
+SCROLL_LOADER = """<script>
+(function () {
+  var grid = document.querySelector('.product-grid[data-more]'), loading = false;
+  if (!grid) { return; }
+  function more() {
+    var next = grid.getAttribute('data-more');
+    if (loading || !next || window.innerHeight + window.scrollY < document.body.scrollHeight - 400) { return; }
+    loading = true;
+    fetch(next).then(function (response) { return response.text(); }).then(function (markup) {
+      grid.insertAdjacentHTML('beforeend', markup);
+      var chunk = grid.lastElementChild;
+      if (chunk && chunk.getAttribute('data-more')) { grid.setAttribute('data-more', chunk.getAttribute('data-more')); }
+      else { grid.removeAttribute('data-more'); }
+      loading = false;
+    });
+  }
+  window.addEventListener('scroll', more);
+})();
+</script>"""
+
+
+def _slugify(name):
+    """Turn a product name into a URL slug"""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _tokens(text):
+    """Lower-case word tokens used for search matching"""
+    return set(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def _money(amount):
+    """Format an amount the way Cartlow does"""
+    return f"AED {amount:,.2f}"
+
+
+CATALOG = [
+    {"id": "1001", "name": Config.LAPTOP_NAME, "price": 1899.0, "category": "laptops",
+     "keywords": "laptop notebook", "options": {}},
+    {"id": "1002", "name": "Dell Latitude 5490 Intel Core i5-8350U 14\" HD Display, 8GB RAM, 256GB SSD",
+     "price": 1149.0, "category": "laptops", "keywords": "laptop notebook", "options": {}},
+    {"id": "1003", "name": "HP EliteBook 840 G5 Intel Core i7-8550U 14\" FHD, 16GB RAM, 512GB SSD",
+     "price": 1649.0, "category": "laptops", "keywords": "laptop notebook", "options": {}},
+    {"id": "2001", "name": Config.WATCH_NAME, "price": 899.0, "category": "smartwatches",
+     "keywords": "smartwatch smart watch", "options": {
+         "connectivity": ["GPS", Config.WATCH_CONNECTIVITY],
+         "color": ["Gold", Config.WATCH_COLOR, "Space Gray"],
+         "size": ["40mm", Config.WATCH_SIZE],
+     }},
+    {"id": "2002", "name": "Apple Watch SE (44mm, GPS) Space Gray Aluminum Case with Black Sport Band",
+     "price": 599.0, "category": "smartwatches", "keywords": "smartwatch smart watch", "options": {
+         "color": ["Space Gray", Config.WATCH_COLOR],
+         "size": ["40mm", "44mm"],
+     }},
+    {"id": "2003", "name": "Samsung Galaxy Watch 4 (44mm, Bluetooth) Black",
+     "price": 449.0, "category": "smartwatches", "keywords": "smartwatch smart watch", "options": {}},
+]
+
+
+class Response:
+    """Minimal response container shared by the HTTP server and in-process callers"""
+
+    def __init__(self, status=200, body="", content_type="text/html; charset=utf-8", headers=None):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.headers = headers or {}
+        self.set_cookies = {}
+
+    @staticmethod
+    def redirect(location):
+        return Response(303, "", headers={"Location": location})
+
+    @staticmethod
+    def json(payload, status=200):
+        return Response(status, json.dumps(payload), "application/json")
+
+
+class StandInSite:
+    """In-memory storefront: catalog, sessions and server-side carts"""
+
+    def __init__(self, extra_results=0, accounts=None, seed=7, listing="all", page_size=24):
+        if listing not in LISTINGS:
+            raise ValueError(f"listing must be one of {', '.join(LISTINGS)}, got {listing!r}")
+        self.products = [dict(product, slug=_slugify(product["name"])) for product in CATALOG]
+        rng = random.Random(seed)
+        brands = ["Lenovo ThinkPad", "Acer Aspire", "Asus ZenBook", "Huawei MateBook", "Garmin Venu"]
+        for index in range(extra_results):
+            brand = rng.choice(brands)
+            category = "smartwatches" if brand.startswith("Garmin") else "laptops"
+            name = f"{brand} {rng.randint(100, 999)} Refurbished Model {index}"
+            self.products.append({
+                "id": str(10000 + index), "name": name, "slug": _slugify(name),
+                "price": float(rng.randint(300, 3000)), "category": category,
+                "keywords": "laptop smartwatch refurbished", "options": {},
+            })
+        self.by_slug = {product["slug"]: product for product in self.products}
+        self.by_id = {product["id"]: product for product in self.products}
+        # None accepts any non-empty credentials, otherwise a {email: password} map
+        self.accounts = accounts
+        self.listing = listing
+        self.page_size = page_size
+        self.sessions = {}
+        self.carts = {}
+        self.lock = threading.RLock()
+
+    # ------------------------------------------------------------------ state
+
+    def _session(self, session_id):
+        with self.lock:
+            if session_id not in self.sessions:
+                self.sessions[session_id] = {"user": None}
+            return self.sessions[session_id]
+
+    def _cart_key(self, session_id):
+        # Logged-in carts belong to the account, like the real site
+        user = self._session(session_id)["user"]
+        return f"user:{user}" if user else f"session:{session_id}"
+
+    def cart(self, session_id):
+        """Return the cart lines for a session"""
+        with self.lock:
+            return self.carts.setdefault(self._cart_key(session_id), [])
+
+    def cart_count(self, session_id):
+        return sum(line["qty"] for line in self.cart(session_id))
+
+    def add_to_cart(self, session_id, product_id, qty=1, variant=None):
+        """Add a product line, merging with an identical variant"""
+        product = self.by_id.get(str(product_id))
+        if not product or qty < 1:
+            return None
+        variant = {key: value for key, value in (variant or {}).items() if value}
+        with self.lock:
+            lines = self.carts.setdefault(self._cart_key(session_id), [])
+            for line in lines:
+                if line["product_id"] == product["id"] and line["variant"] == variant:
+                    line["qty"] += qty
+                    return line
+            line = {"line_id": uuid.uuid4().hex[:8], "product_id": product["id"],
+                    "qty": qty, "variant": variant}
+            lines.append(line)
+            return line
+
+    def search(self, query):
+        """Return products matching at least half of the query tokens"""
+        terms = _tokens(query)
+        if not terms:
+            return []
+        results = []
+        for product in self.products:
+            haystack = _tokens(f"{product['name']} {product['category']} {product['keywords']}")
+            hits = len(terms & haystack)
+            if hits * 2 >= len(terms):
+                results.append((hits, product))
+        results.sort(key=lambda item: -item[0])
+        return [product for _, product in results]
+
+    def snapshots(self):
+        """Render one page per page type, as saved DOM snapshots for offline work"""
+        sid = "snapshot-" + uuid.uuid4().hex[:8]
+        pages = {"login": self._login_page(sid)}
+        self._session(sid)["user"] = f"{sid}@example.com"
+        laptop, watch = self.products[0], self.products[3]
+        pages["home"] = self._home_page(sid)
+        pages["search"] = self._search_page(Config.LAPTOP_SEARCH_TERM, sid)
+        pages["product"] = self._product_page(watch, {}, sid)
+        pages["cart_empty"] = self._cart_page(sid)
+        self.add_to_cart(sid, laptop["id"])
+        self.add_to_cart(sid, watch["id"], 2, {"color": Config.WATCH_COLOR, "size": Config.WATCH_SIZE})
+        pages["cart"] = self._cart_page(sid)
+        pages["checkout"] = self._checkout_page(sid)
+        return pages
+
+    # ---------------------------------------------------------------- routing
+
+    def handle(self, method, path, query=None, form=None, session_id=None):
+        """Dispatch a request and return a Response"""
+        query = query or {}
+        form = form or {}
+        response_session = session_id or uuid.uuid4().hex
+        route = path.rstrip("/") or "/"
+        try:
+            response = self._route(method.upper(), route, query, form, response_session)
+        except KeyError:
+            response = Response(404, self._layout("Not found", "<h1>Page not found</h1>", response_session))
+        if session_id != response_session:
+            response.set_cookies[SESSION_COOKIE] = response_session
+        return response
+
+    def _route(self, method, route, query, form, sid):
+        if route == "/":
+            return Response(body=self._home_page(sid))
+        if route == "/login":
+            return self._login(method, form, sid)
+        if route == "/logout":
+            self._session(sid)["user"] = None
+            return Response.redirect("/")
+        if route == "/search":
+            return Response(body=self._search_page(query.get("q", ""), sid, self._page_number(query)))
+        if route == "/search/more":
+            return Response(body=self._search_chunk(query.get("q", ""), self._page_number(query)))
+        if route.startswith("/category/"):
+            return Response(body=self._category_page(route.split("/")[-1], sid))
+        if route.startswith("/product/"):
+            return Response(body=self._product_page(self.by_slug[route.split("/")[-1]], query, sid))
+        if route == "/cart":
+            return Response(body=self._cart_page(sid))
+        if route == "/cart/add" and method == "POST":
+            return self._cart_add(form, sid)
+        if route == "/cart/update" and method == "POST":
+            return self._cart_update(form, sid)
+        if route == "/cart/remove" and method == "POST":
+            return self._cart_remove(form, sid)
+        if route == "/checkout":
+            return Response(body=self._checkout_page(sid))
+        raise KeyError(route)
+
+    def _login(self, method, form, sid):
+        if method != "POST":
+            return Response(body=self._login_page(sid))
+        email = form.get("email", "").strip()
+        password = form.get("password", "")
+        valid = bool(email and password)
+        if valid and self.accounts is not None:
+            valid = self.accounts.get(email) == password
+        if not valid:
+            return Response(401, self._login_page(sid, error="Invalid email or password"))
+        self._session(sid)["user"] = email
+        return Response.redirect("/")
+
+    def _cart_add(self, form, sid):
+        variant = {key: form.get(key) for key in ("connectivity", "color", "size")}
+        try:
+            qty = int(form.get("qty") or 1)
+        except ValueError:
+            qty = 1
+        line = self.add_to_cart(sid, form.get("product_id"), qty, variant)
+        if not line:
+            return Response(400, self._layout("Error", "<h1>Could not add to cart</h1>", sid))
+        product = self.by_id[line["product_id"]]
+        selection = urlencode({key: value for key, value in line["variant"].items()})
+        return Response.redirect(f"/product/{product['slug']}?added=1" + (f"&{selection}" if selection else ""))
+
+    def _cart_update(self, form, sid):
+        with self.lock:
+            lines = self.carts.get(self._cart_key(sid), [])
+            for line in lines:
+                if line["line_id"] == form.get("line_id"):
+                    try:
+                        line["qty"] = max(1, int(form.get("qty") or line["qty"]))
+                    except ValueError:
+                        pass
+        return Response.redirect("/cart")
+
+    def _cart_remove(self, form, sid):
+        with self.lock:
+            lines = self.carts.get(self._cart_key(sid), [])
+            lines[:] = [line for line in lines if line["line_id"] != form.get("line_id")]
+        return Response.redirect("/cart")
+
+    # -------------------------------------------------------------- rendering
+
+    def _layout(self, title, content, sid):
+        session = self._session(sid)
+        if session["user"]:
+            account = (f'<div class="user-menu"><span class="greeting">Hi, {html.escape(session["user"])}</span>'
+                       f'<a href="/logout">Logout</a></div>')
+        else:
+            account = ('<span class="account-toggle" onclick="window.location.href=\'/login\'">Account</span>'
+                       '<a class="signin-link" href="/login">Sign In</a>')
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{html.escape(title)} | Cartlow</title></head>
+<body>
+<header class="site-header">
+  <a class="logo" href="/">Cartlow</a>
+  <form class="search-form" method="get" action="/search">
+    <input type="search" name="q" placeholder="Search products here">
+    <button class="search-btn">Search</button>
+  </form>
+  <nav>{account}<a class="cart-link" href="/cart">Cart <span class="cart-count">{self.cart_count(sid)}</span></a></nav>
+</header>
+<div class="category-menu">
+  <a href="/category/laptops">Laptops</a>
+  <a href="/category/smartwatches">Smartwatches</a>
+</div>
+<main>
+{content}
+</main>
+</body>
+</html>"""
+
+    def _product_card(self, product):
+        return (f'<div class="product-card" data-product-id="{product["id"]}">'
+                f'<a class="product-link" href="/product/{product["slug"]}">'
+                f'<h3 class="product-name">{html.escape(product["name"])}</h3></a>'
+                f'<span class="product-price">{_money(product["price"])}</span>'
+                f'<span class="availability">In stock</span></div>')
+
+    def _home_page(self, sid):
+        featured = "".join(self._product_card(product) for product in self.products[:6])
+        return self._layout("Buy Refurbished Electronics", f'<h1>Refurbished deals</h1><div class="product-grid">{featured}</div>', sid)
+
+    def _login_page(self, sid, error=None):
+        message = f'<div class="error-message">{html.escape(error)}</div>' if error else ""
+        content = f"""<h1>Sign In</h1>{message}
+<form class="login-form" method="post" action="/login">
+  <input type="email" name="email" id="email" placeholder="Email">
+  <input type="password" name="password" id="password" placeholder="Password">
+  <button type="submit">Login</button>
+</form>"""
+        return self._layout("Sign In", content, sid)
+
+    @staticmethod
+    def _page_number(query):
+        try:
+            return max(1, int(query.get("page", 1)))
+        except ValueError:
+            return 1
+
+    def _results_page(self, query, page):
+        """One page of results, the URL of the next page (None on the last) and the result count"""
+        results = self.search(query)
+        if self.listing == "all":
+            return results, None, len(results)
+        chunk = results[(page - 1) * self.page_size:page * self.page_size]
+        more = len(results) > page * self.page_size
+        path = "/search" if self.listing == "pages" else "/search/more"
+        return chunk, f"{path}?{urlencode({'q': query, 'page': page + 1})}" if more else None, len(results)
+
+    def _search_page(self, query, sid, page=1):
+        chunk, next_url, total = self._results_page(query, page)
+        cards = "".join(self._product_card(product) for product in chunk)
+        grid, footer = f'<div class="product-grid">{cards}</div>', ""
+        if self.listing == "pages" and next_url:
+            footer = f'<nav class="pagination"><a class="next" rel="next" href="{html.escape(next_url)}">Next</a></nav>'
+        elif self.listing == "scroll" and next_url:
+            grid = f'<div class="product-grid" data-more="{html.escape(next_url)}">{cards}</div>'
+            footer = SCROLL_LOADER
+        content = (f'<h1>Search results for "{html.escape(query)}"</h1>'
+                   f'<p class="result-count">{total} results</p>{grid}{footer}')
+        return self._layout("Search", content, sid)
+
+    def _search_chunk(self, query, page):
+        """Markup the scroll loader appends for one more page of results"""
+        chunk, next_url, _ = self._results_page(query, page)
+        more = f' data-more="{html.escape(next_url)}"' if next_url else ""
+        cards = "".join(self._product_card(product) for product in chunk)
+        return f'<div class="result-chunk"{more}>{cards}</div>'
+
+    def _category_page(self, category, sid):
+        products = [product for product in self.products if product["category"] == category]
+        if not products:
+            raise KeyError(category)
+        cards = "".join(self._product_card(product) for product in products)
+        return self._layout(category.title(), f'<h1>{category.title()}</h1><div class="product-grid">{cards}</div>', sid)
+
+    def _product_page(self, product, query, sid):
+        selection = {key: query.get(key) for key in product["options"] if query.get(key)}
+        hidden = "".join(f'<input type="hidden" name="{key}" value="{html.escape(value)}">'
+                         for key, value in selection.items())
+        # Option buttons re-render the page with the choice in the query string,
+        # so selection works without client-side scripting
+        groups = []
+        for key, values in product["options"].items():
+            buttons = []
+            for value in values:
+                selected = " selected" if selection.get(key) == value else ""
+                buttons.append(f'<button type="submit" class="option-btn{selected}" name="{key}" '
+                               f'value="{html.escape(value)}" title="{html.escape(value)}">{html.escape(value)}</button>')
+            groups.append(f'<div class="option-group {key}"><span class="option-label">{key.title()}</span>{"".join(buttons)}</div>')
+        options = ""
+        if groups:
+            kept = "".join(f'<input type="hidden" name="{key}" value="{html.escape(value)}">'
+                           for key, value in selection.items())
+            options = f'<form class="options-form" method="get" action="/product/{product["slug"]}">{kept}{"".join(groups)}</form>'
+        added = '<div class="notice added">Added to cart</div>' if query.get("added") else ""
+        content = f"""<h1 class="product-title">{html.escape(product["name"])}</h1>
+{added}
+<span class="price">{_money(product["price"])}</span>
+{options}
+<form class="add-to-cart-form" method="post" action="/cart/add">
+  <input type="hidden" name="product_id" value="{product["id"]}">{hidden}
+  <input type="number" name="qty" class="quantity-input" value="1" min="1">
+  <button type="submit" class="add-to-cart-btn">Add to Cart</button>
+</form>"""
+        return self._layout(product["name"], content, sid)
+
+    def _cart_page(self, sid):
+        lines = self.cart(sid)
+        if not lines:
+            return self._layout("Cart", '<h1>Shopping Cart</h1><div class="empty-cart">Your cart is empty</div>', sid)
+        rows = []
+        total = 0.0
+        for line in lines:
+            product = self.by_id[line["product_id"]]
+            total += product["price"] * line["qty"]
+            variant = ", ".join(line["variant"].values())
+            rows.append(f"""<div class="cart-item" data-line-id="{line["line_id"]}" data-product-id="{product["id"]}">
+  <a class="product-name" href="/product/{product["slug"]}">{html.escape(product["name"])}</a>
+  <span class="variant">{html.escape(variant)}</span>
+  <span class="price">{_money(product["price"])}</span>
+  <form method="post" action="/cart/update"><input type="hidden" name="line_id" value="{line["line_id"]}">
+    <input type="number" name="qty" class="quantity" value="{line["qty"]}" min="1">
+    <button type="submit" class="update">Update</button></form>
+  <form method="post" action="/cart/remove"><input type="hidden" name="line_id" value="{line["line_id"]}">
+    <button type="submit" class="remove">Remove</button></form>
+</div>""")
+        content = f"""<h1>Shopping Cart</h1>
+<div class="cart-list">{"".join(rows)}</div>
+<p>Total: <span class="cart-total">{_money(total)}</span></p>
+<form method="get" action="/checkout"><button type="submit" class="checkout-btn">Proceed to Checkout</button></form>"""
+        return self._layout("Cart", content, sid)
+
+    def _checkout_page(self, sid):
+        count = self.cart_count(sid)
+        return self._layout("Checkout", f'<h1>Checkout</h1><p class="checkout-summary">{count} items</p>', sid)
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    """Translate HTTP requests into StandInSite.handle calls"""
+
+    site = None
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without this, keep-alive
+    # clients stall ~40 ms per response on Nagle plus delayed ACK
+    disable_nagle_algorithm = True
+
+    def _dispatch(self, method):
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        form = {}
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            raw = self.rfile.read(length).decode("utf-8")
+            if "json" in (self.headers.get("Content-Type") or ""):
+                form = json.loads(raw or "{}")
+            else:
+                form = {key: values[-1] for key, values in parse_qs(raw, keep_blank_values=True).items()}
+        jar = cookies.SimpleCookie(self.headers.get("Cookie") or "")
+        session_id = jar[SESSION_COOKIE].value if SESSION_COOKIE in jar else None
+
+        response = self.site.handle(method, parts.path, query, form, session_id)
+
+        body = response.body.encode("utf-8")
+        self.send_response(response.status)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in response.headers.items():
+            self.send_header(name, value)
+        for name, value in response.set_cookies.items():
+            self.send_header("Set-Cookie", f"{name}={quote(value)}; Path=/; HttpOnly")
+        self.end_headers()
+        if method != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_HEAD(self):
+        self._dispatch("HEAD")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        logging.debug("stand-in: " + format % args)
+
+
+class StandInServer:
+    """Serve a StandInSite over HTTP on a background thread"""
+
+    def __init__(self, site=None, host="127.0.0.1", port=0):
+        self.site = site or StandInSite()
+        handler = type("StandInRequestHandler", (_StandInRequestHandler,), {"site": self.site})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Start serving in a daemon thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="stand-in-server", daemon=True)
+        self.thread.start()
+        logging.info(f"Stand-in site serving at {self.base_url}")
+        return self
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    """Serve the stand-in site until interrupted"""
+    parser = argparse.ArgumentParser(description="Serve the local Cartlow stand-in site")
+    parser.add_argument("--port", type=int, default=8000, help="Port to listen on")
+    parser.add_argument("--extra-results", type=int, default=0, help="Number of filler products to add")
+    parser.add_argument("--listing", choices=LISTINGS, default="all",
+                        help="List search results at once, in pages or loaded on scroll")
+    parser.add_argument("--page-size", type=int, default=24, help="Results per page or scroll chunk")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = StandInServer(StandInSite(extra_results=args.extra_results, listing=args.listing,
+                                      page_size=args.page_size), port=args.port)
+    server.start()
+    print(f"Stand-in site running at {server.base_url} (set BASE_URL to use it)")
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
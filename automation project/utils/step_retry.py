@@ -0,0 +1,245 @@
+"""
+Step-level retry with jittered backoff and persisted flakiness statistics
+
+A failed step is retried in place: the browser state captured before the
+step (URL, cookies, localStorage) is restored, the runner backs off for a
+random share of an exponentially growing delay (full jitter), and the step
+runs again on the same driver, so a transient failure costs one step, not a
+full test rerun. Server-side state (e.g. the cart) is not rolled back, so a
+step that changes it passes a reader of that state and is retried only while
+the state reads as it did before the step (an add that went through is not
+repeated; an unreadable state is not retried).
+
+Outcomes per step and lookups per locator are counted in
+reports/flakiness.json. A step that needed retries in at least FLAKY_RATE
+of its runs gets one extra attempt, each attempt limited to an equal share
+of the step's wait budget (tighter waits, so a stuck attempt leaves time for
+the next). A step that still failed in at least QUARANTINE_RATE of its runs
+is quarantined: its failure is raised as StepQuarantined, which pytest
+reports as xfail and the flow tooling reports separately.
+"""
+
+import json
+import random
+import logging
+import threading
+from pathlib import Path
+from config.config import Config
+from utils.wait_budget import WaitBudget, pause
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+FLAKINESS_FILE = PROJECT_ROOT / "reports" / "flakiness.json"
+# Runs a step needs before its history changes the retry policy
+MIN_RUNS = 5
+FLAKY_RATE = 0.2
+QUARANTINE_RATE = 0.5
+BACKOFF_CAP = 10.0
+
+
+class StepFailed(Exception):
+    """Raised when a flow step does not reach its expected state"""
+
+
+class StepQuarantined(StepFailed):
+    """A quarantined step failed again; its failure is known and tracked"""
+
+
+def backoff_delay(attempt, base=None, cap=BACKOFF_CAP, rng=random):
+    """Full-jitter delay before retry number `attempt` (0-based)"""
+    base = Config.RETRY_BACKOFF if base is None else base
+    return rng.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def capture_checkpoint(driver):
+    """Browser state needed to resume at a step"""
+    try:
+        storage = json.loads(driver.execute_script("return JSON.stringify(window.localStorage);") or "{}")
+    except Exception as e:
+        logging.debug(f"localStorage not captured: {e}")
+        storage = {}
+    return {"url": driver.current_url, "cookies": driver.get_cookies(), "local_storage": storage}
+
+
+def restore_checkpoint(driver, checkpoint):
+    """Put the browser back into a captured state"""
+    driver.get(checkpoint["url"])
+    driver.delete_all_cookies()
+    for cookie in checkpoint["cookies"]:
+        driver.add_cookie({key: value for key, value in cookie.items() if key != "domain"})
+    driver.execute_script("localStorage.clear();")
+    if checkpoint["local_storage"]:
+        driver.execute_script(
+            "Object.entries(arguments[0]).forEach(([k, v]) => localStorage.setItem(k, v));",
+            checkpoint["local_storage"])
+    driver.get(checkpoint["url"])
+
+
+class FlakinessStats:
+    """Per-step outcomes and per-locator timeouts, merged into a JSON file on save"""
+
+    STEP_FIELDS = ("runs", "first_try", "after_retry", "failed", "attempts")
+
+    def __init__(self, path=FLAKINESS_FILE):
+        self.path = Path(path)
+        self.stored = self._load()
+        self.pending = {"steps": {}, "locators": {}}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            data = {}
+        return {"steps": data.get("steps", {}), "locators": data.get("locators", {})}
+
+    @staticmethod
+    def _add(target, source):
+        for kind, entries in source.items():
+            for name, counts in entries.items():
+                entry = target[kind].setdefault(name, {})
+                for key, value in counts.items():
+                    entry[key] = entry.get(key, 0) + value if isinstance(value, int) else value
+
+    def record_step(self, name, attempts, passed, error=None):
+        """Count one run of a step"""
+        outcome = "failed" if not passed else "first_try" if attempts == 1 else "after_retry"
+        update = {"runs": 1, "attempts": attempts, outcome: 1}
+        if error:
+            update["last_error"] = error
+        with self._lock:
+            self._add(self.pending, {"steps": {name: update}})
+
+    def record_lookups(self, ledger):
+        """Count the lookups of a WaitBudget ledger per locator"""
+        locators = {}
+        for entry in ledger:
+            if entry["outcome"] == "slept":
+                continue
+            counts = locators.setdefault(entry["lookup"], {"lookups": 0, "timeouts": 0})
+            counts["lookups"] += 1
+            counts["timeouts"] += entry["outcome"] in ("timeout", "exhausted")
+        with self._lock:
+            self._add(self.pending, {"locators": locators})
+
+    def step(self, name):
+        """Stored and pending counts of a step"""
+        merged = {"steps": {}, "locators": {}}
+        with self._lock:
+            self._add(merged, {"steps": {name: self.stored["steps"].get(name, {})}})
+            self._add(merged, {"steps": {name: self.pending["steps"].get(name, {})}})
+        return {field: merged["steps"][name].get(field, 0) for field in self.STEP_FIELDS}
+
+    def policy(self, name):
+        """Attempts, per-attempt budget share and quarantine for a step from its history"""
+        counts = self.step(name)
+        attempts = 1 + Config.STEP_RETRIES
+        policy = {"attempts": attempts, "budget_share": 1.0, "quarantined": False}
+        if counts["runs"] < MIN_RUNS:
+            return policy
+        if counts["after_retry"] / counts["runs"] >= FLAKY_RATE:
+            policy["attempts"] = attempts + 1
+            policy["budget_share"] = 1.0 / policy["attempts"]
+        policy["quarantined"] = counts["failed"] / counts["runs"] >= QUARANTINE_RATE
+        return policy
+
+    def flaky_locators(self, min_lookups=MIN_RUNS):
+        """(locator, timeout rate, lookups) for locators that timed out, worst first"""
+        merged = {"steps": {}, "locators": {}}
+        with self._lock:
+            self._add(merged, {"locators": self.stored["locators"]})
+            self._add(merged, {"locators": self.pending["locators"]})
+        rows = [(name, counts["timeouts"] / counts["lookups"], counts["lookups"])
+                for name, counts in merged["locators"].items()
+                if counts["lookups"] >= min_lookups and counts["timeouts"]]
+        return sorted(rows, key=lambda row: -row[1])
+
+    def save(self):
+        """Add pending counts to the file (re-read first, so parallel workers do not overwrite each other)"""
+        with self._lock:
+            if not self.pending["steps"] and not self.pending["locators"]:
+                return
+            self.stored = self._load()
+            self._add(self.stored, self.pending)
+            self.pending = {"steps": {}, "locators": {}}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.stored, indent=1, sort_keys=True))
+
+
+class StepRetry:
+    """Run steps on one driver, retrying failed ones in place"""
+
+    def __init__(self, driver, stats=None, retries=None, rng=random):
+        self.driver = driver
+        self.stats = stats
+        self.retries = retries
+        self.rng = rng
+        self.last_attempts = 0
+
+    def policy(self, name):
+        policy = self.stats.policy(name) if self.stats else \
+            {"attempts": 1 + Config.STEP_RETRIES, "budget_share": 1.0, "quarantined": False}
+        if self.retries is not None:
+            policy["attempts"] = 1 + self.retries
+        return policy
+
+    def _attempt(self, name, action, share):
+        budget = WaitBudget.current()
+        if budget is None or share >= 1.0:
+            result = action()
+        else:
+            with WaitBudget(f"{name} attempt", budget.seconds * share) as attempt_budget:
+                try:
+                    result = action()
+                finally:
+                    budget.ledger.extend(attempt_budget.ledger)
+        if result is False:
+            raise StepFailed(f"Step '{name}' did not succeed")
+        return result
+
+    @staticmethod
+    def _read(state):
+        try:
+            return state()
+        except Exception as e:
+            logging.warning(f"Step state not read: {e}")
+            return None
+
+    def run(self, name, action, state=None):
+        """Run action() as step `name`, retrying on an exception or a False result; returns the result.
+        state() reads the server-side state the step changes; the step is retried only while it is unchanged"""
+        policy = self.policy(name)
+        checkpoint = capture_checkpoint(self.driver) if policy["attempts"] > 1 else None
+        before = self._read(state) if state and checkpoint else None
+        budget = WaitBudget.current()
+        error = None
+        for attempt in range(policy["attempts"]):
+            if attempt:
+                delay = backoff_delay(attempt - 1, rng=self.rng)
+                logging.warning(f"Step '{name}' failed ({error}); retry {attempt} in {delay:.2f}s")
+                pause(delay, f"retry backoff {name}")
+                try:
+                    restore_checkpoint(self.driver, checkpoint)
+                except Exception as e:
+                    logging.warning(f"Could not restore the state before '{name}': {e}")
+                if state and (before is None or self._read(state) != before):
+                    logging.warning(f"Step '{name}' not retried: it may already have taken effect")
+                    break
+            self.last_attempts = attempt + 1
+            try:
+                result = self._attempt(name, action, policy["budget_share"])
+                self._record(name, True, None, budget)
+                return result
+            except Exception as e:
+                error = e
+                if budget is not None and budget.remaining() <= 0:
+                    break
+        self._record(name, False, str(error) or error.__class__.__name__, budget)
+        if policy["quarantined"]:
+            raise StepQuarantined(f"Quarantined step '{name}' failed: {error}") from error
+        raise error
+
+    def _record(self, name, passed, error, budget):
+        if self.stats:
+            self.stats.record_step(name, self.last_attempts, passed, error)
+            if budget is not None:
+                self.stats.record_lookups(budget.ledger)
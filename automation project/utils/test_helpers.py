@@ -1,19 +1,21 @@
-import time
 import logging
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from utils.overlay_guard import OverlayGuard
+from pages.search_results_page import SearchResultsPage
+from utils.page_metrics import PageMetricsCollector
+from utils.wait_budget import wait_until, pause
+from utils.step_retry import backoff_delay
 
 class TestHelpers:
     @staticmethod
     def wait_for_page_load(driver, timeout=30):
         """Wait for page to fully load"""
         try:
-            WebDriverWait(driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
-            )
-            time.sleep(2)  # Additional wait for dynamic content
+            wait_until(driver, lambda driver: driver.execute_script("return document.readyState") == "complete",
+                       "document.readyState complete", timeout)
+            PageMetricsCollector.collect(driver)
+            pause(2)  # Additional wait for dynamic content
             return True
         except TimeoutException:
             logging.warning("Page load timeout")
@@ -21,27 +23,15 @@ class TestHelpers:
     
     @staticmethod
     def find_product_by_name(driver, product_name, timeout=10):
-        """Find product by name on the page"""
+        """Find the link of the search result that best matches a product name"""
         try:
-            # Try different selectors for product links
-            selectors = [
-                f"//a[contains(text(), '{product_name}')]",
-                f"//h3[contains(text(), '{product_name}')]//parent::a",
-                f"//div[contains(@class, 'product')]//a[contains(text(), '{product_name}')]",
-                f"//*[contains(text(), '{product_name}')]//ancestor::a"
-            ]
-            
-            for selector in selectors:
-                try:
-                    element = WebDriverWait(driver, timeout).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                    return element
-                except TimeoutException:
-                    continue
-            
-            logging.warning(f"Product '{product_name}' not found")
-            return None
+            # New result cards are read in one script call per scroll or page and ranked by
+            # fuzzy token match, so quotes in the name and small title changes do not matter
+            best, _ = SearchResultsPage(driver).scan_for(product_name, timeout=timeout)
+            if best is None:
+                logging.warning(f"Product '{product_name}' not found")
+                return None
+            return best["element"]
             
         except Exception as e:
             logging.error(f"Error finding product: {e}")
@@ -52,7 +42,7 @@ class TestHelpers:
         """Scroll to element"""
         try:
             driver.execute_script("arguments[0].scrollIntoView(true);", element)
-            time.sleep(1)
+            pause(1)
             return True
         except Exception as e:
             logging.error(f"Failed to scroll to element: {e}")
@@ -73,9 +63,7 @@ class TestHelpers:
     def wait_for_element_clickable(driver, locator, timeout=10):
         """Wait for element to be clickable"""
         try:
-            element = WebDriverWait(driver, timeout).until(
-                EC.element_to_be_clickable(locator)
-            )
+            element = wait_until(driver, EC.element_to_be_clickable(locator), f"clickable {locator}", timeout)
             return element
         except TimeoutException:
             logging.error(f"Element not clickable: {locator}")
@@ -85,9 +73,7 @@ class TestHelpers:
     def wait_for_text_in_element(driver, locator, text, timeout=10):
         """Wait for specific text in element"""
         try:
-            WebDriverWait(driver, timeout).until(
-                EC.text_to_be_present_in_element(locator, text)
-            )
+            wait_until(driver, EC.text_to_be_present_in_element(locator, text), f"text '{text}' in {locator}", timeout)
             return True
         except TimeoutException:
             logging.error(f"Text '{text}' not found in element: {locator}")
@@ -95,32 +81,16 @@ class TestHelpers:
     
     @staticmethod
     def handle_popup(driver):
-        """Handle common popups"""
-        try:
-            # Common popup selectors
-            popup_selectors = [
-                "//button[contains(text(), 'Close')]",
-                "//button[contains(@class, 'close')]",
-                "//div[contains(@class, 'popup')]//button",
-                "//div[contains(@class, 'modal')]//button"
-            ]
-            
-            for selector in popup_selectors:
-                try:
-                    popup = driver.find_element(By.XPATH, selector)
-                    if popup.is_displayed():
-                        popup.click()
-                        time.sleep(1)
-                        break
-                except:
-                    continue
-                    
-        except Exception as e:
-            logging.warning(f"Error handling popup: {e}")
+        """Dismiss open popups now; the overlay guard normally does this as they appear"""
+        if getattr(driver, "overlay_guard", None) is None:
+            OverlayGuard.install(driver)
+        else:
+            OverlayGuard.ensure(driver, force=True)
+        return len(OverlayGuard.read_log(driver))
     
     @staticmethod
     def retry_action(action, max_retries=3, delay=2):
-        """Retry an action multiple times"""
+        """Retry an action multiple times with jittered exponential backoff (delay is the base)"""
         for attempt in range(max_retries):
             try:
                 result = action()
@@ -128,8 +98,8 @@ class TestHelpers:
                     return True
             except Exception as e:
                 logging.warning(f"Attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(delay)
+            if attempt < max_retries - 1:
+                pause(backoff_delay(attempt, base=delay), "retry backoff")
         
         logging.error(f"Action failed after {max_retries} attempts")
         return False
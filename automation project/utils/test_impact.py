@@ -0,0 +1,259 @@
+"""
+Coverage-based test impact analysis for CI selection
+
+Recording (pytest --record-impact) runs the suite under coverage of pages/
+and utils/ with one coverage context per test, and stores which functions
+and methods each test executed in reports/impact_map.json. Selection
+(pytest --impacted-since REF) diffs the tree against a git ref, maps the
+changed lines to those units, and keeps only the tests that executed one of
+them, plus the safety set in config/impact_safety.txt and any test the map
+has not seen yet. A changed locator (a class attribute) counts as a change
+to every method that reads it. Changes outside pages/, utils/ and tests/
+(conftest, config, requirements) select everything.
+"""
+
+import ast
+import json
+import time
+import logging
+import subprocess
+from pathlib import Path
+import coverage
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+IMPACT_MAP_FILE = PROJECT_ROOT / "reports" / "impact_map.json"
+SAFETY_FILE = PROJECT_ROOT / "config" / "impact_safety.txt"
+IMPACT_SOURCES = ("pages", "utils")
+TEST_DIR = "tests"
+# Files that can change behaviour outside the map (sources, settings, requirements)
+GLOBAL_SUFFIXES = (".py", ".json", ".ini", ".txt", ".cfg", ".toml")
+# Generated output that never affects a test
+IGNORED_DIRS = ("reports", "logs", "screenshots")
+
+
+def code_units(path):
+    """Functions and methods of a file as (first line, last line, qualified name, class attributes)"""
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    units = []
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                start = min([child.lineno] + [decorator.lineno for decorator in child.decorator_list])
+                units.append((start, child.end_lineno, f"{prefix}{child.name}", None))
+                visit(child, f"{prefix}{child.name}.")
+            elif isinstance(child, ast.ClassDef):
+                attributes = {}
+                for item in child.body:
+                    if isinstance(item, (ast.Assign, ast.AnnAssign)):
+                        targets = item.targets if isinstance(item, ast.Assign) else [item.target]
+                        for line in range(item.lineno, item.end_lineno + 1):
+                            attributes.setdefault(line, []).extend(
+                                target.id for target in targets if isinstance(target, ast.Name))
+                units.append((child.lineno, child.end_lineno, f"{prefix}{child.name}", attributes))
+                visit(child, f"{prefix}{child.name}.")
+
+    visit(tree, "")
+    return units
+
+
+def innermost_unit(units, line):
+    """The narrowest unit containing a line, or None at module level"""
+    containing = [unit for unit in units if unit[0] <= line <= unit[1]]
+    return min(containing, key=lambda unit: unit[1] - unit[0]) if containing else None
+
+
+def attribute_readers(root, names, sources=IMPACT_SOURCES):
+    """Units in the source folders that read any of the attribute names (self.LOGIN_BUTTON, page.CART_ICON)"""
+    readers = set()
+    for folder in sources:
+        for path in sorted((Path(root) / folder).rglob("*.py")):
+            relative = path.relative_to(root).as_posix()
+            try:
+                units = [unit for unit in code_units(path) if unit[3] is None]
+                tree = ast.parse(path.read_text(encoding="utf-8"))
+            except SyntaxError:
+                continue
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Attribute) and node.attr in names:
+                    unit = innermost_unit(units, node.lineno)
+                    if unit:
+                        readers.add(f"{relative}::{unit[2]}")
+    return readers
+
+
+class ImpactRecorder:
+    """pytest plugin: record the units each test executes"""
+
+    def __init__(self, root=PROJECT_ROOT, path=IMPACT_MAP_FILE, sources=IMPACT_SOURCES):
+        self.root = Path(root)
+        self.path = Path(path)
+        self.sources = sources
+        self.coverage = coverage.Coverage(data_file=None, source=[str(self.root / folder) for folder in sources])
+        self.nodeids = []
+
+    def pytest_sessionstart(self, session):
+        self.coverage.start()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self.nodeids.append(item.nodeid)
+        self.coverage.switch_context(item.nodeid)
+        yield
+        self.coverage.switch_context("")
+
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.coverage.stop()
+        tests = self.build(self.coverage.get_data())
+        self.save(tests)
+        logging.info(f"Impact map: {len(tests)} tests recorded in {self.path}")
+
+    def build(self, data):
+        """nodeid -> sorted units ("pages/login_page.py::LoginPage.login") from per-test contexts"""
+        tests = {nodeid: set() for nodeid in self.nodeids}
+        for filename in data.measured_files():
+            try:
+                relative = Path(filename).resolve().relative_to(self.root).as_posix()
+                units = [unit for unit in code_units(filename) if unit[3] is None]
+            except (ValueError, SyntaxError, OSError):
+                continue
+            for line, contexts in data.contexts_by_lineno(filename).items():
+                unit = innermost_unit(units, line)
+                if not unit:
+                    continue
+                for context in contexts:
+                    if context in tests:
+                        tests[context].add(f"{relative}::{unit[2]}")
+        return {nodeid: sorted(units) for nodeid, units in tests.items()}
+
+    def save(self, tests):
+        """Merge into the stored map so recording a subset keeps the other tests"""
+        stored = load_impact_map(self.path) or {"tests": {}}
+        stored["tests"].update(tests)
+        stored["recorded_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(stored, indent=1, sort_keys=True))
+
+
+def load_impact_map(path=IMPACT_MAP_FILE):
+    """Stored impact map, or None when missing or unreadable"""
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def load_safety_set(path=SAFETY_FILE):
+    """Node ids or node id prefixes that always run"""
+    try:
+        lines = Path(path).read_text().splitlines()
+    except OSError:
+        return []
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith("#")]
+
+
+def changed_lines(base, root=PROJECT_ROOT):
+    """Changed line numbers per file (relative to root) between a git ref and the working tree"""
+    diff = subprocess.run(["git", "diff", "--relative", "--no-color", "-U0", base, "--", "."],
+                          cwd=root, capture_output=True, text=True, check=True).stdout
+    untracked = subprocess.run(["git", "ls-files", "--others", "--exclude-standard"],
+                               cwd=root, capture_output=True, text=True, check=True).stdout
+    changes = {path: None for path in untracked.splitlines() if path.endswith(".py")}
+    current = None
+    for line in diff.splitlines():
+        # git appends a tab to paths containing spaces
+        if line.startswith(("--- a/", "+++ b/")):
+            current = line[6:].rstrip("\t")
+            changes.setdefault(current, set())
+        elif line.startswith("+++ /dev/null"):
+            # Deleted file: everything that used it is affected
+            changes[current] = None
+        elif line.startswith("@@") and changes.get(current) is not None:
+            start, _, count = line.split()[2][1:].partition(",")
+            count = int(count) if count else 1
+            changes[current].update(range(int(start), int(start) + max(count, 1)))
+    return changes
+
+
+def changed_units(changes, root=PROJECT_ROOT, sources=IMPACT_SOURCES):
+    """Map changed lines to units; returns (units, whole files, test files) or None to run everything"""
+    units, files, test_files = set(), set(), set()
+    for relative, lines in changes.items():
+        folder = relative.split("/")[0]
+        if folder in IGNORED_DIRS or not relative.endswith(GLOBAL_SUFFIXES):
+            continue
+        if folder == TEST_DIR and Path(relative).name.startswith("test_"):
+            test_files.add(relative)
+            continue
+        if folder not in sources or not relative.endswith(".py"):
+            return None
+        path = Path(root) / relative
+        if lines is None or not path.exists():
+            files.add(relative)
+            continue
+        file_units = code_units(path)
+        for line in lines:
+            unit = innermost_unit(file_units, line)
+            if unit is None:
+                # Imports and module constants can change any function in the file
+                files.add(relative)
+            elif unit[3] is None:
+                units.add(f"{relative}::{unit[2]}")
+            elif unit[3].get(line):
+                units |= attribute_readers(root, set(unit[3][line]), sources)
+            else:
+                files.add(relative)
+    return units, files, test_files
+
+
+def select_tests(nodeids, impact_map, changes, safety=(), root=PROJECT_ROOT):
+    """Split node ids into (selected, reasons) for a change set"""
+    impact = changed_units(changes, root)
+    if impact is None or not impact_map:
+        reason = "no impact map" if not impact_map else "global change"
+        return list(nodeids), {nodeid: reason for nodeid in nodeids}
+    units, files, test_files = impact
+    recorded = impact_map.get("tests", {})
+    reasons = {}
+    for nodeid in nodeids:
+        touched = set(recorded.get(nodeid, ()))
+        if nodeid.split("::")[0] in test_files:
+            reasons[nodeid] = "test changed"
+        elif any(nodeid == entry or nodeid.startswith(entry) for entry in safety):
+            reasons[nodeid] = "safety set"
+        elif nodeid not in recorded:
+            reasons[nodeid] = "not in impact map"
+        elif touched & units or any(unit.split("::")[0] in files for unit in touched):
+            reasons[nodeid] = "executes changed code"
+    return [nodeid for nodeid in nodeids if nodeid in reasons], reasons
+
+
+class ImpactSelector:
+    """pytest plugin: deselect tests the changes since a git ref cannot affect"""
+
+    def __init__(self, base, root=PROJECT_ROOT, path=IMPACT_MAP_FILE, safety_file=SAFETY_FILE):
+        self.base = base
+        self.root = Path(root)
+        self.path = path
+        self.safety_file = safety_file
+
+    def pytest_collection_modifyitems(self, session, config, items):
+        impact_map = load_impact_map(self.path)
+        if not impact_map:
+            logging.warning(f"No impact map at {self.path}; running every test (record one with --record-impact)")
+            return
+        try:
+            changes = changed_lines(self.base, self.root)
+        except (subprocess.CalledProcessError, OSError) as e:
+            logging.warning(f"Could not diff against {self.base}: {e}; running every test")
+            return
+        # pytest.ini sits in the project root, so node ids are relative to it like the map's
+        nodeids = [item.nodeid for item in items]
+        selected, _ = select_tests(nodeids, impact_map, changes, load_safety_set(self.safety_file), self.root)
+        keep = set(selected)
+        deselected = [item for item, nodeid in zip(items, nodeids) if nodeid not in keep]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item, nodeid in zip(items, nodeids) if nodeid in keep]
+        logging.info(f"Impact selection since {self.base}: {len(items)} selected, {len(deselected)} deselected")
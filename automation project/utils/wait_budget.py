@@ -0,0 +1,178 @@
+"""
+Per-step wait budgets
+
+A step declares its total time budget by entering a WaitBudget. Every
+explicit wait and settle pause inside it draws its timeout from what is
+left, so fallback lookups cannot stack timeout upon timeout past the step's
+deadline. Implicit waits stay at 0 (see DriverFactory.apply_profile) so a
+lookup never blocks outside this accounting. Each wait is recorded in the
+budget's ledger, which is reported when a step fails or overruns.
+
+Optional elements are probed instead of waited for: probe() answers
+"present now" immediately, or "settled absent" once the DOM has stopped
+changing for QUIESCENCE_WINDOW seconds, within a short ABSENCE_TIMEOUT.
+"""
+
+import time
+import logging
+import threading
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+from config.config import Config
+
+# Document state plus a mutation counter installed on first use; equal results mean no DOM change
+DOM_SIGNATURE_SCRIPT = """
+if (!window.__domMutations) {
+    window.__domMutations = {count: 0};
+    new MutationObserver(function (records) { window.__domMutations.count += records.length; })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+return [document.readyState, window.__domMutations.count, document.getElementsByTagName('*').length];
+"""
+
+
+class BudgetExhausted(TimeoutException):
+    """A wait was requested after the step's budget ran out"""
+
+
+class WaitBudget:
+    """Total wait budget for one step; nested budgets are capped by their parent"""
+
+    _local = threading.local()
+
+    def __init__(self, name, seconds):
+        self.name = name
+        self.seconds = seconds
+        self.ledger = []
+        self.parent = None
+        self.started = None
+
+    @staticmethod
+    def _stack():
+        if not hasattr(WaitBudget._local, "stack"):
+            WaitBudget._local.stack = []
+        return WaitBudget._local.stack
+
+    @staticmethod
+    def current():
+        """Innermost budget active on this thread, or None"""
+        stack = WaitBudget._stack()
+        return stack[-1] if stack else None
+
+    def __enter__(self):
+        stack = WaitBudget._stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self)
+        self.started = time.monotonic()
+        return self
+
+    def __exit__(self, *exc_info):
+        WaitBudget._stack().remove(self)
+        return False
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    def remaining(self):
+        """Seconds left, never more than the parent budget has left"""
+        left = self.seconds - self.elapsed()
+        if self.parent:
+            left = min(left, self.parent.remaining())
+        return max(0.0, left)
+
+    def overrun(self):
+        """Seconds spent past the deadline (0 when within budget)"""
+        return max(0.0, self.elapsed() - self.seconds)
+
+    def timeout(self, label, requested=None):
+        """Timeout for the next wait: the request capped by what is left"""
+        left = self.remaining()
+        if left <= 0:
+            self.record(label, 0.0, "exhausted")
+            raise BudgetExhausted(f"Wait budget of step '{self.name}' exhausted before: {label}")
+        return left if requested is None else min(requested, left)
+
+    def record(self, label, seconds, outcome):
+        self.ledger.append({"lookup": label, "seconds": round(seconds, 3), "outcome": outcome})
+
+    def summary(self):
+        return {
+            "budget_s": self.seconds,
+            "spent_s": round(self.elapsed(), 3),
+            "lookups": self.ledger,
+        }
+
+    def report(self):
+        """Human-readable budget consumption per lookup"""
+        lines = [f"Step '{self.name}': {self.elapsed():.2f} s of {self.seconds:.2f} s budget"]
+        for entry in self.ledger:
+            share = entry["seconds"] / self.seconds * 100 if self.seconds else 0
+            lines.append(f"  {entry['seconds']:>7.2f} s {share:>5.1f}%  {entry['outcome']:<9} {entry['lookup']}")
+        return "\n".join(lines)
+
+
+def wait_until(driver, condition, label, timeout=None):
+    """WebDriverWait.until with its timeout drawn from the active budget, charged to its ledger"""
+    budget = WaitBudget.current()
+    if budget is None:
+        timeout = Config.EXPLICIT_WAIT if timeout is None else timeout
+    else:
+        timeout = budget.timeout(label, Config.EXPLICIT_WAIT if timeout is None else timeout)
+    started = time.monotonic()
+    outcome = "timeout"
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=Config.POLL_INTERVAL).until(condition)
+        outcome = "found"
+        return result
+    finally:
+        if budget is not None:
+            budget.record(label, time.monotonic() - started, outcome)
+
+
+def probe(driver, locator, label, timeout=None):
+    """Elements matching now, or [] once the DOM settled without them (or ABSENCE_TIMEOUT ran out)"""
+    budget = WaitBudget.current()
+    timeout = Config.ABSENCE_TIMEOUT if timeout is None else timeout
+    if budget is not None:
+        timeout = budget.timeout(label, timeout)
+    started = time.monotonic()
+    signature, stable_since = None, started
+    outcome = "absent-timeout"
+    try:
+        while True:
+            elements = driver.find_elements(*locator)
+            if elements:
+                outcome = "present"
+                return elements
+            now = time.monotonic()
+            try:
+                current = driver.execute_script(DOM_SIGNATURE_SCRIPT)
+            except WebDriverException:
+                current = None
+            if current != signature:
+                signature, stable_since = current, now
+            elif current and current[0] == "complete" and now - stable_since >= Config.QUIESCENCE_WINDOW:
+                outcome = "absent"
+                return []
+            if now - started >= timeout:
+                return []
+            time.sleep(min(Config.POLL_INTERVAL, timeout - (now - started)))
+    finally:
+        if budget is not None:
+            budget.record(label, time.monotonic() - started, outcome)
+
+
+def pause(seconds, label="pause"):
+    """Fixed settle delay scaled by SLEEP_SCALE and capped by the active budget"""
+    seconds *= Config.SLEEP_SCALE
+    budget = WaitBudget.current()
+    if budget is not None:
+        seconds = min(seconds, budget.remaining())
+        budget.record(label, seconds, "slept")
+    time.sleep(seconds)
+
+
+def log_budget(budget):
+    """Log a failed or overrun step's budget consumption per lookup"""
+    for line in budget.report().splitlines():
+        logging.error(line)
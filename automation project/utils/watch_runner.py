@@ -0,0 +1,130 @@
+"""
+Watch mode: re-run only what an edit touches, on an already-open browser
+
+Source files are polled for changes. Each change is mapped through the
+static DependencyGraph to the pytest node ids and ShoppingFlow steps that
+use the edited code; the tests run in-process against a warm DriverPool and
+the steps resume from a checkpoint (URL, cookies, localStorage) captured
+before the first affected step, so login and navigation are not repeated.
+Server-side state such as the cart is not rolled back by a checkpoint.
+"""
+
+import time
+import logging
+import importlib
+from pathlib import Path
+from utils.dependency_graph import PROJECT_ROOT, SKIP_DIRS, DependencyGraph
+from utils.runner_daemon import KEEP_MODULES, purge_project_modules, run_pytest
+from utils.step_retry import capture_checkpoint, restore_checkpoint
+
+FLOW_MODULE = "utils.shopping_flow"
+WATCH_PATTERNS = ("*.py", "config/*.json")
+# Warm state that must survive a reload
+WATCH_KEEP_MODULES = KEEP_MODULES | {"utils.watch_runner", "utils.dependency_graph"}
+
+
+class FileWatcher:
+    """Poll modification times of the project's sources"""
+
+    def __init__(self, root=PROJECT_ROOT, patterns=WATCH_PATTERNS):
+        self.root = Path(root)
+        self.patterns = patterns
+        self.mtimes = self.snapshot()
+
+    def snapshot(self):
+        mtimes = {}
+        for pattern in self.patterns:
+            for path in self.root.rglob(pattern) if pattern.startswith("*") else self.root.glob(pattern):
+                if not SKIP_DIRS.intersection(path.relative_to(self.root).parts):
+                    mtimes[path] = path.stat().st_mtime_ns
+        return mtimes
+
+    def changes(self):
+        """Paths added, modified or deleted since the last call"""
+        current = self.snapshot()
+        changed = {path for path in current.keys() | self.mtimes.keys() if current.get(path) != self.mtimes.get(path)}
+        self.mtimes = current
+        return sorted(changed)
+
+
+class WatchRunner:
+    """Map source changes to tests and flow steps and re-run them on a warm pool"""
+
+    def __init__(self, pool, graph=None, run_tests=True, run_flow=True, runner=run_pytest, emit=None,
+                 reload=True, base_url=None):
+        self.pool = pool
+        self.base_url = base_url
+        self.graph = graph or DependencyGraph()
+        self.run_tests = run_tests
+        self.run_flow = run_flow
+        self.runner = runner
+        self.emit = emit or (lambda event: None)
+        self.reload = reload
+        # Step name -> browser state captured just before that step last ran
+        self.checkpoints = {}
+
+    def _flow_class(self):
+        if self.reload:
+            purge_project_modules(keep=WATCH_KEEP_MODULES)
+        return importlib.import_module(FLOW_MODULE).ShoppingFlow
+
+    def flow(self, steps=None):
+        """Run the flow from the checkpoint before the first of `steps` through the last of them"""
+        flow_class = self._flow_class()
+        names = [name for name, _ in flow_class.STEPS]
+        wanted = [name for name in names if not steps or name in steps]
+        first, last = names.index(wanted[0]), names.index(wanted[-1])
+        # Without a checkpoint the steps before it have to run again
+        while first and names[first] not in self.checkpoints:
+            first -= 1
+        results = []
+        with self.pool.lease() as driver:
+            if first:
+                restore_checkpoint(driver, self.checkpoints[names[first]])
+                logging.info(f"Resumed flow at '{names[first]}' from its checkpoint")
+            flow = flow_class(driver, base_url=self.base_url)
+            for name in names[first:last + 1]:
+                self.checkpoints[name] = capture_checkpoint(driver)
+                result = flow.run(steps=[name])[0]
+                results.append(result)
+                self.emit({"event": "step", **result})
+                if not result["passed"]:
+                    # State after a failed step is not a valid starting point
+                    for later in names[names.index(name) + 1:]:
+                        self.checkpoints.pop(later, None)
+                    break
+        return results
+
+    def handle(self, paths):
+        """Re-run what the changed paths impact; returns what ran"""
+        self.graph.build()
+        paths = [self.graph.root / path for path in paths]
+        relative = [path.relative_to(self.graph.root).as_posix() for path in paths]
+        tests = self.graph.impacted_tests(paths) if self.run_tests else []
+        steps = []
+        if self.run_flow and FLOW_MODULE in self.graph.modules:
+            steps = [name[len("step_"):] for name in
+                     self.graph.impacted_methods(FLOW_MODULE, "ShoppingFlow", paths, prefix="step_")]
+        self.emit({"event": "changed", "paths": relative, "tests": tests, "steps": steps})
+        outcome = {"paths": relative, "tests": tests, "steps": steps, "exit_code": None, "step_results": []}
+        if steps:
+            outcome["step_results"] = self.flow(steps)
+        if tests:
+            outcome["exit_code"] = self.runner(tests, self.emit)
+        return outcome
+
+    def watch(self, watcher=None, interval=0.5):
+        """Poll until interrupted"""
+        watcher = watcher or FileWatcher(self.graph.root)
+        logging.info(f"Watching {len(watcher.mtimes)} files under {watcher.root}")
+        try:
+            while True:
+                changed = watcher.changes()
+                if changed:
+                    try:
+                        self.handle(changed)
+                    except Exception as e:
+                        logging.error(f"Watch run failed: {e}")
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            logging.info("Watch mode stopped")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Watch mode: re-run only the tests and flow steps an edit impacts
+
+    python watch_tests.py                 # real browser, signed in once
+    python watch_tests.py --stand-in      # in-process fake browser, offline
+
+On start the 8-step flow runs once to record a checkpoint before each step.
+After that, saving a page object, helper or config file re-runs only the
+steps and tests that depend on it, on the same open browser.
+"""
+
+import os
+import sys
+import logging
+import argparse
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent))
+
+from config.config import Config
+from utils.driver_pool import DriverPool, sign_in
+from utils.fake_webdriver import FakeWebDriver
+from utils.stand_in_site import StandInSite
+from utils.watch_runner import WatchRunner
+from run_warm import print_event
+
+
+def print_watch_event(event):
+    """Print one watch-mode event"""
+    if event["event"] == "changed":
+        print(f"\nChanged: {', '.join(event['paths'])}")
+        print(f"Impacted: {len(event['steps'])} steps, {len(event['tests'])} tests")
+    elif event["event"] == "step":
+        status = "PASSED" if event["passed"] else "FAILED"
+        print(f"{status:<8} step {event['step']} {event['name']} [{event['duration_ms'] / 1000:.2f}s]")
+        if event["error"]:
+            print(f"         {event['error']}")
+    else:
+        print_event(event)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Re-run impacted tests and flow steps on file changes')
+    parser.add_argument('--browser', choices=['chrome', 'firefox', 'edge'], help='Browser to use')
+    parser.add_argument('--stand-in', action='store_true', help='Use an in-process fake browser on the stand-in site')
+    parser.add_argument('--interval', type=float, default=0.5, help='Seconds between file scans')
+    parser.add_argument('--no-tests', action='store_true', help='Only re-run flow steps')
+    parser.add_argument('--no-flow', action='store_true', help='Only re-run pytest tests')
+    args = parser.parse_args()
+
+    os.chdir(Path(__file__).parent)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    create_driver = None
+    if args.stand_in:
+        site = StandInSite()
+        os.environ["BASE_URL"] = "http://stand-in.local"
+        create_driver = lambda: FakeWebDriver(site)
+    elif args.browser:
+        os.environ["BROWSER"] = args.browser
+    Config.apply()
+
+    print("Cartlow Watch Mode")
+    print("=" * 50)
+    # The flow signs in itself, so only the tests' driver needs the warm-up login
+    pool = DriverPool(size=1, create_driver=create_driver, warm_up=None if not args.no_flow else sign_in).start()
+    runner = WatchRunner(pool, run_tests=not args.no_tests, run_flow=not args.no_flow, emit=print_watch_event)
+    try:
+        if runner.run_flow:
+            print("Recording step checkpoints...")
+            runner.flow()
+        print(f"Watching for changes every {args.interval:g}s - Ctrl+C to stop")
+        runner.watch(interval=args.interval)
+    finally:
+        pool.close()
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)